@@ -0,0 +1,69 @@
+"""
+Archivo: analisis_lote.py
+Análisis financiero por lotes desde la línea de comandos (sin interfaz gráfica)
+
+Uso:
+    python analisis_lote.py <directorio|manifiesto> -o resultados.jsonl
+    python analisis_lote.py empresas/ -o resultados.parquet --procesos 8
+    python analisis_lote.py empresas/ -o r.jsonl --base-conocimiento retail.yaml
+
+Cada empresa es un archivo JSON:
+    {
+        "empresa": "Nombre",
+        "balance": {"caja_bancos": [850, 1100], ...},
+        "estado_resultados": {"ingresos_servicios": [8500, 11200], ...}
+    }
+(también se aceptan claves "caja_bancos_y1", "caja_bancos_y2", ...)
+"""
+
+import argparse
+import sys
+import time
+
+from services.analisis_lote import listar_empresas, ejecutar_lote
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Ejecuta el análisis financiero completo para muchas empresas."
+    )
+    parser.add_argument('origen',
+                        help="Directorio con un .json por empresa o manifiesto con una ruta por línea")
+    parser.add_argument('-o', '--salida', required=True,
+                        help="Archivo de salida (.jsonl, o .parquet si pyarrow está instalado)")
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Procesos en paralelo (por defecto, todos los núcleos; 1 = sin pool)")
+    parser.add_argument('--chunksize', type=int, default=16,
+                        help="Empresas enviadas juntas a cada proceso (por defecto 16)")
+    parser.add_argument('--base-conocimiento', default=None,
+                        help="Archivo .json/.yaml con los rangos óptimos de los ratios "
+                             "(por defecto, core/analysis/base_conocimiento_ratios.json)")
+    args = parser.parse_args(argv)
+
+    rutas = listar_empresas(args.origen)
+    if not rutas:
+        print(f"No se encontraron empresas en {args.origen}")
+        return 1
+
+    inicio = time.time()
+    paso = max(1, len(rutas) // 20)
+
+    def al_avanzar(procesadas, total):
+        if procesadas % paso == 0 or procesadas == total:
+            print(f"  {procesadas}/{total} empresas", flush=True)
+
+    print(f"Analizando {len(rutas)} empresas -> {args.salida}")
+    try:
+        resumen = ejecutar_lote(rutas, args.salida, args.procesos, args.chunksize, al_avanzar,
+                                base_conocimiento=args.base_conocimiento)
+    except (ImportError, OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"✅ {resumen['correctas']} correctas, {resumen['errores']} con error "
+          f"({time.time() - inicio:.1f} s)")
+    return 0 if resumen['errores'] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
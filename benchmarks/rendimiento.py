@@ -0,0 +1,462 @@
+"""
+Archivo: benchmarks/rendimiento.py
+Benchmarks del núcleo de análisis y de los gráficos, con líneas base en JSON
+
+Mide empresas procesadas por segundo y pico de memoria de cada análisis
+sobre empresas sintéticas (1, 1.000 y 100.000 empresas) y compara con la
+línea base guardada para detectar regresiones.
+
+Cada vuelta se mide con los caches de subtotales de los modelos y el LRU
+de REGISTRO vacíos: de lo contrario, desde la segunda vuelta solo se
+medirían aciertos de cache. Los análisis por empresa miden las empresas
+que entran en el presupuesto y la memoria sobre MUESTRA_MEMORIA empresas;
+la salida y la línea base guardan cuántas se midieron en cada caso.
+
+Uso:
+    python -m benchmarks.rendimiento
+    python -m benchmarks.rendimiento --casos ratios graficos --escalas 1 1000
+    python -m benchmarks.rendimiento --guardar          # actualiza la línea base
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from core.models.balance import BalanceGeneral
+from core.models.estado_resultado import EstadoResultado
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+
+
+LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lineas_base.json')
+
+ESCALAS = (1, 1_000, 100_000)
+
+# Segundos de medición por caso y escala. Los análisis que procesan una
+# empresa por vez miden las primeras empresas que entren en el tiempo
+# (100.000 recomendaciones tardarían minutos); el resultado por segundo
+# sigue siendo comparable entre corridas
+PRESUPUESTO_S = 1.0
+
+# Empresas con las que se mide el pico de memoria de los casos por
+# empresa: fija, para que el pico no dependa de cuántas empresas entraron
+# en el presupuesto (y tracemalloc los hace varias veces más lentos)
+MUESTRA_MEMORIA = 10
+
+# Duración mínima de cada muestra: las entradas chicas se procesan varias
+# veces seguidas para que el reloj y el ruido del sistema no dominen
+MUESTRA_MINIMA_S = 0.02
+
+# Muestras mínimas por caso y escala, aunque se pase del presupuesto: se
+# compara la mediana, que una muestra lenta (o rápida) suelta no mueve
+MUESTRAS_MINIMAS = 5
+
+# Caída de empresas/s (o aumento de memoria) tolerada frente a la línea base
+TOLERANCIA = 0.30
+
+# Los gráficos dependen del renderizador de matplotlib y de la caché de
+# fuentes: entre corridas iguales varían ±25%, así que toleran más
+TOLERANCIA_GRAFICOS = 0.50
+
+# Diferencias de memoria menores a esta no cuentan como regresión
+HOLGURA_MEMORIA_KIB = 64
+
+SEMILLA = 20240101
+
+
+# ============================================================
+# EMPRESAS SINTÉTICAS
+# ============================================================
+
+class EmpresasSinteticas:
+    """
+    N empresas generadas a partir del caso de estudio (test_datos_reales):
+    cada una con un tamaño log-normal y ±15% de ruido por cuenta.
+
+    Los valores se guardan como arreglos (empresas x periodos x cuentas)
+    y los modelos de 2 años se crean solo para las empresas que se usen.
+    """
+
+    def __init__(self, n, semilla=SEMILLA):
+        from test_datos_reales import crear_datos_caso_estudio
+
+        balance, estado = crear_datos_caso_estudio()
+        base_balance = BalanceMultiperiodo.desde_modelo(balance).valores.T
+        base_estado = EstadoResultadoMultiperiodo.desde_modelo(estado).valores.T
+
+        rng = np.random.default_rng(semilla)
+        tamano = rng.lognormal(0.0, 1.0, size=(n, 1, 1))
+
+        def generar(base):
+            ruido = np.clip(rng.normal(1.0, 0.15, size=(n,) + base.shape), 0.5, 1.5)
+            return base[np.newaxis] * tamano * ruido
+
+        self.n = n
+        self.balances = generar(base_balance)
+        self.estados = generar(base_estado)
+        self._modelos = []
+
+    def modelos(self, n):
+        """Pares (BalanceGeneral, EstadoResultado) de las primeras n empresas"""
+        for i in range(len(self._modelos), min(n, self.n)):
+            self._modelos.append((
+                BalanceMultiperiodo(self.balances[i].T).a_modelo(BalanceGeneral()),
+                EstadoResultadoMultiperiodo(self.estados[i].T).a_modelo(EstadoResultado()),
+            ))
+        return self._modelos[:n]
+
+
+# ============================================================
+# CASOS
+# ============================================================
+
+class Caso:
+    """
+    Un benchmark: `preparar(datos, n)` arma las entradas de n empresas
+    (no se mide) y `ejecutar(entradas)` las procesa todas.
+    """
+
+    def __init__(self, nombre, preparar, ejecutar, por_empresa=True, tolerancia=TOLERANCIA):
+        """
+        Args:
+            nombre: Identificador en la línea base ('grupo.caso')
+            preparar: Función (EmpresasSinteticas, n) -> entradas
+            ejecutar: Función (entradas) -> None
+            por_empresa: False si procesa todas las empresas de una vez
+                         (se mide siempre a escala completa)
+            tolerancia: Caída tolerada frente a la línea base
+        """
+        self.nombre = nombre
+        self.preparar = preparar
+        self.ejecutar = ejecutar
+        self.por_empresa = por_empresa
+        self.tolerancia = tolerancia
+
+
+def _para_cada(funcion):
+    """ejecutar() que aplica funcion(balance, estado) a cada par"""
+    def ejecutar(pares):
+        for balance, estado in pares:
+            funcion(balance, estado)
+    return ejecutar
+
+
+def _ratios_ambos_anos(balance, estado):
+    from core.calculators.ratio_calculator import RatioCalculator
+    RatioCalculator(balance, estado).calcular_ambos_años()
+
+
+def _ratios_lote(arreglos):
+    from core.calculators.ratio_calculator_lote import RatioCalculatorLote
+    RatioCalculatorLote(*arreglos).calcular()
+
+
+def _matriz_ratios(balance, estado):
+    from core.analysis.matriz_ratios import MatrizRatios
+    MatrizRatios(balance, estado).generar_matriz_completa()
+
+
+def _preparar_matrices(datos, n):
+    from core.analysis.matriz_ratios import MatrizRatios
+    return [MatrizRatios(b, e).generar_matriz_completa() for b, e in datos.modelos(n)]
+
+
+def _fortalezas_debilidades(matrices):
+    from core.analysis.fortalezas_debilidades import FortalezasDebilidadesAnalysis
+    for matriz in matrices:
+        FortalezasDebilidadesAnalysis(matriz).identificar_fortalezas_debilidades()
+
+
+def _recomendaciones(balance, estado):
+    from core.analysis.recomendaciones_estrategicas import RecomendacionesEstrategicas
+    RecomendacionesEstrategicas(balance, estado).generar_recomendaciones_completas()
+
+
+def _resumen_integral(balance, estado):
+    from core.analysis.resumen_integral import ResumenIntegralRatios
+    ResumenIntegralRatios(balance, estado).generar_resumen_completo()
+
+
+def _preparar_ratios(datos, n):
+    """Ratios de ambos años de cada empresa, con las claves de graphics/graficas.py"""
+    from core.calculators.ratio_calculator import RatioCalculator
+    entradas = []
+    for balance, estado in datos.modelos(n):
+        ratios = RatioCalculator(balance, estado).calcular_ambos_años()
+        entradas.append(tuple(
+            {
+                'liquidez_general': r['razon_liquidez'],
+                'tesoreria': r['razon_tesoreria'],
+                'disponibilidad': r['razon_disponibilidad'],
+                'garantia': r['ratio_garantia'],
+                'autonomia': r['ratio_autonomia'],
+                'calidad_deuda': r['ratio_calidad_deuda'],
+                'roa': r['rat'] * 100,
+                'roe': r['rpp'] * 100,
+                'margen_neto': r['margen_neto'] * 100,
+                'rotacion_activo': r['rotacion_activos'],
+                'apalancamiento': r['apalancamiento'],
+                'margen_bruto': r['margen_bruto'] * 100,
+                'margen_operativo': r['margen_operativo'] * 100,
+                'fondo_maniobra': balance.get_total_corriente(year) - balance.get_total_pasivo_corriente(year),
+            }
+            for year, r in ((1, ratios['year_1']), (2, ratios['year_2']))
+        ))
+    return entradas
+
+
+def _grafico_fondo_maniobra(entradas):
+    from graphics.fondo_maniobra import grafico_barras_con_variacion
+    for ano1, ano2 in entradas:
+        grafico_barras_con_variacion(ano1['fondo_maniobra'], ano2['fondo_maniobra'])
+
+
+def _grafico_balance(balance, estado):
+    from graphics.grafico_balance import grafico_balance
+    grafico_balance(
+        activo_nc=balance.get_total_no_corriente(2),
+        activo_c=balance.get_total_corriente(2),
+        patrimonio=balance.get_total_patrimonio(2),
+        pasivo_nc=balance.get_total_pasivo_no_corriente(2),
+        pasivo_c=balance.get_total_pasivo_corriente(2),
+        anio=2
+    )
+
+
+def _grafico_financiero(entradas):
+    from graphics.graficas import grafico_analisis_financiero
+    for ano1, ano2 in entradas:
+        grafico_analisis_financiero(ano1, ano2)
+
+
+def _grafico_economico(entradas):
+    from graphics.graficas import grafico_analisis_economico
+    for ano1, ano2 in entradas:
+        grafico_analisis_economico(ano1, ano2)
+
+
+CASOS = [
+    Caso('ratios.calcular_ambos_anos', EmpresasSinteticas.modelos, _para_cada(_ratios_ambos_anos)),
+    Caso('ratios.calcular_lote', lambda datos, n: (datos.balances[:n], datos.estados[:n]),
+         _ratios_lote, por_empresa=False),
+    Caso('matriz_ratios.generar_matriz_completa', EmpresasSinteticas.modelos, _para_cada(_matriz_ratios)),
+    Caso('fortalezas_debilidades.identificar', _preparar_matrices, _fortalezas_debilidades),
+    Caso('recomendaciones.generar_completas', EmpresasSinteticas.modelos, _para_cada(_recomendaciones)),
+    Caso('resumen_integral.generar_completo', EmpresasSinteticas.modelos, _para_cada(_resumen_integral)),
+    Caso('graficos.fondo_maniobra', _preparar_ratios, _grafico_fondo_maniobra,
+         tolerancia=TOLERANCIA_GRAFICOS),
+    Caso('graficos.balance', EmpresasSinteticas.modelos, _para_cada(_grafico_balance),
+         tolerancia=TOLERANCIA_GRAFICOS),
+    Caso('graficos.analisis_financiero', _preparar_ratios, _grafico_financiero,
+         tolerancia=TOLERANCIA_GRAFICOS),
+    Caso('graficos.analisis_economico', _preparar_ratios, _grafico_economico,
+         tolerancia=TOLERANCIA_GRAFICOS),
+]
+
+
+# ============================================================
+# MEDICIÓN
+# ============================================================
+
+def _limpiar_caches(entradas):
+    """
+    Vacía los caches que harían que una vuelta repetida mida aciertos:
+    el LRU de REGISTRO y los subtotales de los modelos de las entradas
+    """
+    from core.calculators.registro_ratios import REGISTRO
+    REGISTRO.limpiar()
+    if not isinstance(entradas, list):
+        return
+    for entrada in entradas:
+        for modelo in (entrada if isinstance(entrada, tuple) else (entrada,)):
+            if hasattr(modelo, 'limpiar_cache'):
+                modelo.limpiar_cache()
+
+
+def _cronometrar(caso, entradas, vueltas=1):
+    """Segundos por vuelta de `vueltas` ejecuciones, con caches vacíos (sin medir la limpieza)"""
+    gc.collect()
+    total = 0.0
+    for _ in range(vueltas):
+        _limpiar_caches(entradas)
+        inicio = time.perf_counter()
+        caso.ejecutar(entradas)
+        total += time.perf_counter() - inicio
+    return total / vueltas
+
+
+def medir(caso, datos, presupuesto=PRESUPUESTO_S):
+    """
+    Mide un caso sobre las empresas de `datos`.
+
+    Antes de medir se ejecuta una vez sin cronometrar (importaciones,
+    cachés de matplotlib). Los casos por empresa se calibran con hasta 10
+    empresas y luego miden tantas como entren MUESTRAS_MINIMAS veces en
+    el presupuesto (todas, si alcanzan). Cada muestra dura al menos
+    MUESTRA_MINIMA_S; se toman muestras mientras quede presupuesto, al
+    menos MUESTRAS_MINIMAS, y se usa la mediana.
+
+    El pico de memoria de los casos por empresa se mide sobre las primeras
+    MUESTRA_MEMORIA empresas, no sobre la escala completa.
+
+    Returns:
+        dict: {'empresas', 'empresas_memoria', 'ops_s', 'pico_kib'};
+              ops_s = empresas por segundo
+    """
+    n = datos.n
+    if caso.por_empresa:
+        muestra = min(n, 10)
+        calibracion = caso.preparar(datos, muestra)
+        caso.ejecutar(calibracion)
+        por_empresa = _cronometrar(caso, calibracion) / muestra
+        n = min(n, max(muestra, int(presupuesto / MUESTRAS_MINIMAS / max(por_empresa, 1e-9))))
+
+    entradas = caso.preparar(datos, n)
+    if not caso.por_empresa:
+        caso.ejecutar(entradas)
+    primera = _cronometrar(caso, entradas)
+    vueltas = max(1, int(MUESTRA_MINIMA_S / max(primera, 1e-9)))
+    tiempos = []
+    while len(tiempos) < MUESTRAS_MINIMAS or sum(tiempos) * vueltas < presupuesto:
+        tiempos.append(_cronometrar(caso, entradas, vueltas))
+
+    empresas_memoria = n
+    if caso.por_empresa:
+        empresas_memoria = min(datos.n, MUESTRA_MEMORIA)
+        entradas = caso.preparar(datos, empresas_memoria)
+    _limpiar_caches(entradas)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        caso.ejecutar(entradas)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'empresas': n,
+        'empresas_memoria': empresas_memoria,
+        'ops_s': n / max(float(np.median(tiempos)), 1e-9),
+        'pico_kib': pico / 1024,
+    }
+
+
+def entorno():
+    """Datos de la máquina que acompañan a la línea base"""
+    import matplotlib
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'sistema': platform.platform(),
+        'procesador': platform.machine(),
+    }
+
+
+def cargar_linea_base(ruta=LINEA_BASE):
+    """
+    Returns:
+        dict: {'entorno': {...}, 'resultados': {caso: {escala: medición}}}
+    """
+    if not os.path.exists(ruta):
+        return {'entorno': {}, 'resultados': {}}
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def guardar_linea_base(linea_base, ruta=LINEA_BASE):
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(linea_base, archivo, indent=2, ensure_ascii=False, sort_keys=True)
+        archivo.write('\n')
+
+
+def comparar(medicion, base, tolerancia=TOLERANCIA):
+    """
+    Returns:
+        list[str]: Regresiones de `medicion` frente a `base` (vacía si no hay)
+    """
+    regresiones = []
+    if medicion['ops_s'] < base['ops_s'] * (1 - tolerancia):
+        regresiones.append(f"{medicion['ops_s']:,.0f} empresas/s (base {base['ops_s']:,.0f})")
+    if (medicion['pico_kib'] > base['pico_kib'] * (1 + tolerancia)
+            and medicion['pico_kib'] - base['pico_kib'] > HOLGURA_MEMORIA_KIB):
+        regresiones.append(f"pico {medicion['pico_kib']:,.0f} KiB (base {base['pico_kib']:,.0f})")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks del análisis financiero con detección de regresiones."
+    )
+    parser.add_argument('--casos', nargs='*', default=None,
+                        help="Prefijos de los casos a ejecutar (por defecto, todos)")
+    parser.add_argument('--escalas', nargs='*', type=int, default=list(ESCALAS),
+                        help="Cantidades de empresas sintéticas (por defecto 1 1000 100000)")
+    parser.add_argument('--presupuesto', type=float, default=PRESUPUESTO_S,
+                        help=f"Segundos de medición por caso y escala (por defecto {PRESUPUESTO_S})")
+    parser.add_argument('--tolerancia', type=float, default=None,
+                        help=f"Caída tolerada frente a la línea base (por defecto {TOLERANCIA}, "
+                             f"{TOLERANCIA_GRAFICOS} en los gráficos)")
+    parser.add_argument('--linea-base', default=LINEA_BASE, help="Archivo JSON de la línea base")
+    parser.add_argument('--guardar', action='store_true',
+                        help="Guarda las mediciones como nueva línea base")
+    args = parser.parse_args(argv)
+
+    casos = [c for c in CASOS if not args.casos or c.nombre.startswith(tuple(args.casos))]
+    if not casos:
+        print(f"Ningún caso empieza con {', '.join(args.casos)}")
+        return 1
+
+    linea_base = cargar_linea_base(args.linea_base)
+    if linea_base['entorno'] and linea_base['entorno'] != entorno():
+        print("⚠️ La línea base se midió en otro entorno; las comparaciones son orientativas")
+
+    regresiones = []
+    print(f"{'caso':40} {'escala':>7} {'medidas':>7} {'empresas/s':>12} "
+          f"{'memoria de':>10} {'pico KiB':>10} {'vs base':>8}")
+    for escala in args.escalas:
+        datos = EmpresasSinteticas(escala)
+        for caso in casos:
+            medicion = medir(caso, datos, args.presupuesto)
+            base = linea_base['resultados'].get(caso.nombre, {}).get(str(escala))
+
+            diferencia = ''
+            if base is not None:
+                diferencia = f"{medicion['ops_s'] / base['ops_s'] - 1:+.0%}"
+                tolerancia = args.tolerancia if args.tolerancia is not None else caso.tolerancia
+                for regresion in comparar(medicion, base, tolerancia):
+                    regresiones.append(f"{caso.nombre} [{escala}]: {regresion}")
+            print(f"{caso.nombre:40} {escala:>7} {medicion['empresas']:>7} "
+                  f"{medicion['ops_s']:>12,.0f} {medicion['empresas_memoria']:>10} "
+                  f"{medicion['pico_kib']:>10,.0f} {diferencia:>8}",
+                  flush=True)
+
+            linea_base['resultados'].setdefault(caso.nombre, {})[str(escala)] = {
+                'empresas': medicion['empresas'],
+                'empresas_memoria': medicion['empresas_memoria'],
+                'ops_s': round(medicion['ops_s'], 1),
+                'pico_kib': round(medicion['pico_kib'], 1),
+            }
+
+    if args.guardar:
+        linea_base['entorno'] = entorno()
+        guardar_linea_base(linea_base, args.linea_base)
+        print(f"✅ Línea base guardada en {args.linea_base}")
+        return 0
+
+    for regresion in regresiones:
+        print(f"❌ {regresion}")
+    if not regresiones:
+        print("✅ Sin regresiones frente a la línea base")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Archivo: benchmarks/tiempo_inicio.py
+Tiempo de arranque de la aplicación medido con `python -X importtime`
+
+Compara el arranque real (import main) con el arranque que importa de
+entrada todas las pestañas de análisis y gráficos, como antes de diferir
+esas importaciones, y falla si matplotlib o alguna pestaña de análisis
+vuelven a cargarse al iniciar.
+
+Uso:
+    python -m benchmarks.tiempo_inicio
+    python -m benchmarks.tiempo_inicio --repeticiones 10 --limite-ms 400
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Arranque real de la aplicación (sin crear la ventana)
+CODIGO_INICIO = "import main"
+
+# No deben aparecer al arrancar: matplotlib, graphics/ y las pestañas de
+# análisis (a1_..., d4_..., analisis_..., graficos)
+_DIFERIDO = re.compile(
+    r"^(matplotlib|graphics|gui\.windows\.([a-d]\d_|analisis_|graficos))"
+)
+
+# Arranque importando de entrada todas las pestañas, como antes de
+# diferirlas (referencia para medir la ganancia)
+CODIGO_COMPLETO = """
+import pkgutil, re, importlib, main, gui.windows
+for m in pkgutil.iter_modules(gui.windows.__path__, 'gui.windows.'):
+    if m.name.rpartition('.')[2].isidentifier() and re.match(%r, m.name):
+        importlib.import_module(m.name)
+""" % _DIFERIDO.pattern
+
+# "import time: self [us] | cumulative | imported package"
+_LINEA = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def medir_importacion(codigo):
+    """
+    Ejecuta `codigo` en un intérprete nuevo con -X importtime.
+
+    Args:
+        codigo: Código Python a ejecutar (desde la raíz del proyecto)
+
+    Returns:
+        tuple: (milisegundos totales de importación, set de módulos importados)
+    """
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        cwd=RAIZ, capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(f"Falló `{codigo}`:\n{proceso.stderr[-2000:]}")
+
+    total_us = 0
+    modulos = set()
+    for linea in proceso.stderr.splitlines():
+        coincidencia = _LINEA.match(linea)
+        if coincidencia is None:
+            continue
+        _, acumulado, sangria, modulo = coincidencia.groups()
+        modulos.add(modulo)
+        # Las importaciones de primer nivel ya incluyen a las anidadas
+        if len(sangria) == 1:
+            total_us += int(acumulado)
+    return total_us / 1000, modulos
+
+
+def mediana_importacion(codigo, repeticiones):
+    """
+    Mediana de `repeticiones` mediciones, después de una ejecución de
+    calentamiento (compila los .pyc y llena la cache del disco).
+
+    Returns:
+        tuple: (mediana en ms, set de módulos importados)
+    """
+    _, modulos = medir_importacion(codigo)
+    tiempos = [medir_importacion(codigo)[0] for _ in range(repeticiones)]
+    return statistics.median(tiempos), modulos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mide el tiempo de arranque con -X importtime y detecta regresiones."
+    )
+    parser.add_argument('--repeticiones', type=int, default=5,
+                        help="Mediciones por escenario (se reporta la mediana)")
+    parser.add_argument('--limite-ms', type=float, default=None,
+                        help="Falla si el arranque supera estos milisegundos")
+    args = parser.parse_args(argv)
+
+    inicio_ms, modulos = mediana_importacion(CODIGO_INICIO, args.repeticiones)
+    completo_ms, _ = mediana_importacion(CODIGO_COMPLETO, args.repeticiones)
+
+    print(f"Arranque (import main):            {inicio_ms:8.1f} ms  ({len(modulos)} módulos)")
+    print(f"Con todas las pestañas importadas: {completo_ms:8.1f} ms")
+    print(f"Ganancia:                          {completo_ms - inicio_ms:8.1f} ms "
+          f"({completo_ms / inicio_ms:.1f}x)")
+
+    fallas = []
+    cargados = sorted(m for m in modulos if _DIFERIDO.match(m))
+    if cargados:
+        fallas.append(f"Módulos que deberían cargarse al abrir una pestaña: {', '.join(cargados[:10])}"
+                      + (" ..." if len(cargados) > 10 else ""))
+    if args.limite_ms is not None and inicio_ms > args.limite_ms:
+        fallas.append(f"El arranque ({inicio_ms:.1f} ms) supera el límite de {args.limite_ms:.1f} ms")
+
+    for falla in fallas:
+        print(f"❌ {falla}")
+    if not fallas:
+        print("✅ Sin regresiones en el arranque")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 Archivo: config.py
 Configuración global, estilos y constantes de la aplicación
 """
+import os
 import tkinter as tk
 from tkinter import ttk  
 
@@ -282,6 +283,12 @@ class WindowConfig:
     # Configuración de frames
     FRAME_BG = Colors.BG_SECONDARY
     
+    # Pausa (ms) sin ediciones tras la que se notifican los cambios
+    DATA_CHANGE_DEBOUNCE_MS = 250
+    
+    # Demora máxima (ms) de la notificación mientras se sigue editando
+    DATA_CHANGE_MAX_WAIT_MS = 1000
+    
     @staticmethod
     def center_window(window):
         """Centra una ventana en la pantalla"""
@@ -293,6 +300,40 @@ class WindowConfig:
         window.geometry(f'{width}x{height}+{x}+{y}')
 
 
+# ============================================================
+# ALMACENAMIENTO LOCAL
+# ============================================================
+class StorageConfig:
+    """Base local de empresas y análisis guardados"""
+    
+    # Archivo SQLite (se crea al primer uso)
+    DB_PATH = os.path.join(os.path.expanduser("~"), ".analisis_financiero", "empresas.sqlite3")
+    
+    # Nombre con que se guardan los datos si no se eligió una empresa
+    EMPRESA_PREDETERMINADA = "Mi empresa"
+    
+    # Índice de percentiles por sector para la matriz D1 (se genera con
+    # percentiles_sector.py; sin él, D1 muestra solo los rangos óptimos)
+    PERCENTILES_PATH = os.path.join(os.path.expanduser("~"), ".analisis_financiero", "percentiles_sector.npz")
+
+
+# ============================================================
+# DIAGNÓSTICO
+# ============================================================
+class DebugConfig:
+    """Herramientas de diagnóstico (no visibles en la interfaz normal)"""
+    
+    # Registrar tiempos desde el inicio (ANALISIS_PERFILADO=1); si no,
+    # se activan desde el panel de perfilado
+    PERFILADO = os.environ.get("ANALISIS_PERFILADO", "") == "1"
+    
+    # Atajo de teclado que abre el panel de perfilado
+    ATAJO_PANEL_PERFILADO = "<Control-Shift-P>"
+    
+    # Cada cuánto (ms) el panel abierto muestra los árboles nuevos
+    REFRESCO_PANEL_MS = 1000
+
+
 # ============================================================
 # CONFIGURACIÓN DE ANÁLISIS
 # ============================================================
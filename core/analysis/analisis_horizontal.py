@@ -1,94 +1,235 @@
 """
 Archivo: core/analysis/analisis_horizontal.py
-Análisis Horizontal del Balance General (comparación entre años)
+Análisis Horizontal del Balance General (comparación entre periodos)
 """
 
+import numpy as np
+
+from core.models.matriz_cuentas import MatrizCuentas
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from utils.perfilado import perfilar
+
+
+# ============================================================
+# VARIACIONES VECTORIZADAS (N periodos, una o muchas empresas)
+# ============================================================
+
+# Filas del análisis horizontal: (clave, concepto, {cuenta_o_total: signo})
+# sobre las cuentas y totales de BalanceMultiperiodo
+FILAS_HORIZONTALES = (
+    # ACTIVOS
+    ('caja', "Caja y Bancos", {'caja_bancos': 1}),
+    ('clientes', "Clientes por Cobrar", {'clientes_cobrar': 1}),
+    ('inversiones', "Inversiones CP", {'inversion_cp': 1}),
+    ('existencias', "Existencias", {'existencias': 1}),
+    ('ac', "Activo Corriente", {'total_corriente': 1}),
+    ('ppe', "Inmuebles, Planta y Equipo", {'inmuebles_planta': 1, 'depreciacion_acum': -1}),
+    ('intangibles', "Intangibles", {'intangibles': 1, 'depreciacion_intang': -1}),
+    ('anc', "Activo No Corriente", {'total_no_corriente': 1}),
+    ('activo_total', "TOTAL ACTIVO", {'total_activos': 1}),
+    # PASIVO CORRIENTE
+    ('proveedores', "Proveedores y gastos por pagar", {'proveedores': 1}),
+    ('impuestos', "Impuestos por pagar", {'impuestos_pagar': 1}),
+    ('deuda_cp', "Deuda a corto plazo bancaria", {'deuda_cp': 1}),
+    ('pc', "Pasivo Corriente", {'total_pasivo_corriente': 1}),
+    # PASIVO NO CORRIENTE
+    ('prestamos_lp', "Préstamos a largo plazo (5% anual)", {'prestamos_lp': 1}),
+    ('provisiones_lp', "Provisiones a largo plazo", {'provisiones_lp': 1}),
+    ('pnc', "Pasivo No Corriente", {'total_pasivo_no_corriente': 1}),
+    ('pasivo_total', "TOTAL PASIVO", {'total_pasivo': 1}),
+    # PATRIMONIO
+    ('capital', "Capital Social", {'capital_social': 1}),
+    ('reservas', "Reservas Legales", {'reservas_legales': 1}),
+    ('ganancias', "Ganancias Acumuladas", {'ganancias_acum': 1}),
+    ('patrimonio', "Patrimonio", {'total_patrimonio': 1}),
+)
+
+
+def _compilar_filas():
+    """Matriz de pesos (filas x cuentas) de FILAS_HORIZONTALES"""
+    indice = BalanceMultiperiodo.indice_cuentas()
+    nombres_totales, pesos_totales = BalanceMultiperiodo.matriz_pesos()
+    pesos = np.zeros((len(FILAS_HORIZONTALES), len(BalanceMultiperiodo.CUENTAS)))
+    for f, (_, _, componentes) in enumerate(FILAS_HORIZONTALES):
+        for componente, signo in componentes.items():
+            if componente in indice:
+                pesos[f, indice[componente]] += signo
+            else:
+                pesos[f] += signo * pesos_totales[nombres_totales.index(componente)]
+    return pesos
+
+
+_PESOS_FILAS = _compilar_filas()
+
+
+def pares_periodos(n_periodos):
+    """
+    Pares (desde, hasta) de periodos comparados, contando desde 1: primero
+    los consecutivos y después cada periodo contra el primero (año base),
+    sin repetir el (1, 2).
+    """
+    consecutivos = [(p, p + 1) for p in range(1, n_periodos)]
+    base = [(1, p) for p in range(3, n_periodos + 1)]
+    return consecutivos + base
+
+
+def _variaciones(inicio, fin):
+    """(variación, variación %, base_cero); la variación % es 0 si el inicio es 0"""
+    variacion = fin - inicio
+    base_cero = inicio == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variacion_pct = np.where(base_cero, 0.0, variacion / np.where(base_cero, 1.0, inicio) * 100)
+    return variacion, variacion_pct, base_cero
+
+
+class VariacionesHorizontales:
+    """
+    Variaciones absolutas y porcentuales de todas las filas del análisis
+    horizontal entre todos los pares de periodos (consecutivos y contra
+    el año base), calculadas con una sola resta sobre arreglos.
+
+    Sirve para una empresa (cuentas x periodos) o para muchas a la vez
+    (empresas x cuentas x periodos, p.ej. una Cartera). Si el periodo de
+    partida es 0, la variación porcentual es 0 y `base_cero` lo indica.
+
+    Atributos (los ejes iniciales son los de `valores`):
+        importes: (..., filas, periodos)
+        variacion, variacion_pct, base_cero: (..., filas, pares)
+    """
+
+    CLAVES = tuple(fila[0] for fila in FILAS_HORIZONTALES)
+    CONCEPTOS = {fila[0]: fila[1] for fila in FILAS_HORIZONTALES}
+
+    def __init__(self, valores, periodos=None):
+        """
+        Args:
+            valores: Arreglo (..., cuentas, periodos) en el orden de
+                     BalanceMultiperiodo.CUENTAS
+            periodos: Etiquetas de los periodos (por defecto 'Periodo 1', ...)
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        n_periodos = valores.shape[-1]
+        if valores.ndim < 2 or valores.shape[-2] != len(BalanceMultiperiodo.CUENTAS):
+            raise ValueError(
+                f"Se esperaba un arreglo (..., {len(BalanceMultiperiodo.CUENTAS)}, periodos), "
+                f"se recibió {valores.shape}"
+            )
+        if n_periodos < 2:
+            raise ValueError("El análisis horizontal necesita al menos 2 periodos")
+
+        self.periodos = list(periodos) if periodos is not None else \
+            [f"Periodo {p}" for p in range(1, n_periodos + 1)]
+        self.pares = pares_periodos(n_periodos)
+        self._columnas = {par: i for i, par in enumerate(self.pares)}
+
+        self.importes = _PESOS_FILAS @ valores
+        desde = np.array([d - 1 for d, _ in self.pares])
+        hasta = np.array([h - 1 for _, h in self.pares])
+        self.variacion, self.variacion_pct, self.base_cero = _variaciones(
+            self.importes[..., desde], self.importes[..., hasta])
+
+    @classmethod
+    def desde_modelo(cls, balance, periodos=None):
+        """
+        Args:
+            balance: BalanceGeneral (2 años) o BalanceMultiperiodo
+            periodos: Etiquetas (por defecto las del modelo, o 2 periodos)
+        """
+        if isinstance(balance, MatrizCuentas):
+            return cls(balance.valores, periodos or balance.periodos)
+        return cls(BalanceMultiperiodo.desde_modelo(balance, periodos).valores, periodos)
+
+    @classmethod
+    def desde_cartera(cls, cartera, filas=None):
+        """
+        Variaciones de todas las empresas de una Cartera (sin copiar los
+        balances si no se eligen filas).
+
+        Returns:
+            VariacionesHorizontales con ejes (empresas, filas, pares)
+        """
+        balances = cartera.balances if filas is None else cartera.balances[filas]
+        return cls(balances, cartera.periodos)
+
+    def columna(self, desde, hasta):
+        """Posición del par (desde, hasta) en el último eje de las variaciones"""
+        try:
+            return self._columnas[(desde, hasta)]
+        except KeyError:
+            raise KeyError(f"No se calcula el par de periodos ({desde}, {hasta})") from None
+
+    def par(self, desde, hasta, empresa=None):
+        """
+        Variaciones de una empresa entre dos periodos (si el par no está
+        entre los precalculados, se calcula en el momento).
+
+        Args:
+            desde, hasta: Periodos, contando desde 1
+            empresa: Índice de la empresa si hay varias (ejes iniciales)
+
+        Returns:
+            dict: {clave: (importe_desde, importe_hasta, variacion, variacion_pct)}
+        """
+        importes = self.importes if empresa is None else self.importes[empresa]
+        if importes.ndim != 2:
+            raise ValueError("Hay varias empresas: indicar `empresa`")
+
+        if (desde, hasta) in self._columnas:
+            columna = self._columnas[(desde, hasta)]
+            variacion = self.variacion if empresa is None else self.variacion[empresa]
+            pct = self.variacion_pct if empresa is None else self.variacion_pct[empresa]
+        else:
+            if not (1 <= desde <= len(self.periodos) and 1 <= hasta <= len(self.periodos)):
+                raise KeyError(f"No existe el par de periodos ({desde}, {hasta})")
+            columna = 0
+            variacion, pct, _ = _variaciones(importes[:, [desde - 1]], importes[:, [hasta - 1]])
+
+        return {
+            clave: (float(importes[f, desde - 1]), float(importes[f, hasta - 1]),
+                    float(variacion[f, columna]), float(pct[f, columna]))
+            for f, clave in enumerate(self.CLAVES)
+        }
+
+
+# ============================================================
+# ANÁLISIS E INTERPRETACIÓN (una empresa, un par de periodos)
+# ============================================================
+
 class AnalisisHorizontalBalance:
     """
     Analiza la evolución del Balance entre dos años.
     Responde: ¿Qué activos crecieron más? ¿Cómo se financió el crecimiento?
     """
     
-    def __init__(self, balance_model):
+    def __init__(self, balance_model, desde=1, hasta=2):
         """
         Args:
-            balance_model: Instancia de BalanceGeneral con datos de ambos años
+            balance_model: BalanceGeneral con datos de ambos años, o
+                           BalanceMultiperiodo
+            desde, hasta: Periodos comparados (los atributos *_y1 son los
+                          de `desde` y los *_y2 los de `hasta`)
         """
         self.balance = balance_model
+        self.desde = desde
+        self.hasta = hasta
         
         # Obtener totales de ambos años
         self.calcular_variaciones()
     
+    @perfilar('analisis')
     def calcular_variaciones(self):
-        """Calcula todas las variaciones entre año 1 y año 2"""
-        
-        # ACTIVOS
-        self.caja_y1 = self.balance.caja_bancos_y1
-        self.caja_y2 = self.balance.caja_bancos_y2
-        self.var_caja = self.caja_y2 - self.caja_y1
-        self.var_caja_pct = (self.var_caja / self.caja_y1 * 100) if self.caja_y1 != 0 else 0
-        
-        self.clientes_y1 = self.balance.clientes_cobrar_y1
-        self.clientes_y2 = self.balance.clientes_cobrar_y2
-        self.var_clientes = self.clientes_y2 - self.clientes_y1
-        self.var_clientes_pct = (self.var_clientes / self.clientes_y1 * 100) if self.clientes_y1 != 0 else 0
-        
-        self.inversiones_y1 = self.balance.inversion_cp_y1
-        self.inversiones_y2 = self.balance.inversion_cp_y2
-        self.var_inversiones = self.inversiones_y2 - self.inversiones_y1
-        self.var_inversiones_pct = (self.var_inversiones / self.inversiones_y1 * 100) if self.inversiones_y1 != 0 else 0
-        
-        self.existencias_y1 = self.balance.existencias_y1
-        self.existencias_y2 = self.balance.existencias_y2
-        self.var_existencias = self.existencias_y2 - self.existencias_y1
-        self.var_existencias_pct = (self.var_existencias / self.existencias_y1 * 100) if self.existencias_y1 != 0 else 0
-        
-        self.ac_y1 = self.balance.get_total_corriente(1)
-        self.ac_y2 = self.balance.get_total_corriente(2)
-        self.var_ac = self.ac_y2 - self.ac_y1
-        self.var_ac_pct = (self.var_ac / self.ac_y1 * 100) if self.ac_y1 != 0 else 0
-        
-        # Activo No Corriente (neto)
-        self.ppe_y1 = self.balance.inmuebles_planta_y1 - self.balance.depreciacion_acum_y1
-        self.ppe_y2 = self.balance.inmuebles_planta_y2 - self.balance.depreciacion_acum_y2
-        self.var_ppe = self.ppe_y2 - self.ppe_y1
-        self.var_ppe_pct = (self.var_ppe / self.ppe_y1 * 100) if self.ppe_y1 != 0 else 0
-        
-        self.intangibles_y1 = self.balance.intangibles_y1 - self.balance.depreciacion_intang_y1
-        self.intangibles_y2 = self.balance.intangibles_y2 - self.balance.depreciacion_intang_y2
-        self.var_intangibles = self.intangibles_y2 - self.intangibles_y1
-        self.var_intangibles_pct = (self.var_intangibles / self.intangibles_y1 * 100) if self.intangibles_y1 != 0 else 0
-        
-        self.anc_y1 = self.balance.get_total_no_corriente(1)
-        self.anc_y2 = self.balance.get_total_no_corriente(2)
-        self.var_anc = self.anc_y2 - self.anc_y1
-        self.var_anc_pct = (self.var_anc / self.anc_y1 * 100) if self.anc_y1 != 0 else 0
-        
-        self.activo_total_y1 = self.balance.get_total_activos(1)
-        self.activo_total_y2 = self.balance.get_total_activos(2)
-        self.var_activo_total = self.activo_total_y2 - self.activo_total_y1
-        self.var_activo_total_pct = (self.var_activo_total / self.activo_total_y1 * 100) if self.activo_total_y1 != 0 else 0
-        
-        # PASIVOS Y PATRIMONIO
-        self.pc_y1 = self.balance.get_total_pasivo_corriente(1)
-        self.pc_y2 = self.balance.get_total_pasivo_corriente(2)
-        self.var_pc = self.pc_y2 - self.pc_y1
-        self.var_pc_pct = (self.var_pc / self.pc_y1 * 100) if self.pc_y1 != 0 else 0
-        
-        self.pnc_y1 = self.balance.get_total_pasivo_no_corriente(1)
-        self.pnc_y2 = self.balance.get_total_pasivo_no_corriente(2)
-        self.var_pnc = self.pnc_y2 - self.pnc_y1
-        self.var_pnc_pct = (self.var_pnc / self.pnc_y1 * 100) if self.pnc_y1 != 0 else 0
-        
-        self.pasivo_total_y1 = self.pc_y1 + self.pnc_y1
-        self.pasivo_total_y2 = self.pc_y2 + self.pnc_y2
-        self.var_pasivo_total = self.pasivo_total_y2 - self.pasivo_total_y1
-        self.var_pasivo_total_pct = (self.var_pasivo_total / self.pasivo_total_y1 * 100) if self.pasivo_total_y1 != 0 else 0
-        
-        self.patrimonio_y1 = self.balance.get_total_patrimonio(1)
-        self.patrimonio_y2 = self.balance.get_total_patrimonio(2)
-        self.var_patrimonio = self.patrimonio_y2 - self.patrimonio_y1
-        self.var_patrimonio_pct = (self.var_patrimonio / self.patrimonio_y1 * 100) if self.patrimonio_y1 != 0 else 0
+        """
+        Calcula las variaciones de todas las filas entre los dos periodos
+        y las deja como atributos (caja_y1, caja_y2, var_caja, var_caja_pct, ...)
+        """
+        self.variaciones = VariacionesHorizontales.desde_modelo(self.balance)
+        self.variaciones_par = self.variaciones.par(self.desde, self.hasta)
+        
+        for clave, (inicio, fin, variacion, pct) in self.variaciones_par.items():
+            setattr(self, f"{clave}_y1", inicio)
+            setattr(self, f"{clave}_y2", fin)
+            setattr(self, f"var_{clave}", variacion)
+            setattr(self, f"var_{clave}_pct", pct)
     
     def get_activo_mayor_crecimiento_absoluto(self):
         """Identifica el rubro del activo con mayor crecimiento absoluto"""
@@ -220,6 +361,7 @@ class AnalisisHorizontalBalance:
             # La empresa decreció o se mantuvo
             return "La empresa redujo su tamaño, posiblemente por desinversión, pago de deudas o reparto de dividendos."
     
+    @perfilar('analisis')
     def analisis_completo(self):
         """Genera el análisis horizontal completo"""
         return {
@@ -230,22 +372,12 @@ class AnalisisHorizontalBalance:
     
     def get_tabla_variaciones(self):
         """Retorna los datos para la tabla de variaciones"""
+        def filas(claves):
+            return [(VariacionesHorizontales.CONCEPTOS[clave],) + self.variaciones_par[clave]
+                    for clave in claves]
+        
         return {
-            "activos": [
-                ("Caja y Bancos", self.caja_y1, self.caja_y2, self.var_caja, self.var_caja_pct),
-                ("Clientes por Cobrar", self.clientes_y1, self.clientes_y2, self.var_clientes, self.var_clientes_pct),
-                ("Inversiones CP", self.inversiones_y1, self.inversiones_y2, self.var_inversiones, self.var_inversiones_pct),
-                ("Existencias", self.existencias_y1, self.existencias_y2, self.var_existencias, self.var_existencias_pct),
-                ("Activo Corriente", self.ac_y1, self.ac_y2, self.var_ac, self.var_ac_pct),
-                ("Inmuebles, Planta y Equipo", self.ppe_y1, self.ppe_y2, self.var_ppe, self.var_ppe_pct),
-                ("Intangibles", self.intangibles_y1, self.intangibles_y2, self.var_intangibles, self.var_intangibles_pct),
-                ("Activo No Corriente", self.anc_y1, self.anc_y2, self.var_anc, self.var_anc_pct),
-                ("TOTAL ACTIVO", self.activo_total_y1, self.activo_total_y2, self.var_activo_total, self.var_activo_total_pct),
-            ],
-            "pasivo_patrimonio": [
-                ("Pasivo Corriente", self.pc_y1, self.pc_y2, self.var_pc, self.var_pc_pct),
-                ("Pasivo No Corriente", self.pnc_y1, self.pnc_y2, self.var_pnc, self.var_pnc_pct),
-                ("TOTAL PASIVO", self.pasivo_total_y1, self.pasivo_total_y2, self.var_pasivo_total, self.var_pasivo_total_pct),
-                ("Patrimonio", self.patrimonio_y1, self.patrimonio_y2, self.var_patrimonio, self.var_patrimonio_pct),
-            ]
-        }
\ No newline at end of file
+            "activos": filas(('caja', 'clientes', 'inversiones', 'existencias', 'ac',
+                              'ppe', 'intangibles', 'anc', 'activo_total')),
+            "pasivo_patrimonio": filas(('pc', 'pnc', 'pasivo_total', 'patrimonio'))
+        }
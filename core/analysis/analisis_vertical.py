@@ -3,6 +3,8 @@ Archivo: core/analysis/analisis_vertical.py
 Análisis Vertical del Balance General e interpretación de estructura
 """
 
+from utils.perfilado import perfilar
+
 class AnalisisVerticalBalance:
     """
     Clase para realizar análisis vertical del balance e interpretar
@@ -29,6 +31,7 @@ class AnalisisVerticalBalance:
         # Calcular porcentajes
         self.calcular_porcentajes()
     
+    @perfilar('analisis')
     def calcular_porcentajes(self):
         """Calcula todos los porcentajes respecto al Activo Total"""
         if self.activo_total == 0:
@@ -3,6 +3,9 @@ Archivo: core/analysis/apalancamiento_analysis.py
 Análisis de Apalancamiento Financiero
 """
 
+from core.calculators.registro_ratios import REGISTRO
+from utils.perfilado import perfilar
+
 
 class ApalancamientoAnalysis:
     """Análisis completo del apalancamiento financiero"""
@@ -11,6 +14,10 @@ class ApalancamientoAnalysis:
         self.balance_data = balance_data
         self.income_data = income_data
     
+    def _ratios(self):
+        """Subtotales y ratios de ambos años (registro_ratios, compartidos)"""
+        return REGISTRO.evaluar_modelos(self.balance_data, self.income_data)
+    
     def calcular_costo_deuda(self, year):
         """
         Calcula el costo promedio de la deuda:
@@ -22,18 +29,7 @@ class ApalancamientoAnalysis:
         Returns:
             float: Costo de deuda en porcentaje
         """
-        gastos_financieros = self.income_data.gastos_financieros_y1 if year == 1 else self.income_data.gastos_financieros_y2
-        
-        # Deuda Total = Préstamos LP + Deuda CP
-        if year == 1:
-            deuda_total = self.balance_data.prestamos_lp_y1 + self.balance_data.proveedores_y1
-        else:
-            deuda_total = self.balance_data.prestamos_lp_y2 + self.balance_data.proveedores_y2
-        
-        if deuda_total == 0:
-            return 0.0
-        
-        return (gastos_financieros / deuda_total) * 100
+        return self._ratios().porcentaje('costo_deuda', year, cero=0.0)
     
     def calcular_rat(self, year):
         """
@@ -45,13 +41,7 @@ class ApalancamientoAnalysis:
         Returns:
             float: RAT en porcentaje
         """
-        baii = self.income_data.get_utilidad_operativa(year)
-        activo_total = self.balance_data.get_total_activos(year)
-        
-        if activo_total == 0:
-            return 0.0
-        
-        return (baii / activo_total) * 100
+        return self._ratios().porcentaje('rat_operativa', year, cero=0.0)
     
     def calcular_rrp(self, year):
         """
@@ -63,13 +53,7 @@ class ApalancamientoAnalysis:
         Returns:
             float: RRP en porcentaje
         """
-        utilidad_neta = self.income_data.get_utilidad_neta(year)
-        patrimonio_neto = self.balance_data.get_total_patrimonio(year)
-        
-        if patrimonio_neto == 0:
-            return 0.0
-        
-        return (utilidad_neta / patrimonio_neto) * 100
+        return self._ratios().porcentaje('rpp', year, cero=0.0)
     
     def calcular_efecto_apalancamiento(self, year):
         """
@@ -86,18 +70,11 @@ class ApalancamientoAnalysis:
         i = self.calcular_costo_deuda(year)
         rrp_directo = self.calcular_rrp(year)
         
-        # Deuda Total
-        if year == 1:
-            deuda = self.balance_data.prestamos_lp_y1 + self.balance_data.deuda_cp_y1
-        else:
-            deuda = self.balance_data.prestamos_lp_y2 + self.balance_data.deuda_cp_y2
-        
-        patrimonio = self.balance_data.get_total_patrimonio(year)
-        
-        if patrimonio == 0:
-            d_pn = 0
-        else:
-            d_pn = deuda / patrimonio
+        # Deuda financiera (Préstamos LP + Deuda CP) sobre patrimonio
+        ratios = self._ratios()
+        deuda = ratios.subtotal('deuda_financiera', year)
+        patrimonio = ratios.subtotal('total_patrimonio', year)
+        d_pn = ratios.valor('deuda_patrimonio', year, cero=0)
         
         # Efecto apalancamiento
         diferencial = rat - i
@@ -116,6 +93,7 @@ class ApalancamientoAnalysis:
             'rrp_directo': rrp_directo
         }
     
+    @perfilar('analisis')
     def analisis_dual_apalancamiento(self):
         """
         Análisis completo del apalancamiento financiero para ambos años
@@ -0,0 +1,285 @@
+"""
+Archivo: core/analysis/base_conocimiento.py
+Base de conocimiento de ratios compilada: se carga una vez por proceso
+desde un archivo versionado (JSON o YAML) y clasifica valores por banda
+"""
+
+import os
+import sys
+import threading
+
+import numpy as np
+
+
+# Versión del formato de archivo que entiende este módulo
+VERSION_FORMATO = 1
+
+# Archivo incluido con la aplicación
+RUTA_PREDETERMINADA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   'base_conocimiento_ratios.json')
+
+# Estados en el orden de sus códigos (0, 1, 2, 3)
+ESTADOS = ('bajo', 'optimo', 'alto', 'error')
+BAJO, OPTIMO, ALTO, ERROR = range(4)
+
+_ESTADOS_ARRAY = np.array(ESTADOS)
+_BANDAS = ESTADOS[:3]
+_CAMPOS_BANDA = ('interpretacion', 'causa', 'recomendacion')
+
+
+# ============================================================
+# REGISTROS
+# ============================================================
+
+class BandaRatio:
+    """Textos de una banda (bajo, óptimo o alto) de un ratio"""
+
+    __slots__ = ('estado', 'interpretacion', 'causa', 'recomendacion')
+
+    def __init__(self, estado, interpretacion, causa, recomendacion):
+        self.estado = estado
+        self.interpretacion = interpretacion
+        self.causa = causa
+        self.recomendacion = recomendacion
+
+    def como_dict(self):
+        return {campo: getattr(self, campo) for campo in _CAMPOS_BANDA}
+
+
+class RatioConocimiento:
+    """Rango óptimo y bandas de un ratio"""
+
+    __slots__ = ('clave', 'nombre', 'rango', 'unidad', 'bandas', 'limites')
+
+    def __init__(self, clave, nombre, rango, unidad, bandas):
+        """
+        Args:
+            clave: Nombre interno del ratio (ej: 'razon_liquidez')
+            nombre: Nombre descriptivo
+            rango: (mínimo, máximo) del rango óptimo, ambos incluidos
+            unidad: 'ratio', 'porcentaje', 'días', ...
+            bandas: Tupla (bajo, optimo, alto) de BandaRatio
+        """
+        self.clave = clave
+        self.nombre = nombre
+        self.rango = rango
+        self.unidad = unidad
+        self.bandas = bandas
+
+        # Límites para np.searchsorted(side='right'): el máximo del rango
+        # es óptimo, así que el corte superior es el float siguiente
+        low, high = rango
+        self.limites = np.array([low, np.nextafter(high, np.inf)])
+
+    def codigo(self, valor):
+        """Código de banda de un valor (NaN cuenta como óptimo)"""
+        low, high = self.rango
+        if valor < low:
+            return BAJO
+        if valor > high:
+            return ALTO
+        return OPTIMO
+
+    def banda(self, valor):
+        """BandaRatio que corresponde a un valor"""
+        return self.bandas[self.codigo(valor)]
+
+
+# ============================================================
+# BASE DE CONOCIMIENTO
+# ============================================================
+
+class BaseConocimiento:
+    """
+    Conjunto de ratios compilados, indexado por clave.
+
+    Los textos se internan al cargar, así que varias bases (por ejemplo,
+    una por sector) comparten en memoria los textos repetidos.
+    """
+
+    def __init__(self, ratios, version=VERSION_FORMATO, origen=None):
+        """
+        Args:
+            ratios: Lista de RatioConocimiento
+            version: Versión del formato del archivo de origen
+            origen: Ruta del archivo de origen (None si se armó en memoria)
+        """
+        self.ratios = {ratio.clave: ratio for ratio in ratios}
+        self.version = version
+        self.origen = origen
+        self._dict = None
+        self._huella = None
+
+    def __contains__(self, clave):
+        return clave in self.ratios
+
+    def __len__(self):
+        return len(self.ratios)
+
+    def get(self, clave):
+        """RatioConocimiento de una clave, o None si no existe"""
+        return self.ratios.get(clave)
+
+    @classmethod
+    def desde_dict(cls, datos, origen=None):
+        """
+        Compila el contenido de un archivo de base de conocimiento:
+        {"version": 1, "ratios": {"clave": {"nombre", "rango", "unidad",
+        "bajo", "optimo", "alto"}, ...}}
+
+        Raises:
+            ValueError: Si la versión no es compatible o falta algún campo
+        """
+        origen_txt = origen or 'base de conocimiento'
+        version = datos.get('version')
+        if version != VERSION_FORMATO:
+            raise ValueError(
+                f"{origen_txt}: versión de formato {version!r} no soportada "
+                f"(se esperaba {VERSION_FORMATO})"
+            )
+
+        intern = sys.intern
+        ratios = []
+        for clave, info in (datos.get('ratios') or {}).items():
+            try:
+                low, high = (float(v) for v in info['rango'])
+                bandas = tuple(
+                    BandaRatio(estado, *(intern(str(info[estado][campo])) for campo in _CAMPOS_BANDA))
+                    for estado in _BANDAS
+                )
+                nombre = intern(str(info['nombre']))
+                unidad = intern(str(info['unidad']))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{origen_txt}: ratio '{clave}' incompleto o inválido ({e})")
+
+            if low > high:
+                raise ValueError(f"{origen_txt}: ratio '{clave}' tiene rango {low} > {high}")
+
+            ratios.append(RatioConocimiento(intern(clave), nombre, (low, high), unidad, bandas))
+
+        return cls(ratios, version, origen)
+
+    @classmethod
+    def desde_archivo(cls, ruta):
+        """
+        Carga una base de conocimiento desde .json o .yaml/.yml
+        (YAML requiere PyYAML).
+        """
+        with open(ruta, encoding='utf-8') as archivo:
+            if ruta.lower().endswith(('.yaml', '.yml')):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ImportError("Leer la base de conocimiento en YAML requiere PyYAML (pip install pyyaml)")
+                datos = yaml.safe_load(archivo)
+            else:
+                import json
+                datos = json.load(archivo)
+        return cls.desde_dict(datos or {}, origen=ruta)
+
+    def como_dict(self):
+        """
+        Estructura anidada {clave: {"nombre", "rango", "unidad", "bajo",
+        "optimo", "alto"}} que usaba FinancialInterpreter.database.
+        Se arma una sola vez y se comparte: no modificarla.
+        """
+        if self._dict is None:
+            self._dict = {
+                clave: {
+                    "nombre": ratio.nombre,
+                    "rango": ratio.rango,
+                    "unidad": ratio.unidad,
+                    **{banda.estado: banda.como_dict() for banda in ratio.bandas}
+                }
+                for clave, ratio in self.ratios.items()
+            }
+        return self._dict
+
+    def huella(self):
+        """
+        SHA-256 del contenido (rangos y textos): identifica la base en las
+        cachés de análisis sin depender de la ruta del archivo.
+        """
+        if self._huella is None:
+            import hashlib
+            import json
+            texto = json.dumps(self.como_dict(), sort_keys=True, ensure_ascii=False)
+            self._huella = hashlib.sha256(texto.encode('utf-8')).hexdigest()
+        return self._huella
+
+    # ============================================================
+    # CLASIFICACIÓN VECTORIZADA
+    # ============================================================
+
+    def clasificar(self, nombres, valores):
+        """
+        Códigos de banda (BAJO, OPTIMO, ALTO o ERROR) de muchos valores.
+
+        Args:
+            nombres: Clave de ratio común a todos los valores, o una
+                     secuencia de claves alineada con `valores`
+            valores: Array de valores (cualquier forma)
+
+        Returns:
+            np.ndarray: Códigos int8 con la forma de `valores`. Igual que
+            la evaluación escalar, NaN cuenta como óptimo; las claves
+            desconocidas dan ERROR.
+        """
+        valores = np.asarray(valores, dtype=float)
+        codigos = np.full(valores.shape, ERROR, dtype=np.int8)
+
+        if isinstance(nombres, str):
+            grupos = [(nombres, Ellipsis)]
+        else:
+            nombres = np.asarray(nombres)
+            if nombres.shape != valores.shape:
+                raise ValueError(
+                    f"nombres {nombres.shape} y valores {valores.shape} deben tener la misma forma"
+                )
+            unicos, inversa = np.unique(nombres, return_inverse=True)
+            inversa = inversa.reshape(valores.shape)
+            grupos = [(str(nombre), inversa == i) for i, nombre in enumerate(unicos)]
+
+        for nombre, seleccion in grupos:
+            ratio = self.ratios.get(nombre)
+            if ratio is None:
+                continue
+            v = valores[seleccion]
+            codigo = np.searchsorted(ratio.limites, v, side='right').astype(np.int8)
+            codigo[np.isnan(v)] = OPTIMO
+            codigos[seleccion] = codigo
+
+        return codigos
+
+    def estados(self, nombres, valores):
+        """Como clasificar(), pero con los textos 'bajo'/'optimo'/'alto'/'error'"""
+        return _ESTADOS_ARRAY[self.clasificar(nombres, valores)]
+
+
+# ============================================================
+# INSTANCIA COMPARTIDA POR PROCESO
+# ============================================================
+
+_bases = {}
+_lock = threading.Lock()
+
+
+def obtener_base(ruta=None):
+    """
+    Base de conocimiento compartida del proceso: cada archivo se lee y
+    compila una sola vez.
+
+    Args:
+        ruta: Archivo .json/.yaml (None = base incluida con la aplicación)
+
+    Returns:
+        BaseConocimiento
+    """
+    ruta = os.path.abspath(ruta or RUTA_PREDETERMINADA)
+    base = _bases.get(ruta)
+    if base is None:
+        with _lock:
+            base = _bases.get(ruta)
+            if base is None:
+                base = _bases[ruta] = BaseConocimiento.desde_archivo(ruta)
+    return base
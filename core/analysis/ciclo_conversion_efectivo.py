@@ -3,6 +3,8 @@ Archivo: core/analysis/ciclo_conversion_efectivo.py
 Cálculo e interpretación del Ciclo de Conversión de Efectivo (CCE)
 """
 
+from utils.perfilado import perfilar
+
 class CicloConversionEfectivo:
     """
     Calcula el Ciclo de Conversión de Efectivo y sus componentes.
@@ -180,6 +182,7 @@ class CicloConversionEfectivo:
             "interpretacion_cce": self.interpretar_cce(year, cce_val)
         }
     
+    @perfilar('analisis')
     def analisis_dual(self):
         """
         Analiza el CCE para ambos años y genera comparación.
@@ -218,6 +221,7 @@ class CicloConversionEfectivo:
             "tendencia": tendencia
         }
     
+    @perfilar('analisis')
     def recomendaciones(self, year):
         """
         Genera recomendaciones específicas basadas en el análisis.
@@ -3,6 +3,8 @@ Archivo: core/analysis/diagnostico_patrimonial.py
 Diagnóstico del Estado Patrimonial de la empresa
 """
 
+from utils.perfilado import perfilar
+
 class EstadoPatrimonial:
     """
     Calcula e interpreta el estado patrimonial de una empresa
@@ -246,6 +248,7 @@ class DiagnosticoPatrimonialDual:
         
         return EstadoPatrimonial(ac, pc, pn, pt, at)
     
+    @perfilar('analisis')
     def analisis_dual(self):
         """
         Realiza análisis comparativo entre ambos años.
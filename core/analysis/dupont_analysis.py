@@ -3,6 +3,9 @@ Archivo: core/analysis/dupont_analysis.py
 Análisis DuPont para descomponer la Rentabilidad de Recursos Propios
 """
 
+from core.calculators.registro_ratios import REGISTRO
+from utils.perfilado import perfilar
+
 
 class DuPontAnalysis:
     """Análisis DuPont completo con descomposición de RRP"""
@@ -11,6 +14,10 @@ class DuPontAnalysis:
         self.balance_data = balance_data
         self.income_data = income_data
     
+    def _ratios(self):
+        """Subtotales y ratios de ambos años (registro_ratios, compartidos)"""
+        return REGISTRO.evaluar_modelos(self.balance_data, self.income_data)
+    
     def calcular_margen_neto(self, year):
         """
         Calcula Margen Neto = Utilidad Neta / Ventas × 100
@@ -21,13 +28,7 @@ class DuPontAnalysis:
         Returns:
             float: Margen neto en porcentaje
         """
-        utilidad_neta = self.income_data.get_utilidad_neta(year)
-        ventas = self.income_data.ingresos_servicios_y1 if year == 1 else self.income_data.ingresos_servicios_y2
-        
-        if ventas == 0:
-            return 0.0
-        
-        return (utilidad_neta / ventas) * 100
+        return self._ratios().porcentaje('margen_neto', year, cero=0.0)
     
     def calcular_rotacion_activo(self, year):
         """
@@ -39,13 +40,7 @@ class DuPontAnalysis:
         Returns:
             float: Rotación del activo (veces)
         """
-        ventas = self.income_data.ingresos_servicios_y1 if year == 1 else self.income_data.ingresos_servicios_y2
-        activo_total = self.balance_data.get_total_activos(year)
-        
-        if activo_total == 0:
-            return 0.0
-        
-        return ventas / activo_total
+        return self._ratios().valor('rotacion_activos', year, cero=0.0)
     
     def calcular_apalancamiento(self, year):
         """
@@ -57,13 +52,7 @@ class DuPontAnalysis:
         Returns:
             float: Apalancamiento (veces)
         """
-        activo_total = self.balance_data.get_total_activos(year)
-        patrimonio_neto = self.balance_data.get_total_patrimonio(year)
-        
-        if patrimonio_neto == 0:
-            return 0.0
-        
-        return activo_total / patrimonio_neto
+        return self._ratios().valor('apalancamiento', year, cero=0.0)
     
     def calcular_rrp_dupont(self, year):
         """
@@ -93,14 +82,9 @@ class DuPontAnalysis:
         Returns:
             float: RRP directo (%)
         """
-        utilidad_neta = self.income_data.get_utilidad_neta(year)
-        patrimonio_neto = self.balance_data.get_total_patrimonio(year)
-        
-        if patrimonio_neto == 0:
-            return 0.0
-        
-        return (utilidad_neta / patrimonio_neto) * 100
+        return self._ratios().porcentaje('rpp', year, cero=0.0)
     
+    @perfilar('analisis')
     def analisis_dupont_dual(self):
         """
         Análisis DuPont completo para ambos años con verificación
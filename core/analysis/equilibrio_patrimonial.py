@@ -3,6 +3,8 @@ Archivo: core/analysis/equilibrio_patrimonial.py
 Analisis de Equilibrio Patrimonial y Fondo de Maniobra para 2 anos
 """
 
+from utils.perfilado import perfilar
+
 class EquilibrioPatrimonial:
     """
     Analiza el equilibrio patrimonial de un ano especifico.
@@ -402,6 +404,7 @@ class AnalisisPatrimonialCompleto:
         
         return EquilibrioPatrimonial(ac, anc, pc, pnc, pat)
     
+    @perfilar('analisis')
     def analisis_dual(self):
         """
         Realiza el analisis comparativo entre ambos anos.
@@ -3,6 +3,8 @@ Archivo: core/analysis/estres_financiero.py
 Análisis de estrés financiero y punto de equilibrio
 """
 
+from utils.perfilado import perfilar
+
 class EstresFinanciero:
     """
     Analiza el impacto de una caída en ingresos y calcula el punto de equilibrio.
@@ -40,6 +42,7 @@ class EstresFinanciero:
         else:
             self.punto_equilibrio = float('inf')
     
+    @perfilar('analisis')
     def aplicar_escenario_pesimista(self, caida_ingresos=0.30):
         """
         Aplica un escenario de caída en ingresos.
@@ -75,6 +78,24 @@ class EstresFinanciero:
             'impacto_utilidad': self.utilidad_neta_actual - nueva_utilidad
         }
     
+    @perfilar('analisis')
+    def simular_montecarlo(self, n=100_000, gastos_financieros=0.0, distribuciones=None,
+                           correlacion=None, semilla=None, nivel_confianza=0.95):
+        """
+        Versión probabilística de aplicar_escenario_pesimista: evalúa n
+        escenarios de caída de ingresos, estructura de costos y costo
+        financiero (ver core/analysis/estres_montecarlo.py).
+        
+        Returns:
+            dict con probabilidad de pérdida, VaR/CVaR de la utilidad neta,
+            percentiles y distribución de niveles del punto de equilibrio
+        """
+        from core.analysis.estres_montecarlo import EstresMonteCarlo
+        
+        simulacion = EstresMonteCarlo(self, gastos_financieros, distribuciones, correlacion)
+        return simulacion.simular(n, semilla=semilla, nivel_confianza=nivel_confianza)
+    
+    @perfilar('analisis')
     def evaluar_punto_equilibrio(self):
         """
         Evalúa el punto de equilibrio en relación a los ingresos actuales.
@@ -163,6 +184,7 @@ class EstresFinanciero:
                 f"para reducir costos fijos o aumentar márgenes."
             )
     
+    @perfilar('analisis')
     def resumen_metricas(self):
         """
         Retorna un resumen de todas las métricas clave.
@@ -0,0 +1,304 @@
+"""
+Archivo: core/analysis/estres_montecarlo.py
+Estrés financiero por simulación Monte Carlo: miles de escenarios conjuntos
+de caída de ingresos, estructura de costos y costo financiero evaluados
+con NumPy sobre el modelo de EstresFinanciero
+"""
+
+import math
+
+import numpy as np
+
+
+# Variables simuladas, en el orden de la matriz de correlación
+VARIABLES = ('caida_ingresos', 'proporcion_gastos_fijos', 'aumento_costo_financiero')
+
+# Mismos cortes que EstresFinanciero.evaluar_punto_equilibrio (% de ingresos)
+UMBRALES_EQUILIBRIO = (50, 70, 90)
+NIVELES_EQUILIBRIO = ('ÓPTIMO', 'ACEPTABLE', 'RIESGOSO', 'CRÍTICO')
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _cdf_normal(z):
+    """
+    Función de distribución normal estándar, vectorizada
+    (Abramowitz y Stegun 7.1.26, error < 1.5e-7; NumPy no trae erf).
+    """
+    x = np.abs(z) / math.sqrt(2)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    polinomio = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741
+                     + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - polinomio * np.exp(-x * x)
+    return 0.5 * (1.0 + np.copysign(erf, z))
+
+
+# ============================================================
+# DISTRIBUCIONES
+# ============================================================
+
+class Distribucion:
+    """
+    Distribución marginal de una variable del escenario.
+
+    Se muestrea a partir de normales estándar (cópula gaussiana), así la
+    correlación entre variables se aplica igual con cualquier tipo:
+        'constante'   valor
+        'normal'      media, desviacion, minimo=None, maximo=None (recorta)
+        'uniforme'    minimo, maximo
+        'triangular'  minimo, moda, maximo
+        'lognormal'   media_log, desviacion_log
+    """
+
+    PARAMETROS = {
+        'constante': ('valor',),
+        'normal': ('media', 'desviacion'),
+        'uniforme': ('minimo', 'maximo'),
+        'triangular': ('minimo', 'moda', 'maximo'),
+        'lognormal': ('media_log', 'desviacion_log'),
+    }
+
+    def __init__(self, tipo, **parametros):
+        if tipo not in self.PARAMETROS:
+            raise ValueError(f"Distribución '{tipo}' no soportada "
+                             f"(opciones: {', '.join(self.PARAMETROS)})")
+        faltantes = [p for p in self.PARAMETROS[tipo] if p not in parametros]
+        if faltantes:
+            raise ValueError(f"Distribución '{tipo}' requiere: {', '.join(faltantes)}")
+        if tipo == 'triangular' and not (parametros['minimo'] <= parametros['moda'] <= parametros['maximo']):
+            raise ValueError("Distribución triangular requiere minimo <= moda <= maximo")
+
+        self.tipo = tipo
+        self.parametros = parametros
+
+    def __repr__(self):
+        args = ', '.join(f"{k}={v}" for k, v in self.parametros.items())
+        return f"Distribucion('{self.tipo}', {args})"
+
+    def transformar(self, z):
+        """
+        Convierte normales estándar en muestras de esta distribución.
+
+        Args:
+            z: np.ndarray de N(0, 1)
+
+        Returns:
+            np.ndarray con la misma forma
+        """
+        p = self.parametros
+
+        if self.tipo == 'constante':
+            return np.full(z.shape, float(p['valor']))
+
+        if self.tipo == 'normal':
+            x = p['media'] + p['desviacion'] * z
+            if p.get('minimo') is not None or p.get('maximo') is not None:
+                x = np.clip(x, p.get('minimo'), p.get('maximo'))
+            return x
+
+        if self.tipo == 'lognormal':
+            return np.exp(p['media_log'] + p['desviacion_log'] * z)
+
+        u = _cdf_normal(z)
+
+        if self.tipo == 'uniforme':
+            return p['minimo'] + (p['maximo'] - p['minimo']) * u
+
+        # Triangular: inversa de la función de distribución
+        a, c, b = p['minimo'], p['moda'], p['maximo']
+        if b == a:
+            return np.full(z.shape, float(a))
+        corte = (c - a) / (b - a)
+        return np.where(
+            u < corte,
+            a + np.sqrt(u * (b - a) * (c - a)),
+            b - np.sqrt((1 - u) * (b - a) * (b - c))
+        )
+
+
+# Escenario de estrés por defecto: centrado en el escenario pesimista
+# determinista (caída del 30%, 40% de gastos fijos)
+DISTRIBUCIONES_PREDETERMINADAS = {
+    'caida_ingresos': Distribucion('triangular', minimo=0.0, moda=0.30, maximo=0.60),
+    'proporcion_gastos_fijos': Distribucion('triangular', minimo=0.30, moda=0.40, maximo=0.50),
+    'aumento_costo_financiero': Distribucion('normal', media=0.10, desviacion=0.15, minimo=-0.50),
+}
+
+# En una crisis, caídas de ingresos fuertes suelen venir con crédito más caro
+CORRELACION_ESTRES = np.array([
+    [1.0, 0.0, 0.4],
+    [0.0, 1.0, 0.0],
+    [0.4, 0.0, 1.0],
+])
+
+
+# ============================================================
+# SIMULACIÓN
+# ============================================================
+
+class EstresMonteCarlo:
+    """
+    Evalúa el modelo de EstresFinanciero sobre muchos escenarios a la vez.
+
+    En cada escenario:
+        nuevo_ingreso     = ingreso × (1 − caída)
+        gasto_fijo        = gasto_total × proporción_fijos
+                            + gastos_financieros × aumento_costo_financiero
+        gasto_variable    = gasto_total × (1 − proporción_fijos) × (1 − caída)
+        nueva_utilidad    = nuevo_ingreso − gasto_fijo − gasto_variable
+
+    El punto de equilibrio de cada escenario se compara con su propio
+    nuevo_ingreso (margen de seguridad en la situación de estrés); sin
+    caída coincide con evaluar_punto_equilibrio(). Con caída 30%, fijos
+    40% y sin aumento financiero, la utilidad coincide con
+    aplicar_escenario_pesimista().
+    """
+
+    def __init__(self, estres, gastos_financieros=0.0, distribuciones=None, correlacion=None):
+        """
+        Args:
+            estres: EstresFinanciero con los datos base (año 2)
+            gastos_financieros: Gastos financieros actuales (base del shock
+                                de costo financiero)
+            distribuciones: {variable: Distribucion} que reemplaza las
+                            predeterminadas (variables en VARIABLES)
+            correlacion: Matriz 3×3 de correlación entre las normales de
+                         VARIABLES (None = independientes)
+        """
+        desconocidas = set(distribuciones or {}) - set(VARIABLES)
+        if desconocidas:
+            raise ValueError(f"Variables desconocidas: {', '.join(sorted(desconocidas))}")
+
+        self.estres = estres
+        self.gastos_financieros = gastos_financieros
+        self.distribuciones = {**DISTRIBUCIONES_PREDETERMINADAS, **(distribuciones or {})}
+
+        self.cholesky = None
+        if correlacion is not None:
+            correlacion = np.asarray(correlacion, dtype=float)
+            if correlacion.shape != (len(VARIABLES), len(VARIABLES)):
+                raise ValueError(f"La correlación debe ser {len(VARIABLES)}×{len(VARIABLES)}")
+            try:
+                self.cholesky = np.linalg.cholesky(correlacion)
+            except np.linalg.LinAlgError:
+                raise ValueError("La matriz de correlación no es definida positiva")
+
+    def generar_escenarios(self, n, rng):
+        """
+        Sortea n escenarios conjuntos.
+
+        Returns:
+            dict: {variable: np.ndarray(n)}
+        """
+        z = rng.standard_normal((len(VARIABLES), n))
+        if self.cholesky is not None:
+            z = self.cholesky @ z
+        return {
+            variable: self.distribuciones[variable].transformar(z[i])
+            for i, variable in enumerate(VARIABLES)
+        }
+
+    def evaluar(self, escenarios):
+        """
+        Evalúa utilidad y punto de equilibrio de cada escenario.
+
+        Returns:
+            dict de np.ndarray: nuevo_ingreso, nueva_utilidad,
+            punto_equilibrio, porcentaje_equilibrio, nivel_equilibrio
+            (índice en NIVELES_EQUILIBRIO)
+        """
+        e = self.estres
+        caida = escenarios['caida_ingresos']
+        fijos = escenarios['proporcion_gastos_fijos']
+
+        nuevo_ingreso = e.ingreso_actual * (1 - caida)
+        gasto_fijo = (e.gasto_total * fijos
+                      + self.gastos_financieros * escenarios['aumento_costo_financiero'])
+        gasto_variable = e.gasto_total * (1 - fijos) * (1 - caida)
+        nueva_utilidad = nuevo_ingreso - gasto_fijo - gasto_variable
+
+        # Los gastos variables acompañan a los ingresos: el margen de
+        # contribución solo depende de la estructura de costos
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if e.ingreso_actual > 0:
+                margen = 1 - e.gasto_total * (1 - fijos) / e.ingreso_actual
+            else:
+                margen = np.zeros_like(fijos)
+            punto_equilibrio = np.where(margen > 0, gasto_fijo / margen, np.inf)
+            porcentaje = np.where(nuevo_ingreso > 0,
+                                  punto_equilibrio / nuevo_ingreso * 100, np.inf)
+
+        nivel = np.searchsorted(UMBRALES_EQUILIBRIO, porcentaje, side='right')
+
+        return {
+            'nuevo_ingreso': nuevo_ingreso,
+            'nueva_utilidad': nueva_utilidad,
+            'punto_equilibrio': punto_equilibrio,
+            'porcentaje_equilibrio': porcentaje,
+            'nivel_equilibrio': nivel,
+        }
+
+    def simular(self, n=100_000, semilla=None, nivel_confianza=0.95, devolver_escenarios=False):
+        """
+        Ejecuta la simulación y resume la distribución de resultados.
+
+        Args:
+            n: Cantidad de escenarios (10^5 a 10^6 es lo habitual)
+            semilla: Semilla del generador (para resultados reproducibles)
+            nivel_confianza: Nivel del VaR/CVaR (0.95 = 95%)
+            devolver_escenarios: Incluir los arrays de cada escenario
+
+        Returns:
+            dict con:
+                probabilidad_perdida: P(nueva utilidad < 0)
+                var / cvar: Caída de la utilidad neta respecto de la actual
+                            que no se supera con el nivel de confianza, y
+                            caída promedio en el resto de los casos
+                utilidad_var: Utilidad neta en ese percentil
+                percentiles: {'nueva_utilidad'|'porcentaje_equilibrio'|
+                              'caida_ingresos': {p: valor}}
+                niveles_equilibrio: {nivel: proporción de escenarios}
+                                    ({'NO_EVALUABLE': 1.0} sin ingresos)
+        """
+        rng = np.random.default_rng(semilla)
+        escenarios = self.generar_escenarios(n, rng)
+        resultado = self.evaluar(escenarios)
+
+        utilidad = resultado['nueva_utilidad']
+        caida_utilidad = self.estres.utilidad_neta_actual - utilidad
+
+        var = float(np.quantile(caida_utilidad, nivel_confianza))
+        cola = caida_utilidad[caida_utilidad >= var]
+
+        if self.estres.ingreso_actual == 0:
+            niveles = {'NO_EVALUABLE': 1.0}
+        else:
+            conteo = np.bincount(resultado['nivel_equilibrio'], minlength=len(NIVELES_EQUILIBRIO))
+            niveles = dict(zip(NIVELES_EQUILIBRIO, (conteo / n).tolist()))
+
+        resumen = {
+            'n_escenarios': n,
+            'semilla': semilla,
+            'nivel_confianza': nivel_confianza,
+            'utilidad_actual': self.estres.utilidad_neta_actual,
+            'utilidad_esperada': float(utilidad.mean()),
+            'probabilidad_perdida': float(np.mean(utilidad < 0)),
+            'var': var,
+            'cvar': float(cola.mean()),
+            'utilidad_var': self.estres.utilidad_neta_actual - var,
+            'percentiles': {
+                # Sin interpolar: el porcentaje de equilibrio puede ser inf
+                nombre: dict(zip(PERCENTILES, np.percentile(valores, PERCENTILES,
+                                                            method='inverted_cdf').tolist()))
+                for nombre, valores in (
+                    ('nueva_utilidad', utilidad),
+                    ('porcentaje_equilibrio', resultado['porcentaje_equilibrio']),
+                    ('caida_ingresos', escenarios['caida_ingresos']),
+                )
+            },
+            'niveles_equilibrio': niveles,
+        }
+
+        if devolver_escenarios:
+            resumen['escenarios'] = {**escenarios, **resultado}
+        return resumen
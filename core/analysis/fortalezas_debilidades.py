@@ -3,6 +3,8 @@ Archivo: core/analysis/fortalezas_debilidades.py
 Análisis de Fortalezas y Debilidades Financieras
 """
 
+from utils.perfilado import perfilar
+
 
 class FortalezasDebilidadesAnalysis:
     """Identifica las principales fortalezas y debilidades financieras"""
@@ -14,6 +16,7 @@ class FortalezasDebilidadesAnalysis:
         """
         self.matriz = matriz_ratios
     
+    @perfilar('analisis')
     def identificar_fortalezas_debilidades(self):
         """
         Identifica las 3 principales fortalezas y 3 principales debilidades
@@ -5,6 +5,8 @@ CORREGIDO: Nueva logica que evalua margenes por valor absoluto,
 separa impuestos de gastos financieros, y considera evolucion temporal.
 """
 
+from utils.perfilado import perfilar
+
 
 class MargenesAnalysis:
     """Analisis completo de margenes de ganancia"""
@@ -66,6 +68,7 @@ class MargenesAnalysis:
         
         return (utilidad_neta / ingresos) * 100
     
+    @perfilar('analisis')
     def analisis_dual_margenes(self):
         """
         Analisis completo de margenes para ambos años
@@ -5,101 +5,91 @@ CORREGIDO: La direccion (mejora/deterioro) ahora se evalua respecto
 al rango optimo, no simplemente si el valor subio o bajo.
 """
 
+from core.calculators.registro_ratios import REGISTRO
+from utils.perfilado import perfilar
+
 
 class MatrizRatios:
     """Matriz comparativa de los principales ratios financieros"""
-    
+
+    # Ratio del registro (registro_ratios) detrás de cada fila de la matriz
+    RATIOS_REGISTRO = {
+        'fondo_maniobra': 'fondo_maniobra',
+        'liquidez_general': 'razon_liquidez',
+        'razon_tesoreria': 'razon_tesoreria',
+        'razon_disponibilidad': 'razon_disponibilidad',
+        'ratio_garantia': 'ratio_garantia',
+        'ratio_autonomia': 'ratio_autonomia',
+        'ratio_calidad_deuda': 'ratio_calidad_deuda',
+        'rat': 'rat_operativa',
+        'rrp': 'rpp',
+        'margen_neto': 'margen_neto',
+        'rotacion_activos': 'rotacion_activos',
+        'apalancamiento': 'apalancamiento',
+    }
+
     def __init__(self, balance_data, income_data):
         self.balance_data = balance_data
         self.income_data = income_data
+    
+    def _ratios(self):
+        """Subtotales y ratios de ambos años (registro_ratios, compartidos)"""
+        return REGISTRO.evaluar_modelos(self.balance_data, self.income_data)
 
     def _get_total_pasivos(self, year):
         """Helper: Calcula Pasivo Total = PC + PNC"""
-        return (self.balance_data.get_total_pasivo_corriente(year) + 
-                self.balance_data.get_total_pasivo_no_corriente(year))
-
+        return self._ratios().subtotal('total_pasivo', year)
+    
     def calcular_fondo_maniobra(self, year):
         """Calcula Fondo de Maniobra"""
-        activo_corriente = self.balance_data.get_total_corriente(year)
-        pasivo_corriente = self.balance_data.get_total_pasivo_corriente(year)
-        return activo_corriente - pasivo_corriente
+        return self._ratios().subtotal('fondo_maniobra_absoluto', year)
     
     def calcular_ratio_fm(self, year):
         """Calcula Ratio FM = FM / Activo Total"""
-        fm = self.calcular_fondo_maniobra(year)
-        activo_total = self.balance_data.get_total_activos(year)
-        return (fm / activo_total) if activo_total != 0 else 0
+        return self._ratios().valor('fondo_maniobra', year, cero=0)
     
     def calcular_liquidez_general(self, year):
         """Calcula Liquidez General = AC / PC"""
-        ac = self.balance_data.get_total_corriente(year)
-        pc = self.balance_data.get_total_pasivo_corriente(year)
-        return (ac / pc) if pc != 0 else 0
+        return self._ratios().valor('razon_liquidez', year, cero=0)
     
     def calcular_razon_tesoreria(self, year):
         """Calcula Razon de Tesoreria"""
-        if year == 1:
-            disponible = self.balance_data.caja_bancos_y1
-            cxc = self.balance_data.clientes_cobrar_y1
-        else:
-            disponible = self.balance_data.caja_bancos_y2
-            cxc = self.balance_data.clientes_cobrar_y2
-        
-        pc = self.balance_data.get_total_pasivo_corriente(year)
-        return ((disponible + cxc) / pc) if pc != 0 else 0
+        return self._ratios().valor('razon_tesoreria', year, cero=0)
     
     def calcular_razon_disponibilidad(self, year):
         """Calcula Razon de Disponibilidad"""
-        disponible = self.balance_data.caja_bancos_y1 if year == 1 else self.balance_data.caja_bancos_y2
-        pc = self.balance_data.get_total_pasivo_corriente(year)
-        return (disponible / pc) if pc != 0 else 0
+        return self._ratios().valor('razon_disponibilidad', year, cero=0)
     
     def calcular_ratio_garantia(self, year):
-        activo = self.balance_data.get_total_activos(year)
-        pasivo = self._get_total_pasivos(year) 
-        return (activo / pasivo) if pasivo != 0 else 0
+        return self._ratios().valor('ratio_garantia', year, cero=0)
     
     def calcular_ratio_autonomia(self, year):
         """Calcula Ratio de Autonomia = Patrimonio / Pasivo"""
-        patrimonio = self.balance_data.get_total_patrimonio(year)
-        pasivo = self._get_total_pasivos(year)
-        return (patrimonio / pasivo) if pasivo != 0 else 0
+        return self._ratios().valor('ratio_autonomia', year, cero=0)
     
     def calcular_ratio_calidad_deuda(self, year):
         """Calcula Calidad de Deuda = PC / Pasivo Total"""
-        pc = self.balance_data.get_total_pasivo_corriente(year)
-        pasivo = self._get_total_pasivos(year)
-        return (pc / pasivo) if pasivo != 0 else 0
+        return self._ratios().valor('ratio_calidad_deuda', year, cero=0)
     
     def calcular_rat(self, year):
         """Calcula RAT = BAII / Activo Total x 100"""
-        baii = self.income_data.get_utilidad_operativa(year)
-        activo = self.balance_data.get_total_activos(year)
-        return (baii / activo * 100) if activo != 0 else 0
+        return self._ratios().porcentaje('rat_operativa', year, cero=0)
     
     def calcular_rrp(self, year):
         """Calcula RRP = UN / PN x 100"""
-        un = self.income_data.get_utilidad_neta(year)
-        pn = self.balance_data.get_total_patrimonio(year)
-        return (un / pn * 100) if pn != 0 else 0
+        return self._ratios().porcentaje('rpp', year, cero=0)
     
     def calcular_margen_neto(self, year):
         """Calcula Margen Neto = UN / Ventas x 100"""
-        un = self.income_data.get_utilidad_neta(year)
-        ventas = self.income_data.ingresos_servicios_y1 if year == 1 else self.income_data.ingresos_servicios_y2
-        return (un / ventas * 100) if ventas != 0 else 0
+        return self._ratios().porcentaje('margen_neto', year, cero=0)
     
     def calcular_rotacion_activos(self, year):
         """Calcula Rotacion de Activos = Ventas / Activo"""
-        ventas = self.income_data.ingresos_servicios_y1 if year == 1 else self.income_data.ingresos_servicios_y2
-        activo = self.balance_data.get_total_activos(year)
-        return (ventas / activo) if activo != 0 else 0
+        return self._ratios().valor('rotacion_activos', year, cero=0)
     
     def calcular_apalancamiento(self, year):
         """Calcula Apalancamiento = Activo / PN"""
-        activo = self.balance_data.get_total_activos(year)
-        pn = self.balance_data.get_total_patrimonio(year)
-        return (activo / pn) if pn != 0 else 0
+        return self._ratios().valor('apalancamiento', year, cero=0)
     
     def _calcular_distancia_al_optimo(self, valor, rango_min, rango_max):
         """
@@ -168,6 +158,7 @@ class MatrizRatios:
         else:
             return ("estable", "=")
     
+    @perfilar('analisis')
     def generar_matriz_completa(self):
         """
         Genera la matriz completa de ratios comparativos
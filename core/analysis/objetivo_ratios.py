@@ -0,0 +1,293 @@
+"""
+Archivo: core/analysis/objetivo_ratios.py
+Búsqueda de objetivo: el menor cambio en un grupo de cuentas que lleva
+uno o más ratios a su rango óptimo, sin descuadrar el balance
+"""
+
+import numpy as np
+
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+from core.models.campos import CAMPOS, ETIQUETAS_CAMPOS
+from core.calculators.ratio_calculator_lote import calcular_subtotales
+from core.calculators.registro_ratios import REGISTRO
+from core.analysis.base_conocimiento import obtener_base
+
+
+_N_BALANCE = len(BalanceMultiperiodo.CUENTAS)
+_DEFINICIONES = {d[0]: d for d in REGISTRO.definiciones}
+
+
+def _subtotales(cuentas):
+    """Subtotales de un arreglo (..., CAMPOS)"""
+    return calcular_subtotales(cuentas[..., :_N_BALANCE], cuentas[..., _N_BALANCE:])
+
+
+def _gradientes_lineales():
+    """
+    Gradiente de cada subtotal respecto de CAMPOS. Todos son lineales
+    salvo impuestos_renta y utilidad_neta (ver _gradiente).
+    """
+    identidad = _subtotales(np.eye(len(CAMPOS)))
+    cero = _subtotales(np.zeros(len(CAMPOS)))
+    return {nombre: identidad[nombre] - cero[nombre] for nombre in identidad}
+
+
+_GRADIENTES = _gradientes_lineales()
+
+# Activos − (Pasivo + Patrimonio): debe quedar igual tras el cambio
+_IDENTIDAD_BALANCE = _GRADIENTES['total_activos'] - _GRADIENTES['total_pasivo_patrimonio']
+
+
+class BuscadorObjetivo:
+    """
+    Resuelve: minimizar ||Δ / escala||  sujeto a
+        - cada ratio elegido dentro de su rango óptimo
+        - Activos − (Pasivo + Patrimonio) sin cambios: si el balance
+          cuadraba sigue cuadrando ('balance_cuadra' lo comprueba sobre
+          los valores nuevos, igual que validar_balance)
+        - cuentas >= 0
+    donde Δ es el cambio en las cuentas elegidas y la escala es el valor
+    actual de cada cuenta (se minimiza el cambio relativo; las cuentas en
+    0 usan el 1% del activo total).
+
+    Cada iteración linealiza los ratios con gradientes analíticos
+    (cociente de subtotales lineales) y obtiene el paso de norma mínima
+    con mínimos cuadrados (Gauss-Newton); en pocas iteraciones converge.
+    """
+
+    def __init__(self, balance, estado, year=2, base=None):
+        """
+        Args:
+            balance: BalanceGeneral
+            estado: EstadoResultado
+            year: Año sobre el que se busca el objetivo
+            base: BaseConocimiento con los rangos (None = la compartida)
+        """
+        self.year = year
+        self.base = base or obtener_base()
+
+        valores = [getattr(balance, f"{c}_y{year}") for c in BalanceMultiperiodo.CUENTAS]
+        valores += [getattr(estado, f"{c}_y{year}") for c in EstadoResultadoMultiperiodo.CUENTAS]
+        self.cuentas = np.array(valores, dtype=np.float64)
+
+        activo = _subtotales(self.cuentas)['total_activos']
+        self.escala = np.where(self.cuentas != 0, np.abs(self.cuentas),
+                               max(abs(float(activo)) * 0.01, 1.0))
+
+    # ============================================================
+    # RATIOS Y GRADIENTES
+    # ============================================================
+
+    def _evaluar(self, cuentas, ratios):
+        """Valores y gradientes (ratios x CAMPOS) de los ratios en `cuentas`"""
+        subtotales = _subtotales(cuentas)
+
+        # utilidad_neta = uai − max(0, uai × tasa): lineal por tramos
+        gradientes = dict(_GRADIENTES)
+        tasa = EstadoResultadoMultiperiodo.TASA_IMPUESTO
+        g_uai = _GRADIENTES['utilidad_antes_impuestos']
+        if subtotales['utilidad_antes_impuestos'] > 0:
+            gradientes['impuestos_renta'] = tasa * g_uai
+            gradientes['utilidad_neta'] = (1 - tasa) * g_uai
+        else:
+            gradientes['impuestos_renta'] = np.zeros_like(g_uai)
+            gradientes['utilidad_neta'] = g_uai
+
+        valores = np.empty(len(ratios))
+        jacobiano = np.zeros((len(ratios), len(CAMPOS)))
+        for i, ratio in enumerate(ratios):
+            _, numerador, denominador, valor_cero = _DEFINICIONES[ratio]
+            n = float(subtotales[numerador])
+            d = float(subtotales[denominador])
+            if d == 0:
+                valores[i] = valor_cero
+                continue
+            valores[i] = n / d
+            jacobiano[i] = (gradientes[numerador] * d - n * gradientes[denominador]) / (d * d)
+        return valores, jacobiano
+
+    def rango(self, ratio):
+        """Rango óptimo (mínimo, máximo) de un ratio en la base de conocimiento"""
+        info = self.base.get(ratio)
+        if info is None:
+            raise ValueError(f"Ratio '{ratio}' sin rango en la base de conocimiento")
+        return info.rango
+
+    # ============================================================
+    # RESOLUCIÓN
+    # ============================================================
+
+    def resolver(self, ratios, campos, rangos=None, margen=0.05, max_iter=25):
+        """
+        Busca el menor cambio en `campos` que lleva `ratios` a su rango.
+
+        Args:
+            ratios: Ratios objetivo (nombres declarados en registro_ratios)
+            campos: Cuentas que se permite modificar (ver CAMPOS)
+            rangos: {ratio: (mínimo, máximo)} que reemplaza el rango de la
+                    base de conocimiento; usar ±inf para límites abiertos
+            margen: Fracción del ancho del rango que se deja hacia adentro
+                    al apuntar a un borde (evita quedar justo en el límite)
+            max_iter: Máximo de iteraciones de Gauss-Newton
+
+        Returns:
+            dict: {'exito', 'mensaje', 'iteraciones', 'cambios',
+            'nuevos_valores', 'ratios': {ratio: {'antes', 'despues',
+            'rango'}}, 'balance_cuadra'}
+        """
+        ratios = list(ratios)
+        for ratio in ratios:
+            if ratio not in _DEFINICIONES:
+                raise ValueError(f"Ratio '{ratio}' desconocido")
+        for campo in campos:
+            if campo not in CAMPOS:
+                raise ValueError(f"Cuenta '{campo}' desconocida")
+
+        rangos = rangos or {}
+        limites = np.array([rangos.get(r) or self.rango(r) for r in ratios], dtype=np.float64)
+        bajo, alto = limites[:, 0], limites[:, 1]
+        ancho = np.where(np.isfinite(alto - bajo), alto - bajo, 0.0)
+        objetivo_bajo = bajo + margen * ancho
+        objetivo_alto = alto - margen * ancho
+
+        indices = np.array([CAMPOS.index(c) for c in campos])
+        libres = np.ones(len(indices), dtype=bool)
+
+        delta = np.zeros(len(CAMPOS))
+        valores_iniciales, _ = self._evaluar(self.cuentas, ratios)
+        activos = np.zeros(len(ratios), dtype=bool)
+        metas = np.zeros(len(ratios))
+
+        iteracion = 0
+        factible = True
+        for iteracion in range(1, max_iter + 1):
+            actual = self.cuentas + delta
+            valores, jacobiano = self._evaluar(actual, ratios)
+
+            # Un ratio fuera de su rango pasa a tener meta fija (el borde
+            # más cercano, hacia adentro) hasta el final
+            fuera = (valores < bajo) | (valores > alto)
+            nuevos = fuera & ~activos
+            metas[nuevos] = np.clip(valores[nuevos], objetivo_bajo[nuevos], objetivo_alto[nuevos])
+            activos |= fuera
+
+            if not activos.any():
+                break
+
+            # Entrar al rango no basta: la linealización puede pasarse de la
+            # meta (y de la solución de menor cambio); se sigue hasta que
+            # los ratios activos queden en su meta
+            residuo = metas[activos] - valores[activos]
+            if not fuera.any() and np.all(np.abs(residuo) <= 1e-9 * np.maximum(1.0, np.abs(metas[activos]))):
+                break
+
+            nuevo_delta, factible = self._paso(jacobiano[activos], residuo,
+                                               delta, indices, libres)
+            if not factible:
+                break
+
+            paso = np.max(np.abs(nuevo_delta - delta) / self.escala)
+            delta = nuevo_delta
+            if paso < 1e-12:
+                break
+
+        valores_finales, _ = self._evaluar(self.cuentas + delta, ratios)
+        tolerancia = 1e-9 * np.maximum(1.0, np.abs(limites)).max(axis=1)
+        en_rango = (valores_finales >= bajo - tolerancia) & (valores_finales <= alto + tolerancia)
+        exito = bool(factible and en_rango.all())
+
+        # Igual que validar_balance, pero sobre las cuentas con el cambio
+        diferencia = float(_IDENTIDAD_BALANCE @ (self.cuentas + delta))
+        if not exito:
+            mensaje = "No se alcanza el rango óptimo modificando solo estas cuentas"
+        elif not np.any(delta):
+            mensaje = "Los ratios ya están en su rango óptimo"
+        else:
+            mensaje = "Objetivo alcanzado"
+
+        return {
+            'exito': exito,
+            'mensaje': mensaje,
+            'iteraciones': iteracion,
+            'cambios': {c: float(delta[CAMPOS.index(c)]) for c in campos},
+            'nuevos_valores': {c: float(self.cuentas[CAMPOS.index(c)] + delta[CAMPOS.index(c)])
+                               for c in campos},
+            'ratios': {
+                ratio: {
+                    'antes': float(valores_iniciales[i]),
+                    'despues': float(valores_finales[i]),
+                    'rango': (float(bajo[i]), float(alto[i])),
+                }
+                for i, ratio in enumerate(ratios)
+            },
+            'balance_cuadra': abs(diferencia) < 0.01,
+        }
+
+    def _paso(self, jacobiano, residuo, delta, indices, libres):
+        """
+        Cambio total de norma mínima que satisface la linealización de los
+        ratios activos y la identidad del balance. Las cuentas que
+        quedarían negativas se fijan en 0 y se vuelve a resolver.
+
+        Returns:
+            tuple: (nuevo delta completo, factible)
+        """
+        while True:
+            fijos = indices[~libres]
+            variables = indices[libres]
+
+            # Cuentas fijadas en 0
+            nuevo = delta.copy()
+            nuevo[fijos] = -self.cuentas[fijos]
+
+            # J (Δ − Δ_actual) = meta − valor ; identidad · Δ = 0
+            filas = [jacobiano]
+            lado_derecho = [residuo + jacobiano @ delta - jacobiano[:, fijos] @ nuevo[fijos]]
+            filas.append(_IDENTIDAD_BALANCE[None, :])
+            lado_derecho.append(np.array([-_IDENTIDAD_BALANCE[fijos] @ nuevo[fijos]]))
+
+            matriz = np.vstack(filas)[:, variables] * self.escala[variables]
+            b = np.concatenate(lado_derecho)
+
+            if len(variables) == 0:
+                return nuevo, bool(np.allclose(b, 0))
+
+            y, *_ = np.linalg.lstsq(matriz, b, rcond=None)
+            nuevo[variables] = y * self.escala[variables]
+
+            # Sistema incompatible: las cuentas elegidas no mueven el ratio
+            # o no pueden hacerlo sin descuadrar el balance
+            residual = matriz @ y - b
+            if np.any(np.abs(residual) > 1e-8 * np.maximum(1.0, np.abs(b))):
+                return nuevo, False
+
+            negativos = libres & (self.cuentas[indices] + nuevo[indices] < 0)
+            if not negativos.any():
+                return nuevo, True
+            libres = libres & ~negativos
+
+
+def describir_cambios(resultado, minimo=0.005):
+    """
+    Texto breve con los cambios de cuentas de un resultado de resolver().
+
+    Args:
+        resultado: dict de BuscadorObjetivo.resolver
+        minimo: Cambio relativo mínimo para mencionarlo
+
+    Returns:
+        list[str]: p.ej. ["Deuda a corto plazo bancaria: -$500.00 (-33.3%)"]
+    """
+    lineas = []
+    for campo, cambio in resultado['cambios'].items():
+        anterior = resultado['nuevos_valores'][campo] - cambio
+        relativo = (cambio / anterior) if anterior else None
+        if cambio == 0 or (relativo is not None and abs(relativo) < minimo):
+            continue
+        signo = '+' if cambio > 0 else '-'
+        texto = f"{ETIQUETAS_CAMPOS.get(campo, campo)}: {signo}${abs(cambio):,.2f}"
+        if relativo is not None:
+            texto += f" ({relativo * 100:+.1f}%)"
+        lineas.append(texto)
+    return lineas
@@ -0,0 +1,312 @@
+"""
+Archivo: core/analysis/percentiles_sector.py
+Comparación con pares del sector: percentil de cada ratio de una empresa
+dentro de su sector, con bosquejos de cuantiles ordenados y combinables
+"""
+
+import json
+
+import numpy as np
+
+from core.models.matriz_cuentas import MatrizCuentas
+from core.calculators.registro_ratios import REGISTRO
+from core.analysis.matriz_ratios import MatrizRatios
+
+
+# Versión del formato del índice guardado (.npz)
+VERSION_INDICE = 2
+
+# Puntos que conserva cada bosquejo; con más observaciones se resume en
+# MAX_PUNTOS cuantiles de igual peso (error de rango < 100 / MAX_PUNTOS
+# puntos percentiles por cada resumen)
+MAX_PUNTOS = 2048
+
+# Ratios comparados por defecto: los de la matriz D1, con su nombre del registro
+RATIOS_COMPARADOS = tuple(MatrizRatios.RATIOS_REGISTRO.values())
+
+
+# ============================================================
+# BOSQUEJO DE CUANTILES
+# ============================================================
+
+class BosquejoCuantiles:
+    """
+    Distribución de un ratio como valores ordenados con peso.
+
+    Mientras tenga hasta MAX_PUNTOS observaciones es exacta (peso 1 cada
+    una); al superarlo se resume en MAX_PUNTOS cuantiles de igual peso.
+    Dos bosquejos se combinan mezclando sus puntos (y resumiendo si hace
+    falta), así que los datos del sector se pueden mantener agregando
+    solo las empresas nuevas, o calcular por partes y unir al final.
+
+    El percentil de un valor se obtiene con dos searchsorted, O(log n).
+    """
+
+    __slots__ = ('valores', 'pesos', '_acumulado')
+
+    def __init__(self, valores=(), pesos=None):
+        """
+        Args:
+            valores: Observaciones (en cualquier orden; los NaN se descartan)
+            pesos: Peso de cada observación (por defecto 1)
+        """
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        pesos = np.ones_like(valores) if pesos is None else np.asarray(pesos, dtype=np.float64).ravel()
+
+        validos = ~np.isnan(valores)
+        valores, pesos = valores[validos], pesos[validos]
+        orden = np.argsort(valores, kind='stable')
+
+        self.valores = valores[orden]
+        self.pesos = pesos[orden]
+        self._acumulado = None
+        if len(self.valores) > MAX_PUNTOS:
+            self._resumir()
+
+    @property
+    def total(self):
+        """Peso total (cantidad de observaciones resumidas)"""
+        return float(self.pesos.sum())
+
+    def __len__(self):
+        return len(self.valores)
+
+    def _resumir(self):
+        """Reemplaza los puntos por MAX_PUNTOS cuantiles de igual peso"""
+        acumulado = np.cumsum(self.pesos)
+        total = acumulado[-1]
+        objetivos = (np.arange(MAX_PUNTOS) + 0.5) * (total / MAX_PUNTOS)
+        posiciones = np.minimum(np.searchsorted(acumulado, objetivos), len(acumulado) - 1)
+        self.valores = self.valores[posiciones]
+        self.pesos = np.full(MAX_PUNTOS, total / MAX_PUNTOS)
+        self._acumulado = None
+
+    def combinar(self, otro):
+        """
+        Bosquejo con las observaciones de ambos (no modifica ninguno).
+
+        Returns:
+            BosquejoCuantiles
+        """
+        return BosquejoCuantiles(np.concatenate((self.valores, otro.valores)),
+                                 np.concatenate((self.pesos, otro.pesos)))
+
+    def percentil(self, valor):
+        """
+        Percentil (0-100) de un valor o arreglo de valores: peso por debajo
+        más la mitad del peso igual, sobre el total.
+
+        Returns:
+            float o ndarray (NaN si el bosquejo está vacío o el valor es NaN)
+        """
+        valor = np.asarray(valor, dtype=np.float64)
+        if not len(self.valores):
+            return np.full(valor.shape, np.nan)[()]
+
+        if self._acumulado is None:
+            self._acumulado = np.concatenate(([0.0], np.cumsum(self.pesos)))
+        acumulado = self._acumulado
+
+        izquierda = np.searchsorted(self.valores, valor, side='left')
+        derecha = np.searchsorted(self.valores, valor, side='right')
+        debajo = acumulado[izquierda]
+        iguales = acumulado[derecha] - debajo
+        resultado = 100 * (debajo + 0.5 * iguales) / acumulado[-1]
+        return np.where(np.isnan(valor), np.nan, resultado)[()]
+
+    def cuantil(self, q):
+        """
+        Valor bajo el que queda la fracción `q` (0-1) del peso.
+
+        Returns:
+            float (NaN si el bosquejo está vacío)
+        """
+        if not len(self.valores):
+            return float('nan')
+        acumulado = np.cumsum(self.pesos)
+        posicion = min(int(np.searchsorted(acumulado, q * acumulado[-1])), len(acumulado) - 1)
+        return float(self.valores[posicion])
+
+
+# ============================================================
+# ÍNDICE POR SECTOR, ANTIGÜEDAD Y RATIO
+# ============================================================
+
+class IndicePercentiles:
+    """
+    Un BosquejoCuantiles por (sector, antigüedad, ratio), calculado sobre
+    una Cartera (core/models/cartera.py) con los ratios del registro.
+
+    Los periodos se alinean desde el último: antigüedad 0 es el último
+    periodo de cada cartera, 1 el anterior, etc. Así el año 2 de la
+    empresa se compara con el último periodo del sector y el año 1 con
+    el anterior, aunque las carteras agregadas tengan distinta cantidad
+    de periodos.
+
+    Uso:
+        indice = IndicePercentiles.desde_cartera(cartera)
+        indice.agregar_cartera(nuevas)            # presentaciones nuevas
+        indice.percentiles('retail', balance, estado)
+        # {'razon_liquidez': {1: 42.0, 2: 57.5}, ...}
+    """
+
+    def __init__(self, ratios=RATIOS_COMPARADOS):
+        """
+        Args:
+            ratios: Nombres de ratios del registro a comparar
+        """
+        for ratio in ratios:
+            if ratio not in REGISTRO.indice:
+                raise KeyError(f"'{ratio}' no está declarado en el registro de ratios")
+        self.ratios = tuple(ratios)
+        # {(sector, antigüedad, ratio): BosquejoCuantiles}
+        self._bosquejos = {}
+
+    @classmethod
+    def desde_cartera(cls, cartera, ratios=RATIOS_COMPARADOS):
+        """Índice con todas las empresas de una cartera"""
+        indice = cls(ratios)
+        indice.agregar_cartera(cartera)
+        return indice
+
+    @property
+    def sectores(self):
+        """Sectores con datos, en orden alfabético"""
+        return sorted({sector for sector, _, _ in self._bosquejos})
+
+    def antiguedades(self, sector):
+        """Antigüedades (0 = último periodo, 1 = el anterior, ...) con datos del sector"""
+        return sorted({a for s, a, _ in self._bosquejos if s == sector})
+
+    def empresas(self, sector, antiguedad=0):
+        """Cantidad de empresas del sector en un periodo (0 = el último)"""
+        bosquejo = self._bosquejos.get((sector, antiguedad, self.ratios[0]))
+        return int(round(bosquejo.total)) if bosquejo is not None else 0
+
+    def bosquejo(self, sector, antiguedad, ratio):
+        """BosquejoCuantiles de un ratio, o None si no hay datos"""
+        return self._bosquejos.get((sector, antiguedad, ratio))
+
+    # ============================================================
+    # ACTUALIZACIÓN
+    # ============================================================
+
+    def agregar(self, sector, balances, estados):
+        """
+        Agrega empresas de un sector.
+
+        Args:
+            sector: Nombre del sector
+            balances: Arreglo (empresas x periodos x cuentas_balance)
+            estados: Arreglo (empresas x periodos x cuentas_estado)
+        """
+        ratios = REGISTRO.evaluar(balances, estados, self.ratios)
+        n_periodos = ratios.shape[1]
+        for periodo in range(n_periodos):
+            for r, ratio in enumerate(self.ratios):
+                clave = (sector, n_periodos - 1 - periodo, ratio)
+                nuevo = BosquejoCuantiles(ratios[:, periodo, r])
+                anterior = self._bosquejos.get(clave)
+                self._bosquejos[clave] = nuevo if anterior is None else anterior.combinar(nuevo)
+
+    def agregar_cartera(self, cartera, filas=None):
+        """
+        Agrega las empresas de una cartera, cada una en su sector.
+
+        Args:
+            cartera: Cartera
+            filas: Filas a agregar (por defecto, todas)
+        """
+        balances, estados = cartera.arreglos_lote()
+        for sector in cartera.nombres_sectores:
+            filas_sector = cartera.filas_sector(sector)
+            if filas is not None:
+                filas_sector = np.intersect1d(filas_sector, filas)
+            if len(filas_sector):
+                self.agregar(sector, balances[filas_sector], estados[filas_sector])
+
+    def combinar(self, otro):
+        """Agrega los bosquejos de otro índice con los mismos ratios"""
+        if otro.ratios != self.ratios:
+            raise ValueError("Los índices comparan ratios distintos")
+        for clave, bosquejo in otro._bosquejos.items():
+            anterior = self._bosquejos.get(clave)
+            self._bosquejos[clave] = bosquejo if anterior is None else anterior.combinar(bosquejo)
+
+    # ============================================================
+    # CONSULTA
+    # ============================================================
+
+    def percentil(self, sector, antiguedad, ratio, valor):
+        """
+        Percentil (0-100) de un valor entre las empresas del sector.
+
+        Args:
+            antiguedad: Periodo del sector (0 = el último, 1 = el anterior)
+
+        Returns:
+            float, o None si no hay datos del sector en ese periodo
+        """
+        bosquejo = self._bosquejos.get((sector, antiguedad, ratio))
+        if bosquejo is None or not len(bosquejo):
+            return None
+        return float(bosquejo.percentil(valor))
+
+    def percentiles(self, sector, balance, estado, periodos=(1, 2)):
+        """
+        Percentil de cada ratio de una empresa dentro de su sector.
+
+        Args:
+            sector: Sector de comparación
+            balance, estado: Modelos de la empresa (de 2 años o multiperiodo;
+                             de estos se usan los dos últimos periodos)
+            periodos: Años a comparar: el año 2 con el último periodo del
+                      sector y el año 1 con el anterior
+
+        Returns:
+            dict: {ratio: {periodo: percentil o None}}
+        """
+        if isinstance(balance, MatrizCuentas) and balance.n_periodos != 2:
+            balance = type(balance)(balance.valores[:, -2:], balance.periodos[-2:])
+            estado = type(estado)(estado.valores[:, -2:], estado.periodos[-2:])
+        resultado = REGISTRO.evaluar_modelos(balance, estado)
+        return {
+            ratio: {
+                periodo: self.percentil(sector, 2 - periodo, ratio, resultado.valor(ratio, periodo))
+                for periodo in periodos
+            }
+            for ratio in self.ratios
+        }
+
+    # ============================================================
+    # PERSISTENCIA
+    # ============================================================
+
+    def guardar(self, ruta):
+        """Guarda el índice en un archivo .npz"""
+        claves = list(self._bosquejos)
+        arreglos = {}
+        for i, clave in enumerate(claves):
+            arreglos[f"valores_{i}"] = self._bosquejos[clave].valores
+            arreglos[f"pesos_{i}"] = self._bosquejos[clave].pesos
+        meta = {'version': VERSION_INDICE, 'ratios': list(self.ratios),
+                'claves': [list(clave) for clave in claves]}
+        with open(ruta, 'wb') as archivo:
+            np.savez_compressed(archivo, indice=np.array(json.dumps(meta, ensure_ascii=False)), **arreglos)
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Lee un índice guardado con guardar()"""
+        with np.load(ruta, allow_pickle=False) as datos:
+            meta = json.loads(str(datos['indice']))
+            if meta.get('version') != VERSION_INDICE:
+                raise ValueError(f"{ruta}: versión de índice {meta.get('version')} no soportada; "
+                                 f"vuelva a generarlo con percentiles_sector.py")
+            indice = cls(meta['ratios'])
+            for i, (sector, antiguedad, ratio) in enumerate(meta['claves']):
+                bosquejo = BosquejoCuantiles.__new__(BosquejoCuantiles)
+                bosquejo.valores = datos[f"valores_{i}"]
+                bosquejo.pesos = datos[f"pesos_{i}"]
+                bosquejo._acumulado = None
+                indice._bosquejos[(sector, antiguedad, ratio)] = bosquejo
+        return indice
@@ -3,6 +3,9 @@ Archivo: core/analysis/rat_analysis.py
 Análisis de Rentabilidad del Activo Total (RAT)
 """
 
+from core.calculators.registro_ratios import REGISTRO
+from utils.perfilado import perfilar
+
 
 class RATAnalysis:
     """Análisis completo de la Rentabilidad del Activo Total"""
@@ -11,6 +14,10 @@ class RATAnalysis:
         self.balance_data = balance_data
         self.income_data = income_data
     
+    def _ratios(self):
+        """Subtotales y ratios de ambos años (registro_ratios, compartidos)"""
+        return REGISTRO.evaluar_modelos(self.balance_data, self.income_data)
+    
     def calcular_rat(self, year):
         """
         Calcula RAT = BAII / Activo Total × 100
@@ -21,14 +28,9 @@ class RATAnalysis:
         Returns:
             float: RAT en porcentaje
         """
-        baii = self.income_data.get_utilidad_operativa(year)
-        activo_total = self.balance_data.get_total_activos(year)
-        
-        if activo_total == 0:
-            return 0.0
-        
-        return (baii / activo_total) * 100
+        return self._ratios().porcentaje('rat_operativa', year, cero=0.0)
     
+    @perfilar('analisis')
     def analisis_dual(self):
         """
         Análisis comparativo de RAT entre Año 1 y Año 2
@@ -3,6 +3,26 @@ Archivo: core/analysis/recomendaciones_estrategicas.py
 Recomendaciones Estratégicas Fundamentadas Cuantitativamente
 """
 
+from core.analysis.objetivo_ratios import BuscadorObjetivo, describir_cambios
+from core.models.campos import ETIQUETAS_CAMPOS
+from utils.perfilado import perfilar
+
+
+# Meta de cada recomendación: ratios que busca mejorar y cuentas con que
+# se logra. Se calcula el menor cambio que lleva los ratios al mínimo de
+# su rango óptimo (BuscadorObjetivo).
+OBJETIVOS_RECOMENDACIONES = {
+    ('liquidez', 1): (['razon_disponibilidad'], ['caja_bancos', 'clientes_cobrar']),
+    ('liquidez', 2): (['razon_liquidez'], ['deuda_cp', 'prestamos_lp']),
+    ('liquidez', 3): (['razon_disponibilidad'], ['caja_bancos', 'ganancias_acum']),
+    ('rentabilidad', 1): (['margen_neto'], ['ingresos_servicios', 'costo_servicios']),
+    ('rentabilidad', 2): (['margen_operativo'], ['gastos_admin', 'gastos_ventas']),
+    ('rentabilidad', 3): (['rpp'], ['ingresos_servicios']),
+    ('eficiencia_operativa', 1): (['rotacion_activos'], ['inmuebles_planta', 'prestamos_lp']),
+    ('eficiencia_operativa', 2): (['margen_operativo'], ['gastos_admin']),
+    ('eficiencia_operativa', 3): (['fondo_maniobra'], ['clientes_cobrar', 'caja_bancos', 'proveedores']),
+}
+
 
 class RecomendacionesEstrategicas:
     """Genera recomendaciones estratégicas fundamentadas en datos"""
@@ -10,7 +30,9 @@ class RecomendacionesEstrategicas:
     def __init__(self, balance_data, income_data):
         self.balance_data = balance_data
         self.income_data = income_data
+        self._buscador = None
     
+    @perfilar('analisis')
     def generar_recomendaciones_completas(self):
         """
         Genera las 3 recomendaciones estratégicas principales
@@ -18,11 +40,64 @@ class RecomendacionesEstrategicas:
         Returns:
             dict: Recomendaciones con fundamentos cuantitativos
         """
-        return {
+        resultado = {
             'liquidez': self._generar_recomendaciones_liquidez(),
             'rentabilidad': self._generar_recomendaciones_rentabilidad(),
             'eficiencia_operativa': self._generar_recomendaciones_eficiencia()
         }
+        
+        # Meta cuantificada de cada recomendación
+        for seccion, recomendaciones in resultado.items():
+            for recom in recomendaciones:
+                recom['meta'] = self._calcular_meta(seccion, recom['numero'])
+        
+        return resultado
+    
+    def _calcular_meta(self, seccion, numero):
+        """
+        Cuánto deben cambiar las cuentas de la recomendación para que sus
+        ratios lleguen al mínimo del rango óptimo (año 2).
+        
+        Returns:
+            str: Texto de la meta ('' si la recomendación no tiene meta)
+        """
+        if (seccion, numero) not in OBJETIVOS_RECOMENDACIONES:
+            return ''
+        ratios, campos = OBJETIVOS_RECOMENDACIONES[(seccion, numero)]
+        
+        if self._buscador is None:
+            self._buscador = BuscadorObjetivo(self.balance_data, self.income_data)
+        buscador = self._buscador
+        
+        rangos = {ratio: (buscador.rango(ratio)[0], float('inf')) for ratio in ratios}
+        resultado = buscador.resolver(ratios, campos, rangos=rangos)
+        
+        nombres = {ratio: buscador.base.get(ratio).nombre for ratio in ratios}
+        
+        def formato(ratio, valor):
+            if buscador.base.get(ratio).unidad == 'porcentaje':
+                return f"{valor * 100:.1f}%"
+            return f"{valor:.2f}"
+        
+        estado_ratios = ", ".join(
+            f"{nombres[ratio]} {formato(ratio, datos['antes'])} "
+            f"(mínimo óptimo {formato(ratio, datos['rango'][0])})"
+            for ratio, datos in resultado['ratios'].items()
+        )
+        
+        if not resultado['exito']:
+            cuentas = ", ".join(ETIQUETAS_CAMPOS[c] for c in campos)
+            return f"{estado_ratios}: no se alcanza modificando solo {cuentas}."
+        
+        cambios = describir_cambios(resultado)
+        if not cambios:
+            return f"{estado_ratios}: ya cumple el mínimo óptimo."
+        
+        proyectado = ", ".join(
+            f"{nombres[ratio]} → {formato(ratio, datos['despues'])}"
+            for ratio, datos in resultado['ratios'].items()
+        )
+        return f"{estado_ratios}. Cambio mínimo necesario: {'; '.join(cambios)}. Resultado: {proyectado}."
     
     def _generar_recomendaciones_liquidez(self):
         """Genera 3 recomendaciones para mejorar liquidez"""
@@ -4,21 +4,27 @@ Resumen Integral de todos los Ratios Financieros
 """
 
 from core.analysis.financial_interpreter import FinancialInterpreter
+from core.calculators.registro_ratios import REGISTRO
+from utils.perfilado import perfilar
 
 
 class ResumenIntegralRatios:
     """Genera resumen completo con interpretaciones de todos los ratios"""
     
-    def __init__(self, balance_data, income_data):
+    def __init__(self, balance_data, income_data, interpreter=None):
         self.balance_data = balance_data
         self.income_data = income_data
-        self.interpreter = FinancialInterpreter()
+        self.interpreter = interpreter or FinancialInterpreter()
+    
+    def _ratios(self):
+        """Subtotales y ratios de ambos años (registro_ratios, compartidos)"""
+        return REGISTRO.evaluar_modelos(self.balance_data, self.income_data)
     
     def _get_total_pasivos(self, year):
         """Helper: Calcula Pasivo Total = PC + PNC"""
-        return (self.balance_data.get_total_pasivo_corriente(year) + 
-                self.balance_data.get_total_pasivo_no_corriente(year))
+        return self._ratios().subtotal('total_pasivo', year)
     
+    @perfilar('analisis')
     def generar_resumen_completo(self):
         """
         Genera resumen completo de todos los ratios con interpretación, causa y recomendación
@@ -97,83 +103,51 @@ class ResumenIntegralRatios:
     
     def _calcular_ratio_fm(self, year):
         """Calcula Ratio FM = FM / Activo Total"""
-        ac = self.balance_data.get_total_corriente(year)
-        pc = self.balance_data.get_total_pasivo_corriente(year)
-        fm = ac - pc
-        activo = self.balance_data.get_total_activos(year)
-        return (fm / activo) if activo != 0 else 0
+        return self._ratios().valor('fondo_maniobra', year, cero=0)
     
     def _calcular_liquidez_general(self, year):
         """Calcula Liquidez General = AC / PC"""
-        ac = self.balance_data.get_total_corriente(year)
-        pc = self.balance_data.get_total_pasivo_corriente(year)
-        return (ac / pc) if pc != 0 else 0
+        return self._ratios().valor('razon_liquidez', year, cero=0)
     
     def _calcular_razon_tesoreria(self, year):
         """Calcula Razón de Tesorería"""
-        if year == 1:
-            disponible = self.balance_data.caja_bancos_y1
-            cxc = self.balance_data.clientes_cobrar_y1
-        else:
-            disponible = self.balance_data.caja_bancos_y2
-            cxc = self.balance_data.clientes_cobrar_y2
-        
-        pc = self.balance_data.get_total_pasivo_corriente(year)
-        return ((disponible + cxc) / pc) if pc != 0 else 0
+        return self._ratios().valor('razon_tesoreria', year, cero=0)
     
     def _calcular_razon_disponibilidad(self, year):
         """Calcula Razón de Disponibilidad"""
-        disponible = self.balance_data.caja_bancos_y1 if year == 1 else self.balance_data.caja_bancos_y2
-        pc = self.balance_data.get_total_pasivo_corriente(year)
-        return (disponible / pc) if pc != 0 else 0
+        return self._ratios().valor('razon_disponibilidad', year, cero=0)
     
     def _calcular_ratio_garantia(self, year):
         """Calcula Ratio de Garantía"""
-        activo = self.balance_data.get_total_activos(year)
-        pasivo = self._get_total_pasivos(year)
-        return (activo / pasivo) if pasivo != 0 else 0
+        return self._ratios().valor('ratio_garantia', year, cero=0)
     
     def _calcular_ratio_autonomia(self, year):
         """Calcula Ratio de Autonomía"""
-        patrimonio = self.balance_data.get_total_patrimonio(year)
-        pasivo = self._get_total_pasivos(year)
-        return (patrimonio / pasivo) if pasivo != 0 else 0
+        return self._ratios().valor('ratio_autonomia', year, cero=0)
     
     def _calcular_ratio_calidad_deuda(self, year):
         """Calcula Calidad de Deuda"""
-        pc = self.balance_data.get_total_pasivo_corriente(year)
-        pasivo = self._get_total_pasivos(year)
-        return (pc / pasivo) if pasivo != 0 else 0
+        return self._ratios().valor('ratio_calidad_deuda', year, cero=0)
     
     def _calcular_ratio_endeudamiento(self, year):
         """Calcula Ratio de Endeudamiento"""
-        pasivo = self._get_total_pasivos(year)
-        activo = self.balance_data.get_total_activos(year)
-        return (pasivo / activo) if activo != 0 else 0
+        return self._ratios().valor('ratio_endeudamiento', year, cero=0)
     
     def _calcular_rrp(self, year):
         """Calcula RRP"""
-        un = self.income_data.get_utilidad_neta(year)
-        pn = self.balance_data.get_total_patrimonio(year)
-        return ((un / pn) * 100) if pn != 0 else 0
+        return self._ratios().porcentaje('rpp', year, cero=0)
     
     def _calcular_margen_neto(self, year):
         """Calcula Margen Neto"""
-        un = self.income_data.get_utilidad_neta(year)
-        ventas = self.income_data.ingresos_servicios_y1 if year == 1 else self.income_data.ingresos_servicios_y2
-        return ((un / ventas) * 100) if ventas != 0 else 0
+        return self._ratios().porcentaje('margen_neto', year, cero=0)
     
     def _calcular_rotacion_activos(self, year):
         """Calcula Rotación de Activos"""
-        ventas = self.income_data.ingresos_servicios_y1 if year == 1 else self.income_data.ingresos_servicios_y2
-        activo = self.balance_data.get_total_activos(year)
-        return (ventas / activo) if activo != 0 else 0
+        return self._ratios().valor('rotacion_activos', year, cero=0)
     
     def _calcular_apalancamiento(self, year):
         """Calcula Apalancamiento"""
-        activo = self.balance_data.get_total_activos(year)
-        pn = self.balance_data.get_total_patrimonio(year)
-        return (activo / pn) if pn != 0 else 0
+        return self._ratios().valor('apalancamiento', year, cero=0)
     
     def _generar_conclusion_global(self, resumen):
         """Genera conclusión global del análisis"""
@@ -3,6 +3,9 @@ Archivo: core/analysis/rrp_analysis.py
 Análisis de Rentabilidad de Recursos Propios (RRP)
 """
 
+from core.calculators.registro_ratios import REGISTRO
+from utils.perfilado import perfilar
+
 
 class RRPAnalysis:
     """Análisis completo de la Rentabilidad de Recursos Propios"""
@@ -11,6 +14,10 @@ class RRPAnalysis:
         self.balance_data = balance_data
         self.income_data = income_data
     
+    def _ratios(self):
+        """Subtotales y ratios de ambos años (registro_ratios, compartidos)"""
+        return REGISTRO.evaluar_modelos(self.balance_data, self.income_data)
+    
     def calcular_rrp(self, year):
         """
         Calcula RRP = Utilidad Neta / Patrimonio Neto × 100
@@ -21,13 +28,7 @@ class RRPAnalysis:
         Returns:
             float: RRP en porcentaje
         """
-        utilidad_neta = self.income_data.get_utilidad_neta(year)
-        patrimonio_neto = self.balance_data.get_total_patrimonio(year)
-        
-        if patrimonio_neto == 0:
-            return 0.0
-        
-        return (utilidad_neta / patrimonio_neto) * 100
+        return self._ratios().porcentaje('rpp', year, cero=0.0)
     
     def calcular_rat(self, year):
         """
@@ -40,14 +41,9 @@ class RRPAnalysis:
         Returns:
             float: RAT en porcentaje
         """
-        baii = self.income_data.get_utilidad_operativa(year)
-        activo_total = self.balance_data.get_total_activos(year)
-        
-        if activo_total == 0:
-            return 0.0
-        
-        return (baii / activo_total) * 100
+        return self._ratios().porcentaje('rat_operativa', year, cero=0.0)
     
+    @perfilar('analisis')
     def analisis_dual_rrp(self):
         """
         Análisis comparativo de RRP entre Año 1 y Año 2
@@ -98,6 +94,7 @@ class RRPAnalysis:
             }
         }
     
+    @perfilar('analisis')
     def analisis_comparativo_rat_rrp(self):
         """
         Análisis comparativo entre RAT y RRP (apalancamiento financiero)
@@ -0,0 +1,185 @@
+"""
+Archivo: core/analysis/sensibilidad.py
+Análisis de sensibilidad: cuánto mueve cada cuenta del balance y del
+estado de resultados a cada ratio (tornado y grillas 2-D)
+"""
+
+import numpy as np
+
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+from core.models.campos import CAMPOS, ETIQUETAS_CAMPOS
+from core.calculators.ratio_calculator_lote import DEFINICION_RATIOS, calcular_ratios_vectorizado
+from utils.perfilado import perfilar
+
+
+class AnalisisSensibilidad:
+    """
+    Perturba las cuentas de un año y evalúa todos los ratios de una sola
+    vez con calcular_ratios_vectorizado: cada perturbación es un eje más
+    del arreglo de cuentas, así un tornado completo (2 variaciones × 23
+    cuentas × 14 ratios) o una grilla de 50×50 son una sola llamada.
+
+    Las variaciones son relativas (+0.10 = +10% sobre el valor actual);
+    una cuenta en 0 no cambia y no aparece en el tornado.
+    """
+
+    def __init__(self, balance, estado, year=2, definiciones=DEFINICION_RATIOS):
+        """
+        Args:
+            balance: BalanceGeneral (o modelo con atributos <cuenta>_y<N>)
+            estado: EstadoResultado
+            year: Año a analizar (1 o 2)
+            definiciones: Ratios a evaluar (formato de DEFINICION_RATIOS)
+        """
+        self.year = year
+        self.definiciones = definiciones
+        self.ratios = tuple(d[0] for d in definiciones)
+
+        valores = [getattr(balance, f"{c}_y{year}") for c in BalanceMultiperiodo.CUENTAS]
+        valores += [getattr(estado, f"{c}_y{year}") for c in EstadoResultadoMultiperiodo.CUENTAS]
+        self.cuentas = np.array(valores, dtype=np.float64)
+
+        self._n_balance = len(BalanceMultiperiodo.CUENTAS)
+        self._base = None
+
+    # ============================================================
+    # EVALUACIÓN
+    # ============================================================
+
+    def evaluar(self, cuentas):
+        """
+        Ratios de un arreglo de cuentas (..., CAMPOS) -> (..., ratios)
+        """
+        return calcular_ratios_vectorizado(
+            cuentas[..., :self._n_balance],
+            cuentas[..., self._n_balance:],
+            self.definiciones
+        )
+
+    def base(self):
+        """Ratios sin perturbar: {ratio: valor}"""
+        if self._base is None:
+            self._base = self.evaluar(self.cuentas)
+        return dict(zip(self.ratios, self._base.tolist()))
+
+    def indice_ratio(self, ratio):
+        if ratio not in self.ratios:
+            raise ValueError(f"Ratio '{ratio}' desconocido (opciones: {', '.join(self.ratios)})")
+        return self.ratios.index(ratio)
+
+    def indice_campo(self, campo):
+        if campo not in CAMPOS:
+            raise ValueError(f"Cuenta '{campo}' desconocida")
+        return CAMPOS.index(campo)
+
+    def perturbar(self, variaciones):
+        """
+        Aplica cada variación a cada cuenta por separado.
+
+        Args:
+            variaciones: Variaciones relativas, p.ej. [-0.10, 0.10]
+
+        Returns:
+            ndarray: (variaciones, CAMPOS, ratios); [i, j, k] es el ratio k
+            cuando solo la cuenta j cambia en variaciones[i]
+        """
+        variaciones = np.asarray(variaciones, dtype=np.float64)
+        # (variaciones, CAMPOS perturbado, CAMPOS): la diagonal lleva el cambio
+        factores = 1.0 + variaciones[:, None, None] * np.eye(len(CAMPOS))
+        return self.evaluar(self.cuentas * factores)
+
+    def elasticidades(self, delta=0.10):
+        """
+        Elasticidad de cada ratio respecto de cada cuenta (diferencia
+        centrada): % de cambio del ratio por 1% de cambio de la cuenta.
+
+        Returns:
+            ndarray: (CAMPOS, ratios); NaN si el ratio base es 0 o infinito
+        """
+        bajo, alto = self.perturbar([-delta, delta])
+        base = self.evaluar(self.cuentas)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            elasticidad = (alto - bajo) / (2 * delta * np.abs(base))
+        return np.where(np.isfinite(elasticidad), elasticidad, np.nan)
+
+    # ============================================================
+    # RESULTADOS
+    # ============================================================
+
+    @perfilar('analisis')
+    def tornado(self, ratio, delta=0.10, maximo=None):
+        """
+        Cuentas ordenadas por el impacto de ±delta sobre un ratio.
+
+        Args:
+            ratio: Nombre del ratio (ver RATIOS)
+            delta: Variación relativa aplicada a cada cuenta
+            maximo: Cantidad máxima de cuentas (None = todas con efecto)
+
+        Returns:
+            list[dict]: {'campo', 'etiqueta', 'valor_cuenta', 'bajo', 'alto',
+            'amplitud', 'elasticidad'} de mayor a menor amplitud
+        """
+        k = self.indice_ratio(ratio)
+        bajo, alto = self.perturbar([-delta, delta])[..., k]
+        valor_base = self.evaluar(self.cuentas)[k]
+
+        amplitud = np.abs(alto - bajo)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            elasticidad = (alto - bajo) / (2 * delta * abs(valor_base))
+
+        con_efecto = np.isfinite(amplitud) & (amplitud > 0)
+        orden = [j for j in np.argsort(-amplitud, kind='stable') if con_efecto[j]]
+        if maximo is not None:
+            orden = orden[:maximo]
+
+        return [
+            {
+                'campo': CAMPOS[j],
+                'etiqueta': ETIQUETAS_CAMPOS.get(CAMPOS[j], CAMPOS[j]),
+                'valor_cuenta': float(self.cuentas[j]),
+                'bajo': float(bajo[j]),
+                'alto': float(alto[j]),
+                'amplitud': float(amplitud[j]),
+                'elasticidad': float(elasticidad[j]) if np.isfinite(elasticidad[j]) else None,
+            }
+            for j in orden
+        ]
+
+    @perfilar('analisis')
+    def grilla(self, campo_x, campo_y, variaciones_x, variaciones_y, ratio=None):
+        """
+        Evalúa los ratios sobre todas las combinaciones de variación de
+        dos cuentas (p.ej. ingresos vs. gastos de administración).
+
+        Args:
+            campo_x, campo_y: Cuentas a variar
+            variaciones_x, variaciones_y: Variaciones relativas de cada eje
+            ratio: Ratio a retornar (None = todos)
+
+        Returns:
+            dict: {'x', 'y' (variaciones), 'campo_x', 'campo_y', 'ratio',
+            'valores': ndarray (len(y), len(x)) o (len(y), len(x), ratios)}
+        """
+        jx = self.indice_campo(campo_x)
+        jy = self.indice_campo(campo_y)
+        vx = np.asarray(variaciones_x, dtype=np.float64)
+        vy = np.asarray(variaciones_y, dtype=np.float64)
+
+        cuentas = np.broadcast_to(self.cuentas, (len(vy), len(vx), len(CAMPOS))).copy()
+        cuentas[..., jx] *= 1.0 + vx[None, :]
+        cuentas[..., jy] *= 1.0 + vy[:, None]
+
+        valores = self.evaluar(cuentas)
+        if ratio is not None:
+            valores = valores[..., self.indice_ratio(ratio)]
+
+        return {
+            'campo_x': campo_x,
+            'campo_y': campo_y,
+            'ratio': ratio,
+            'x': vx,
+            'y': vy,
+            'valores': valores,
+        }
@@ -3,6 +3,13 @@ Archivo: core/calculators/ratio_calculator.py
 Calculadora de ratios financieros a partir de Balance y Estado de Resultados
 """
 
+from core.calculators.registro_ratios import REGISTRO
+from utils.perfilado import perfilar
+
+
+# Ratios de calcular_todos_ratios, en orden (declarados en registro_ratios)
+RATIOS_CALCULADORA = REGISTRO.ratios[:REGISTRO.indice['margen_operativo'] + 1]
+
 class RatioCalculator:
     """
     Calcula todos los ratios financieros a partir de los modelos
@@ -18,6 +25,16 @@ class RatioCalculator:
         self.balance = balance_model
         self.estado = estado_resultado_model
     
+    def resultado(self):
+        """
+        Subtotales y ratios de ambos años evaluados por el registro de
+        ratios (compartido con otros análisis de los mismos datos).
+        
+        Returns:
+            ResultadoRatios
+        """
+        return REGISTRO.evaluar_modelos(self.balance, self.estado)
+    
     # ============================================================
     # RATIOS PATRIMONIALES
     # ============================================================
@@ -30,14 +47,7 @@ class RatioCalculator:
         IMPORTANTE: Este ratio decimal (0.10 - 0.30) se usa para comparar 
         con los rangos del FinancialInterpreter.
         """
-        activo_corriente = self.balance.get_total_corriente(year)
-        pasivo_corriente = self.balance.get_total_pasivo_corriente(year)
-        activo_total = self.balance.get_total_activos(year)
-        
-        if activo_total == 0:
-            return 0
-        
-        return (activo_corriente - pasivo_corriente) / activo_total
+        return self.resultado().valor('fondo_maniobra', year)
     
     def calcular_fondo_maniobra_absoluto(self, year):
         """
@@ -46,10 +56,7 @@ class RatioCalculator:
         
         Este valor se usa para análisis de equilibrio patrimonial.
         """
-        activo_corriente = self.balance.get_total_corriente(year)
-        pasivo_corriente = self.balance.get_total_pasivo_corriente(year)
-        
-        return activo_corriente - pasivo_corriente
+        return self.resultado().subtotal('fondo_maniobra_absoluto', year)
     
     # ============================================================
     # RATIOS DE LIQUIDEZ
@@ -59,38 +66,19 @@ class RatioCalculator:
         """
         Razón de Liquidez = Activo Corriente / Pasivo Corriente
         """
-        activo_corriente = self.balance.get_total_corriente(year)
-        pasivo_corriente = self.balance.get_total_pasivo_corriente(year)
-        
-        if pasivo_corriente == 0:
-            return float('inf')
-        
-        return activo_corriente / pasivo_corriente
+        return self.resultado().valor('razon_liquidez', year)
     
     def calcular_razon_tesoreria(self, year):
         """
         Razón de Tesorería = (Activo Corriente - Existencias) / Pasivo Corriente
         """
-        efectivo = self.balance.caja_bancos_y1 if year == 1 else self.balance.caja_bancos_y2
-        cuentas_cobrar = self.balance.clientes_cobrar_y1 if year == 1 else self.balance.clientes_cobrar_y2
-        pasivo_corriente = self.balance.get_total_pasivo_corriente(year)
-        
-        if pasivo_corriente == 0:
-            return float('inf')
-        
-        return (efectivo + cuentas_cobrar) / pasivo_corriente
+        return self.resultado().valor('razon_tesoreria', year)
     
     def calcular_razon_disponibilidad(self, year):
         """
         Razón de Disponibilidad = Caja y Bancos / Pasivo Corriente
         """
-        caja_bancos = self.balance.caja_bancos_y1 if year == 1 else self.balance.caja_bancos_y2
-        pasivo_corriente = self.balance.get_total_pasivo_corriente(year)
-        
-        if pasivo_corriente == 0:
-            return float('inf')
-        
-        return caja_bancos / pasivo_corriente
+        return self.resultado().valor('razon_disponibilidad', year)
     
     # ============================================================
     # RATIOS DE SOLVENCIA
@@ -100,40 +88,19 @@ class RatioCalculator:
         """
         Ratio de Garantía = Activo Total / Pasivo Total
         """
-        activo_total = self.balance.get_total_activos(year)
-        pasivo_total = (self.balance.get_total_pasivo_corriente(year) + 
-                       self.balance.get_total_pasivo_no_corriente(year))
-        
-        if pasivo_total == 0:
-            return float('inf')
-        
-        return activo_total / pasivo_total
+        return self.resultado().valor('ratio_garantia', year)
     
     def calcular_ratio_autonomia(self, year):
         """
         Ratio de Autonomía = Patrimonio / Pasivo Total
         """
-        patrimonio = self.balance.get_total_patrimonio(year)
-        pasivo_total = (self.balance.get_total_pasivo_corriente(year) + 
-                       self.balance.get_total_pasivo_no_corriente(year))
-        
-        if pasivo_total == 0:
-            return float('inf')
-        
-        return patrimonio / pasivo_total
+        return self.resultado().valor('ratio_autonomia', year)
     
     def calcular_ratio_calidad_deuda(self, year):
         """
         Ratio de Calidad de Deuda = Pasivo Corriente / Pasivo Total
         """
-        pasivo_corriente = self.balance.get_total_pasivo_corriente(year)
-        pasivo_total = (self.balance.get_total_pasivo_corriente(year) + 
-                       self.balance.get_total_pasivo_no_corriente(year))
-        
-        if pasivo_total == 0:
-            return 0
-        
-        return pasivo_corriente / pasivo_total
+        return self.resultado().valor('ratio_calidad_deuda', year)
     
     # ============================================================
     # RATIOS DE RENTABILIDAD
@@ -143,86 +110,44 @@ class RatioCalculator:
         """
         RAT (Rentabilidad sobre Activos Totales) = Utilidad Neta / Activo Total
         """
-        utilidad_neta = self.estado.get_utilidad_neta(year)
-        activo_total = self.balance.get_total_activos(year)
-        
-        if activo_total == 0:
-            return 0
-        
-        return utilidad_neta / activo_total
+        return self.resultado().valor('rat', year)
     
     def calcular_rpp(self, year):
         """
         RPP (Rentabilidad sobre Patrimonio) = Utilidad Neta / Patrimonio
         También conocido como ROE
         """
-        utilidad_neta = self.estado.get_utilidad_neta(year)
-        patrimonio = self.balance.get_total_patrimonio(year)
-        
-        if patrimonio == 0:
-            return 0
-        
-        return utilidad_neta / patrimonio
+        return self.resultado().valor('rpp', year)
     
     def calcular_margen_neto(self, year):
         """
         Margen Neto = Utilidad Neta / Ingresos
         """
-        utilidad_neta = self.estado.get_utilidad_neta(year)
-        ingresos = self.estado.ingresos_servicios_y1 if year == 1 else self.estado.ingresos_servicios_y2
-        
-        if ingresos == 0:
-            return 0
-        
-        return utilidad_neta / ingresos
+        return self.resultado().valor('margen_neto', year)
     
     def calcular_rotacion_activos(self, year):
         """
         Rotación de Activos = Ingresos / Activo Total
         """
-        ingresos = self.estado.ingresos_servicios_y1 if year == 1 else self.estado.ingresos_servicios_y2
-        activo_total = self.balance.get_total_activos(year)
-        
-        if activo_total == 0:
-            return 0
-        
-        return ingresos / activo_total
+        return self.resultado().valor('rotacion_activos', year)
     
     def calcular_apalancamiento(self, year):
         """
         Apalancamiento Financiero = Activo Total / Patrimonio
         """
-        activo_total = self.balance.get_total_activos(year)
-        patrimonio = self.balance.get_total_patrimonio(year)
-        
-        if patrimonio == 0:
-            return float('inf')
-        
-        return activo_total / patrimonio
+        return self.resultado().valor('apalancamiento', year)
     
     def calcular_margen_bruto(self, year):
         """
         Margen Bruto = Ganancia Bruta / Ingresos
         """
-        ganancia_bruta = self.estado.get_ganancia_bruta(year)
-        ingresos = self.estado.ingresos_servicios_y1 if year == 1 else self.estado.ingresos_servicios_y2
-        
-        if ingresos == 0:
-            return 0
-        
-        return ganancia_bruta / ingresos
+        return self.resultado().valor('margen_bruto', year)
     
     def calcular_margen_operativo(self, year):
         """
         Margen Operativo = Utilidad Operativa / Ingresos
         """
-        utilidad_operativa = self.estado.get_utilidad_operativa(year)
-        ingresos = self.estado.ingresos_servicios_y1 if year == 1 else self.estado.ingresos_servicios_y2
-        
-        if ingresos == 0:
-            return 0
-        
-        return utilidad_operativa / ingresos
+        return self.resultado().valor('margen_operativo', year)
     
     # ============================================================
     # MÉTODO PARA CALCULAR TODOS LOS RATIOS
@@ -238,30 +163,9 @@ class RatioCalculator:
         Returns:
             dict: Diccionario con todos los ratios calculados
         """
-        return {
-            # Patrimoniales
-            "fondo_maniobra": self.calcular_fondo_maniobra(year),
-            
-            # Liquidez
-            "razon_liquidez": self.calcular_razon_liquidez(year),
-            "razon_tesoreria": self.calcular_razon_tesoreria(year),
-            "razon_disponibilidad": self.calcular_razon_disponibilidad(year),
-            
-            # Solvencia
-            "ratio_garantia": self.calcular_ratio_garantia(year),
-            "ratio_autonomia": self.calcular_ratio_autonomia(year),
-            "ratio_calidad_deuda": self.calcular_ratio_calidad_deuda(year),
-            
-            # Rentabilidad
-            "rat": self.calcular_rat(year),
-            "rpp": self.calcular_rpp(year),
-            "margen_neto": self.calcular_margen_neto(year),
-            "rotacion_activos": self.calcular_rotacion_activos(year),
-            "apalancamiento": self.calcular_apalancamiento(year),
-            "margen_bruto": self.calcular_margen_bruto(year),
-            "margen_operativo": self.calcular_margen_operativo(year)
-        }
+        return self.resultado().como_dict(year, RATIOS_CALCULADORA)
     
+    @perfilar('analisis')
     def calcular_ambos_años(self):
         """
         Calcula todos los ratios para ambos años.
@@ -269,7 +173,28 @@ class RatioCalculator:
         Returns:
             dict: Diccionario con ratios de año 1 y año 2
         """
+        resultado = self.resultado()
         return {
-            "year_1": self.calcular_todos_ratios(1),
-            "year_2": self.calcular_todos_ratios(2)
-        }
\ No newline at end of file
+            "year_1": resultado.como_dict(1, RATIOS_CALCULADORA),
+            "year_2": resultado.como_dict(2, RATIOS_CALCULADORA)
+        }
+    
+    # ============================================================
+    # MODO LOTE (VECTORIZADO)
+    # ============================================================
+    
+    @staticmethod
+    def calcular_lote(pares, n_periodos=2):
+        """
+        Calcula todos los ratios para muchas empresas y periodos de una vez.
+        
+        Args:
+            pares: Iterable de (balance_model, estado_resultado_model)
+            n_periodos: Periodos a evaluar por empresa
+            
+        Returns:
+            RatioCalculatorLote: Usar .calcular() para obtener el arreglo
+            (empresas x periodos x ratios)
+        """
+        from core.calculators.ratio_calculator_lote import RatioCalculatorLote
+        return RatioCalculatorLote.desde_modelos(pares, n_periodos)
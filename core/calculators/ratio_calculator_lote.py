@@ -0,0 +1,130 @@
+"""
+Archivo: core/calculators/ratio_calculator_lote.py
+Cálculo vectorizado de todos los ratios para muchas empresas y periodos
+"""
+
+import numpy as np
+
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+from core.calculators.registro_ratios import REGISTRO, evaluar_definiciones
+
+
+# Ratios de RatioCalculator.calcular_todos_ratios, en su orden, tomados del
+# registro: (nombre, numerador, denominador, valor si el denominador es 0)
+DEFINICION_RATIOS = REGISTRO.definiciones[:REGISTRO.indice["margen_operativo"] + 1]
+
+RATIOS = tuple(definicion[0] for definicion in DEFINICION_RATIOS)
+
+
+def calcular_subtotales(balance, estado):
+    """
+    Calcula una sola vez todos los subtotales compartidos por los ratios.
+
+    Args:
+        balance: Arreglo (..., cuentas_balance) en el orden de BalanceMultiperiodo.CUENTAS
+        estado: Arreglo (..., cuentas_estado) en el orden de EstadoResultadoMultiperiodo.CUENTAS
+
+    Returns:
+        dict: {nombre_subtotal: arreglo (...)}; incluye también las cuentas
+        individuales para poder referirlas por nombre
+    """
+    return REGISTRO.subtotales(balance, estado)
+
+
+def calcular_ratios_vectorizado(balance, estado, definiciones=DEFINICION_RATIOS):
+    """
+    Evalúa todos los ratios sobre arreglos de cuentas en una sola pasada.
+
+    Los ejes iniciales son libres (empresas, periodos, escenarios, ...);
+    el último eje de cada arreglo son las cuentas.
+
+    Args:
+        balance: Arreglo (..., cuentas_balance)
+        estado: Arreglo (..., cuentas_estado)
+        definiciones: Tupla (nombre, numerador, denominador, valor_cero)
+
+    Returns:
+        ndarray: (..., ratios) en el orden de `definiciones`
+    """
+    return evaluar_definiciones(calcular_subtotales(balance, estado), definiciones)
+
+
+class RatioCalculatorLote:
+    """
+    Calcula todos los ratios de RatioCalculator para muchas empresas y
+    periodos a la vez, con operaciones de arreglos NumPy.
+
+    El resultado tiene forma (empresas x periodos x ratios), con el
+    mismo tratamiento de división por cero que RatioCalculator
+    (`inf` o `0` según el ratio).
+    """
+
+    RATIOS = RATIOS
+
+    def __init__(self, balances, estados):
+        """
+        Args:
+            balances: Arreglo (empresas x periodos x cuentas_balance)
+            estados: Arreglo (empresas x periodos x cuentas_estado)
+        """
+        self.balances = np.asarray(balances, dtype=np.float64)
+        self.estados = np.asarray(estados, dtype=np.float64)
+
+        if self.balances.shape[:2] != self.estados.shape[:2]:
+            raise ValueError("Balances y estados deben tener las mismas empresas y periodos")
+
+        self._resultado = None
+
+    @classmethod
+    def desde_modelos(cls, pares, n_periodos=2):
+        """
+        Construye el lote a partir de pares (balance, estado).
+
+        Args:
+            pares: Iterable de (BalanceGeneral|BalanceMultiperiodo,
+                   EstadoResultado|EstadoResultadoMultiperiodo)
+            n_periodos: Periodos a tomar de los modelos de 2 años
+
+        Returns:
+            RatioCalculatorLote
+        """
+        balances = []
+        estados = []
+        for balance, estado in pares:
+            if not isinstance(balance, BalanceMultiperiodo):
+                balance = BalanceMultiperiodo.desde_modelo(
+                    balance, [f"Periodo {p}" for p in range(1, n_periodos + 1)])
+            if not isinstance(estado, EstadoResultadoMultiperiodo):
+                estado = EstadoResultadoMultiperiodo.desde_modelo(
+                    estado, [f"Periodo {p}" for p in range(1, n_periodos + 1)])
+            balances.append(balance.valores.T)
+            estados.append(estado.valores.T)
+        return cls(np.stack(balances), np.stack(estados))
+
+    def calcular(self):
+        """
+        Calcula (una sola vez) todos los ratios de todas las empresas y periodos.
+
+        Returns:
+            ndarray: (empresas x periodos x ratios), columnas en el orden de RATIOS
+        """
+        if self._resultado is None:
+            self._resultado = calcular_ratios_vectorizado(self.balances, self.estados)
+        return self._resultado
+
+    def ratio(self, nombre):
+        """Retorna la matriz (empresas x periodos) de un ratio"""
+        return self.calcular()[..., self.RATIOS.index(nombre)]
+
+    def como_dict(self, empresa=0, year=1):
+        """
+        Retorna los ratios de una empresa y periodo con el mismo formato
+        que RatioCalculator.calcular_todos_ratios(year).
+
+        Args:
+            empresa: Índice de la empresa en el lote
+            year: Periodo, empezando en 1
+        """
+        fila = self.calcular()[empresa, year - 1]
+        return {nombre: float(valor) for nombre, valor in zip(self.RATIOS, fila)}
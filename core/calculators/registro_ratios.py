@@ -0,0 +1,447 @@
+"""
+Archivo: core/calculators/registro_ratios.py
+Registro único de subtotales derivados y ratios, compilado al importar en
+evaluadores para modelos de 2 años (escalares) y para arreglos de NumPy
+"""
+
+import ast
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.cache_subtotales import TODOS_LOS_CAMPOS
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+
+
+# ============================================================
+# DECLARACIONES
+# ============================================================
+
+# Subtotales que no son totales de los modelos, como expresiones sobre
+# cuentas, totales de BalanceMultiperiodo/EstadoResultadoMultiperiodo y
+# subtotales anteriores. Operadores: + - * y maximo(a, b)
+SUBTOTALES_DERIVADOS = (
+    ("total_pasivo", "total_pasivo_corriente + total_pasivo_no_corriente"),
+    ("impuestos_renta",
+     f"maximo(0, utilidad_antes_impuestos * {EstadoResultadoMultiperiodo.TASA_IMPUESTO!r})"),
+    ("utilidad_neta", "utilidad_antes_impuestos - impuestos_renta"),
+    ("fondo_maniobra_absoluto", "total_corriente - total_pasivo_corriente"),
+    ("tesoreria", "caja_bancos + clientes_cobrar"),
+    # Deuda de C5: la del costo de la deuda (i) y la del efecto apalancamiento (D/PN)
+    ("deuda_con_costo", "prestamos_lp + proveedores"),
+    ("deuda_financiera", "prestamos_lp + deuda_cp"),
+)
+
+# (nombre, numerador, denominador, valor si el denominador es 0)
+# Los primeros, en el orden de RatioCalculator.calcular_todos_ratios.
+# Todos son fracciones: quien los muestra en % multiplica por 100
+DECLARACION_RATIOS = (
+    # Patrimoniales
+    ("fondo_maniobra", "fondo_maniobra_absoluto", "total_activos", 0),
+
+    # Liquidez
+    ("razon_liquidez", "total_corriente", "total_pasivo_corriente", np.inf),
+    ("razon_tesoreria", "tesoreria", "total_pasivo_corriente", np.inf),
+    ("razon_disponibilidad", "caja_bancos", "total_pasivo_corriente", np.inf),
+
+    # Solvencia
+    ("ratio_garantia", "total_activos", "total_pasivo", np.inf),
+    ("ratio_autonomia", "total_patrimonio", "total_pasivo", np.inf),
+    ("ratio_calidad_deuda", "total_pasivo_corriente", "total_pasivo", 0),
+
+    # Rentabilidad
+    ("rat", "utilidad_neta", "total_activos", 0),
+    ("rpp", "utilidad_neta", "total_patrimonio", 0),
+    ("margen_neto", "utilidad_neta", "ingresos_servicios", 0),
+    ("rotacion_activos", "ingresos_servicios", "total_activos", 0),
+    ("apalancamiento", "total_activos", "total_patrimonio", np.inf),
+    ("margen_bruto", "ganancia_bruta", "ingresos_servicios", 0),
+    ("margen_operativo", "utilidad_operativa", "ingresos_servicios", 0),
+
+    # Usados por los análisis (C1, C2, C5, D1, D3)
+    ("rat_operativa", "utilidad_operativa", "total_activos", 0),
+    ("ratio_endeudamiento", "total_pasivo", "total_activos", 0),
+    ("costo_deuda", "gastos_financieros", "deuda_con_costo", 0),
+    ("deuda_patrimonio", "deuda_financiera", "total_patrimonio", 0),
+)
+
+# Resultados de modelos de 2 años que se recuerdan por contenido (además
+# del cache de subtotales de cada modelo)
+MAX_RESULTADOS = 128
+
+
+# ============================================================
+# COMPILACIÓN
+# ============================================================
+
+def _nombres_base():
+    """{nombre: (modelo, es_cuenta)} de cuentas y totales de los modelos"""
+    nombres = {}
+    for modelo, clase in (('balance', BalanceMultiperiodo), ('estado', EstadoResultadoMultiperiodo)):
+        for cuenta in clase.CUENTAS:
+            nombres[cuenta] = (modelo, True)
+        for total in clase.TOTALES:
+            nombres[total] = (modelo, False)
+    return nombres
+
+
+def _validar_expresion(texto, conocidos):
+    """
+    Revisa que la expresión use solo + - *, maximo(a, b), números y
+    nombres conocidos.
+
+    Returns:
+        tuple: (código Python equivalente, set de nombres usados)
+
+    Raises:
+        ValueError: Con la parte no soportada
+    """
+    arbol = ast.parse(texto, mode='eval')
+    usados = set()
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Name):
+            if nodo.id != 'maximo' and nodo.id not in conocidos:
+                raise ValueError(f"'{texto}': nombre desconocido '{nodo.id}'")
+            if nodo.id != 'maximo':
+                usados.add(nodo.id)
+        elif isinstance(nodo, ast.Call):
+            if not (isinstance(nodo.func, ast.Name) and nodo.func.id == 'maximo'
+                    and len(nodo.args) == 2 and not nodo.keywords):
+                raise ValueError(f"'{texto}': solo se admite la función maximo(a, b)")
+        elif isinstance(nodo, ast.BinOp):
+            if not isinstance(nodo.op, (ast.Add, ast.Sub, ast.Mult)):
+                raise ValueError(f"'{texto}': operador no soportado (las divisiones van en los ratios)")
+        elif isinstance(nodo, ast.UnaryOp):
+            if not isinstance(nodo.op, ast.USub):
+                raise ValueError(f"'{texto}': operador no soportado")
+        elif isinstance(nodo, ast.Constant):
+            if not isinstance(nodo.value, (int, float)):
+                raise ValueError(f"'{texto}': constante no numérica")
+        elif not isinstance(nodo, (ast.Expression, ast.Load, ast.operator, ast.unaryop)):
+            raise ValueError(f"'{texto}': {type(nodo).__name__} no soportado")
+    return ast.unparse(arbol), usados
+
+
+class RegistroRatios:
+    """
+    Compila las declaraciones una sola vez:
+
+    - evaluar_modelos(balance, estado): todos los subtotales y ratios de
+      los modelos de 2 años en una pasada, con los mismos valores (bit a
+      bit) que las fórmulas escritas a mano con los getters del modelo.
+      El resultado se guarda en el cache de subtotales de los modelos:
+      todos los análisis que consultan los mismos datos comparten una
+      sola evaluación.
+    - subtotales(balance, estado) / evaluar(...): lo mismo sobre arreglos
+      (..., cuentas) con ejes libres (empresas, periodos, escenarios).
+    """
+
+    def __init__(self, subtotales=SUBTOTALES_DERIVADOS, ratios=DECLARACION_RATIOS):
+        # Un subtotal derivado reemplaza al total del modelo con el mismo
+        # nombre (total_pasivo: los modelos de 2 años no tienen getter)
+        base = _nombres_base()
+        for nombre, _ in subtotales:
+            base.pop(nombre, None)
+        conocidos = set(base)
+
+        lineas = []
+        usados = set()
+        # {subtotal derivado: nombres que usa su expresión}
+        self.dependencias = {}
+        for nombre, expresion in subtotales:
+            codigo, nombres = _validar_expresion(expresion, conocidos)
+            lineas.append(f"    {nombre} = {codigo}")
+            usados |= nombres
+            conocidos.add(nombre)
+            self.dependencias[nombre] = frozenset(nombres)
+
+        for nombre, numerador, denominador, _ in ratios:
+            for termino in (numerador, denominador):
+                if termino not in conocidos:
+                    raise ValueError(f"Ratio '{nombre}': subtotal desconocido '{termino}'")
+                usados.add(termino)
+
+        self.definiciones = tuple(ratios)
+        self.ratios = tuple(d[0] for d in ratios)
+        self.indice = {nombre: i for i, nombre in enumerate(self.ratios)}
+        self.valores_cero = {d[0]: d[3] for d in ratios}
+        self.derivados = tuple(nombre for nombre, _ in subtotales)
+
+        # Cuentas y totales de los modelos que hay que leer
+        self.entradas = tuple(sorted(n for n in usados if n in base))
+        self._lectura = tuple(
+            (n, base[n][0] == 'balance', base[n][1]) for n in self.entradas
+        )
+
+        self._derivar_escalar = self._compilar_derivados(lineas, max)
+        self._derivar_vector = self._compilar_derivados(lineas, np.maximum)
+        self._ratios_escalar = self._compilar_ratios_escalar()
+        # Funciones de lectura compiladas por cantidad de periodos
+        self._lecturas = {2: self._compilar_lectura(2)}
+
+        self._resultados = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _compilar_derivados(self, lineas, maximo):
+        """Función s -> s con los subtotales derivados agregados"""
+        fuente = "\n".join(
+            ["def derivar(s):"]
+            + [f"    {n} = s['{n}']" for n in self.entradas]
+            + lineas
+            + [f"    s['{n}'] = {n}" for n in self.derivados]
+            + ["    return s"]
+        )
+        espacio = {'maximo': maximo}
+        exec(compile(fuente, "<registro_ratios: derivados>", 'exec'), espacio)
+        return espacio['derivar']
+
+    def _compilar_ratios_escalar(self):
+        """Función s -> tupla de ratios (None donde el denominador es 0)"""
+        nombres = sorted({d[1] for d in self.definiciones} | {d[2] for d in self.definiciones})
+        fuente = "\n".join(
+            ["def ratios(s):"]
+            + [f"    {n} = s['{n}']" for n in nombres]
+            + ["    return ("]
+            + [f"        None if {den} == 0 else {num} / {den},"
+               for _, num, den, _ in self.definiciones]
+            + ["    )"]
+        )
+        espacio = {}
+        exec(compile(fuente, "<registro_ratios: ratios>", 'exec'), espacio)
+        return espacio['ratios']
+
+    # ============================================================
+    # MODELOS DE 2 AÑOS Y MATRICES DE N PERIODOS
+    # ============================================================
+
+    def _compilar_lectura(self, n_periodos):
+        """
+        Función (balance, estado) -> ((entradas año 1), ..., (entradas año N)):
+        cuentas como atributos <cuenta>_yN y totales con get_<total>(N)
+        """
+        def lectura(nombre, es_balance, es_cuenta, year):
+            modelo = 'b' if es_balance else 'e'
+            return f"{modelo}.{nombre}_y{year}" if es_cuenta else f"{modelo}.get_{nombre}({year})"
+
+        fuente = "\n".join(
+            ["def leer(b, e):", "    return ("]
+            + ["        (" + ", ".join(lectura(*entrada, year) for entrada in self._lectura) + ",),"
+               for year in range(1, n_periodos + 1)]
+            + ["    )"]
+        )
+        espacio = {}
+        exec(compile(fuente, "<registro_ratios: lectura>", 'exec'), espacio)
+        return espacio['leer']
+
+    def _lector(self, balance, estado):
+        """
+        Función de lectura para los periodos del par de modelos: 2 en los
+        modelos clásicos, n_periodos en los de MatrizCuentas
+        """
+        n_balance = getattr(balance, 'n_periodos', 2)
+        n_estado = getattr(estado, 'n_periodos', 2)
+        if n_balance != n_estado:
+            raise ValueError(
+                f"El balance tiene {n_balance} periodos y el estado de resultados {n_estado}"
+            )
+        leer = self._lecturas.get(n_balance)
+        if leer is None:
+            leer = self._lecturas[n_balance] = self._compilar_lectura(n_balance)
+        return leer
+
+    def evaluar_modelos(self, balance, estado):
+        """
+        Subtotales y ratios de todos los periodos de un par de modelos
+        (2 en BalanceGeneral/EstadoResultado, n_periodos en las matrices).
+
+        El resultado queda en el cache de subtotales de los dos modelos
+        (se descarta al asignar cualquier campo, también si la asignación
+        ocurre durante el cálculo) y, por contenido, en un
+        LRU del registro para modelos sin ese cache o recién creados.
+
+        Args:
+            balance: BalanceGeneral o BalanceMultiperiodo
+            estado: EstadoResultado o EstadoResultadoMultiperiodo
+
+        Returns:
+            ResultadoRatios
+
+        Raises:
+            ValueError: Si los modelos tienen distinta cantidad de periodos
+        """
+        cache_balance = balance.__dict__.get('_cache_subtotales')
+        cache_estado = estado.__dict__.get('_cache_subtotales')
+        if cache_balance is not None and cache_estado is not None:
+            clave_balance = (TODOS_LOS_CAMPOS, id(self), id(estado))
+            clave_estado = (TODOS_LOS_CAMPOS, id(self), id(balance))
+            resultado = cache_balance.get(clave_balance)
+            # Vale solo si ninguno de los dos modelos cambió desde que se guardó
+            if resultado is not None and cache_estado.get(clave_estado) is resultado:
+                return resultado
+            versiones = (balance.version_campos, estado.version_campos)
+            resultado = self._evaluar_contenido(self._lector(balance, estado)(balance, estado))
+            cache_balance[clave_balance] = resultado
+            cache_estado[clave_estado] = resultado
+            # Si un campo cambió mientras se leía (edición desde otro hilo),
+            # el resultado puede ser de datos viejos: no dejarlo en el cache
+            if (balance.version_campos, estado.version_campos) != versiones:
+                for cache, clave in ((cache_balance, clave_balance), (cache_estado, clave_estado)):
+                    if cache.get(clave) is resultado:
+                        cache.pop(clave, None)
+            return resultado
+
+        return self._evaluar_contenido(self._lector(balance, estado)(balance, estado))
+
+    def _evaluar_contenido(self, clave):
+        """ResultadoRatios de las entradas leídas, recordado por contenido"""
+        with self._lock:
+            resultado = self._resultados.get(clave)
+            if resultado is not None:
+                self._resultados.move_to_end(clave)
+                return resultado
+
+        periodos = []
+        for valores in clave:
+            s = self._derivar_escalar(dict(zip(self.entradas, valores)))
+            periodos.append((s, self._ratios_escalar(s)))
+        resultado = ResultadoRatios(self, periodos)
+
+        with self._lock:
+            self._resultados[clave] = resultado
+            while len(self._resultados) > MAX_RESULTADOS:
+                self._resultados.popitem(last=False)
+        return resultado
+
+    def limpiar(self):
+        """Vacía el LRU por contenido (los caches de los modelos no se tocan)"""
+        with self._lock:
+            self._resultados.clear()
+
+    # ============================================================
+    # ARREGLOS
+    # ============================================================
+
+    def subtotales(self, balance, estado):
+        """
+        Todos los subtotales sobre arreglos de cuentas.
+
+        Args:
+            balance: Arreglo (..., cuentas_balance) en el orden de BalanceMultiperiodo.CUENTAS
+            estado: Arreglo (..., cuentas_estado) en el orden de EstadoResultadoMultiperiodo.CUENTAS
+
+        Returns:
+            dict: {nombre: arreglo (...)}, con las cuentas individuales,
+            los totales de los modelos y los subtotales derivados
+        """
+        balance = np.asarray(balance, dtype=np.float64)
+        estado = np.asarray(estado, dtype=np.float64)
+
+        s = {}
+        for arreglo, clase in ((balance, BalanceMultiperiodo), (estado, EstadoResultadoMultiperiodo)):
+            nombres, pesos = clase.matriz_pesos()
+            totales = arreglo @ pesos.T
+            for i, nombre in enumerate(nombres):
+                s[nombre] = totales[..., i]
+            for i, cuenta in enumerate(clase.CUENTAS):
+                s[cuenta] = arreglo[..., i]
+        return self._derivar_vector(s)
+
+    def evaluar(self, balance, estado, nombres=None):
+        """
+        Ratios sobre arreglos de cuentas en una sola pasada.
+
+        Args:
+            balance, estado: Arreglos (..., cuentas) como en subtotales()
+            nombres: Ratios a evaluar (por defecto, todos los declarados)
+
+        Returns:
+            ndarray: (..., ratios) en el orden de `nombres`
+        """
+        definiciones = self.definiciones if nombres is None else \
+            tuple(self.definiciones[self.indice[n]] for n in nombres)
+        return evaluar_definiciones(self.subtotales(balance, estado), definiciones)
+
+
+def evaluar_definiciones(subtotales, definiciones):
+    """
+    Evalúa ratios (nombre, numerador, denominador, valor_cero) sobre
+    subtotales ya calculados, apilando numeradores y denominadores para
+    dividir todos juntos.
+
+    Returns:
+        ndarray: (..., ratios) en el orden de `definiciones`
+    """
+    numeradores = np.stack([subtotales[d[1]] for d in definiciones], axis=-1)
+    denominadores = np.stack([subtotales[d[2]] for d in definiciones], axis=-1)
+    valores_cero = np.array([d[3] for d in definiciones], dtype=np.float64)
+
+    sin_denominador = denominadores == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = numeradores / np.where(sin_denominador, 1.0, denominadores)
+
+    return np.where(sin_denominador, valores_cero, ratios)
+
+
+class ResultadoRatios:
+    """Subtotales y ratios de cada periodo de un par de modelos (solo lectura)"""
+
+    __slots__ = ('_registro', '_periodos')
+
+    def __init__(self, registro, periodos):
+        """
+        Args:
+            registro: RegistroRatios que lo calculó
+            periodos: [(subtotales, ratios)] por periodo
+        """
+        self._registro = registro
+        self._periodos = periodos
+
+    @property
+    def n_periodos(self):
+        """Cantidad de periodos evaluados"""
+        return len(self._periodos)
+
+    def _periodo(self, year):
+        """(subtotales, ratios) del periodo `year`, contando desde 1"""
+        if not 1 <= year <= len(self._periodos):
+            raise ValueError(
+                f"Periodo {year} fuera de rango: los modelos tienen {len(self._periodos)} "
+                f"periodos (1 a {len(self._periodos)})"
+            )
+        return self._periodos[year - 1]
+
+    def valor(self, ratio, year, cero=None):
+        """
+        Args:
+            ratio: Nombre declarado en el registro
+            year: Periodo (1, 2, ...)
+            cero: Valor si el denominador es 0 (por defecto, el declarado)
+
+        Returns:
+            float
+
+        Raises:
+            ValueError: Si `year` no es un periodo de los modelos
+        """
+        valor = self._periodo(year)[1][self._registro.indice[ratio]]
+        if valor is None:
+            return self._registro.valores_cero[ratio] if cero is None else cero
+        return valor
+
+    def porcentaje(self, ratio, year, cero=None):
+        """Como valor(), multiplicado por 100"""
+        return self.valor(ratio, year, cero) * 100
+
+    def subtotal(self, nombre, year):
+        """Cuenta, total o subtotal derivado de un periodo"""
+        return self._periodo(year)[0][nombre]
+
+    def como_dict(self, year, ratios):
+        """{ratio: valor} de un periodo, con los valores declarados para denominador 0"""
+        return {ratio: self.valor(ratio, year) for ratio in ratios}
+
+
+# Registro de la aplicación, compilado al importar el módulo
+REGISTRO = RegistroRatios()
@@ -1,2 +1,4 @@
 from .balance import BalanceGeneral
 from .estado_resultado import EstadoResultado
+from .balance_multiperiodo import BalanceMultiperiodo
+from .estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
@@ -3,10 +3,30 @@ Archivo: core/models/balance.py
 Modelo de datos para el Balance General
 """
 
-class BalanceGeneral:
+from core.models.cache_subtotales import SubtotalesCacheados, subtotal_cacheado
+
+
+class BalanceGeneral(SubtotalesCacheados):
     """Modelo para almacenar datos del Balance General de 2 anos"""
     
+    # Campos (sin sufijo de año) y subtotales de los que depende cada subtotal
+    DEPENDENCIAS = {
+        'get_total_corriente': ('caja_bancos', 'clientes_cobrar',
+                                'inversion_cp', 'existencias'),
+        'get_total_no_corriente': ('inmuebles_planta', 'depreciacion_acum',
+                                   'intangibles', 'depreciacion_intang'),
+        'get_total_activos': ('get_total_corriente', 'get_total_no_corriente'),
+        'get_total_pasivo_corriente': ('proveedores', 'impuestos_pagar', 'deuda_cp'),
+        'get_total_pasivo_no_corriente': ('prestamos_lp', 'provisiones_lp'),
+        'get_total_patrimonio': ('capital_social', 'reservas_legales', 'ganancias_acum'),
+        'get_total_pasivo_patrimonio': ('get_total_pasivo_corriente',
+                                        'get_total_pasivo_no_corriente',
+                                        'get_total_patrimonio'),
+    }
+    
     def __init__(self):
+        self._iniciar_cache()
+        
         # ACTIVO CORRIENTE - Ano 1 (2023)
         self.caja_bancos_y1 = 850.0
         self.clientes_cobrar_y1 = 1200.0
@@ -61,6 +81,7 @@ class BalanceGeneral:
     
     # METODOS DE CALCULO AUTOMATICO
     
+    @subtotal_cacheado
     def get_total_corriente(self, year):
         """Calcula Total Activo Corriente"""
         if year == 1:
@@ -70,6 +91,7 @@ class BalanceGeneral:
             return (self.caja_bancos_y2 + self.clientes_cobrar_y2 + 
                     self.inversion_cp_y2 + self.existencias_y2)
     
+    @subtotal_cacheado
     def get_total_no_corriente(self, year):
         """Calcula Total Activo No Corriente"""
         if year == 1:
@@ -79,10 +101,12 @@ class BalanceGeneral:
             return (self.inmuebles_planta_y2 - self.depreciacion_acum_y2 + 
                     self.intangibles_y2 - self.depreciacion_intang_y2)
     
+    @subtotal_cacheado
     def get_total_activos(self, year):
         """Calcula Total Activos"""
         return self.get_total_corriente(year) + self.get_total_no_corriente(year)
     
+    @subtotal_cacheado
     def get_total_pasivo_corriente(self, year):
         """Calcula Total Pasivo Corriente"""
         if year == 1:
@@ -92,6 +116,7 @@ class BalanceGeneral:
             return (self.proveedores_y2 + self.impuestos_pagar_y2 + 
                     self.deuda_cp_y2)
     
+    @subtotal_cacheado
     def get_total_pasivo_no_corriente(self, year):
         """Calcula Total Pasivo No Corriente"""
         if year == 1:
@@ -99,6 +124,7 @@ class BalanceGeneral:
         else:
             return self.prestamos_lp_y2 + self.provisiones_lp_y2
     
+    @subtotal_cacheado
     def get_total_patrimonio(self, year):
         """Calcula Total Patrimonio"""
         if year == 1:
@@ -108,6 +134,7 @@ class BalanceGeneral:
             return (self.capital_social_y2 + self.reservas_legales_y2 + 
                     self.ganancias_acum_y2)
     
+    @subtotal_cacheado
     def get_total_pasivo_patrimonio(self, year):
         """Calcula Total Pasivo + Patrimonio"""
         return (self.get_total_pasivo_corriente(year) + 
@@ -0,0 +1,111 @@
+"""
+Archivo: core/models/balance_multiperiodo.py
+Balance General columnar para N periodos (cuentas x periodos)
+"""
+
+from core.models.matriz_cuentas import MatrizCuentas
+
+
+class BalanceMultiperiodo(MatrizCuentas):
+    """
+    Balance General de N periodos respaldado por un arreglo NumPy.
+
+    Mantiene la misma API que BalanceGeneral (get_total_corriente(year),
+    validar_balance(year), caja_bancos_y1, ...) y añade versiones
+    vectorizadas que devuelven un arreglo con todos los periodos.
+    """
+
+    CUENTAS = (
+        # ACTIVO CORRIENTE
+        'caja_bancos',
+        'clientes_cobrar',
+        'inversion_cp',
+        'existencias',
+        # ACTIVO NO CORRIENTE
+        'inmuebles_planta',
+        'depreciacion_acum',
+        'intangibles',
+        'depreciacion_intang',
+        # PASIVO CORRIENTE
+        'proveedores',
+        'impuestos_pagar',
+        'deuda_cp',
+        # PASIVO NO CORRIENTE
+        'prestamos_lp',
+        'provisiones_lp',
+        # PATRIMONIO
+        'capital_social',
+        'reservas_legales',
+        'ganancias_acum',
+    )
+
+    TOTALES = {
+        'total_corriente': {
+            'caja_bancos': 1, 'clientes_cobrar': 1,
+            'inversion_cp': 1, 'existencias': 1,
+        },
+        'total_no_corriente': {
+            'inmuebles_planta': 1, 'depreciacion_acum': -1,
+            'intangibles': 1, 'depreciacion_intang': -1,
+        },
+        'total_activos': {'total_corriente': 1, 'total_no_corriente': 1},
+        'total_pasivo_corriente': {
+            'proveedores': 1, 'impuestos_pagar': 1, 'deuda_cp': 1,
+        },
+        'total_pasivo_no_corriente': {'prestamos_lp': 1, 'provisiones_lp': 1},
+        'total_pasivo': {'total_pasivo_corriente': 1, 'total_pasivo_no_corriente': 1},
+        'total_patrimonio': {
+            'capital_social': 1, 'reservas_legales': 1, 'ganancias_acum': 1,
+        },
+        'total_pasivo_patrimonio': {'total_pasivo': 1, 'total_patrimonio': 1},
+    }
+
+    # ============================================================
+    # TOTALES VECTORIZADOS (todos los periodos)
+    # ============================================================
+
+    def validar_todos(self):
+        """
+        Verifica Activos = Pasivos + Patrimonio en todos los periodos.
+
+        Returns:
+            ndarray[bool]: Un valor por periodo
+        """
+        totales = self.totales()
+        return abs(totales['total_activos'] - totales['total_pasivo_patrimonio']) < 0.01
+
+    # ============================================================
+    # ADAPTADOR DE LA API DE BalanceGeneral
+    # ============================================================
+
+    def get_total_corriente(self, year):
+        """Calcula Total Activo Corriente"""
+        return self._total_periodo('total_corriente', year)
+
+    def get_total_no_corriente(self, year):
+        """Calcula Total Activo No Corriente"""
+        return self._total_periodo('total_no_corriente', year)
+
+    def get_total_activos(self, year):
+        """Calcula Total Activos"""
+        return self._total_periodo('total_activos', year)
+
+    def get_total_pasivo_corriente(self, year):
+        """Calcula Total Pasivo Corriente"""
+        return self._total_periodo('total_pasivo_corriente', year)
+
+    def get_total_pasivo_no_corriente(self, year):
+        """Calcula Total Pasivo No Corriente"""
+        return self._total_periodo('total_pasivo_no_corriente', year)
+
+    def get_total_patrimonio(self, year):
+        """Calcula Total Patrimonio"""
+        return self._total_periodo('total_patrimonio', year)
+
+    def get_total_pasivo_patrimonio(self, year):
+        """Calcula Total Pasivo + Patrimonio"""
+        return self._total_periodo('total_pasivo_patrimonio', year)
+
+    def validar_balance(self, year):
+        """Verifica que Activos = Pasivos + Patrimonio"""
+        return bool(self.validar_todos()[year - 1])
@@ -0,0 +1,115 @@
+"""
+Archivo: core/models/cache_subtotales.py
+Memoización de subtotales con invalidación por campo para los modelos de 2 años
+"""
+
+import functools
+
+
+# Primer elemento de las claves del cache que dependen de todos los campos
+# del modelo (p.ej. el resultado de registro_ratios): cualquier asignación
+# de un campo <campo>_yN las descarta
+TODOS_LOS_CAMPOS = '*'
+
+
+def subtotal_cacheado(metodo):
+    """
+    Decorador para los métodos get_*(year) de los modelos.
+    Guarda el resultado por (método, año) hasta que cambie un campo
+    del que depende.
+    """
+    nombre = metodo.__name__
+
+    @functools.wraps(metodo)
+    def envoltura(self, year):
+        cache = self.__dict__['_cache_subtotales']
+        clave = (nombre, year)
+        if clave in cache:
+            return cache[clave]
+        valor = metodo(self, year)
+        cache[clave] = valor
+        return valor
+
+    return envoltura
+
+
+class SubtotalesCacheados:
+    """
+    Mixin que memoiza los subtotales de un modelo con campos <campo>_y1 / _y2.
+
+    Cada subclase declara DEPENDENCIAS: {metodo: (campo_o_metodo, ...)}
+    usando el nombre base de los campos (sin el sufijo de año). Al asignar
+    un campo, por ejemplo `gastos_admin_y2`, solo se invalidan los
+    subtotales del año 2 que dependen (directa o indirectamente) de
+    `gastos_admin`.
+
+    `version_campos` aumenta en cada asignación de un campo: quien calcula
+    algo a partir del modelo puede comprobar después que no cambió.
+    """
+
+    DEPENDENCIAS = {}
+
+    # {clase: {campo_base: frozenset(metodos afectados)}}
+    _afectados_por_clase = {}
+
+    def __setattr__(self, nombre, valor):
+        object.__setattr__(self, nombre, valor)
+
+        base, sep, sufijo = nombre.rpartition('_y')
+        if not sep or not sufijo.isdigit():
+            return
+
+        # Después de asignar y antes de invalidar: un resultado guardado
+        # en el cache con una lectura anterior se descarta aquí abajo o lo
+        # descarta quien lo guardó al ver la versión nueva
+        self.__dict__['version_campos'] = self.__dict__.get('version_campos', 0) + 1
+
+        cache = self.__dict__.get('_cache_subtotales')
+        if not cache:
+            return
+
+        for clave in [c for c in cache if c[0] == TODOS_LOS_CAMPOS]:
+            del cache[clave]
+
+        afectados = self._metodos_afectados().get(base)
+        if not afectados:
+            return
+
+        # Los métodos usan "year == 1" para el año 1 y el resto para el año 2
+        es_year_1 = sufijo == '1'
+        for clave in [c for c in cache if c[0] in afectados and (c[1] == 1) == es_year_1]:
+            del cache[clave]
+
+    def _iniciar_cache(self):
+        """Crea el cache vacío (llamar al inicio de __init__)"""
+        object.__setattr__(self, '_cache_subtotales', {})
+        object.__setattr__(self, 'version_campos', 0)
+
+    def limpiar_cache(self):
+        """Descarta todos los subtotales memoizados"""
+        self.__dict__['_cache_subtotales'].clear()
+
+    @classmethod
+    def _metodos_afectados(cls):
+        """Calcula (una vez por clase) qué métodos dependen de cada campo"""
+        if cls in SubtotalesCacheados._afectados_por_clase:
+            return SubtotalesCacheados._afectados_por_clase[cls]
+
+        def campos_de(metodo, visitados=()):
+            campos = set()
+            for dependencia in cls.DEPENDENCIAS.get(metodo, ()):
+                if dependencia in cls.DEPENDENCIAS:
+                    if dependencia not in visitados:
+                        campos |= campos_de(dependencia, visitados + (metodo,))
+                else:
+                    campos.add(dependencia)
+            return campos
+
+        afectados = {}
+        for metodo in cls.DEPENDENCIAS:
+            for campo in campos_de(metodo):
+                afectados.setdefault(campo, set()).add(metodo)
+
+        resultado = {campo: frozenset(metodos) for campo, metodos in afectados.items()}
+        SubtotalesCacheados._afectados_por_clase[cls] = resultado
+        return resultado
@@ -0,0 +1,39 @@
+"""
+Archivo: core/models/campos.py
+Cuentas de entrada de los modelos (balance y estado de resultados) con
+los textos de los formularios de carga
+"""
+
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+
+
+# Cuentas de entrada: primero las del balance, luego las del estado
+CAMPOS = BalanceMultiperiodo.CUENTAS + EstadoResultadoMultiperiodo.CUENTAS
+
+# Mismos textos que los formularios de carga de datos
+ETIQUETAS_CAMPOS = {
+    'caja_bancos': "Caja y Bancos",
+    'clientes_cobrar': "Clientes por cobrar",
+    'inversion_cp': "Inversión a corto plazo",
+    'existencias': "Existencias y servicios en preparación",
+    'inmuebles_planta': "Inmuebles, planta y equipo",
+    'depreciacion_acum': "Depreciación acumulada",
+    'intangibles': "Intangibles (software desarrollado)",
+    'depreciacion_intang': "Depreciación intangibles",
+    'proveedores': "Proveedores y gastos por pagar",
+    'impuestos_pagar': "Impuestos por pagar",
+    'deuda_cp': "Deuda a corto plazo bancaria",
+    'prestamos_lp': "Préstamos a largo plazo",
+    'provisiones_lp': "Provisiones a largo plazo",
+    'capital_social': "Capital Social",
+    'reservas_legales': "Reservas legales",
+    'ganancias_acum': "Ganancias acumuladas",
+    'ingresos_servicios': "Ingresos por servicios",
+    'costo_servicios': "Costo de servicios",
+    'gastos_admin': "Gastos de administración",
+    'gastos_ventas': "Gastos de ventas",
+    'depreciacion_amort': "Depreciación y amortización",
+    'gastos_financieros': "Gastos financieros",
+    'otros_ingresos': "Otros ingresos",
+}
@@ -0,0 +1,289 @@
+"""
+Archivo: core/models/cartera.py
+Cartera de muchas empresas en arreglos columnares mapeados en memoria (.npy)
+"""
+
+import json
+import os
+
+import numpy as np
+
+from core.models.matriz_cuentas import MatrizCuentas
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+
+
+# Versión del formato en disco (cambia si cambian los archivos o su forma)
+VERSION_CARTERA = 1
+
+# Sector asignado a las empresas que no declaran uno
+SIN_SECTOR = 'Sin sector'
+
+
+class Cartera:
+    """
+    Empresas x cuentas x periodos en dos arreglos float64 contiguos, uno
+    para el balance y otro para el estado de resultados, guardados como
+    .npy en un directorio y abiertos con np.load(mmap_mode=...): abrir una
+    cartera de 50.000 empresas no lee los valores ni crea un objeto por
+    empresa; el sistema operativo trae las páginas a medida que se usan.
+
+    Archivos del directorio:
+        cartera.json    versión, periodos, cuentas y nombres de sectores
+        balances.npy    (empresas x cuentas_balance x periodos)
+        estados.npy     (empresas x cuentas_estado x periodos)
+        ids.npy         identificador de cada empresa (texto)
+        sectores.npy    código de sector de cada empresa (índice en cartera.json)
+
+    Cada empresa ocupa un bloque (cuentas x periodos) contiguo, que es
+    exactamente el arreglo de BalanceMultiperiodo/EstadoResultadoMultiperiodo:
+    balance(id) y estado(id) envuelven ese bloque sin copiarlo, con la API
+    de los modelos de 2 años (get_total_corriente(year), caja_bancos_y2, ...).
+    """
+
+    ARCHIVO_INDICE = 'cartera.json'
+    ARCHIVO_BALANCES = 'balances.npy'
+    ARCHIVO_ESTADOS = 'estados.npy'
+    ARCHIVO_IDS = 'ids.npy'
+    ARCHIVO_SECTORES = 'sectores.npy'
+
+    def __init__(self, balances, estados, ids, sectores, nombres_sectores, periodos, ruta=None):
+        """
+        Args:
+            balances: Arreglo (empresas x cuentas_balance x periodos)
+            estados: Arreglo (empresas x cuentas_estado x periodos)
+            ids: Arreglo de textos, uno por empresa (sin repetidos)
+            sectores: Arreglo de enteros, índice de cada empresa en `nombres_sectores`
+            nombres_sectores: Nombres de los sectores
+            periodos: Etiquetas de los periodos
+            ruta: Directorio de origen (None si vive solo en memoria)
+        """
+        n_periodos = len(periodos)
+        for arreglo, clase in ((balances, BalanceMultiperiodo), (estados, EstadoResultadoMultiperiodo)):
+            if arreglo.dtype != np.float64 or arreglo.shape[1:] != (len(clase.CUENTAS), n_periodos):
+                raise ValueError(
+                    f"Se esperaba un arreglo float64 de forma (empresas, {len(clase.CUENTAS)}, "
+                    f"{n_periodos}) para {clase.__name__}, se recibió {arreglo.dtype} {arreglo.shape}"
+                )
+        if not len(balances) == len(estados) == len(ids) == len(sectores):
+            raise ValueError("Balances, estados, ids y sectores deben tener las mismas empresas")
+
+        self.balances = balances
+        self.estados = estados
+        self.ids = ids
+        self.sectores = sectores
+        self.nombres_sectores = list(nombres_sectores)
+        self.periodos = list(periodos)
+        self.ruta = ruta
+
+        # Índices construidos en la primera consulta
+        self._ids_ordenados = None
+        self._orden_ids = None
+        self._orden_sectores = None
+        self._inicios_sectores = None
+
+    # ============================================================
+    # CREACIÓN Y APERTURA
+    # ============================================================
+
+    @classmethod
+    def crear(cls, ruta, empresas, total, periodos=None):
+        """
+        Escribe una cartera nueva recorriendo las empresas una sola vez
+        (no hace falta tenerlas todas en memoria).
+
+        Args:
+            ruta: Directorio destino (se crea si no existe)
+            empresas: Iterable de (id, sector, balance, estado); los modelos
+                      pueden ser de 2 años o multiperiodo, y sector None
+                      equivale a SIN_SECTOR
+            total: Cantidad de empresas del iterable
+            periodos: Etiquetas de los periodos (por defecto 2)
+
+        Returns:
+            Cartera: La cartera recién escrita, abierta en modo 'r+'
+        """
+        if periodos is None:
+            periodos = [f"Periodo {p}" for p in (1, 2)]
+        n_periodos = len(periodos)
+        os.makedirs(ruta, exist_ok=True)
+
+        balances = np.lib.format.open_memmap(
+            os.path.join(ruta, cls.ARCHIVO_BALANCES), mode='w+', dtype=np.float64,
+            shape=(total, len(BalanceMultiperiodo.CUENTAS), n_periodos))
+        estados = np.lib.format.open_memmap(
+            os.path.join(ruta, cls.ARCHIVO_ESTADOS), mode='w+', dtype=np.float64,
+            shape=(total, len(EstadoResultadoMultiperiodo.CUENTAS), n_periodos))
+        sectores = np.zeros(total, dtype=np.int32)
+        codigos = {}
+        ids = []
+
+        for fila, (id_empresa, sector, balance, estado) in enumerate(empresas):
+            if fila >= total:
+                raise ValueError(f"Hay más de {total} empresas")
+            balances[fila] = cls._valores(balance, BalanceMultiperiodo, periodos)
+            estados[fila] = cls._valores(estado, EstadoResultadoMultiperiodo, periodos)
+            sectores[fila] = codigos.setdefault(sector or SIN_SECTOR, len(codigos))
+            ids.append(str(id_empresa))
+
+        if len(ids) != total:
+            raise ValueError(f"Se esperaban {total} empresas, se recibieron {len(ids)}")
+        if len(set(ids)) != total:
+            raise ValueError("Hay identificadores de empresa repetidos")
+
+        balances.flush()
+        estados.flush()
+        del balances, estados
+
+        np.save(os.path.join(ruta, cls.ARCHIVO_IDS), np.array(ids, dtype=str))
+        np.save(os.path.join(ruta, cls.ARCHIVO_SECTORES), sectores)
+        with open(os.path.join(ruta, cls.ARCHIVO_INDICE), 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'version': VERSION_CARTERA,
+                'empresas': total,
+                'periodos': list(periodos),
+                'sectores': list(codigos),
+                'cuentas_balance': list(BalanceMultiperiodo.CUENTAS),
+                'cuentas_estado': list(EstadoResultadoMultiperiodo.CUENTAS),
+            }, archivo, ensure_ascii=False, indent=2)
+
+        return cls.abrir(ruta, modo='r+')
+
+    @staticmethod
+    def _valores(modelo, clase, periodos):
+        """Arreglo (cuentas x periodos) de un modelo de 2 años o multiperiodo"""
+        if isinstance(modelo, MatrizCuentas):
+            return modelo.valores
+        return clase.desde_modelo(modelo, periodos).valores
+
+    @classmethod
+    def abrir(cls, ruta, modo='r'):
+        """
+        Abre una cartera sin leer sus valores.
+
+        Args:
+            ruta: Directorio creado con Cartera.crear
+            modo: 'r' (solo lectura) o 'r+' (las asignaciones en las vistas
+                  de los modelos se escriben en el archivo)
+
+        Returns:
+            Cartera
+        """
+        with open(os.path.join(ruta, cls.ARCHIVO_INDICE), encoding='utf-8') as archivo:
+            indice = json.load(archivo)
+
+        if indice.get('version') != VERSION_CARTERA:
+            raise ValueError(f"{ruta}: versión de cartera {indice.get('version')} no soportada")
+        if (indice['cuentas_balance'] != list(BalanceMultiperiodo.CUENTAS) or
+                indice['cuentas_estado'] != list(EstadoResultadoMultiperiodo.CUENTAS)):
+            raise ValueError(f"{ruta}: las cuentas de la cartera no coinciden con los modelos")
+
+        return cls(
+            np.load(os.path.join(ruta, cls.ARCHIVO_BALANCES), mmap_mode=modo),
+            np.load(os.path.join(ruta, cls.ARCHIVO_ESTADOS), mmap_mode=modo),
+            np.load(os.path.join(ruta, cls.ARCHIVO_IDS), mmap_mode='r'),
+            np.load(os.path.join(ruta, cls.ARCHIVO_SECTORES), mmap_mode='r'),
+            indice['sectores'],
+            indice['periodos'],
+            ruta
+        )
+
+    def flush(self):
+        """Escribe en disco los cambios hechos en modo 'r+'"""
+        for arreglo in (self.balances, self.estados):
+            if isinstance(arreglo, np.memmap):
+                arreglo.flush()
+
+    # ============================================================
+    # ÍNDICES POR EMPRESA Y POR SECTOR
+    # ============================================================
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id_empresa):
+        return self._buscar(id_empresa) is not None
+
+    def _buscar(self, id_empresa):
+        """Fila de una empresa (búsqueda binaria sobre los ids ordenados) o None"""
+        if self._ids_ordenados is None:
+            self._orden_ids = np.argsort(self.ids, kind='stable')
+            self._ids_ordenados = self.ids[self._orden_ids]
+        id_empresa = str(id_empresa)
+        posicion = int(np.searchsorted(self._ids_ordenados, id_empresa))
+        if posicion < len(self) and self._ids_ordenados[posicion] == id_empresa:
+            return int(self._orden_ids[posicion])
+        return None
+
+    def fila(self, id_empresa):
+        """
+        Posición de una empresa en los arreglos.
+
+        Raises:
+            KeyError: Si la empresa no está en la cartera
+        """
+        fila = self._buscar(id_empresa)
+        if fila is None:
+            raise KeyError(f"La empresa '{id_empresa}' no está en la cartera")
+        return fila
+
+    def filas_sector(self, sector):
+        """
+        Filas de las empresas de un sector, en orden ascendente.
+
+        Returns:
+            ndarray[int]: Vacío si el sector no existe
+        """
+        if sector not in self.nombres_sectores:
+            return np.empty(0, dtype=np.intp)
+        if self._orden_sectores is None:
+            # Filas agrupadas por sector (orden estable) y dónde empieza cada grupo
+            self._orden_sectores = np.argsort(self.sectores, kind='stable')
+            conteos = np.bincount(self.sectores, minlength=len(self.nombres_sectores))
+            self._inicios_sectores = np.concatenate(([0], np.cumsum(conteos)))
+        codigo = self.nombres_sectores.index(sector)
+        return self._orden_sectores[self._inicios_sectores[codigo]:self._inicios_sectores[codigo + 1]]
+
+    def sector(self, id_empresa):
+        """Nombre del sector de una empresa"""
+        return self.nombres_sectores[self.sectores[self.fila(id_empresa)]]
+
+    # ============================================================
+    # VISTAS POR EMPRESA (sin copia)
+    # ============================================================
+
+    def balance(self, id_empresa):
+        """BalanceMultiperiodo que lee (y escribe, en 'r+') el bloque de la empresa"""
+        return BalanceMultiperiodo(self.balances[self.fila(id_empresa)], self.periodos)
+
+    def estado(self, id_empresa):
+        """EstadoResultadoMultiperiodo sobre el bloque de la empresa"""
+        return EstadoResultadoMultiperiodo(self.estados[self.fila(id_empresa)], self.periodos)
+
+    def modelos(self, id_empresa):
+        """
+        Returns:
+            tuple: (BalanceMultiperiodo, EstadoResultadoMultiperiodo) de la empresa
+        """
+        return self.balance(id_empresa), self.estado(id_empresa)
+
+    # ============================================================
+    # ARREGLOS PARA EL CÁLCULO POR LOTES
+    # ============================================================
+
+    def arreglos_lote(self, filas=None):
+        """
+        Balances y estados con las cuentas en el último eje, como los
+        espera RatioCalculatorLote. Sin `filas` son vistas de los archivos
+        (no se copian); con `filas` se copian solo esas empresas.
+
+        Args:
+            filas: Filas a tomar (p.ej. filas_sector(...)); None = todas
+
+        Returns:
+            tuple: (balances, estados) de forma (empresas x periodos x cuentas)
+        """
+        balances, estados = self.balances, self.estados
+        if filas is not None:
+            balances, estados = balances[filas], estados[filas]
+        return np.moveaxis(balances, 1, 2), np.moveaxis(estados, 1, 2)
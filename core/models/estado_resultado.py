@@ -3,10 +3,29 @@ Archivo: core/models/estado_resultado.py
 Modelo de datos para el Estado de Resultados
 """
 
-class EstadoResultado:
+from core.models.cache_subtotales import SubtotalesCacheados, subtotal_cacheado
+
+
+class EstadoResultado(SubtotalesCacheados):
     """Modelo para almacenar datos del Estado de Resultados de 2 anos"""
     
+    # Campos (sin sufijo de año) y subtotales de los que depende cada subtotal
+    DEPENDENCIAS = {
+        'get_ganancia_bruta': ('ingresos_servicios', 'costo_servicios'),
+        'get_utilidad_operativa': ('get_ganancia_bruta', 'gastos_admin',
+                                   'gastos_ventas', 'depreciacion_amort'),
+        'get_utilidad_antes_impuestos': ('get_utilidad_operativa',
+                                         'gastos_financieros', 'otros_ingresos'),
+        'get_impuestos_renta': ('get_utilidad_antes_impuestos',),
+        'get_utilidad_neta': ('get_utilidad_antes_impuestos', 'get_impuestos_renta'),
+        'get_margen_bruto': ('ingresos_servicios', 'get_ganancia_bruta'),
+        'get_margen_operativo': ('ingresos_servicios', 'get_utilidad_operativa'),
+        'get_margen_neto': ('ingresos_servicios', 'get_utilidad_neta'),
+    }
+    
     def __init__(self):
+        self._iniciar_cache()
+        
         # DATOS ANO 1 (2023)
         self.ingresos_servicios_y1 = 8500.0
         self.costo_servicios_y1 = 3200.0
@@ -27,6 +46,7 @@ class EstadoResultado:
     
     # METODOS DE CALCULO AUTOMATICO
     
+    @subtotal_cacheado
     def get_ganancia_bruta(self, year):
         """Calcula Ganancia Bruta"""
         if year == 1:
@@ -34,6 +54,7 @@ class EstadoResultado:
         else:
             return self.ingresos_servicios_y2 - self.costo_servicios_y2
     
+    @subtotal_cacheado
     def get_utilidad_operativa(self, year):
         """Calcula Utilidad Operativa (BAII)"""
         ganancia_bruta = self.get_ganancia_bruta(year)
@@ -45,6 +66,7 @@ class EstadoResultado:
             return (ganancia_bruta - self.gastos_admin_y2 - 
                     self.gastos_ventas_y2 - self.depreciacion_amort_y2)
     
+    @subtotal_cacheado
     def get_utilidad_antes_impuestos(self, year):
         """Calcula Utilidad Antes de Impuestos"""
         utilidad_operativa = self.get_utilidad_operativa(year)
@@ -56,17 +78,20 @@ class EstadoResultado:
             return (utilidad_operativa - self.gastos_financieros_y2 + 
                     self.otros_ingresos_y2)
     
+    @subtotal_cacheado
     def get_impuestos_renta(self, year):
         """Calcula Impuestos a la Renta (25%)"""
         utilidad_antes_impuestos = self.get_utilidad_antes_impuestos(year)
         return max(0, utilidad_antes_impuestos * 0.25)  # Solo si hay ganancia
     
+    @subtotal_cacheado
     def get_utilidad_neta(self, year):
         """Calcula Utilidad Neta"""
         utilidad_antes_impuestos = self.get_utilidad_antes_impuestos(year)
         impuestos = self.get_impuestos_renta(year)
         return utilidad_antes_impuestos - impuestos
     
+    @subtotal_cacheado
     def get_margen_bruto(self, year):
         """Calcula Margen Bruto %"""
         ingresos = self.ingresos_servicios_y1 if year == 1 else self.ingresos_servicios_y2
@@ -74,6 +99,7 @@ class EstadoResultado:
             return 0
         return (self.get_ganancia_bruta(year) / ingresos) * 100
     
+    @subtotal_cacheado
     def get_margen_operativo(self, year):
         """Calcula Margen Operativo %"""
         ingresos = self.ingresos_servicios_y1 if year == 1 else self.ingresos_servicios_y2
@@ -81,6 +107,7 @@ class EstadoResultado:
             return 0
         return (self.get_utilidad_operativa(year) / ingresos) * 100
     
+    @subtotal_cacheado
     def get_margen_neto(self, year):
         """Calcula Margen Neto %"""
         ingresos = self.ingresos_servicios_y1 if year == 1 else self.ingresos_servicios_y2
@@ -0,0 +1,116 @@
+"""
+Archivo: core/models/estado_resultado_multiperiodo.py
+Estado de Resultados columnar para N periodos (cuentas x periodos)
+"""
+
+import numpy as np
+
+from core.models.matriz_cuentas import MatrizCuentas
+
+
+class EstadoResultadoMultiperiodo(MatrizCuentas):
+    """
+    Estado de Resultados de N periodos respaldado por un arreglo NumPy.
+
+    Las utilidades intermedias son combinaciones lineales de las cuentas;
+    el impuesto (25% solo si hay ganancia) se aplica después de forma
+    vectorizada. Mantiene la API de EstadoResultado por año.
+    """
+
+    TASA_IMPUESTO = 0.25
+
+    CUENTAS = (
+        'ingresos_servicios',
+        'costo_servicios',
+        'gastos_admin',
+        'gastos_ventas',
+        'depreciacion_amort',
+        'gastos_financieros',
+        'otros_ingresos',
+    )
+
+    TOTALES = {
+        'ganancia_bruta': {'ingresos_servicios': 1, 'costo_servicios': -1},
+        'utilidad_operativa': {
+            'ganancia_bruta': 1, 'gastos_admin': -1,
+            'gastos_ventas': -1, 'depreciacion_amort': -1,
+        },
+        'utilidad_antes_impuestos': {
+            'utilidad_operativa': 1, 'gastos_financieros': -1, 'otros_ingresos': 1,
+        },
+    }
+
+    # ============================================================
+    # TOTALES VECTORIZADOS (todos los periodos)
+    # ============================================================
+
+    def totales(self):
+        """
+        Calcula todas las utilidades de todos los periodos, incluyendo
+        impuestos y utilidad neta.
+
+        Returns:
+            dict: {nombre: arreglo de largo n_periodos}
+        """
+        totales = super().totales()
+        uai = totales['utilidad_antes_impuestos']
+        totales['impuestos_renta'] = np.maximum(0, uai * self.TASA_IMPUESTO)
+        totales['utilidad_neta'] = uai - totales['impuestos_renta']
+        return totales
+
+    def margenes(self):
+        """
+        Calcula margen bruto, operativo y neto (%) de todos los periodos.
+        Devuelve 0 en los periodos sin ingresos.
+
+        Returns:
+            dict: {'margen_bruto': ndarray, 'margen_operativo': ..., 'margen_neto': ...}
+        """
+        totales = self.totales()
+        ingresos = self.fila('ingresos_servicios')
+        divisor = np.where(ingresos == 0, 1.0, ingresos)
+
+        resultado = {}
+        for margen, utilidad in (('margen_bruto', 'ganancia_bruta'),
+                                 ('margen_operativo', 'utilidad_operativa'),
+                                 ('margen_neto', 'utilidad_neta')):
+            resultado[margen] = np.where(ingresos == 0, 0.0,
+                                         totales[utilidad] / divisor * 100)
+        return resultado
+
+    # ============================================================
+    # ADAPTADOR DE LA API DE EstadoResultado
+    # ============================================================
+
+    def get_ganancia_bruta(self, year):
+        """Calcula Ganancia Bruta"""
+        return self._total_periodo('ganancia_bruta', year)
+
+    def get_utilidad_operativa(self, year):
+        """Calcula Utilidad Operativa (BAII)"""
+        return self._total_periodo('utilidad_operativa', year)
+
+    def get_utilidad_antes_impuestos(self, year):
+        """Calcula Utilidad Antes de Impuestos"""
+        return self._total_periodo('utilidad_antes_impuestos', year)
+
+    def get_impuestos_renta(self, year):
+        """Calcula Impuestos a la Renta (25%)"""
+        return max(0, self.get_utilidad_antes_impuestos(year) * self.TASA_IMPUESTO)
+
+    def get_utilidad_neta(self, year):
+        """Calcula Utilidad Neta"""
+        utilidad_antes_impuestos = self.get_utilidad_antes_impuestos(year)
+        return utilidad_antes_impuestos - max(0, utilidad_antes_impuestos * self.TASA_IMPUESTO)
+
+    def get_margen_bruto(self, year):
+        """Calcula Margen Bruto %"""
+        return float(self.margenes()['margen_bruto'][year - 1])
+
+    def get_margen_operativo(self, year):
+        """Calcula Margen Operativo %"""
+        return float(self.margenes()['margen_operativo'][year - 1])
+
+    def get_margen_neto(self, year):
+        """Calcula Margen Neto %"""
+        return float(self.margenes()['margen_neto'][year - 1])
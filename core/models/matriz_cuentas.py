@@ -0,0 +1,239 @@
+"""
+Archivo: core/models/matriz_cuentas.py
+Base columnar para estados financieros de N periodos (cuentas x periodos)
+"""
+
+import numpy as np
+
+
+class MatrizCuentas:
+    """
+    Almacena los valores de un estado financiero en un arreglo NumPy de
+    forma (cuentas x periodos). Cada fila es una cuenta con nombre y cada
+    columna un periodo.
+
+    Las subclases definen:
+        CUENTAS: tupla con los nombres de las cuentas (filas)
+        TOTALES: dict {nombre_total: {cuenta_o_total: signo}} donde cada
+                 total es una combinación lineal de cuentas o de totales
+                 definidos antes en el mismo dict
+
+    Los totales se compilan una sola vez en una matriz de pesos
+    (totales x cuentas), de modo que todos los totales de todos los
+    periodos se obtienen con un único producto matricial.
+
+    Además mantiene compatibilidad con la API de dos años de los modelos
+    clásicos: `modelo.caja_bancos_y1` lee la fila 'caja_bancos' del
+    periodo 1, y `get_total_corriente(year)` devuelve el total del
+    periodo `year` (contando desde 1).
+    Asignar un `<cuenta>_y<N>` que no existe (cuenta desconocida o periodo
+    fuera de rango) lanza AttributeError / IndexError.
+    """
+
+    CUENTAS = ()
+    TOTALES = {}
+
+    # Cache de compilación por subclase: {clase: (indice, nombres_totales, pesos)}
+    _compilados = {}
+
+    def __init__(self, valores=None, periodos=None):
+        """
+        Args:
+            valores: Arreglo (cuentas x periodos). Si es None se crea con ceros
+                     para 2 periodos. No se copia si ya es float64.
+            periodos: Etiquetas de los periodos (ej: ['2023', '2024']).
+                      Por defecto 'Periodo 1', 'Periodo 2', ...
+        """
+        if valores is None:
+            n_periodos = len(periodos) if periodos is not None else 2
+            valores = np.zeros((len(self.CUENTAS), n_periodos))
+
+        valores = np.asarray(valores, dtype=np.float64)
+        if valores.ndim != 2 or valores.shape[0] != len(self.CUENTAS):
+            raise ValueError(
+                f"Se esperaba un arreglo de forma ({len(self.CUENTAS)}, periodos), "
+                f"se recibió {valores.shape}"
+            )
+
+        if periodos is None:
+            periodos = [f"Periodo {i + 1}" for i in range(valores.shape[1])]
+        elif len(periodos) != valores.shape[1]:
+            raise ValueError("La cantidad de etiquetas no coincide con los periodos")
+
+        object.__setattr__(self, 'valores', valores)
+        object.__setattr__(self, 'periodos', list(periodos))
+
+    # ============================================================
+    # COMPILACIÓN DE TOTALES
+    # ============================================================
+
+    @classmethod
+    def _compilar(cls):
+        """Compila TOTALES en una matriz de pesos (totales x cuentas)"""
+        if cls in MatrizCuentas._compilados:
+            return MatrizCuentas._compilados[cls]
+
+        indice = {cuenta: i for i, cuenta in enumerate(cls.CUENTAS)}
+        nombres = tuple(cls.TOTALES)
+        pesos = np.zeros((len(nombres), len(cls.CUENTAS)))
+        filas = {}
+
+        for t, (nombre, componentes) in enumerate(cls.TOTALES.items()):
+            for componente, signo in componentes.items():
+                if componente in indice:
+                    pesos[t, indice[componente]] += signo
+                elif componente in filas:
+                    pesos[t] += signo * pesos[filas[componente]]
+                else:
+                    raise KeyError(
+                        f"'{componente}' no es una cuenta ni un total previo de {cls.__name__}"
+                    )
+            filas[nombre] = t
+
+        MatrizCuentas._compilados[cls] = (indice, nombres, pesos)
+        return MatrizCuentas._compilados[cls]
+
+    @classmethod
+    def indice_cuentas(cls):
+        """Retorna el dict {cuenta: fila}"""
+        return cls._compilar()[0]
+
+    @classmethod
+    def matriz_pesos(cls):
+        """
+        Retorna (nombres_totales, pesos) donde pesos es (totales x cuentas).
+        Útil para evaluar totales sobre arreglos apilados de muchas empresas.
+        """
+        _, nombres, pesos = cls._compilar()
+        return nombres, pesos
+
+    # ============================================================
+    # ACCESO A DATOS
+    # ============================================================
+
+    @property
+    def n_periodos(self):
+        """Cantidad de periodos almacenados"""
+        return self.valores.shape[1]
+
+    def fila(self, cuenta):
+        """Retorna la fila (todos los periodos) de una cuenta"""
+        return self.valores[self.indice_cuentas()[cuenta]]
+
+    def get_valor(self, cuenta, periodo):
+        """
+        Retorna el valor de una cuenta en un periodo.
+
+        Args:
+            cuenta: Nombre de la cuenta (ej: 'caja_bancos')
+            periodo: Número de periodo, empezando en 1
+        """
+        return float(self.valores[self.indice_cuentas()[cuenta], periodo - 1])
+
+    def set_valor(self, cuenta, periodo, valor):
+        """Asigna el valor de una cuenta en un periodo (empezando en 1)"""
+        self.valores[self.indice_cuentas()[cuenta], periodo - 1] = valor
+
+    def totales(self):
+        """
+        Calcula todos los totales de todos los periodos en una sola operación.
+
+        Returns:
+            dict: {nombre_total: arreglo de largo n_periodos}
+        """
+        _, nombres, pesos = self._compilar()
+        matriz = pesos @ self.valores
+        return {nombre: matriz[i] for i, nombre in enumerate(nombres)}
+
+    def total(self, nombre):
+        """Calcula un total para todos los periodos (arreglo de largo n_periodos)"""
+        _, nombres, pesos = self._compilar()
+        return pesos[nombres.index(nombre)] @ self.valores
+
+    def _total_periodo(self, nombre, year):
+        """Total de un periodo como float (adaptador de la API por año)"""
+        _, nombres, pesos = self._compilar()
+        return float(pesos[nombres.index(nombre)] @ self.valores[:, year - 1])
+
+    # ============================================================
+    # COMPATIBILIDAD CON ATRIBUTOS <cuenta>_y<N>
+    # ============================================================
+
+    def _resolver_atributo(self, nombre):
+        """Traduce 'caja_bancos_y2' a (fila, columna) o None"""
+        base, sep, sufijo = nombre.rpartition('_y')
+        if not sep or not sufijo.isdigit():
+            return None
+        fila = self.indice_cuentas().get(base)
+        columna = int(sufijo) - 1
+        if fila is None or not 0 <= columna < self.n_periodos:
+            return None
+        return fila, columna
+
+    def __getattr__(self, nombre):
+        # Solo se invoca cuando el atributo no existe de forma normal
+        if nombre.startswith('__') or nombre == 'valores':
+            raise AttributeError(nombre)
+        posicion = self._resolver_atributo(nombre)
+        if posicion is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' no tiene el atributo '{nombre}'"
+            )
+        return float(self.valores[posicion])
+
+    def __setattr__(self, nombre, valor):
+        base, sep, sufijo = nombre.rpartition('_y')
+        if not sep or not sufijo.isdigit():
+            object.__setattr__(self, nombre, valor)
+            return
+
+        # Un nombre <cuenta>_y<N> siempre es una celda: si no se puede
+        # ubicar es un error (no se crea un atributo suelto que nadie lee)
+        fila = self.indice_cuentas().get(base)
+        if fila is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' no tiene la cuenta '{base}' ('{nombre}')"
+            )
+        columna = int(sufijo) - 1
+        if not 0 <= columna < self.n_periodos:
+            raise IndexError(
+                f"Periodo {sufijo} fuera de rango en '{nombre}': "
+                f"{type(self).__name__} tiene {self.n_periodos} periodos"
+            )
+        self.valores[fila, columna] = valor
+
+    # ============================================================
+    # CONVERSIÓN DESDE/HACIA LOS MODELOS DE 2 AÑOS
+    # ============================================================
+
+    @classmethod
+    def desde_modelo(cls, modelo, periodos=None):
+        """
+        Construye la matriz a partir de un modelo clásico con atributos
+        <cuenta>_y1, <cuenta>_y2, ...
+
+        Args:
+            modelo: Instancia de BalanceGeneral o EstadoResultado
+            periodos: Etiquetas de los periodos (por defecto 2)
+        """
+        n_periodos = len(periodos) if periodos is not None else 2
+        valores = np.array([
+            [getattr(modelo, f"{cuenta}_y{p}") for p in range(1, n_periodos + 1)]
+            for cuenta in cls.CUENTAS
+        ], dtype=np.float64)
+        return cls(valores, periodos)
+
+    def a_modelo(self, modelo):
+        """
+        Vuelca los valores en un modelo clásico (atributos <cuenta>_y<N>).
+
+        Args:
+            modelo: Instancia destino (BalanceGeneral o EstadoResultado)
+
+        Returns:
+            El mismo modelo, para encadenar
+        """
+        for fila, cuenta in enumerate(self.CUENTAS):
+            for columna in range(self.n_periodos):
+                setattr(modelo, f"{cuenta}_y{columna + 1}", float(self.valores[fila, columna]))
+        return modelo
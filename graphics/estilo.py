@@ -0,0 +1,49 @@
+"""
+Archivo: graphics/estilo.py
+Fábrica de figuras de matplotlib sin pyplot y estilo común de los gráficos
+"""
+
+import functools
+import threading
+
+import matplotlib
+from matplotlib.figure import Figure
+
+
+# Estilo de todos los gráficos de graphics/ (antes se aplicaba a
+# matplotlib.rcParams al importar cada módulo)
+ESTILO_GRAFICOS = {
+    'font.size': 10,
+    'axes.titlesize': 14,
+    'axes.labelsize': 12,
+    'xtick.labelsize': 10,
+    'ytick.labelsize': 10,
+}
+
+# rc_context cambia rcParams de todo el proceso mientras dura: la
+# construcción de figuras se serializa; el renderizado (savefig, draw)
+# no lee rcParams y puede ir en paralelo
+_lock_estilo = threading.RLock()
+
+
+def nueva_figura(figsize):
+    """
+    Figura independiente de pyplot: no queda registrada en ningún
+    administrador de figuras y se libera al soltar la referencia.
+
+    Args:
+        figsize: (ancho, alto) en pulgadas
+    """
+    return Figure(figsize=figsize)
+
+
+def con_estilo(funcion):
+    """
+    Decorador para funciones de gráfico: las ejecuta dentro de
+    rc_context(ESTILO_GRAFICOS), sin modificar rcParams globales.
+    """
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        with _lock_estilo, matplotlib.rc_context(ESTILO_GRAFICOS):
+            return funcion(*args, **kwargs)
+    return envoltura
@@ -1,20 +1,18 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import matplotlib
-matplotlib.rcParams.update({
-    'font.size': 10,
-    'axes.titlesize': 14,
-    'axes.labelsize': 12,
-    'xtick.labelsize': 10,
-    'ytick.labelsize': 10,
-})
+from matplotlib.ticker import FuncFormatter
 
+from graphics.estilo import nueva_figura, con_estilo
+from utils.perfilado import perfilar
 
+
+@perfilar('grafico')
+@con_estilo
 def grafico_barras_simple(fm_año1, fm_año2, año1="Año 1", año2="Año 2"):
     """
     Gráfico de barras simple para comparar fondo de maniobra
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = nueva_figura(figsize=(10, 6))
+    ax = fig.subplots()
     
     años = [año1, año2]
     valores = [fm_año1, fm_año2]
@@ -35,17 +33,20 @@ def grafico_barras_simple(fm_año1, fm_año2, año1="Año 1", año2="Año 2"):
     ax.set_axisbelow(True)
     
     # Formato de eje Y
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
+@perfilar('grafico')
+@con_estilo
 def grafico_barras_con_variacion(fm_año1, fm_año2, año1="Año 1", año2="Año 2"):
     """
     Gráfico de barras con indicador de variación porcentual
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = nueva_figura(figsize=(10, 6))
+    ax = fig.subplots()
     
     años = [año1, año2]
     valores = [fm_año1, fm_año2]
@@ -85,17 +86,20 @@ def grafico_barras_con_variacion(fm_año1, fm_año2, año1="Año 1", año2="Año
     ax.set_axisbelow(True)
     
     # Formato de eje Y
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
+@perfilar('grafico')
+@con_estilo
 def grafico_linea_tendencia(fm_año1, fm_año2, año1="Año 1", año2="Año 2"):
     """
     Gráfico de línea para mostrar tendencia
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = nueva_figura(figsize=(10, 6))
+    ax = fig.subplots()
     
     años = [año1, año2]
     valores = [fm_año1, fm_año2]
@@ -128,17 +132,19 @@ def grafico_linea_tendencia(fm_año1, fm_año2, año1="Año 1", año2="Año 2"):
     ax.set_axisbelow(True)
     
     # Formato de eje Y
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
+@perfilar('grafico')
+@con_estilo
 def grafico_comparativo_completo(fm_año1, fm_año2, año1="Año 1", año2="Año 2"):
     """
     Gráfico completo con múltiples visualizaciones
     """
-    fig = plt.figure(figsize=(14, 5))
+    fig = nueva_figura(figsize=(14, 5))
     
     # Calcular variación
     if fm_año1 != 0:
@@ -149,7 +155,7 @@ def grafico_comparativo_completo(fm_año1, fm_año2, año1="Año 1", año2="Año
         diferencia = fm_año2
     
     # Subplot 1: Barras comparativas
-    ax1 = plt.subplot(1, 3, 1)
+    ax1 = fig.add_subplot(1, 3, 1)
     años = [año1, año2]
     valores = [fm_año1, fm_año2]
     colores = ['#4169E1', '#2ECC71' if fm_año2 > fm_año1 else '#E74C3C']
@@ -163,10 +169,10 @@ def grafico_comparativo_completo(fm_año1, fm_año2, año1="Año 1", año2="Año
     ax1.set_ylabel('Monto ($)', fontsize=10, fontweight='bold')
     ax1.set_title('Comparación', fontsize=12, fontweight='bold')
     ax1.grid(axis='y', alpha=0.3, linestyle='--')
-    ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+    ax1.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
     
     # Subplot 2: Variación porcentual
-    ax2 = plt.subplot(1, 3, 2)
+    ax2 = fig.add_subplot(1, 3, 2)
     color_var = '#2ECC71' if variacion > 0 else '#E74C3C'
     ax2.bar(['Variación'], [variacion], color=color_var, width=0.5, 
             edgecolor='black', linewidth=2)
@@ -179,7 +185,7 @@ def grafico_comparativo_completo(fm_año1, fm_año2, año1="Año 1", año2="Año
     ax2.grid(axis='y', alpha=0.3, linestyle='--')
     
     # Subplot 3: Diferencia absoluta
-    ax3 = plt.subplot(1, 3, 3)
+    ax3 = fig.add_subplot(1, 3, 3)
     color_dif = '#2ECC71' if diferencia > 0 else '#E74C3C'
     ax3.bar(['Diferencia'], [diferencia], color=color_dif, width=0.5,
             edgecolor='black', linewidth=2)
@@ -190,11 +196,11 @@ def grafico_comparativo_completo(fm_año1, fm_año2, año1="Año 1", año2="Año
     ax3.set_ylabel('Monto ($)', fontsize=10, fontweight='bold')
     ax3.set_title('Diferencia Absoluta', fontsize=12, fontweight='bold')
     ax3.grid(axis='y', alpha=0.3, linestyle='--')
-    ax3.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
+    ax3.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
     
-    plt.suptitle('Análisis Completo del Fondo de Maniobra', 
+    fig.suptitle('Análisis Completo del Fondo de Maniobra', 
                  fontsize=14, fontweight='bold', y=1.02)
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
@@ -204,21 +210,13 @@ if __name__ == "__main__":
     fondo_maniobra_2023 = 150000
     fondo_maniobra_2024 = 15000
     
-    # Opción 1: Barras simples
-    fig1 = grafico_barras_simple(fondo_maniobra_2023, fondo_maniobra_2024, "2023", "2024")
-    plt.show()
-    
-    # Opción 2: Barras con variación
-    fig2 = grafico_barras_con_variacion(fondo_maniobra_2023, fondo_maniobra_2024, "2023", "2024")
-    plt.show()
-    
-    # Opción 3: Línea de tendencia
-    fig3 = grafico_linea_tendencia(fondo_maniobra_2023, fondo_maniobra_2024, "2023", "2024")
-    plt.show()
-    
-    # Opción 4: Análisis completo
-    fig4 = grafico_comparativo_completo(fondo_maniobra_2023, fondo_maniobra_2024, "2023", "2024")
-    plt.show()
-    
-    # Para guardar cualquier gráfico
-    # fig1.savefig('fondo_maniobra.png', dpi=300, bbox_inches='tight')
\ No newline at end of file
+    # Las figuras no usan pyplot: cada opción se guarda como imagen
+    graficos = {
+        'fm_barras_simple.png': grafico_barras_simple,              # Opción 1
+        'fm_barras_variacion.png': grafico_barras_con_variacion,    # Opción 2
+        'fm_tendencia.png': grafico_linea_tendencia,                # Opción 3
+        'fm_completo.png': grafico_comparativo_completo,            # Opción 4
+    }
+    for archivo, grafico in graficos.items():
+        fig = grafico(fondo_maniobra_2023, fondo_maniobra_2024, "2023", "2024")
+        fig.savefig(archivo, dpi=300, bbox_inches='tight')
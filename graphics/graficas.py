@@ -1,15 +1,11 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import matplotlib
-matplotlib.rcParams.update({
-    'font.size': 10,
-    'axes.titlesize': 14,
-    'axes.labelsize': 12,
-    'xtick.labelsize': 10,
-    'ytick.labelsize': 10,
-})
 
+from graphics.estilo import nueva_figura, con_estilo
+from utils.perfilado import perfilar
 
+
+@perfilar('grafico')
+@con_estilo
 def grafico_analisis_financiero(datos_año1, datos_año2, año1="Año 1", año2="Año 2"):
     """
     Gráfico de Análisis Financiero - Liquidez y Solvencia
@@ -25,14 +21,14 @@ def grafico_analisis_financiero(datos_año1, datos_año2, año1="Año 1", año2=
         'calidad_deuda': float
     }
     """
-    fig = plt.figure(figsize=(16, 10))
+    fig = nueva_figura(figsize=(16, 10))
     
     # Título principal
     fig.suptitle('ANÁLISIS FINANCIERO - LIQUIDEZ Y SOLVENCIA', 
                  fontsize=18, fontweight='bold', y=0.98)
     
     # ============ RATIOS DE LIQUIDEZ ============
-    ax1 = plt.subplot(2, 1, 1)
+    ax1 = fig.add_subplot(2, 1, 1)
     
     # Datos de liquidez
     categorias_liquidez = ['Liquidez\nGeneral', 'Razón de\nTesorería', 'Razón de\nDisponibilidad']
@@ -75,7 +71,7 @@ def grafico_analisis_financiero(datos_año1, datos_año2, año1="Año 1", año2=
     ax1.set_axisbelow(True)
     
     # ============ RATIOS DE SOLVENCIA ============
-    ax2 = plt.subplot(2, 1, 2)
+    ax2 = fig.add_subplot(2, 1, 2)
     
     # Datos de solvencia
     categorias_solvencia = ['Ratio de\nGarantía', 'Ratio de\nAutonomía', 'Calidad de\nDeuda']
@@ -113,10 +109,12 @@ def grafico_analisis_financiero(datos_año1, datos_año2, año1="Año 1", año2=
     ax2.grid(axis='y', alpha=0.3, linestyle='--')
     ax2.set_axisbelow(True)
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
+@perfilar('grafico')
+@con_estilo
 def grafico_analisis_economico(datos_año1, datos_año2, año1="Año 1", año2="Año 2", benchmark_roa=None, benchmark_roe=None):
     """
     Gráfico de Análisis Económico - Rentabilidad
@@ -134,14 +132,14 @@ def grafico_analisis_economico(datos_año1, datos_año2, año1="Año 1", año2="
     }
     benchmark_roa, benchmark_roe: valores de referencia del sector (opcional)
     """
-    fig = plt.figure(figsize=(16, 12))
+    fig = nueva_figura(figsize=(16, 12))
     
     # Título principal
     fig.suptitle('ANÁLISIS ECONÓMICO - RENTABILIDAD\nRENTABILIDAD ECONÓMICA Y FINANCIERA', 
                  fontsize=18, fontweight='bold', y=0.98)
     
     # ============ RENTABILIDAD ECONÓMICA Y FINANCIERA (ROA/ROE) ============
-    ax1 = plt.subplot(3, 1, 1)
+    ax1 = fig.add_subplot(3, 1, 1)
     
     categorias_rent = ['ROA\n(Return on Assets)', 'ROE\n(Return on Equity)']
     valores_año1_rent = [datos_año1['roa'], datos_año1['roe']]
@@ -173,7 +171,7 @@ def grafico_analisis_economico(datos_año1, datos_año2, año1="Año 1", año2="
     ax1.set_axisbelow(True)
     
     # ============ ANÁLISIS DUPONT ============
-    ax2 = plt.subplot(3, 1, 2)
+    ax2 = fig.add_subplot(3, 1, 2)
     
     categorias_dupont = ['Rotación del\nActivo', 'Apalancamiento\nFinanciero']
     valores_año1_dupont = [datos_año1['rotacion_activo'], datos_año1['apalancamiento']]
@@ -213,7 +211,7 @@ def grafico_analisis_economico(datos_año1, datos_año2, año1="Año 1", año2="
     ax2.set_axisbelow(True)
     
     # ============ MÁRGENES DE GANANCIA ============
-    ax3 = plt.subplot(3, 1, 3)
+    ax3 = fig.add_subplot(3, 1, 3)
     
     categorias_margenes = ['Margen\nBruto', 'Margen\nOperativo', 'Margen\nNeto']
     valores_año1_marg = [datos_año1['margen_bruto'], datos_año1['margen_operativo'], datos_año1['margen_neto']]
@@ -261,7 +259,7 @@ def grafico_analisis_economico(datos_año1, datos_año2, año1="Año 1", año2="
     ax3.grid(axis='y', alpha=0.3, linestyle='--')
     ax3.set_axisbelow(True)
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
@@ -310,12 +308,9 @@ if __name__ == "__main__":
     
     # Generar gráficos
     fig1 = grafico_analisis_financiero(datos_financiero_2023, datos_financiero_2024, "2023", "2024")
-    plt.show()
-    
     fig2 = grafico_analisis_economico(datos_economico_2023, datos_economico_2024, "2023", "2024",
                                       benchmark_roa=9.0, benchmark_roe=16.0)
-    plt.show()
     
-    # Para guardar los gráficos
-    # fig1.savefig('analisis_financiero.png', dpi=300, bbox_inches='tight')
-    # fig2.savefig('analisis_economico.png', dpi=300, bbox_inches='tight')
\ No newline at end of file
+    # Las figuras no usan pyplot: se guardan directamente
+    fig1.savefig('analisis_financiero.png', dpi=300, bbox_inches='tight')
+    fig2.savefig('analisis_economico.png', dpi=300, bbox_inches='tight')
\ No newline at end of file
@@ -1,15 +1,11 @@
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-import matplotlib
-matplotlib.rcParams.update({
-    'font.size': 10,
-    'axes.titlesize': 14,
-    'axes.labelsize': 12,
-    'xtick.labelsize': 10,
-    'ytick.labelsize': 10,
-})
 
+from graphics.estilo import nueva_figura, con_estilo
+from utils.perfilado import perfilar
 
+
+@perfilar('grafico')
+@con_estilo
 def grafico_balance(activo_nc, activo_c, patrimonio, pasivo_nc, pasivo_c,anio):
 
     # Calcular totales
@@ -25,7 +21,8 @@ def grafico_balance(activo_nc, activo_c, patrimonio, pasivo_nc, pasivo_c,anio):
     prop_pasivo_c = pasivo_c / total_pasivo_patrimonio if total_pasivo_patrimonio > 0 else 0
     
     # Crear figura
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig = nueva_figura(figsize=(12, 8))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
     ax.axis('off')
@@ -115,7 +112,7 @@ def grafico_balance(activo_nc, activo_c, patrimonio, pasivo_nc, pasivo_c,anio):
             'k--', linewidth=1.5, alpha=0.5)
     
     
-    plt.title(f'Balance General año {anio}', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
+    ax.set_title(f'Balance General año {anio}', fontsize=16, fontweight='bold', pad=20)
+    fig.tight_layout()
     
     return fig
\ No newline at end of file
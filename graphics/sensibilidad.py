@@ -0,0 +1,86 @@
+import numpy as np
+
+from graphics.estilo import nueva_figura, con_estilo
+from utils.perfilado import perfilar
+
+
+@perfilar('grafico')
+@con_estilo
+def grafico_tornado(filas, nombre_ratio, valor_base, delta=0.10):
+    """
+    Gráfico tornado: impacto de ±delta en cada cuenta sobre un ratio
+
+    Parámetros:
+    filas: lista de AnalisisSensibilidad.tornado() (mayor impacto primero),
+           cada una con 'etiqueta', 'bajo' y 'alto'
+    nombre_ratio: nombre del ratio para el título
+    valor_base: valor actual del ratio (eje central)
+    delta: variación aplicada (0.10 = ±10%)
+    """
+    fig = nueva_figura(figsize=(12, max(4, 0.5 * len(filas) + 2)))
+    ax = fig.subplots()
+
+    # El de mayor impacto arriba
+    filas = list(reversed(filas))
+    posiciones = np.arange(len(filas))
+    bajo = np.array([f['bajo'] for f in filas]) - valor_base
+    alto = np.array([f['alto'] for f in filas]) - valor_base
+
+    ax.barh(posiciones, bajo, left=valor_base, color='#E74C3C',
+            edgecolor='black', label=f'Cuenta -{delta * 100:.0f}%')
+    ax.barh(posiciones, alto, left=valor_base, color='#2ECC71',
+            edgecolor='black', label=f'Cuenta +{delta * 100:.0f}%')
+    ax.axvline(valor_base, color='black', linewidth=1.5)
+
+    ax.set_yticks(posiciones)
+    ax.set_yticklabels([f['etiqueta'] for f in filas])
+    ax.set_xlabel(nombre_ratio, fontsize=12, fontweight='bold')
+    ax.set_title(f'Sensibilidad de {nombre_ratio} (±{delta * 100:.0f}% por cuenta)',
+                 fontsize=14, fontweight='bold', pad=15)
+    ax.grid(axis='x', alpha=0.3, linestyle='--')
+    ax.set_axisbelow(True)
+    ax.legend(loc='lower right')
+
+    if not filas:
+        ax.text(0.5, 0.5, 'Ninguna cuenta modifica este ratio',
+                ha='center', va='center', transform=ax.transAxes, fontsize=12)
+
+    fig.tight_layout()
+    return fig
+
+
+@perfilar('grafico')
+@con_estilo
+def grafico_mapa_calor(x, y, valores, etiqueta_x, etiqueta_y, nombre_ratio):
+    """
+    Mapa de calor de un ratio sobre una grilla de variaciones de dos cuentas
+
+    Parámetros:
+    x, y: variaciones relativas de cada eje (0.10 = +10%)
+    valores: matriz (len(y), len(x)) del ratio
+    etiqueta_x, etiqueta_y: nombres de las cuentas
+    nombre_ratio: nombre del ratio para el título y la barra de color
+    """
+    fig = nueva_figura(figsize=(10, 8))
+    ax = fig.subplots()
+
+    x = np.asarray(x) * 100
+    y = np.asarray(y) * 100
+    valores = np.ma.masked_invalid(np.asarray(valores, dtype=float))
+
+    malla = ax.pcolormesh(x, y, valores, cmap='RdYlGn', shading='nearest')
+    barra = fig.colorbar(malla, ax=ax)
+    barra.set_label(nombre_ratio, fontsize=12)
+
+    # Situación actual (sin variación)
+    ax.plot(0, 0, marker='o', color='black', markersize=8)
+    ax.axhline(0, color='black', linewidth=0.8, linestyle='--', alpha=0.6)
+    ax.axvline(0, color='black', linewidth=0.8, linestyle='--', alpha=0.6)
+
+    ax.set_xlabel(f'{etiqueta_x} (variación %)', fontsize=12, fontweight='bold')
+    ax.set_ylabel(f'{etiqueta_y} (variación %)', fontsize=12, fontweight='bold')
+    ax.set_title(f'{nombre_ratio}: {etiqueta_x} vs. {etiqueta_y}',
+                 fontsize=14, fontweight='bold', pad=15)
+
+    fig.tight_layout()
+    return fig
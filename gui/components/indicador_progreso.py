@@ -0,0 +1,40 @@
+"""
+Archivo: gui/components/indicador_progreso.py
+Indicador de trabajos de análisis en segundo plano
+"""
+
+import tkinter as tk
+
+from config import Colors, Fonts, Labels
+
+
+class IndicadorProgreso(tk.Label):
+    """
+    Etiqueta que muestra "Calculando..." mientras el EjecutorAnalisis
+    tiene trabajos pendientes y se oculta al terminar.
+    """
+
+    def __init__(self, parent, bg=Colors.BG_DARK, **kwargs):
+        super().__init__(
+            parent,
+            text="",
+            font=Fonts.SMALL,
+            bg=bg,
+            fg=Colors.TEXT_LIGHT,
+            **kwargs
+        )
+
+    def actualizar(self, pendientes):
+        """
+        Args:
+            pendientes: Trabajos en curso
+        """
+        if not self.winfo_exists():
+            return
+        if pendientes > 0:
+            texto = Labels.MSG_CALCULATING
+            if pendientes > 1:
+                texto += f" ({pendientes})"
+            self.config(text=f"⏳ {texto}")
+        else:
+            self.config(text="")
@@ -0,0 +1,133 @@
+"""
+Archivo: gui/components/panel_perfilado.py
+Panel oculto con los árboles de tiempos de cada refresco (utils/perfilado)
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from config import Colors, Fonts, DebugConfig
+from utils import perfilado
+
+
+class PanelPerfilado(tk.Toplevel):
+    """
+    Ventana de diagnóstico: activa el registro de tramos, muestra los
+    árboles más recientes primero (duración, tiempo propio y porcentaje
+    de la raíz) y exporta la traza para chrome://tracing o Perfetto.
+
+    Se abre con DebugConfig.ATAJO_PANEL_PERFILADO desde la ventana principal.
+    """
+
+    COLUMNAS = (
+        ('ms', "Total (ms)", 110),
+        ('propio', "Propio (ms)", 110),
+        ('porcentaje', "% raíz", 80),
+        ('categoria', "Categoría", 110),
+    )
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Perfilado de análisis e interfaz")
+        self.geometry("900x600")
+        self.configure(bg=Colors.BG_SECONDARY)
+
+        self.var_activo = tk.BooleanVar(value=perfilado.esta_activo())
+        # Última raíz mostrada: evita rearmar el árbol si no hay nada nuevo
+        self._ultima = None
+
+        self.crear_interfaz()
+        self.mostrar_arboles()
+        self.after(DebugConfig.REFRESCO_PANEL_MS, self._refresco_periodico)
+
+    def crear_interfaz(self):
+        barra = tk.Frame(self, bg=Colors.BG_SECONDARY)
+        barra.pack(fill=tk.X, padx=10, pady=8)
+
+        tk.Checkbutton(
+            barra,
+            text="Registrar tiempos",
+            variable=self.var_activo,
+            command=lambda: perfilado.activar(self.var_activo.get()),
+            font=Fonts.NORMAL,
+            bg=Colors.BG_SECONDARY
+        ).pack(side=tk.LEFT)
+
+        for texto, comando in (("Exportar traza…", self.exportar),
+                               ("Limpiar", self.limpiar),
+                               ("Actualizar", lambda: self.mostrar_arboles(forzar=True))):
+            tk.Button(barra, text=texto, command=comando, font=Fonts.SMALL).pack(side=tk.RIGHT, padx=4)
+
+        marco = tk.Frame(self)
+        marco.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        self.arbol = ttk.Treeview(marco, columns=[c[0] for c in self.COLUMNAS])
+        self.arbol.heading('#0', text="Tramo")
+        self.arbol.column('#0', width=450)
+        for clave, titulo, ancho in self.COLUMNAS:
+            self.arbol.heading(clave, text=titulo)
+            self.arbol.column(clave, width=ancho, anchor=tk.E)
+
+        scroll = ttk.Scrollbar(marco, orient=tk.VERTICAL, command=self.arbol.yview)
+        self.arbol.configure(yscrollcommand=scroll.set)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.arbol.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def mostrar_arboles(self, forzar=False):
+        """Vuelve a llenar la vista si hay árboles nuevos (o si `forzar`)"""
+        raices = perfilado.arboles()
+        ultima = raices[-1] if raices else None
+        if ultima is self._ultima and not forzar:
+            return
+        self._ultima = ultima
+
+        self.arbol.delete(*self.arbol.get_children())
+        for raiz in reversed(raices):
+            self._insertar('', raiz, raiz.duracion_ms or 1e-9)
+        # Solo el más reciente queda desplegado
+        hijos = self.arbol.get_children()
+        if hijos:
+            self._desplegar(hijos[0])
+
+    def _insertar(self, padre, tramo, total_ms):
+        item = self.arbol.insert(padre, tk.END, text=tramo.nombre, values=(
+            f"{tramo.duracion_ms:.1f}",
+            f"{tramo.propio_ms:.1f}",
+            f"{tramo.duracion_ms / total_ms:.0%}",
+            tramo.categoria,
+        ))
+        for hijo in tramo.hijos:
+            self._insertar(item, hijo, total_ms)
+
+    def _desplegar(self, item):
+        self.arbol.item(item, open=True)
+        for hijo in self.arbol.get_children(item):
+            self._desplegar(hijo)
+
+    def _refresco_periodico(self):
+        if not self.winfo_exists():
+            return
+        self.mostrar_arboles()
+        self.after(DebugConfig.REFRESCO_PANEL_MS, self._refresco_periodico)
+
+    def limpiar(self):
+        perfilado.limpiar()
+        self.mostrar_arboles(forzar=True)
+
+    def exportar(self):
+        """Guarda los árboles registrados como traza JSON de Chrome"""
+        ruta = filedialog.asksaveasfilename(
+            parent=self,
+            title="Exportar traza de Chrome",
+            defaultextension=".json",
+            filetypes=[("Traza de Chrome", "*.json")]
+        )
+        if not ruta:
+            return
+        try:
+            eventos = perfilado.exportar_chrome(ruta)
+        except OSError as e:
+            messagebox.showerror("Perfilado", f"No se pudo exportar la traza:\n{e}", parent=self)
+            return
+        messagebox.showinfo("Perfilado", f"{eventos} tramos exportados a {ruta}\n"
+                                         "(abrir con chrome://tracing o ui.perfetto.dev)", parent=self)
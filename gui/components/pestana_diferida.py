@@ -0,0 +1,196 @@
+"""
+Archivo: gui/components/pestana_diferida.py
+Pestañas de ttk.Notebook que construyen su contenido la primera vez que se muestran
+"""
+
+import importlib
+import tkinter as tk
+from tkinter import ttk
+
+from gui.components.refresco import cerrar_figuras_de
+from utils import perfilado
+
+
+class PestanaDiferida(ttk.Frame):
+    """
+    Marco vacío que se agrega al Notebook en lugar de la pestaña real.
+    El contenido (widgets, análisis y gráficos) se crea con `fabrica`
+    solo cuando la pestaña se selecciona por primera vez.
+    """
+
+    def __init__(self, parent, fabrica, contexto=None):
+        """
+        Args:
+            parent: Notebook que contiene la pestaña
+            fabrica: Función fabrica(marco) que crea el contenido dentro de
+                     `marco`; si retorna un widget, se empaqueta ocupando
+                     toda la pestaña
+            contexto: AnalysisContext; si se indica y el contenido declara
+                      VISTA (nodo del grafo de dependencias), la pestaña se
+                      refresca solo cuando algo de lo que muestra cambió
+        """
+        super().__init__(parent)
+        self.fabrica = fabrica
+        self.contexto = contexto
+        self.contenido = None
+        self.construida = False
+        # Revisión del grafo con que se construyó o refrescó por última vez
+        self.revision = None
+
+    def construir(self):
+        """Crea el contenido si aún no existe y lo retorna"""
+        if not self.construida:
+            self.construida = True
+            if self.contexto is not None:
+                self.revision = self.contexto.sincronizar()
+            self.contenido = self.fabrica(self)
+            if self.contenido is not None:
+                self.contenido.pack(fill=tk.BOTH, expand=True)
+        return self.contenido
+
+    def reconstruir(self):
+        """Destruye el contenido (y sus figuras) y lo vuelve a crear"""
+        if not self.construida:
+            return
+        cerrar_figuras_de(self)
+        for widget in self.winfo_children():
+            widget.destroy()
+        self.construida = False
+        self.contenido = None
+        self.construir()
+
+    def cambios_pendientes(self):
+        """
+        Entradas de la vista de esta pestaña que cambiaron desde que se
+        construyó o refrescó.
+
+        Returns:
+            frozenset de nodos del grafo (vacío si no hay nada que
+            actualizar), o None si no se sabe (sin contexto o sin VISTA)
+        """
+        vista = getattr(self.contenido, 'VISTA', None)
+        if self.contexto is None or vista is None or self.revision is None:
+            return None
+        self.contexto.sincronizar()
+        return self.contexto.grafo.cambiados_desde(self.revision, ('vista', vista, None))
+
+    def refrescar(self):
+        """
+        Actualiza la pestaña con los datos actuales.
+
+        Las pestañas aún no construidas no hacen nada (tomarán los datos
+        al abrirse), tampoco las que no muestran nada de lo que cambió.
+        Si el contenido implementa `refrescar()` y este retorna True, se
+        actualizó en el lugar; si no, se reconstruye solo esta pestaña.
+        Un `refrescar(cambiados)` recibe los nodos que cambiaron para
+        actualizar solo esas tarjetas o filas.
+        """
+        if not self.construida:
+            return
+        cambiados = self.cambios_pendientes()
+        if cambiados is not None and not cambiados:
+            return
+        if self.contexto is not None:
+            self.revision = self.contexto.sincronizar()
+
+        with perfilado.tramo(f"Refrescar {type(self.contenido).__name__}", 'interfaz'):
+            refrescar = getattr(self.contenido, 'refrescar', None)
+            if refrescar is not None:
+                actualizada = refrescar() if cambiados is None else refrescar(cambiados)
+                if actualizada:
+                    return
+            self.reconstruir()
+
+
+def importacion_diferida(modulo, clase):
+    """
+    Constructor de una pestaña cuyo módulo se importa recién al crearla.
+
+    Los módulos de pestañas arrastran matplotlib (~0.7 s de importación);
+    importarlos al abrir la pestaña por primera vez saca ese costo del
+    arranque. Se usa en lugar de `from modulo import Clase`:
+
+        A1FondoManiobraTab = importacion_diferida('gui.windows.a1_fondo_maniobra',
+                                                  'A1FondoManiobraTab')
+
+    Args:
+        modulo: Nombre completo del módulo
+        clase: Nombre de la clase dentro del módulo
+
+    Returns:
+        Función con la misma firma que la clase, que retorna la instancia
+    """
+    def crear(*args, **kwargs):
+        return getattr(importlib.import_module(modulo), clase)(*args, **kwargs)
+    crear.__name__ = clase
+    crear.__qualname__ = clase
+    crear.modulo = modulo
+    return crear
+
+
+def agregar_pestana_diferida(notebook, fabrica, contexto=None, **opciones):
+    """
+    Agrega al Notebook una pestaña que se construye al seleccionarla.
+
+    Args:
+        notebook: ttk.Notebook destino
+        fabrica: Función fabrica(marco) que crea el contenido
+        contexto: AnalysisContext para refrescar solo si su vista cambió
+        **opciones: Opciones de Notebook.add (text, padding, ...)
+
+    Returns:
+        PestanaDiferida
+    """
+    pestana = PestanaDiferida(notebook, fabrica, contexto)
+    notebook.add(pestana, **opciones)
+
+    if not getattr(notebook, '_construccion_diferida', False):
+        notebook._construccion_diferida = True
+        notebook.bind('<<NotebookTabChanged>>',
+                      lambda e: construir_pestana_seleccionada(notebook), add='+')
+        # La pestaña seleccionada al inicio no siempre dispara el evento
+        notebook.after_idle(lambda: construir_pestana_seleccionada(notebook))
+
+    return pestana
+
+
+def construir_pestana_seleccionada(notebook):
+    """Construye la pestaña diferida que esté seleccionada en el Notebook"""
+    try:
+        if not notebook.winfo_exists() or not notebook.select():
+            return
+        pestana = notebook.nametowidget(notebook.select())
+    except tk.TclError:
+        # El Notebook se destruyó antes de ejecutar la construcción
+        return
+
+    if isinstance(pestana, PestanaDiferida):
+        pestana.construir()
+
+
+def pestanas_con_cambios(notebook):
+    """
+    Pestañas diferidas ya construidas del Notebook que tienen algo que
+    actualizar (las que no declaran VISTA cuentan siempre).
+    """
+    pendientes = []
+    for nombre in notebook.tabs():
+        pestana = notebook.nametowidget(nombre)
+        if isinstance(pestana, PestanaDiferida) and pestana.construida:
+            if pestana.cambios_pendientes() != frozenset():
+                pendientes.append(pestana)
+    return pendientes
+
+
+def refrescar_pestanas(notebook):
+    """Refresca las pestañas diferidas ya construidas del Notebook que lo necesiten"""
+    for nombre in notebook.tabs():
+        pestana = notebook.nametowidget(nombre)
+        if isinstance(pestana, PestanaDiferida):
+            pestana.refrescar()
+
+    if perfilado.esta_activo():
+        # Tk acomoda los widgets recién en el siguiente ciclo ocioso: al
+        # perfilar se fuerza aquí para que ese tiempo quede en el árbol
+        with perfilado.tramo("Tk: geometría y dibujo pendientes", 'tk'):
+            notebook.update_idletasks()
@@ -0,0 +1,79 @@
+"""
+Archivo: gui/components/refresco.py
+Utilidades para actualizar en el lugar widgets y gráficos ya creados
+"""
+
+import sys
+
+
+def escribir_texto(text_widget, contenido):
+    """
+    Reemplaza el contenido de un tk.Text de solo lectura.
+
+    Args:
+        text_widget: tk.Text (normalmente con state='disabled')
+        contenido: Texto nuevo
+    """
+    estado = text_widget.cget('state')
+    text_widget.config(state='normal')
+    text_widget.delete('1.0', 'end')
+    text_widget.insert('1.0', contenido)
+    text_widget.config(state=estado)
+
+
+def llenar_tabla(tree, filas):
+    """
+    Escribe las filas de un ttk.Treeview plano. Si ya tiene la misma
+    cantidad de filas se actualizan en el lugar (conserva la selección y
+    el desplazamiento); si no, se vuelven a insertar.
+
+    Args:
+        tree: ttk.Treeview sin filas anidadas
+        filas: [(valores, tags)] en orden
+    """
+    actuales = tree.get_children()
+    if len(actuales) != len(filas):
+        tree.delete(*actuales)
+        actuales = [tree.insert("", "end") for _ in filas]
+    for iid, (valores, tags) in zip(actuales, filas):
+        tree.item(iid, values=valores, tags=tags)
+
+
+def reemplazar_figura(canvas, figura):
+    """
+    Muestra una figura nueva en un FigureCanvasTkAgg existente, sin
+    recrear el widget de Tk. La figura anterior se libera al soltarla
+    (las de graphics/ no están registradas en pyplot).
+
+    Args:
+        canvas: FigureCanvasTkAgg ya empaquetado
+        figura: matplotlib.figure.Figure con el gráfico actualizado
+    """
+    anterior = canvas.figure
+    if anterior is figura:
+        canvas.draw_idle()
+        return
+
+    # Conservar el tamaño en pantalla del widget
+    figura.set_size_inches(anterior.get_size_inches(), forward=False)
+
+    canvas.figure = figura
+    figura.set_canvas(canvas)
+    canvas.draw_idle()
+
+
+def cerrar_figuras_de(widget):
+    """
+    Cierra en pyplot solo las figuras dibujadas dentro de `widget`
+    (en lugar de plt.close('all'), que afecta a todas las pestañas).
+    """
+    if 'matplotlib.pyplot' not in sys.modules:
+        return
+    import matplotlib.pyplot as plt
+
+    ruta = str(widget)
+    for numero in plt.get_fignums():
+        figura = plt.figure(numero)
+        get_tk_widget = getattr(figura.canvas, 'get_tk_widget', None)
+        if get_tk_widget is not None and str(get_tk_widget()).startswith(ruta + '.'):
+            plt.close(figura)
@@ -3,21 +3,27 @@ Archivo: gui/main_window.py
 Ventana principal con sistema de pestañas y cierre correcto de matplotlib
 """
 
+import sys
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 
-from config import Colors, Fonts, Dimensions, Labels, WindowConfig
+from config import Colors, Fonts, Dimensions, Labels, WindowConfig, ButtonStyles, Icons, DebugConfig
 from core.models.balance import BalanceGeneral
 from core.models.estado_resultado import EstadoResultado
 from gui.windows.balance_window import BalanceTab
 from gui.windows.estado_resultado_window import EstadoResultadoTab
-from gui.windows.analisis_patrimonial import AnalisisPatrimonialTab
-from gui.windows.analisis_financiero import AnalisisFinancieroTab
-from gui.windows.analisis_economico import AnalisisEconomicoTab
-from gui.windows.analisis_integral_diagnostico import AnalisisIntegralTab
-from gui.windows.graficos import GraficosWindow
+from gui.components.pestana_diferida import agregar_pestana_diferida, importacion_diferida
+from gui.components.indicador_progreso import IndicadorProgreso
 from config import configurar_estilos_tablas
 
+# Pestañas de análisis y gráficos: importan matplotlib, que se carga
+# recién al abrir la primera (ver benchmarks/tiempo_inicio.py)
+AnalisisPatrimonialTab = importacion_diferida('gui.windows.analisis_patrimonial', 'AnalisisPatrimonialTab')
+AnalisisFinancieroTab = importacion_diferida('gui.windows.analisis_financiero', 'AnalisisFinancieroTab')
+AnalisisEconomicoTab = importacion_diferida('gui.windows.analisis_economico', 'AnalisisEconomicoTab')
+AnalisisIntegralTab = importacion_diferida('gui.windows.analisis_integral_diagnostico', 'AnalisisIntegralTab')
+GraficosWindow = importacion_diferida('gui.windows.graficos', 'GraficosWindow')
+
 
 class MainWindow(tk.Tk):
     """Ventana principal con pestañas y auto-actualización"""
@@ -37,9 +43,28 @@ class MainWindow(tk.Tk):
         self.geometry(f"{Dimensions.WINDOW_WIDTH}x{Dimensions.WINDOW_HEIGHT}")
         self.configure(bg=Colors.BG_SECONDARY)
         
+        # Las notificaciones de cambios se agrupan con after() de esta ventana
+        if hasattr(self.app, 'bus_cambios'):
+            self.app.bus_cambios.vincular(self)
+            self.app.bus_cambios.suscribir(self.precalcular_analisis)
+        
+        # Los resultados de trabajos en segundo plano vuelven por after()
+        if hasattr(self.app, 'ejecutor'):
+            self.app.ejecutor.vincular(self)
+        
+        # Retomar la última empresa guardada (sus análisis ya están en la base)
+        if getattr(self.app, 'almacen', None) is not None:
+            ultima = self.app.ultima_empresa()
+            if ultima:
+                self.app.abrir_empresa(ultima)
+        
         # Configurar cierre correcto de la aplicación
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         
+        # Panel de perfilado: sin botón, solo con el atajo
+        self.panel_perfilado = None
+        self.bind_all(DebugConfig.ATAJO_PANEL_PERFILADO, lambda e: self.abrir_panel_perfilado())
+        
         
         configurar_estilos_tablas()
         
@@ -69,6 +94,16 @@ class MainWindow(tk.Tk):
         )
         title_label.pack(expand=True)
         
+        # Indicador de análisis en segundo plano
+        if hasattr(self.app, 'ejecutor'):
+            indicador = IndicadorProgreso(header_frame)
+            indicador.place(relx=1.0, rely=0.5, anchor="e", x=-Dimensions.PADDING_LARGE)
+            self.app.ejecutor.observar_pendientes(indicador.actualizar)
+        
+        # Empresa de la base local
+        if getattr(self.app, 'almacen', None) is not None:
+            self.crear_selector_empresa(header_frame)
+        
         # Notebook principal
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(
@@ -82,52 +117,226 @@ class MainWindow(tk.Tk):
         self.crear_pestanas()
     
     def crear_pestanas(self):
-        """Crea todas las pestañas del sistema"""
+        """
+        Crea todas las pestañas del sistema.
+        Cada pestaña se construye la primera vez que se selecciona.
+        """
+        app = self.app
         
         # 1. Balance General
-        balance_tab = BalanceTab(self.notebook, self.app.balance_data, self.actualizar_analisis)
-        self.notebook.add(balance_tab, text=Labels.TAB_BALANCE)
+        self.pestana_balance = agregar_pestana_diferida(
+            self.notebook,
+            lambda padre: BalanceTab(padre, app.balance_data, self.actualizar_analisis),
+            text=Labels.TAB_BALANCE
+        )
         
         # 2. Estado de Resultados
-        estado_tab = EstadoResultadoTab(self.notebook, self.app.income_data, self.actualizar_analisis)
-        self.notebook.add(estado_tab, text=Labels.TAB_ESTADO)
+        self.pestana_estado = agregar_pestana_diferida(
+            self.notebook,
+            lambda padre: EstadoResultadoTab(padre, app.income_data, self.actualizar_analisis),
+            text=Labels.TAB_ESTADO
+        )
         
         # 3. Análisis Patrimonial
-        patrimonial_tab = AnalisisPatrimonialTab(self.notebook, self.app)
-        self.notebook.add(patrimonial_tab, text=Labels.TAB_PATRIMONIAL)
+        agregar_pestana_diferida(
+            self.notebook,
+            lambda padre: AnalisisPatrimonialTab(padre, app),
+            text=Labels.TAB_PATRIMONIAL
+        )
         
         # 4. Análisis Financiero
-        financiero_tab = AnalisisFinancieroTab(self.notebook, self.app)
-        self.notebook.add(financiero_tab, text=Labels.TAB_FINANCIERO)
+        agregar_pestana_diferida(
+            self.notebook,
+            lambda padre: AnalisisFinancieroTab(padre, app),
+            text=Labels.TAB_FINANCIERO
+        )
         
         # 5. Análisis Económico
-        economico_tab = AnalisisEconomicoTab(self.notebook, self.app)
-        self.notebook.add(economico_tab, text=Labels.TAB_ECONOMICO)
+        agregar_pestana_diferida(
+            self.notebook,
+            lambda padre: AnalisisEconomicoTab(padre, app),
+            text=Labels.TAB_ECONOMICO
+        )
         
         # 6. Análisis Integral
-        integral_tab = AnalisisIntegralTab(self.notebook, self.app)
-        self.notebook.add(integral_tab, text=Labels.TAB_INTEGRAL)
+        agregar_pestana_diferida(
+            self.notebook,
+            lambda padre: AnalisisIntegralTab(padre, app),
+            text=Labels.TAB_INTEGRAL
+        )
         
         # 7. Gráficos
-        graficos_tab = GraficosWindow(self.notebook, self.app)
-        self.notebook.add(graficos_tab, text=Labels.TAB_GRAFICOS)
+        agregar_pestana_diferida(
+            self.notebook,
+            lambda padre: GraficosWindow(padre, app),
+            text=Labels.TAB_GRAFICOS
+        )
+    
+    def crear_selector_empresa(self, parent):
+        """
+        Selector de empresa en el encabezado: elegir un nombre de la lista
+        la abre; escribir un nombre nuevo y guardar copia ahí los datos.
+        """
+        marco = tk.Frame(parent, bg=Colors.BG_DARK)
+        marco.place(relx=0.0, rely=0.5, anchor="w", x=Dimensions.PADDING_LARGE)
+        
+        tk.Label(
+            marco,
+            text="Empresa:",
+            font=Fonts.NORMAL_BOLD,
+            bg=Colors.BG_DARK,
+            fg=Colors.TEXT_WHITE
+        ).pack(side=tk.LEFT)
+        
+        self.empresa_var = tk.StringVar(value=self.app.empresa_actual)
+        self.combo_empresa = ttk.Combobox(
+            marco,
+            textvariable=self.empresa_var,
+            values=self.app.listar_empresas(),
+            width=28
+        )
+        self.combo_empresa.pack(side=tk.LEFT, padx=Dimensions.PADDING_SMALL)
+        self.combo_empresa.bind('<<ComboboxSelected>>', lambda e: self.abrir_empresa())
+        self.combo_empresa.bind('<Return>', lambda e: self.abrir_empresa())
+        
+        tk.Button(
+            marco,
+            text=f"{Icons.SAVE} Guardar",
+            command=self.guardar_empresa,
+            **ButtonStyles.SUCCESS
+        ).pack(side=tk.LEFT)
+        
+        tk.Button(
+            marco,
+            text=f"{Icons.IMPORT} Importar",
+            command=self.importar_estados,
+            **ButtonStyles.PRIMARY
+        ).pack(side=tk.LEFT, padx=Dimensions.PADDING_SMALL)
     
-    def actualizar_analisis(self):
+    def abrir_empresa(self, recargar=False):
+        """
+        Abre la empresa elegida en el selector. Si el nombre no existe en
+        la base, guarda ahí los datos actuales.
+        
+        Args:
+            recargar: Volver a leerla aunque sea la empresa actual
+                      (p.ej. después de importarla)
+        """
+        nombre = self.empresa_var.get().strip()
+        if not nombre or (nombre == self.app.empresa_actual and not recargar):
+            return
+        if nombre not in self.app.listar_empresas():
+            self.guardar_empresa()
+            return
+        
+        # No perder ediciones de la empresa actual aún no notificadas
+        if nombre != self.app.empresa_actual:
+            self.app.guardar_cambios()
+        if self.app.abrir_empresa(nombre):
+            # Los formularios ya construidos muestran los valores cargados
+            self.pestana_balance.refrescar()
+            self.pestana_estado.refrescar()
+    
+    def guardar_empresa(self):
+        """Guarda los datos actuales con el nombre del selector"""
+        nombre = self.empresa_var.get().strip() or self.app.empresa_actual
+        if self.app.guardar_empresa(nombre):
+            self.empresa_var.set(nombre)
+            self.combo_empresa.configure(values=self.app.listar_empresas())
+    
+    def importar_estados(self):
+        """
+        Importa empresas desde CSV/Excel a la base local y abre la
+        primera importada. Los errores por fila se muestran al final.
+        """
+        from services.importador import importar_a_almacen
+        
+        ruta = filedialog.askopenfilename(
+            parent=self,
+            title="Importar estados financieros",
+            filetypes=[("CSV o Excel", "*.csv *.txt *.xlsx *.xlsm"), ("Todos", "*.*")]
+        )
+        if not ruta:
+            return
+        
+        try:
+            resumen = importar_a_almacen(ruta, self.app.almacen)
+        except (ImportError, OSError, ValueError) as e:
+            messagebox.showerror("Importar", str(e), parent=self)
+            return
+        
+        self.combo_empresa.configure(values=self.app.listar_empresas())
+        
+        texto = (f"{len(resumen['guardadas'])} empresas importadas, "
+                 f"{len(resumen['rechazadas'])} rechazadas.")
+        errores = resumen['errores']
+        if errores:
+            texto += "\n\n" + "\n".join(str(e) for e in errores[:15])
+            if len(errores) > 15:
+                texto += f"\n... y {len(errores) - 15} errores más"
+            messagebox.showwarning("Importar", texto, parent=self)
+        else:
+            messagebox.showinfo("Importar", texto, parent=self)
+        
+        if resumen['guardadas']:
+            self.empresa_var.set(resumen['guardadas'][0])
+            self.abrir_empresa(recargar=True)
+    
+    def actualizar_analisis(self, campos=None):
         """
         Callback que se ejecuta cuando cambian los datos en Balance o Estado de Resultados.
         Notifica a todas las pestañas de análisis para que se actualicen.
+        
+        Args:
+            campos: Campos modificados (p.ej. ['caja_bancos_y2'])
         """
         if hasattr(self.app, 'notify_data_change'):
-            self.app.notify_data_change()
+            self.app.notify_data_change(campos)
+    
+    def precalcular_analisis(self, cambio):
+        """
+        Calcula en segundo plano los análisis compartidos de la nueva
+        versión de datos, para que las pestañas los encuentren listos.
+        Un cambio posterior reemplaza (cancela) el cálculo en curso.
+        
+        Se calcula sobre una copia de los modelos tomada aquí, en el hilo
+        de Tk: las ediciones siguientes no tocan los modelos que lee el
+        hilo de fondo.
+        """
+        contexto = self.app.analysis_context
+        self.app.ejecutor.enviar(
+            'precalcular_contexto',
+            contexto.precalcular,
+            contexto.instantanea(),
+            version=cambio.version
+        )
+    
+    def abrir_panel_perfilado(self):
+        """Abre (o trae al frente) el panel de tiempos por refresco"""
+        if self.panel_perfilado is not None and self.panel_perfilado.winfo_exists():
+            self.panel_perfilado.lift()
+            return
+        from gui.components.panel_perfilado import PanelPerfilado
+        self.panel_perfilado = PanelPerfilado(self)
     
     def on_closing(self):
         """
         Maneja el cierre correcto de la aplicación.
         Cierra todas las figuras de matplotlib antes de cerrar la ventana.
         """
+        if hasattr(self.app, 'ejecutor'):
+            self.app.ejecutor.cerrar()
+        
+        if getattr(self.app, 'almacen', None) is not None:
+            self.app.guardar_cambios()
+            self.app.almacen.cerrar()
+        
         try:
-            import matplotlib.pyplot as plt
-            plt.close('all')  # Cerrar todas las figuras abiertas
+            # Solo si alguna pestaña llegó a cargar pyplot: importarlo
+            # aquí haría más lento el cierre
+            plt = sys.modules.get('matplotlib.pyplot')
+            if plt is not None:
+                plt.close('all')  # Cerrar todas las figuras abiertas
         except Exception as e:
             print(f"Error al cerrar figuras de matplotlib: {e}")
         
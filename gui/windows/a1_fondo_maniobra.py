@@ -6,24 +6,28 @@ Pestaña A1 - Fondo de Maniobra
 import tkinter as tk
 from tkinter import ttk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib
-matplotlib.use('TkAgg')  # ✅ Forzar backend TkAgg
-matplotlib.rcParams['font.size'] = 10  # ✅ Tamaño de fuente matplotlib
 
 from config import Colors, Fonts, Dimensions, NumberFormat
 from core.analysis.equilibrio_patrimonial import AnalisisPatrimonialCompleto
 from graphics.fondo_maniobra import grafico_barras_con_variacion
 from graphics.grafico_balance import grafico_balance
+from gui.components.refresco import escribir_texto, reemplazar_figura
+from services.cache_graficos import huella_grafico
+from utils.perfilado import perfilar
 
 
 class A1FondoManiobraTab(ttk.Frame):
     """Pestaña A1 - Fondo de Maniobra"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'A1'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
@@ -77,17 +81,19 @@ class A1FondoManiobraTab(ttk.Frame):
         fm1 = ano1['fondo_maniobra_absoluto']
         fm2 = ano2['fondo_maniobra_absoluto']
         
-        tk.Label(tabla_frame, 
+        self.fm1_label = tk.Label(tabla_frame, 
                 text=NumberFormat.format(fm1),
                 font=Fonts.NORMAL,
                 fg=Colors.POSITIVE if fm1 > 0 else Colors.NEGATIVE,
-                bg=Colors.BG_PRIMARY).grid(row=1, column=1, padx=10, pady=5)
+                bg=Colors.BG_PRIMARY)
+        self.fm1_label.grid(row=1, column=1, padx=10, pady=5)
         
-        tk.Label(tabla_frame,
+        self.fm2_label = tk.Label(tabla_frame,
                 text=NumberFormat.format(fm2),
                 font=Fonts.NORMAL,
                 fg=Colors.POSITIVE if fm2 > 0 else Colors.NEGATIVE,
-                bg=Colors.BG_PRIMARY).grid(row=1, column=2, padx=10, pady=5)
+                bg=Colors.BG_PRIMARY)
+        self.fm2_label.grid(row=1, column=2, padx=10, pady=5)
         
         # DESCRIPCIÓN DE EVOLUCIÓN
         evol_frame = ttk.LabelFrame(
@@ -98,7 +104,7 @@ class A1FondoManiobraTab(ttk.Frame):
         evol_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
                        pady=Dimensions.PADDING_MEDIUM)
         
-        evol_text = tk.Text(
+        self.evol_text = tk.Text(
             evol_frame,
             height=4,
             wrap='word',
@@ -108,9 +114,9 @@ class A1FondoManiobraTab(ttk.Frame):
             padx=10,
             pady=10
         )
-        evol_text.pack(fill=tk.X)
-        evol_text.insert('1.0', comparacion['evolucion'])
-        evol_text.config(state='disabled')
+        self.evol_text.pack(fill=tk.X)
+        self.evol_text.insert('1.0', comparacion['evolucion'])
+        self.evol_text.config(state='disabled')
         
         # DESCRIPCIÓN DE EQUILIBRIO
         eq_frame = ttk.LabelFrame(
@@ -124,7 +130,7 @@ class A1FondoManiobraTab(ttk.Frame):
         tk.Label(eq_frame, text="Año 1:", font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).pack(
             anchor='w', pady=(0, 5))
         
-        eq1_text = tk.Text(
+        self.eq1_text = tk.Text(
             eq_frame,
             height=3,
             wrap='word',
@@ -134,14 +140,14 @@ class A1FondoManiobraTab(ttk.Frame):
             padx=10,
             pady=5
         )
-        eq1_text.pack(fill=tk.X, pady=(0, 10))
-        eq1_text.insert('1.0', ano1['descripcion_equilibrio'])
-        eq1_text.config(state='disabled')
+        self.eq1_text.pack(fill=tk.X, pady=(0, 10))
+        self.eq1_text.insert('1.0', ano1['descripcion_equilibrio'])
+        self.eq1_text.config(state='disabled')
         
         tk.Label(eq_frame, text="Año 2:", font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).pack(
             anchor='w', pady=(0, 5))
         
-        eq2_text = tk.Text(
+        self.eq2_text = tk.Text(
             eq_frame,
             height=3,
             wrap='word',
@@ -151,9 +157,9 @@ class A1FondoManiobraTab(ttk.Frame):
             padx=10,
             pady=5
         )
-        eq2_text.pack(fill=tk.X)
-        eq2_text.insert('1.0', ano2['descripcion_equilibrio'])
-        eq2_text.config(state='disabled')
+        self.eq2_text.pack(fill=tk.X)
+        self.eq2_text.insert('1.0', ano2['descripcion_equilibrio'])
+        self.eq2_text.config(state='disabled')
         
         # GRÁFICO: Evolución
         grafico1_frame = ttk.LabelFrame(
@@ -165,12 +171,12 @@ class A1FondoManiobraTab(ttk.Frame):
                            padx=Dimensions.PADDING_XLARGE,
                            pady=Dimensions.PADDING_MEDIUM)
         
-        import matplotlib.pyplot as plt
-        with plt.rc_context({'font.size': 10}):  # Contexto local
-            fig1 = grafico_barras_con_variacion(fm1, fm2, "Año 1", "Año 2")
-            canvas1 = FigureCanvasTkAgg(fig1, master=grafico1_frame)
-            canvas1.draw()
-            canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        fig1, fig2, fig3 = self._generar_figuras(ano1, ano2)
+        self._huella_figuras = self._huella(ano1, ano2)
+        
+        canvas1 = FigureCanvasTkAgg(fig1, master=grafico1_frame)
+        canvas1.draw()
+        canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
         # GRÁFICO: Balance Año 1
         grafico2_frame = ttk.LabelFrame(
@@ -192,18 +198,9 @@ class A1FondoManiobraTab(ttk.Frame):
                         padx=Dimensions.PADDING_XLARGE,
                         pady=Dimensions.PADDING_MEDIUM)
         
-        with plt.rc_context({'font.size': 10}):
-            fig2 = grafico_balance(
-                activo_nc=ano1['activo_no_corriente'],
-                activo_c=ano1['activo_corriente'],
-                patrimonio=ano1['patrimonio'],
-                pasivo_nc=ano1['pasivo_no_corriente'],
-                pasivo_c=ano1['pasivo_corriente'],
-                anio=1
-            )
-            canvas2 = FigureCanvasTkAgg(fig2, master=grafico2_frame)
-            canvas2.draw()
-            canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        canvas2 = FigureCanvasTkAgg(fig2, master=grafico2_frame)
+        canvas2.draw()
+        canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
         # GRÁFICO: Balance Año 2
         grafico3_frame = ttk.LabelFrame(
@@ -215,18 +212,74 @@ class A1FondoManiobraTab(ttk.Frame):
                         padx=Dimensions.PADDING_XLARGE,
                         pady=Dimensions.PADDING_MEDIUM)
     
-        with plt.rc_context({'font.size': 10}):
-            fig3 = grafico_balance(
-                activo_nc=ano2['activo_no_corriente'],
-                activo_c=ano2['activo_corriente'],
-                patrimonio=ano2['patrimonio'],
-                pasivo_nc=ano2['pasivo_no_corriente'],
-                pasivo_c=ano2['pasivo_corriente'],
-                anio=2
-            )
-            canvas3 = FigureCanvasTkAgg(fig3, master=grafico3_frame)
-            canvas3.draw()
-            canvas3.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        canvas3 = FigureCanvasTkAgg(fig3, master=grafico3_frame)
+        canvas3.draw()
+        canvas3.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        self.canvas_graficos = (canvas1, canvas2, canvas3)
         
         canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
+        scrollbar.pack(side="right", fill="y")
+    
+    @staticmethod
+    def _huella(ano1, ano2):
+        """Huella de los datos de los gráficos (None si no se puede calcular)"""
+        try:
+            return huella_grafico('a1_fondo_maniobra', (ano1, ano2))
+        except TypeError:
+            return None
+    
+    def _generar_figuras(self, ano1, ano2):
+        """
+        Genera las figuras de evolución y de balance de ambos años
+        (cada función de graphics/ aplica su propio estilo)
+        """
+        fig1 = grafico_barras_con_variacion(
+            ano1['fondo_maniobra_absoluto'], ano2['fondo_maniobra_absoluto'],
+            "Año 1", "Año 2"
+        )
+        figuras_balance = [
+            grafico_balance(
+                activo_nc=ano['activo_no_corriente'],
+                activo_c=ano['activo_corriente'],
+                patrimonio=ano['patrimonio'],
+                pasivo_nc=ano['pasivo_no_corriente'],
+                pasivo_c=ano['pasivo_corriente'],
+                anio=anio
+            )
+            for anio, ano in ((1, ano1), (2, ano2))
+        ]
+        return [fig1] + figuras_balance
+    
+    def refrescar(self, cambiados=None):
+        """
+        Actualiza la tabla, los textos y los gráficos en el lugar,
+        reutilizando los widgets y canvas existentes.
+        
+        Args:
+            cambiados: Nodos del grafo de dependencias que cambiaron (no se
+                       usan: los gráficos ya se saltan por huella)
+        
+        Returns:
+            bool: True (la estructura de la pestaña no cambia con los datos)
+        """
+        resultado = AnalisisPatrimonialCompleto(self.app.balance_data).analisis_dual()
+        ano1 = resultado['ano_1']
+        ano2 = resultado['ano_2']
+        
+        for label, fm in ((self.fm1_label, ano1['fondo_maniobra_absoluto']),
+                          (self.fm2_label, ano2['fondo_maniobra_absoluto'])):
+            label.config(text=NumberFormat.format(fm),
+                         fg=Colors.POSITIVE if fm > 0 else Colors.NEGATIVE)
+        
+        escribir_texto(self.evol_text, resultado['comparacion']['evolucion'])
+        escribir_texto(self.eq1_text, ano1['descripcion_equilibrio'])
+        escribir_texto(self.eq2_text, ano2['descripcion_equilibrio'])
+        
+        # Con los mismos datos, los gráficos en pantalla ya son correctos
+        huella = self._huella(ano1, ano2)
+        if huella is None or huella != self._huella_figuras:
+            for canvas, figura in zip(self.canvas_graficos, self._generar_figuras(ano1, ano2)):
+                reemplazar_figura(canvas, figura)
+            self._huella_figuras = huella
+        return True
@@ -7,16 +7,22 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions
 from core.analysis.analisis_vertical import AnalisisVerticalBalance
+from gui.components.refresco import escribir_texto, llenar_tabla
+from utils.perfilado import perfilar
 
 
 class A2VerticalTab(ttk.Frame):
     """Pestana A2 - Analisis Vertical"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'A2'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
@@ -36,10 +42,6 @@ class A2VerticalTab(ttk.Frame):
             font=Fonts.TITLE
         ).pack(pady=Dimensions.PADDING_LARGE)
         
-        # Obtener analisis de ambos anos
-        analisis_y1 = AnalisisVerticalBalance(self.app.balance_data, 1)
-        analisis_y2 = AnalisisVerticalBalance(self.app.balance_data, 2)
-        
         # TABLA COMPARATIVA
         tabla_frame = ttk.LabelFrame(
             scrollable_frame,
@@ -49,7 +51,7 @@ class A2VerticalTab(ttk.Frame):
         tabla_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
                         pady=Dimensions.PADDING_MEDIUM)
         
-        # Crear Treeview con 5 columnas
+        # Crear Treeview con 5 columnas (las filas las escribe _mostrar_datos)
         tree = ttk.Treeview(
             tabla_frame, 
             columns=("Concepto", "Valor_Y1", "Pct_Y1", "Valor_Y2", "Pct_Y2"), 
@@ -68,246 +70,274 @@ class A2VerticalTab(ttk.Frame):
         tree.column("Pct_Y1", width=80, anchor="e")
         tree.column("Valor_Y2", width=120, anchor="e")
         tree.column("Pct_Y2", width=80, anchor="e")
+        self.tree = tree
+        
+        # Configurar estilos de las filas
+        tree.tag_configure("header", background=Colors.PRIMARY, foreground="white", font=Fonts.HEADER)
+        tree.tag_configure("subtotal", font=Fonts.NORMAL_BOLD, background="#e8e8e8")
+        tree.tag_configure("total", background=Colors.SUCCESS, foreground="white", font=Fonts.NORMAL_BOLD)
+        
+        tree.pack(fill=tk.BOTH, expand=True)
+        
+        # INTERPRETACION
+        interp_frame = ttk.LabelFrame(
+            scrollable_frame,
+            text=" Interpretacion de la Estructura (Ano 2) ",
+            padding=Dimensions.PADDING_LARGE
+        )
+        interp_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
+                        pady=Dimensions.PADDING_MEDIUM)
+        
+        ttk.Label(interp_frame, text="ESTRUCTURA ECONOMICA:", 
+                font=Fonts.HEADER, foreground=Colors.ACTIVO).pack(anchor='w', pady=(0, 5))
+        
+        text_economica = tk.Text(
+            interp_frame,
+            height=6,
+            wrap='word',
+            font=Fonts.NORMAL,
+            bg=Colors.BG_SECONDARY,
+            relief='flat',
+            padx=10,
+            pady=10
+        )
+        text_economica.pack(fill=tk.X, pady=(0, 15))
+        text_economica.config(state='disabled')
+        self.text_economica = text_economica
+        
+        ttk.Label(interp_frame, text="ESTRUCTURA FINANCIERA:", 
+                font=Fonts.HEADER, foreground=Colors.PASIVO).pack(anchor='w', pady=(0, 5))
+        
+        text_financiera = tk.Text(
+            interp_frame,
+            height=6,
+            wrap='word',
+            font=Fonts.NORMAL,
+            bg=Colors.BG_SECONDARY,
+            relief='flat',
+            padx=10,
+            pady=10
+        )
+        text_financiera.pack(fill=tk.X)
+        text_financiera.config(state='disabled')
+        self.text_financiera = text_financiera
+        
+        self._mostrar_datos()
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+    
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe la tabla y las interpretaciones en el lugar.
+        
+        Returns:
+            bool: True (las filas no cambian con los datos)
+        """
+        self._mostrar_datos()
+        return True
+    
+    def _mostrar_datos(self):
+        """Escribe en la tabla y los textos el análisis de los datos actuales"""
+        analisis_y1 = AnalisisVerticalBalance(self.app.balance_data, 1)
+        analisis_y2 = AnalisisVerticalBalance(self.app.balance_data, 2)
+        
+        llenar_tabla(self.tree, self._filas(self.app.balance_data, analisis_y1, analisis_y2))
+        
+        resumen = analisis_y2.resumen_completo()
+        escribir_texto(self.text_economica, resumen['estructura_economica'])
+        escribir_texto(self.text_financiera, resumen['estructura_financiera'])
+    
+    def _filas(self, balance, analisis_y1, analisis_y2):
+        """Filas (valores, tags) de la tabla comparativa"""
+        filas = []
         
         # ==================== ACTIVO ====================
-        tree.insert("", "end", values=("ACTIVO", "", "", "", ""), tags=("header",))
+        filas.append((("ACTIVO", "", "", "", ""), ("header",)))
         
         # Activo Corriente - Titulo
-        tree.insert("", "end", values=(
+        filas.append(((
             "  Activo Corriente",
             f"{analisis_y1.activo_corriente:,.2f}",
             f"{analisis_y1.pct_activo_corriente:.2f}%",
             f"{analisis_y2.activo_corriente:,.2f}",
             f"{analisis_y2.pct_activo_corriente:.2f}%"
-        ), tags=("subtotal",))
+        ), ("subtotal",)))
         
         # Desglose Activo Corriente
-        tree.insert("", "end", values=(
+        filas.append(((
             "      Caja y Bancos",
-            f"{self.app.balance_data.caja_bancos_y1:,.2f}",
+            f"{balance.caja_bancos_y1:,.2f}",
             f"{analisis_y1.pct_caja_bancos:.2f}%",
-            f"{self.app.balance_data.caja_bancos_y2:,.2f}",
+            f"{balance.caja_bancos_y2:,.2f}",
             f"{analisis_y2.pct_caja_bancos:.2f}%"
-        ))
-        tree.insert("", "end", values=(
+        ), ()))
+        filas.append(((
             "      Clientes por Cobrar",
-            f"{self.app.balance_data.clientes_cobrar_y1:,.2f}",
+            f"{balance.clientes_cobrar_y1:,.2f}",
             f"{analisis_y1.pct_clientes:.2f}%",
-            f"{self.app.balance_data.clientes_cobrar_y2:,.2f}",
+            f"{balance.clientes_cobrar_y2:,.2f}",
             f"{analisis_y2.pct_clientes:.2f}%"
-        ))
-        tree.insert("", "end", values=(
+        ), ()))
+        filas.append(((
             "      Inversiones CP",
-            f"{self.app.balance_data.inversion_cp_y1:,.2f}",
+            f"{balance.inversion_cp_y1:,.2f}",
             f"{analisis_y1.pct_inversiones_cp:.2f}%",
-            f"{self.app.balance_data.inversion_cp_y2:,.2f}",
+            f"{balance.inversion_cp_y2:,.2f}",
             f"{analisis_y2.pct_inversiones_cp:.2f}%"
-        ))
-        tree.insert("", "end", values=(
+        ), ()))
+        filas.append(((
             "      Existencias",
-            f"{self.app.balance_data.existencias_y1:,.2f}",
+            f"{balance.existencias_y1:,.2f}",
             f"{analisis_y1.pct_existencias:.2f}%",
-            f"{self.app.balance_data.existencias_y2:,.2f}",
+            f"{balance.existencias_y2:,.2f}",
             f"{analisis_y2.pct_existencias:.2f}%"
-        ))
+        ), ()))
         
         # Activo No Corriente - Titulo
-        tree.insert("", "end", values=(
+        filas.append(((
             "  Activo No Corriente",
             f"{analisis_y1.activo_no_corriente:,.2f}",
             f"{analisis_y1.pct_activo_no_corriente:.2f}%",
             f"{analisis_y2.activo_no_corriente:,.2f}",
             f"{analisis_y2.pct_activo_no_corriente:.2f}%"
-        ), tags=("subtotal",))
+        ), ("subtotal",)))
         
         # Desglose Activo No Corriente (valores netos)
-        inmuebles_neto_y1 = self.app.balance_data.inmuebles_planta_y1 - self.app.balance_data.depreciacion_acum_y1
-        inmuebles_neto_y2 = self.app.balance_data.inmuebles_planta_y2 - self.app.balance_data.depreciacion_acum_y2
-        intangibles_neto_y1 = self.app.balance_data.intangibles_y1 - self.app.balance_data.depreciacion_intang_y1
-        intangibles_neto_y2 = self.app.balance_data.intangibles_y2 - self.app.balance_data.depreciacion_intang_y2
+        inmuebles_neto_y1 = balance.inmuebles_planta_y1 - balance.depreciacion_acum_y1
+        inmuebles_neto_y2 = balance.inmuebles_planta_y2 - balance.depreciacion_acum_y2
+        intangibles_neto_y1 = balance.intangibles_y1 - balance.depreciacion_intang_y1
+        intangibles_neto_y2 = balance.intangibles_y2 - balance.depreciacion_intang_y2
         
-        tree.insert("", "end", values=(
+        filas.append(((
             "      Inmuebles, Planta y Eq. (neto)",
             f"{inmuebles_neto_y1:,.2f}",
             f"{analisis_y1.pct_inmuebles:.2f}%",
             f"{inmuebles_neto_y2:,.2f}",
             f"{analisis_y2.pct_inmuebles:.2f}%"
-        ))
-        tree.insert("", "end", values=(
+        ), ()))
+        filas.append(((
             "      Intangibles (neto)",
             f"{intangibles_neto_y1:,.2f}",
             f"{analisis_y1.pct_intangibles:.2f}%",
             f"{intangibles_neto_y2:,.2f}",
             f"{analisis_y2.pct_intangibles:.2f}%"
-        ))
+        ), ()))
         
         # TOTAL ACTIVO
-        tree.insert("", "end", values=(
+        filas.append(((
             "TOTAL ACTIVO",
             f"{analisis_y1.activo_total:,.2f}",
             "100.00%",
             f"{analisis_y2.activo_total:,.2f}",
             "100.00%"
-        ), tags=("total",))
+        ), ("total",)))
         
         # Linea en blanco
-        tree.insert("", "end", values=("", "", "", "", ""))
+        filas.append((("", "", "", "", ""), ()))
         
         # ==================== PASIVO Y PATRIMONIO ====================
-        tree.insert("", "end", values=("PASIVO Y PATRIMONIO", "", "", "", ""), tags=("header",))
+        filas.append((("PASIVO Y PATRIMONIO", "", "", "", ""), ("header",)))
         
         # Pasivo Corriente - Titulo
-        tree.insert("", "end", values=(
+        filas.append(((
             "  Pasivo Corriente",
             f"{analisis_y1.pasivo_corriente:,.2f}",
             f"{analisis_y1.pct_pasivo_corriente:.2f}%",
             f"{analisis_y2.pasivo_corriente:,.2f}",
             f"{analisis_y2.pct_pasivo_corriente:.2f}%"
-        ), tags=("subtotal",))
+        ), ("subtotal",)))
         
         # Desglose Pasivo Corriente
-        tree.insert("", "end", values=(
+        filas.append(((
             "      Proveedores y Gastos por Pagar",
-            f"{self.app.balance_data.proveedores_y1:,.2f}",
+            f"{balance.proveedores_y1:,.2f}",
             f"{analisis_y1.pct_proveedores:.2f}%",
-            f"{self.app.balance_data.proveedores_y2:,.2f}",
+            f"{balance.proveedores_y2:,.2f}",
             f"{analisis_y2.pct_proveedores:.2f}%"
-        ))
-        tree.insert("", "end", values=(
+        ), ()))
+        filas.append(((
             "      Impuestos por Pagar",
-            f"{self.app.balance_data.impuestos_pagar_y1:,.2f}",
+            f"{balance.impuestos_pagar_y1:,.2f}",
             f"{analisis_y1.pct_impuestos:.2f}%",
-            f"{self.app.balance_data.impuestos_pagar_y2:,.2f}",
+            f"{balance.impuestos_pagar_y2:,.2f}",
             f"{analisis_y2.pct_impuestos:.2f}%"
-        ))
-        tree.insert("", "end", values=(
+        ), ()))
+        filas.append(((
             "      Deuda CP Bancaria",
-            f"{self.app.balance_data.deuda_cp_y1:,.2f}",
+            f"{balance.deuda_cp_y1:,.2f}",
             f"{analisis_y1.pct_deuda_cp:.2f}%",
-            f"{self.app.balance_data.deuda_cp_y2:,.2f}",
+            f"{balance.deuda_cp_y2:,.2f}",
             f"{analisis_y2.pct_deuda_cp:.2f}%"
-        ))
+        ), ()))
         
         # Pasivo No Corriente - Titulo
-        tree.insert("", "end", values=(
+        filas.append(((
             "  Pasivo No Corriente",
             f"{analisis_y1.pasivo_no_corriente:,.2f}",
             f"{analisis_y1.pct_pasivo_no_corriente:.2f}%",
             f"{analisis_y2.pasivo_no_corriente:,.2f}",
             f"{analisis_y2.pct_pasivo_no_corriente:.2f}%"
-        ), tags=("subtotal",))
+        ), ("subtotal",)))
         
         # Desglose Pasivo No Corriente
-        tree.insert("", "end", values=(
+        filas.append(((
             "      Prestamos LP (5% anual)",
-            f"{self.app.balance_data.prestamos_lp_y1:,.2f}",
+            f"{balance.prestamos_lp_y1:,.2f}",
             f"{analisis_y1.pct_prestamos_lp:.2f}%",
-            f"{self.app.balance_data.prestamos_lp_y2:,.2f}",
+            f"{balance.prestamos_lp_y2:,.2f}",
             f"{analisis_y2.pct_prestamos_lp:.2f}%"
-        ))
-        tree.insert("", "end", values=(
+        ), ()))
+        filas.append(((
             "      Provisiones LP",
-            f"{self.app.balance_data.provisiones_lp_y1:,.2f}",
+            f"{balance.provisiones_lp_y1:,.2f}",
             f"{analisis_y1.pct_provisiones_lp:.2f}%",
-            f"{self.app.balance_data.provisiones_lp_y2:,.2f}",
+            f"{balance.provisiones_lp_y2:,.2f}",
             f"{analisis_y2.pct_provisiones_lp:.2f}%"
-        ))
+        ), ()))
         
         # Patrimonio - Titulo
-        tree.insert("", "end", values=(
+        filas.append(((
             "  Patrimonio",
             f"{analisis_y1.patrimonio:,.2f}",
             f"{analisis_y1.pct_patrimonio:.2f}%",
             f"{analisis_y2.patrimonio:,.2f}",
             f"{analisis_y2.pct_patrimonio:.2f}%"
-        ), tags=("subtotal",))
+        ), ("subtotal",)))
         
         # Desglose Patrimonio
-        tree.insert("", "end", values=(
+        filas.append(((
             "      Capital Social",
-            f"{self.app.balance_data.capital_social_y1:,.2f}",
+            f"{balance.capital_social_y1:,.2f}",
             f"{analisis_y1.pct_capital:.2f}%",
-            f"{self.app.balance_data.capital_social_y2:,.2f}",
+            f"{balance.capital_social_y2:,.2f}",
             f"{analisis_y2.pct_capital:.2f}%"
-        ))
-        tree.insert("", "end", values=(
+        ), ()))
+        filas.append(((
             "      Reservas Legales",
-            f"{self.app.balance_data.reservas_legales_y1:,.2f}",
+            f"{balance.reservas_legales_y1:,.2f}",
             f"{analisis_y1.pct_reservas:.2f}%",
-            f"{self.app.balance_data.reservas_legales_y2:,.2f}",
+            f"{balance.reservas_legales_y2:,.2f}",
             f"{analisis_y2.pct_reservas:.2f}%"
-        ))
-        tree.insert("", "end", values=(
+        ), ()))
+        filas.append(((
             "      Ganancias Acumuladas",
-            f"{self.app.balance_data.ganancias_acum_y1:,.2f}",
+            f"{balance.ganancias_acum_y1:,.2f}",
             f"{analisis_y1.pct_ganancias_acum:.2f}%",
-            f"{self.app.balance_data.ganancias_acum_y2:,.2f}",
+            f"{balance.ganancias_acum_y2:,.2f}",
             f"{analisis_y2.pct_ganancias_acum:.2f}%"
-        ))
+        ), ()))
         
         # TOTAL PASIVO + PATRIMONIO
         total_pp_y1 = analisis_y1.pasivo_corriente + analisis_y1.pasivo_no_corriente + analisis_y1.patrimonio
         total_pp_y2 = analisis_y2.pasivo_corriente + analisis_y2.pasivo_no_corriente + analisis_y2.patrimonio
         
-        tree.insert("", "end", values=(
+        filas.append(((
             "TOTAL PASIVO + PATRIMONIO",
             f"{total_pp_y1:,.2f}",
             "100.00%",
             f"{total_pp_y2:,.2f}",
             "100.00%"
-        ), tags=("total",))
+        ), ("total",)))
         
-        # Configurar estilos de las filas
-        tree.tag_configure("header", background=Colors.PRIMARY, foreground="white", font=Fonts.HEADER)
-        tree.tag_configure("subtotal", font=Fonts.NORMAL_BOLD, background="#e8e8e8")
-        tree.tag_configure("total", background=Colors.SUCCESS, foreground="white", font=Fonts.NORMAL_BOLD)
-        
-        tree.pack(fill=tk.BOTH, expand=True)
-        
-        # INTERPRETACION
-        interp_frame = ttk.LabelFrame(
-            scrollable_frame,
-            text=" Interpretacion de la Estructura (Ano 2) ",
-            padding=Dimensions.PADDING_LARGE
-        )
-        interp_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
-                        pady=Dimensions.PADDING_MEDIUM)
-        
-        resumen = analisis_y2.resumen_completo()
-        
-        ttk.Label(interp_frame, text="ESTRUCTURA ECONOMICA:", 
-                font=Fonts.HEADER, foreground=Colors.ACTIVO).pack(anchor='w', pady=(0, 5))
-        
-        text_economica = tk.Text(
-            interp_frame,
-            height=6,
-            wrap='word',
-            font=Fonts.NORMAL,
-            bg=Colors.BG_SECONDARY,
-            relief='flat',
-            padx=10,
-            pady=10
-        )
-        text_economica.pack(fill=tk.X, pady=(0, 15))
-        text_economica.insert('1.0', resumen['estructura_economica'])
-        text_economica.config(state='disabled')
-        
-        ttk.Label(interp_frame, text="ESTRUCTURA FINANCIERA:", 
-                font=Fonts.HEADER, foreground=Colors.PASIVO).pack(anchor='w', pady=(0, 5))
-        
-        text_financiera = tk.Text(
-            interp_frame,
-            height=6,
-            wrap='word',
-            font=Fonts.NORMAL,
-            bg=Colors.BG_SECONDARY,
-            relief='flat',
-            padx=10,
-            pady=10
-        )
-        text_financiera.pack(fill=tk.X)
-        text_financiera.insert('1.0', resumen['estructura_financiera'])
-        text_financiera.config(state='disabled')
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
+        return filas
\ No newline at end of file
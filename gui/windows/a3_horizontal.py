@@ -6,16 +6,164 @@ Pestaña A3 - Análisis Horizontal
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.analysis.analisis_horizontal import AnalisisHorizontalBalance, VariacionesHorizontales
+from gui.components.refresco import escribir_texto, llenar_tabla
+from utils.perfilado import perfilar
 
 
 class A3HorizontalTab(ttk.Frame):
     """Pestaña A3 - Análisis Horizontal"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'A3'
+    
+    # Filas de las tablas de detalle: (clave en VariacionesHorizontales, concepto)
+    FILAS_PC = (
+        ('proveedores', "  Proveedores y gastos por pagar"),
+        ('impuestos', "  Impuestos por pagar"),
+        ('deuda_cp', "  Deuda a corto plazo bancaria"),
+        ('pc', "TOTAL PASIVO CORRIENTE"),
+    )
+    FILAS_PNC = (
+        ('prestamos_lp', "  Préstamos a largo plazo (5% anual)"),
+        ('provisiones_lp', "  Provisiones a largo plazo"),
+        ('pnc', "TOTAL PASIVO NO CORRIENTE"),
+    )
+    FILAS_PATRIMONIO = (
+        ('capital', "  Capital Social"),
+        ('reservas', "  Reservas Legales"),
+        ('ganancias', "  Ganancias Acumuladas"),
+        ('patrimonio', "TOTAL PATRIMONIO"),
+    )
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Periodos comparados: contra el anterior ('consecutivo') o contra
+        # el primero ('base'); la página None es la más reciente
+        self.modo = 'consecutivo'
+        self.pagina = None
+        self.crear_interfaz()
+    
+    def _balance_periodos(self):
+        """
+        Balance con todos los periodos disponibles: el historial de la
+        empresa en la base local (si tiene más de 2) con los dos últimos
+        tomados de los datos actuales, o solo los 2 años actuales.
+        """
+        actual = BalanceMultiperiodo.desde_modelo(self.app.balance_data, ["Año 1", "Año 2"])
+        almacen = getattr(self.app, 'almacen', None)
+        if almacen is None:
+            return actual
+        try:
+            historial = almacen.cargar_historial(self.app.empresa_actual)
+        except Exception as e:
+            print(f"Error al leer el historial de '{self.app.empresa_actual}': {e}")
+            return actual
+        if historial is None or historial[0].n_periodos <= 2:
+            return actual
+        
+        valores = historial[0].valores.copy()
+        valores[:, -2:] = actual.valores
+        return BalanceMultiperiodo(valores, historial[0].periodos)
+    
+    def _pares_modo(self, n_periodos):
+        """Pares (desde, hasta) que se recorren con ◀ ▶ en el modo actual"""
+        if self.modo == 'base':
+            return [(1, p) for p in range(2, n_periodos + 1)]
+        return [(p, p + 1) for p in range(1, n_periodos)]
+    
+    def _cambiar_pagina(self, pagina=None, modo=None):
+        """Muestra otro par de periodos (vuelve a crear el contenido)"""
+        if modo is not None and modo != self.modo:
+            self.modo = modo
+            pagina = None
+        self.pagina = pagina
+        for widget in self.winfo_children():
+            widget.destroy()
         self.crear_interfaz()
     
+    def _crear_paginador(self, parent, balance, pares, pagina):
+        """Barra para recorrer los pares de periodos (solo con más de 2 periodos)"""
+        barra = ttk.Frame(parent)
+        barra.pack(pady=(0, Dimensions.PADDING_MEDIUM))
+        
+        ttk.Button(barra, text="◀", width=3,
+                   state=tk.NORMAL if pagina > 0 else tk.DISABLED,
+                   command=lambda: self._cambiar_pagina(pagina - 1)).pack(side=tk.LEFT)
+        ttk.Label(barra, text=f"  {pagina + 1} de {len(pares)}  ",
+                  font=Fonts.NORMAL).pack(side=tk.LEFT)
+        ttk.Button(barra, text="▶", width=3,
+                   state=tk.NORMAL if pagina < len(pares) - 1 else tk.DISABLED,
+                   command=lambda: self._cambiar_pagina(pagina + 1)).pack(side=tk.LEFT)
+        
+        modo_var = tk.StringVar(value=self.modo)
+        for valor, texto in (('consecutivo', "Contra el periodo anterior"),
+                             ('base', f"Contra el año base ({balance.periodos[0]})")):
+            ttk.Radiobutton(barra, text=texto, value=valor, variable=modo_var,
+                            command=lambda: self._cambiar_pagina(modo=modo_var.get())
+                            ).pack(side=tk.LEFT, padx=(Dimensions.PADDING_LARGE, 0))
+    
+    def _crear_tabla(self, parent, titulo, filas, encabezados, color_total=None):
+        """
+        Tabla de variaciones (las filas las escribe _mostrar_datos).
+        
+        Args:
+            filas: [(clave, concepto, tag)] con tag 'total', 'bold' o None
+            encabezados: Títulos de las columnas de los dos periodos
+            color_total: Fondo de las filas 'total'
+        """
+        marco = ttk.LabelFrame(parent, text=titulo, padding=Dimensions.PADDING_LARGE)
+        marco.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE, pady=Dimensions.PADDING_MEDIUM)
+        
+        tree = ttk.Treeview(
+            marco,
+            columns=("Concepto", "Año1", "Año2", "VarAbs", "VarPct"),
+            show="headings",
+            height=len(filas) + 1
+        )
+        
+        for columna, texto, ancho, ancla in (("Concepto", "Concepto", 250, "w"),
+                                             ("Año1", encabezados[0], 120, "e"),
+                                             ("Año2", encabezados[1], 120, "e"),
+                                             ("VarAbs", "Variación (Bs.)", 120, "e"),
+                                             ("VarPct", "Variación (%)", 100, "e")):
+            tree.heading(columna, text=texto)
+            tree.column(columna, width=ancho, anchor=ancla)
+        
+        tree.tag_configure("total", background=color_total, foreground="white", font=Fonts.NORMAL_BOLD)
+        tree.tag_configure("bold", font=Fonts.NORMAL_BOLD)
+        
+        tree.pack(fill=tk.BOTH, expand=True)
+        self.tablas.append((tree, filas))
+    
+    def _crear_texto(self, parent, titulo, color, height, font=Fonts.NORMAL):
+        """Título y tk.Text de solo lectura de una interpretación (vacío)"""
+        ttk.Label(parent, text=titulo, 
+                font=Fonts.HEADER, foreground=color).pack(anchor='w', pady=(0, 5))
+        
+        text_widget = tk.Text(
+            parent,
+            height=height,
+            wrap='word',
+            font=font,
+            bg=Colors.BG_SECONDARY,
+            relief='flat',
+            padx=10,
+            pady=10
+        )
+        text_widget.pack(fill=tk.X, pady=(0, 15))
+        text_widget.config(state='disabled')
+        return text_widget
+    
+    def _par_actual(self, balance):
+        """Pares del modo actual, página mostrada y periodos (desde, hasta) de esa página"""
+        pares = self._pares_modo(balance.n_periodos)
+        pagina = len(pares) - 1 if self.pagina is None else min(self.pagina, len(pares) - 1)
+        return pares, pagina, pares[pagina]
+    
+    @perfilar('interfaz')
     def crear_interfaz(self):
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
@@ -29,328 +177,51 @@ class A3HorizontalTab(ttk.Frame):
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
         
+        # Periodos comparados
+        balance = self._balance_periodos()
+        pares, pagina, (desde, hasta) = self._par_actual(balance)
+        encabezados = (balance.periodos[desde - 1], balance.periodos[hasta - 1])
+        # Con otros periodos cambian el paginador y los encabezados: se reconstruye
+        self.periodos = tuple(balance.periodos)
+        
         # Título
         ttk.Label(
             scrollable_frame,
-            text="A.3 ANÁLISIS HORIZONTAL - EVOLUCIÓN AÑO 1 vs AÑO 2",
+            text=f"A.3 ANÁLISIS HORIZONTAL - EVOLUCIÓN {encabezados[0].upper()} vs {encabezados[1].upper()}",
             font=Fonts.TITLE
         ).pack(pady=Dimensions.PADDING_LARGE)
         
-        # Realizar análisis horizontal
-        from core.analysis.analisis_horizontal import AnalisisHorizontalBalance
-        analisis = AnalisisHorizontalBalance(self.app.balance_data)
-        datos_tabla = analisis.get_tabla_variaciones()
+        if balance.n_periodos > 2:
+            self._crear_paginador(scrollable_frame, balance, pares, pagina)
         
-        # ============================================================
-        # TABLA: Variaciones del Activo
-        # ============================================================
-        tabla_activo_frame = ttk.LabelFrame(
-            scrollable_frame,
-            text=" Análisis Horizontal - ACTIVOS ",
-            padding=Dimensions.PADDING_LARGE
-        )
-        tabla_activo_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
-                            pady=Dimensions.PADDING_MEDIUM)
-        
-        tree_activo = ttk.Treeview(
-            tabla_activo_frame, 
-            columns=("Concepto", "Año1", "Año2", "VarAbs", "VarPct"), 
-            show="headings", 
-            height=10
-        )
-        
-        tree_activo.heading("Concepto", text="Concepto")
-        tree_activo.heading("Año1", text="Año 1")
-        tree_activo.heading("Año2", text="Año 2")
-        tree_activo.heading("VarAbs", text="Variación (Bs.)")
-        tree_activo.heading("VarPct", text="Variación (%)")
-        
-        tree_activo.column("Concepto", width=250, anchor="w")
-        tree_activo.column("Año1", width=120, anchor="e")
-        tree_activo.column("Año2", width=120, anchor="e")
-        tree_activo.column("VarAbs", width=120, anchor="e")
-        tree_activo.column("VarPct", width=100, anchor="e")
-        
-        # Insertar datos de activos
-        for concepto, y1, y2, var_abs, var_pct in datos_tabla['activos']:
-            tag = ()
-            if "TOTAL" in concepto:
-                tag = ("total",)
-            elif "Activo Corriente" == concepto or "Activo No Corriente" == concepto:
-                tag = ("bold",)
-            
-            tree_activo.insert("", "end", values=(
-                concepto,
-                f"{y1:,.2f}",
-                f"{y2:,.2f}",
-                f"{var_abs:+,.2f}",
-                f"{var_pct:+.2f}%"
-            ), tags=tag)
-        
-        tree_activo.tag_configure("total", background=Colors.SUCCESS, foreground="white", font=Fonts.NORMAL_BOLD)
-        tree_activo.tag_configure("bold", font=Fonts.NORMAL_BOLD)
-        
-        tree_activo.pack(fill=tk.BOTH, expand=True)
+        # (tree, filas) de cada tabla
+        self.tablas = []
         
         # ============================================================
-        # TABLA: Variaciones del Pasivo Corriente (DESCOMPUESTO)
+        # TABLA: Variaciones del Activo
         # ============================================================
-        tabla_pc_frame = ttk.LabelFrame(
-            scrollable_frame,
-            text=" Análisis Horizontal - PASIVO CORRIENTE (Detallado) ",
-            padding=Dimensions.PADDING_LARGE
-        )
-        tabla_pc_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
-                        pady=Dimensions.PADDING_MEDIUM)
-        
-        tree_pc = ttk.Treeview(
-            tabla_pc_frame, 
-            columns=("Concepto", "Año1", "Año2", "VarAbs", "VarPct"), 
-            show="headings", 
-            height=5
-        )
-        
-        tree_pc.heading("Concepto", text="Concepto")
-        tree_pc.heading("Año1", text="Año 1")
-        tree_pc.heading("Año2", text="Año 2")
-        tree_pc.heading("VarAbs", text="Variación (Bs.)")
-        tree_pc.heading("VarPct", text="Variación (%)")
-        
-        tree_pc.column("Concepto", width=250, anchor="w")
-        tree_pc.column("Año1", width=120, anchor="e")
-        tree_pc.column("Año2", width=120, anchor="e")
-        tree_pc.column("VarAbs", width=120, anchor="e")
-        tree_pc.column("VarPct", width=100, anchor="e")
-        
-        # Obtener datos descompuestos del Pasivo Corriente
-        balance = self.app.balance_data
-        
-        # Proveedores
-        prov_y1 = balance.proveedores_y1
-        prov_y2 = balance.proveedores_y2
-        var_prov = prov_y2 - prov_y1
-        var_prov_pct = (var_prov / prov_y1 * 100) if prov_y1 != 0 else 0
-        
-        # Impuestos
-        imp_y1 = balance.impuestos_pagar_y1
-        imp_y2 = balance.impuestos_pagar_y2
-        var_imp = imp_y2 - imp_y1
-        var_imp_pct = (var_imp / imp_y1 * 100) if imp_y1 != 0 else 0
-        
-        # Deuda CP
-        deuda_y1 = balance.deuda_cp_y1
-        deuda_y2 = balance.deuda_cp_y2
-        var_deuda = deuda_y2 - deuda_y1
-        var_deuda_pct = (var_deuda / deuda_y1 * 100) if deuda_y1 != 0 else 0
-        
-        # Total PC
-        pc_y1 = balance.get_total_pasivo_corriente(1)
-        pc_y2 = balance.get_total_pasivo_corriente(2)
-        var_pc = pc_y2 - pc_y1
-        var_pc_pct = (var_pc / pc_y1 * 100) if pc_y1 != 0 else 0
-        
-        # Insertar en el tree
-        tree_pc.insert("", "end", values=(
-            "  Proveedores y gastos por pagar",
-            f"{prov_y1:,.2f}",
-            f"{prov_y2:,.2f}",
-            f"{var_prov:+,.2f}",
-            f"{var_prov_pct:+.2f}%"
-        ))
-        
-        tree_pc.insert("", "end", values=(
-            "  Impuestos por pagar",
-            f"{imp_y1:,.2f}",
-            f"{imp_y2:,.2f}",
-            f"{var_imp:+,.2f}",
-            f"{var_imp_pct:+.2f}%"
-        ))
-        
-        tree_pc.insert("", "end", values=(
-            "  Deuda a corto plazo bancaria",
-            f"{deuda_y1:,.2f}",
-            f"{deuda_y2:,.2f}",
-            f"{var_deuda:+,.2f}",
-            f"{var_deuda_pct:+.2f}%"
-        ))
-        
-        tree_pc.insert("", "end", values=(
-            "TOTAL PASIVO CORRIENTE",
-            f"{pc_y1:,.2f}",
-            f"{pc_y2:,.2f}",
-            f"{var_pc:+,.2f}",
-            f"{var_pc_pct:+.2f}%"
-        ), tags=("total",))
-        
-        tree_pc.tag_configure("total", background=Colors.PASIVO, foreground="white", font=Fonts.NORMAL_BOLD)
-        
-        tree_pc.pack(fill=tk.BOTH, expand=True)
+        filas_activo = [
+            (clave, VariacionesHorizontales.CONCEPTOS[clave],
+             "total" if clave == 'activo_total' else "bold" if clave in ('ac', 'anc') else None)
+            for clave in ('caja', 'clientes', 'inversiones', 'existencias', 'ac',
+                          'ppe', 'intangibles', 'anc', 'activo_total')
+        ]
+        self._crear_tabla(scrollable_frame, " Análisis Horizontal - ACTIVOS ",
+                          filas_activo, encabezados, Colors.SUCCESS)
         
         # ============================================================
-        # TABLA: Variaciones del Pasivo No Corriente (DESCOMPUESTO)
+        # TABLAS: Pasivo Corriente, Pasivo No Corriente y Patrimonio (DESCOMPUESTOS)
         # ============================================================
-        tabla_pnc_frame = ttk.LabelFrame(
-            scrollable_frame,
-            text=" Análisis Horizontal - PASIVO NO CORRIENTE (Detallado) ",
-            padding=Dimensions.PADDING_LARGE
-        )
-        tabla_pnc_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
-                        pady=Dimensions.PADDING_MEDIUM)
-        
-        tree_pnc = ttk.Treeview(
-            tabla_pnc_frame, 
-            columns=("Concepto", "Año1", "Año2", "VarAbs", "VarPct"), 
-            show="headings", 
-            height=4
-        )
-        
-        tree_pnc.heading("Concepto", text="Concepto")
-        tree_pnc.heading("Año1", text="Año 1")
-        tree_pnc.heading("Año2", text="Año 2")
-        tree_pnc.heading("VarAbs", text="Variación (Bs.)")
-        tree_pnc.heading("VarPct", text="Variación (%)")
-        
-        tree_pnc.column("Concepto", width=250, anchor="w")
-        tree_pnc.column("Año1", width=120, anchor="e")
-        tree_pnc.column("Año2", width=120, anchor="e")
-        tree_pnc.column("VarAbs", width=120, anchor="e")
-        tree_pnc.column("VarPct", width=100, anchor="e")
-        
-        # Préstamos LP
-        prest_y1 = balance.prestamos_lp_y1
-        prest_y2 = balance.prestamos_lp_y2
-        var_prest = prest_y2 - prest_y1
-        var_prest_pct = (var_prest / prest_y1 * 100) if prest_y1 != 0 else 0
-        
-        # Provisiones LP
-        prov_lp_y1 = balance.provisiones_lp_y1
-        prov_lp_y2 = balance.provisiones_lp_y2
-        var_prov_lp = prov_lp_y2 - prov_lp_y1
-        var_prov_lp_pct = (var_prov_lp / prov_lp_y1 * 100) if prov_lp_y1 != 0 else 0
-        
-        # Total PNC
-        pnc_y1 = balance.get_total_pasivo_no_corriente(1)
-        pnc_y2 = balance.get_total_pasivo_no_corriente(2)
-        var_pnc = pnc_y2 - pnc_y1
-        var_pnc_pct = (var_pnc / pnc_y1 * 100) if pnc_y1 != 0 else 0
-        
-        tree_pnc.insert("", "end", values=(
-            "  Préstamos a largo plazo (5% anual)",
-            f"{prest_y1:,.2f}",
-            f"{prest_y2:,.2f}",
-            f"{var_prest:+,.2f}",
-            f"{var_prest_pct:+.2f}%"
-        ))
-        
-        tree_pnc.insert("", "end", values=(
-            "  Provisiones a largo plazo",
-            f"{prov_lp_y1:,.2f}",
-            f"{prov_lp_y2:,.2f}",
-            f"{var_prov_lp:+,.2f}",
-            f"{var_prov_lp_pct:+.2f}%"
-        ))
-        
-        tree_pnc.insert("", "end", values=(
-            "TOTAL PASIVO NO CORRIENTE",
-            f"{pnc_y1:,.2f}",
-            f"{pnc_y2:,.2f}",
-            f"{var_pnc:+,.2f}",
-            f"{var_pnc_pct:+.2f}%"
-        ), tags=("total",))
-        
-        tree_pnc.tag_configure("total", background=Colors.PASIVO, foreground="white", font=Fonts.NORMAL_BOLD)
-        
-        tree_pnc.pack(fill=tk.BOTH, expand=True)
-        
-        # ============================================================
-        # TABLA: Variaciones del Patrimonio (DESCOMPUESTO)
-        # ============================================================
-        tabla_pat_frame = ttk.LabelFrame(
-            scrollable_frame,
-            text=" Análisis Horizontal - PATRIMONIO (Detallado) ",
-            padding=Dimensions.PADDING_LARGE
-        )
-        tabla_pat_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
-                        pady=Dimensions.PADDING_MEDIUM)
-        
-        tree_pat = ttk.Treeview(
-            tabla_pat_frame, 
-            columns=("Concepto", "Año1", "Año2", "VarAbs", "VarPct"), 
-            show="headings", 
-            height=5
-        )
-        
-        tree_pat.heading("Concepto", text="Concepto")
-        tree_pat.heading("Año1", text="Año 1")
-        tree_pat.heading("Año2", text="Año 2")
-        tree_pat.heading("VarAbs", text="Variación (Bs.)")
-        tree_pat.heading("VarPct", text="Variación (%)")
-        
-        tree_pat.column("Concepto", width=250, anchor="w")
-        tree_pat.column("Año1", width=120, anchor="e")
-        tree_pat.column("Año2", width=120, anchor="e")
-        tree_pat.column("VarAbs", width=120, anchor="e")
-        tree_pat.column("VarPct", width=100, anchor="e")
-        
-        # Capital Social
-        cap_y1 = balance.capital_social_y1
-        cap_y2 = balance.capital_social_y2
-        var_cap = cap_y2 - cap_y1
-        var_cap_pct = (var_cap / cap_y1 * 100) if cap_y1 != 0 else 0
-        
-        # Reservas Legales
-        res_y1 = balance.reservas_legales_y1
-        res_y2 = balance.reservas_legales_y2
-        var_res = res_y2 - res_y1
-        var_res_pct = (var_res / res_y1 * 100) if res_y1 != 0 else 0
-        
-        # Ganancias Acumuladas
-        gan_y1 = balance.ganancias_acum_y1
-        gan_y2 = balance.ganancias_acum_y2
-        var_gan = gan_y2 - gan_y1
-        var_gan_pct = (var_gan / gan_y1 * 100) if gan_y1 != 0 else 0
-        
-        # Total Patrimonio
-        pat_y1 = balance.get_total_patrimonio(1)
-        pat_y2 = balance.get_total_patrimonio(2)
-        var_pat = pat_y2 - pat_y1
-        var_pat_pct = (var_pat / pat_y1 * 100) if pat_y1 != 0 else 0
-        
-        tree_pat.insert("", "end", values=(
-            "  Capital Social",
-            f"{cap_y1:,.2f}",
-            f"{cap_y2:,.2f}",
-            f"{var_cap:+,.2f}",
-            f"{var_cap_pct:+.2f}%"
-        ))
-        
-        tree_pat.insert("", "end", values=(
-            "  Reservas Legales",
-            f"{res_y1:,.2f}",
-            f"{res_y2:,.2f}",
-            f"{var_res:+,.2f}",
-            f"{var_res_pct:+.2f}%"
-        ))
-        
-        tree_pat.insert("", "end", values=(
-            "  Ganancias Acumuladas",
-            f"{gan_y1:,.2f}",
-            f"{gan_y2:,.2f}",
-            f"{var_gan:+,.2f}",
-            f"{var_gan_pct:+.2f}%"
-        ))
-        
-        tree_pat.insert("", "end", values=(
-            "TOTAL PATRIMONIO",
-            f"{pat_y1:,.2f}",
-            f"{pat_y2:,.2f}",
-            f"{var_pat:+,.2f}",
-            f"{var_pat_pct:+.2f}%"
-        ), tags=("total",))
-        
-        tree_pat.tag_configure("total", background=Colors.PATRIMONIO, foreground="white", font=Fonts.NORMAL_BOLD)
-        
-        tree_pat.pack(fill=tk.BOTH, expand=True)
+        for titulo, filas, color in (
+                (" Análisis Horizontal - PASIVO CORRIENTE (Detallado) ", self.FILAS_PC, Colors.PASIVO),
+                (" Análisis Horizontal - PASIVO NO CORRIENTE (Detallado) ", self.FILAS_PNC, Colors.PASIVO),
+                (" Análisis Horizontal - PATRIMONIO (Detallado) ", self.FILAS_PATRIMONIO, Colors.PATRIMONIO)):
+            self._crear_tabla(
+                scrollable_frame, titulo,
+                [(clave, concepto, "total" if not concepto.startswith(" ") else None)
+                 for clave, concepto in filas],
+                encabezados, color
+            )
         
         # ============================================================
         # INTERPRETACIÓN MEJORADA
@@ -363,107 +234,28 @@ class A3HorizontalTab(ttk.Frame):
         interp_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
                         pady=Dimensions.PADDING_MEDIUM)
         
-        analisis_completo = analisis.analisis_completo()
-        
         # 1. ¿Qué activos crecieron más?
-        ttk.Label(interp_frame, text="1. ¿QUÉ ACTIVOS CRECIERON MÁS?", 
-                font=Fonts.HEADER, foreground=Colors.ACTIVO).pack(anchor='w', pady=(0, 5))
-        
-        text_activos = tk.Text(
-            interp_frame,
-            height=5,
-            wrap='word',
-            font=Fonts.NORMAL,
-            bg=Colors.BG_SECONDARY,
-            relief='flat',
-            padx=10,
-            pady=10
-        )
-        text_activos.pack(fill=tk.X, pady=(0, 15))
-        text_activos.insert('1.0', analisis_completo['interpretacion_activos'])
-        text_activos.config(state='disabled')
+        self.text_activos = self._crear_texto(
+            interp_frame, "1. ¿QUÉ ACTIVOS CRECIERON MÁS?", Colors.ACTIVO, 5)
         
         # 2. ¿Cómo se financió el crecimiento? (CON DETALLES)
-        ttk.Label(interp_frame, text="2. ¿CÓMO SE FINANCIÓ EL CRECIMIENTO?", 
-                font=Fonts.HEADER, foreground=Colors.PASIVO).pack(anchor='w', pady=(0, 5))
-        
-        text_financiamiento = tk.Text(
-            interp_frame,
-            height=5,
-            wrap='word',
-            font=Fonts.NORMAL,
-            bg=Colors.BG_SECONDARY,
-            relief='flat',
-            padx=10,
-            pady=10
-        )
-        text_financiamiento.pack(fill=tk.X, pady=(0, 15))
-        text_financiamiento.insert('1.0', analisis_completo['interpretacion_financiamiento'])
-        text_financiamiento.config(state='disabled')
+        self.text_financiamiento = self._crear_texto(
+            interp_frame, "2. ¿CÓMO SE FINANCIÓ EL CRECIMIENTO?", Colors.PASIVO, 5)
         
         # 3. Interpretación Detallada del Pasivo Corriente
-        ttk.Label(interp_frame, text="3. DETALLE DEL PASIVO CORRIENTE", 
-                font=Fonts.HEADER, foreground=Colors.PASIVO).pack(anchor='w', pady=(0, 5))
-        
-        # Generar interpretación específica del PC
-        interpretacion_pc = f"""
-    Proveedores: {'Aumentó' if var_prov > 0 else 'Disminuyó'} en {abs(var_prov):,.2f} Bs. ({abs(var_prov_pct):.2f}%). {'Esto indica mayor financiamiento de proveedores.' if var_prov > 0 else 'Indica pago a proveedores o reducción de compras a crédito.'}
-
-    Impuestos por Pagar: {'Aumentó' if var_imp > 0 else 'Disminuyó'} en {abs(var_imp):,.2f} Bs. ({abs(var_imp_pct):.2f}%). {'Mayor actividad operativa genera más obligaciones tributarias.' if var_imp > 0 else 'Reducción en obligaciones fiscales.'}
-
-    Deuda Bancaria CP: {'Aumentó' if var_deuda > 0 else 'Disminuyó'} en {abs(var_deuda):,.2f} Bs. ({abs(var_deuda_pct):.2f}%). {'Mayor dependencia de financiamiento bancario de corto plazo.' if var_deuda > 0 else 'Reducción de deuda bancaria, mejorando la salud financiera.'}
-        """.strip()
-        
-        text_pc_det = tk.Text(
-            interp_frame,
-            height=6,
-            wrap='word',
-            font=Fonts.SMALL,
-            bg=Colors.BG_SECONDARY,
-            relief='flat',
-            padx=10,
-            pady=10
-        )
-        text_pc_det.pack(fill=tk.X, pady=(0, 15))
-        text_pc_det.insert('1.0', interpretacion_pc)
-        text_pc_det.config(state='disabled')
+        self.text_pc_det = self._crear_texto(
+            interp_frame, "3. DETALLE DEL PASIVO CORRIENTE", Colors.PASIVO, 6, Fonts.SMALL)
         
         # 4. Interpretación Detallada del Patrimonio
-        ttk.Label(interp_frame, text="4. DETALLE DEL PATRIMONIO", 
-                font=Fonts.HEADER, foreground=Colors.PATRIMONIO).pack(anchor='w', pady=(0, 5))
-        
-        # Generar interpretación específica del Patrimonio
-        interpretacion_pat = f"""
-    Capital Social: {'Aumentó' if var_cap > 0 else 'Disminuyó' if var_cap < 0 else 'Se mantuvo'} en {abs(var_cap):,.2f} Bs. {'(Capitalización o nuevos aportes de socios)' if var_cap > 0 else '(Reducción de capital o retiro de socios)' if var_cap < 0 else '(Sin cambios en aportes)'}
-
-    Reservas Legales: {'Aumentó' if var_res > 0 else 'Disminuyó' if var_res < 0 else 'Se mantuvo'} en {abs(var_res):,.2f} Bs. {'Retención de utilidades para cumplir requisitos legales.' if var_res > 0 else ''}
-
-    Ganancias Acumuladas: {'Aumentó' if var_gan > 0 else 'Disminuyó' if var_gan < 0 else 'Se mantuvo'} en {abs(var_gan):,.2f} Bs. ({abs(var_gan_pct):.2f}%). {'Reinversión de utilidades en el negocio.' if var_gan > 0 else 'Distribución de dividendos o pérdidas del período.' if var_gan < 0 else 'Sin cambios significativos.'}
-
-    CONCLUSIÓN: El patrimonio {'se fortaleció' if var_pat > 0 else 'se debilitó'} principalmente {'por retención de utilidades' if abs(var_gan) > abs(var_cap) and var_gan > 0 else 'por nuevos aportes de capital' if var_cap > 0 else 'por distribución de dividendos'}.
-        """.strip()
-        
-        text_pat_det = tk.Text(
-            interp_frame,
-            height=7,
-            wrap='word',
-            font=Fonts.SMALL,
-            bg=Colors.BG_SECONDARY,
-            relief='flat',
-            padx=10,
-            pady=10
-        )
-        text_pat_det.pack(fill=tk.X, pady=(0, 15))
-        text_pat_det.insert('1.0', interpretacion_pat)
-        text_pat_det.config(state='disabled')
+        self.text_pat_det = self._crear_texto(
+            interp_frame, "4. DETALLE DEL PATRIMONIO", Colors.PATRIMONIO, 7, Fonts.SMALL)
         
         # 5. Conclusión General
         ttk.Label(interp_frame, text="5. CONCLUSIÓN GENERAL", 
                 font=Fonts.HEADER, foreground=Colors.PRIMARY).pack(anchor='w', pady=(0, 5))
         
-        conclusion_label = tk.Label(
+        self.conclusion_label = tk.Label(
             interp_frame,
-            text=analisis_completo['conclusion'],
             font=Fonts.NORMAL_BOLD,
             bg=Colors.INFO,
             fg="white",
@@ -474,7 +266,80 @@ class A3HorizontalTab(ttk.Frame):
             relief="raised",
             borderwidth=2
         )
-        conclusion_label.pack(fill=tk.X)
+        self.conclusion_label.pack(fill=tk.X)
+        
+        self._mostrar_datos(balance)
         
         canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
+        scrollbar.pack(side="right", fill="y")
+    
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe tablas e interpretaciones en el lugar.
+        
+        Returns:
+            bool: False si cambiaron los periodos disponibles (hay que
+            reconstruir el paginador y los encabezados)
+        """
+        balance = self._balance_periodos()
+        if tuple(balance.periodos) != self.periodos:
+            return False
+        self._mostrar_datos(balance)
+        return True
+    
+    def _mostrar_datos(self, balance):
+        """Escribe las variaciones del par de periodos mostrado y su interpretación"""
+        _, _, (desde, hasta) = self._par_actual(balance)
+        analisis = AnalisisHorizontalBalance(balance, desde, hasta)
+        variaciones = analisis.variaciones_par
+        
+        for tree, filas in self.tablas:
+            contenido = []
+            for clave, concepto, tag in filas:
+                inicio, fin, var_abs, var_pct = variaciones[clave]
+                contenido.append(((
+                    concepto,
+                    f"{inicio:,.2f}",
+                    f"{fin:,.2f}",
+                    f"{var_abs:+,.2f}",
+                    f"{var_pct:+.2f}%"
+                ), (tag,) if tag else ()))
+            llenar_tabla(tree, contenido)
+        
+        analisis_completo = analisis.analisis_completo()
+        escribir_texto(self.text_activos, analisis_completo['interpretacion_activos'])
+        escribir_texto(self.text_financiamiento, analisis_completo['interpretacion_financiamiento'])
+        escribir_texto(self.text_pc_det, self._interpretacion_pc(variaciones))
+        escribir_texto(self.text_pat_det, self._interpretacion_patrimonio(variaciones))
+        self.conclusion_label.config(text=analisis_completo['conclusion'])
+    
+    def _interpretacion_pc(self, variaciones):
+        """Interpretación específica del Pasivo Corriente"""
+        _, _, var_prov, var_prov_pct = variaciones['proveedores']
+        _, _, var_imp, var_imp_pct = variaciones['impuestos']
+        _, _, var_deuda, var_deuda_pct = variaciones['deuda_cp']
+        
+        return f"""
+    Proveedores: {'Aumentó' if var_prov > 0 else 'Disminuyó'} en {abs(var_prov):,.2f} Bs. ({abs(var_prov_pct):.2f}%). {'Esto indica mayor financiamiento de proveedores.' if var_prov > 0 else 'Indica pago a proveedores o reducción de compras a crédito.'}
+
+    Impuestos por Pagar: {'Aumentó' if var_imp > 0 else 'Disminuyó'} en {abs(var_imp):,.2f} Bs. ({abs(var_imp_pct):.2f}%). {'Mayor actividad operativa genera más obligaciones tributarias.' if var_imp > 0 else 'Reducción en obligaciones fiscales.'}
+
+    Deuda Bancaria CP: {'Aumentó' if var_deuda > 0 else 'Disminuyó'} en {abs(var_deuda):,.2f} Bs. ({abs(var_deuda_pct):.2f}%). {'Mayor dependencia de financiamiento bancario de corto plazo.' if var_deuda > 0 else 'Reducción de deuda bancaria, mejorando la salud financiera.'}
+        """.strip()
+    
+    def _interpretacion_patrimonio(self, variaciones):
+        """Interpretación específica del Patrimonio"""
+        _, _, var_cap, _ = variaciones['capital']
+        _, _, var_res, _ = variaciones['reservas']
+        _, _, var_gan, var_gan_pct = variaciones['ganancias']
+        _, _, var_pat, _ = variaciones['patrimonio']
+        
+        return f"""
+    Capital Social: {'Aumentó' if var_cap > 0 else 'Disminuyó' if var_cap < 0 else 'Se mantuvo'} en {abs(var_cap):,.2f} Bs. {'(Capitalización o nuevos aportes de socios)' if var_cap > 0 else '(Reducción de capital o retiro de socios)' if var_cap < 0 else '(Sin cambios en aportes)'}
+
+    Reservas Legales: {'Aumentó' if var_res > 0 else 'Disminuyó' if var_res < 0 else 'Se mantuvo'} en {abs(var_res):,.2f} Bs. {'Retención de utilidades para cumplir requisitos legales.' if var_res > 0 else ''}
+
+    Ganancias Acumuladas: {'Aumentó' if var_gan > 0 else 'Disminuyó' if var_gan < 0 else 'Se mantuvo'} en {abs(var_gan):,.2f} Bs. ({abs(var_gan_pct):.2f}%). {'Reinversión de utilidades en el negocio.' if var_gan > 0 else 'Distribución de dividendos o pérdidas del período.' if var_gan < 0 else 'Sin cambios significativos.'}
+
+    CONCLUSIÓN: El patrimonio {'se fortaleció' if var_pat > 0 else 'se debilitó'} principalmente {'por retención de utilidades' if abs(var_gan) > abs(var_cap) and var_gan > 0 else 'por nuevos aportes de capital' if var_cap > 0 else 'por distribución de dividendos'}.
+        """.strip()
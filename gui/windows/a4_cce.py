@@ -7,16 +7,21 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions
 from core.analysis.ciclo_conversion_efectivo import CicloConversionEfectivo
+from utils.perfilado import perfilar
 
 
 class A4CCETab(ttk.Frame):
     """Pestaña A4 - Ciclo de Conversión de Efectivo"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'A4'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
 
         # Canvas con scroll
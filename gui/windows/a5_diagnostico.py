@@ -7,16 +7,21 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions
 from core.analysis.diagnostico_patrimonial import DiagnosticoPatrimonialDual
+from utils.perfilado import perfilar
 
 
 class A5DiagnosticoTab(ttk.Frame):
     """Pestaña A5 - Diagnóstico Patrimonial"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'A5'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
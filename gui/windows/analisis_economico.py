@@ -6,11 +6,17 @@ Pestaña de Análisis Financiero - Liquidez - Solvencia
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts
-from gui.windows.c1_rat import C1RATTab
-from gui.windows.c2_rrp import C2RRPTab 
-from gui.windows.c3_dupont import C3DuPontTab
-from gui.windows.c4_margenes import C4MargenesTab
-from gui.windows.c5_apalancamiento import C5ApalancamientoTab
+from utils import perfilado
+from gui.components.pestana_diferida import (
+    agregar_pestana_diferida, importacion_diferida, pestanas_con_cambios, refrescar_pestanas
+)
+
+# Pestañas individuales: cada módulo se importa al abrir su pestaña
+C1RATTab = importacion_diferida('gui.windows.c1_rat', 'C1RATTab')
+C2RRPTab = importacion_diferida('gui.windows.c2_rrp', 'C2RRPTab')
+C3DuPontTab = importacion_diferida('gui.windows.c3_dupont', 'C3DuPontTab')
+C4MargenesTab = importacion_diferida('gui.windows.c4_margenes', 'C4MargenesTab')
+C5ApalancamientoTab = importacion_diferida('gui.windows.c5_apalancamiento', 'C5ApalancamientoTab')
 
 class AnalisisEconomicoTab(ttk.Frame):
     """Pestaña con subpestañas de Análisis Financiero"""
@@ -26,8 +32,8 @@ class AnalisisEconomicoTab(ttk.Frame):
         self.crear_interfaz()
         
         # Suscribirse para marcar como desactualizado
-        if hasattr(self.app, 'on_data_change_callbacks'):
-            self.app.on_data_change_callbacks.append(self.marcar_desactualizado)
+        if hasattr(self.app, 'bus_cambios'):
+            self.app.bus_cambios.suscribir(self.marcar_desactualizado)
     
     def crear_interfaz(self):
         """Crea la interfaz con subpestañas"""
@@ -78,28 +84,51 @@ class AnalisisEconomicoTab(ttk.Frame):
         self.sub_notebook.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
         
         # Crear subpestañas (adaptar según cada análisis)
-        c1_tab = C1RATTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(c1_tab, text="C1. Rentabilidad Económica (RAT)")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: C1RATTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="C1. Rentabilidad Económica (RAT)"
+        )
 
-        c2_tab = C2RRPTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(c2_tab, text="C2 - RRP")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: C2RRPTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="C2 - RRP"
+        )
 
-        c3_tab = C3DuPontTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(c3_tab, text="C3 - DuPont")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: C3DuPontTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="C3 - DuPont"
+        )
 
-        c4_tab = C4MargenesTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(c4_tab, text="C4 - Márgenes")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: C4MargenesTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="C4 - Márgenes"
+        )
     
-        c5_tab = C5ApalancamientoTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(c5_tab, text="C5 - Apalancamiento")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: C5ApalancamientoTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="C5 - Apalancamiento"
+        )
 
         # Marcar como actualizado
         self.datos_desactualizados = False
         if self.label_estado:
             self.label_estado.pack_forget()
     
-    def marcar_desactualizado(self):
+    def marcar_desactualizado(self, cambio=None):
         """Marca que hay datos nuevos"""
+        # Solo si alguna sub-pestaña abierta muestra algo que cambió
+        if not pestanas_con_cambios(self.sub_notebook):
+            return
         self.datos_desactualizados = True
         if self.label_estado and self.label_estado.winfo_exists():
             self.label_estado.pack(side=tk.LEFT, padx=10)
@@ -110,10 +139,14 @@ class AnalisisEconomicoTab(ttk.Frame):
     def actualizar_contenido(self):
         """Actualiza manualmente"""
         try:
-            import matplotlib.pyplot as plt
-            plt.close('all')
+            # Solo las sub-pestañas ya abiertas; se actualizan en el lugar
+            with perfilado.tramo("Actualizar análisis económico", 'refresco'):
+                refrescar_pestanas(self.sub_notebook)
             
-            self.crear_interfaz()
+            # Marcar como actualizado
+            self.datos_desactualizados = False
+            if self.label_estado:
+                self.label_estado.pack_forget()
             print("✅ Análisis actualizado")
         except Exception as e:
             print(f"❌ Error: {e}")
@@ -6,13 +6,17 @@ Pestaña principal de Análisis Financiero con 5 sub-pestañas separadas
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts
+from utils import perfilado
+from gui.components.pestana_diferida import (
+    agregar_pestana_diferida, importacion_diferida, pestanas_con_cambios, refrescar_pestanas
+)
 
-# Importar las pestañas individuales
-from gui.windows.b1_liquidez import B1LiquidezTab
-from gui.windows.b2_solvencia import B2SolvenciaTab
-from gui.windows.b3_comparativa import B3ComparativaTab
-from gui.windows.b4_estructura import B4EstructuraTab
-from gui.windows.b5_estres import B5EstresTab
+# Pestañas individuales: cada módulo se importa al abrir su pestaña
+B1LiquidezTab = importacion_diferida('gui.windows.b1_liquidez', 'B1LiquidezTab')
+B2SolvenciaTab = importacion_diferida('gui.windows.b2_solvencia', 'B2SolvenciaTab')
+B3ComparativaTab = importacion_diferida('gui.windows.b3_comparativa', 'B3ComparativaTab')
+B4EstructuraTab = importacion_diferida('gui.windows.b4_estructura', 'B4EstructuraTab')
+B5EstresTab = importacion_diferida('gui.windows.b5_estres', 'B5EstresTab')
 
 
 class AnalisisFinancieroTab(ttk.Frame):
@@ -29,8 +33,8 @@ class AnalisisFinancieroTab(ttk.Frame):
         self.crear_interfaz()
         
         # Suscribirse para marcar como desactualizado
-        if hasattr(self.app, 'on_data_change_callbacks'):
-            self.app.on_data_change_callbacks.append(self.marcar_desactualizado)
+        if hasattr(self.app, 'bus_cambios'):
+            self.app.bus_cambios.suscribir(self.marcar_desactualizado)
     
     def crear_interfaz(self):
         """Crea la interfaz con subpestañas"""
@@ -92,24 +96,44 @@ class AnalisisFinancieroTab(ttk.Frame):
         """Crea las 5 pestañas del análisis financiero"""
         
         # B1 - Ratios de Liquidez
-        b1_tab = B1LiquidezTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(b1_tab, text="B1 - Liquidez")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: B1LiquidezTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="B1 - Liquidez"
+        )
         
         # B2 - Ratios de Solvencia
-        b2_tab = B2SolvenciaTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(b2_tab, text="B2 - Solvencia")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: B2SolvenciaTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="B2 - Solvencia"
+        )
         
         # B3 - Placeholder (implementar después)
-        b3_tab = B3ComparativaTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(b3_tab, text="B3 - Comparativa")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: B3ComparativaTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="B3 - Comparativa"
+        )
         
         # B4 - Placeholder (implementar después)
-        b4_tab = B4EstructuraTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(b4_tab, text="B4 - Estructura")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: B4EstructuraTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="B4 - Estructura"
+        )
         
         # B5 - Placeholder (implementar después)
-        b5_tab = B5EstresTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(b5_tab, text="B5 - Estrés Financiero")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: B5EstresTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="B5 - Estrés Financiero"
+        )
     
     def _crear_placeholder(self, nombre):
         """Crea una pestaña placeholder"""
@@ -121,8 +145,11 @@ class AnalisisFinancieroTab(ttk.Frame):
         ).pack(expand=True)
         return tab
     
-    def marcar_desactualizado(self):
+    def marcar_desactualizado(self, cambio=None):
         """Marca que hay datos nuevos"""
+        # Solo si alguna sub-pestaña abierta muestra algo que cambió
+        if not pestanas_con_cambios(self.sub_notebook):
+            return
         self.datos_desactualizados = True
         if self.label_estado and self.label_estado.winfo_exists():
             self.label_estado.pack(side=tk.LEFT, padx=10)
@@ -133,10 +160,14 @@ class AnalisisFinancieroTab(ttk.Frame):
     def actualizar_contenido(self):
         """Actualiza manualmente"""
         try:
-            import matplotlib.pyplot as plt
-            plt.close('all')
+            # Solo las sub-pestañas ya abiertas; se actualizan en el lugar
+            with perfilado.tramo("Actualizar análisis financiero", 'refresco'):
+                refrescar_pestanas(self.sub_notebook)
             
-            self.crear_interfaz()
+            # Marcar como actualizado
+            self.datos_desactualizados = False
+            if self.label_estado:
+                self.label_estado.pack_forget()
             print("✅ Análisis Financiero actualizado")
         except Exception as e:
             print(f"❌ Error: {e}")
\ No newline at end of file
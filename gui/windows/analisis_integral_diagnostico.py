@@ -6,10 +6,16 @@ Pestaña de Análisis Financiero - Liquidez - Solvencia
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts
-from gui.windows.d1_matriz_ratios import D1MatrizRatiosTab
-from gui.windows.d2_fortalezas_debilidades import D2FortalezasDebilidadesTab
-from gui.windows.d3_resumen_integral import D3ResumenIntegralTab 
-from gui.windows.d4_recomendaciones import D4RecomendacionesTab
+from utils import perfilado
+from gui.components.pestana_diferida import (
+    agregar_pestana_diferida, importacion_diferida, pestanas_con_cambios, refrescar_pestanas
+)
+
+# Pestañas individuales: cada módulo se importa al abrir su pestaña
+D1MatrizRatiosTab = importacion_diferida('gui.windows.d1_matriz_ratios', 'D1MatrizRatiosTab')
+D2FortalezasDebilidadesTab = importacion_diferida('gui.windows.d2_fortalezas_debilidades', 'D2FortalezasDebilidadesTab')
+D3ResumenIntegralTab = importacion_diferida('gui.windows.d3_resumen_integral', 'D3ResumenIntegralTab')
+D4RecomendacionesTab = importacion_diferida('gui.windows.d4_recomendaciones', 'D4RecomendacionesTab')
 
 class AnalisisIntegralTab(ttk.Frame):
     """Pestaña con subpestañas de Análisis Financiero"""
@@ -25,8 +31,8 @@ class AnalisisIntegralTab(ttk.Frame):
         self.crear_interfaz()
         
         # Suscribirse para marcar como desactualizado
-        if hasattr(self.app, 'on_data_change_callbacks'):
-            self.app.on_data_change_callbacks.append(self.marcar_desactualizado)
+        if hasattr(self.app, 'bus_cambios'):
+            self.app.bus_cambios.suscribir(self.marcar_desactualizado)
     
     def crear_interfaz(self):
         """Crea la interfaz con subpestañas"""
@@ -77,25 +83,44 @@ class AnalisisIntegralTab(ttk.Frame):
         self.sub_notebook.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
         
         # Crear subpestañas (adaptar según cada análisis)
-        d1_tab = D1MatrizRatiosTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(d1_tab, text="D1 - Matriz Ratios")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: D1MatrizRatiosTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="D1 - Matriz Ratios"
+        )
         
-        d2_tab = D2FortalezasDebilidadesTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(d2_tab, text="D2 - Fortalezas/Debilidades")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: D2FortalezasDebilidadesTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="D2 - Fortalezas/Debilidades"
+        )
 
-        d3_tab = D3ResumenIntegralTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(d3_tab, text="D3 - Resumen Integral")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: D3ResumenIntegralTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="D3 - Resumen Integral"
+        )
 
-        d4_tab = D4RecomendacionesTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(d4_tab, text="D4 - Recomendaciones Estratégicas")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: D4RecomendacionesTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="D4 - Recomendaciones Estratégicas"
+        )
         
         # Marcar como actualizado
         self.datos_desactualizados = False
         if self.label_estado:
             self.label_estado.pack_forget()
     
-    def marcar_desactualizado(self):
+    def marcar_desactualizado(self, cambio=None):
         """Marca que hay datos nuevos"""
+        # Solo si alguna sub-pestaña abierta muestra algo que cambió
+        if not pestanas_con_cambios(self.sub_notebook):
+            return
         self.datos_desactualizados = True
         if self.label_estado and self.label_estado.winfo_exists():
             self.label_estado.pack(side=tk.LEFT, padx=10)
@@ -106,10 +131,14 @@ class AnalisisIntegralTab(ttk.Frame):
     def actualizar_contenido(self):
         """Actualiza manualmente"""
         try:
-            import matplotlib.pyplot as plt
-            plt.close('all')
+            # Solo las sub-pestañas ya abiertas; se actualizan en el lugar
+            with perfilado.tramo("Actualizar análisis integral", 'refresco'):
+                refrescar_pestanas(self.sub_notebook)
             
-            self.crear_interfaz()
+            # Marcar como actualizado
+            self.datos_desactualizados = False
+            if self.label_estado:
+                self.label_estado.pack_forget()
             print("✅ Análisis actualizado")
         except Exception as e:
             print(f"❌ Error: {e}")
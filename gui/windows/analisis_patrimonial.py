@@ -6,12 +6,17 @@ Pestaña principal de Análisis Patrimonial con 5 sub-pestañas separadas
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts
+from utils import perfilado
+from gui.components.pestana_diferida import (
+    agregar_pestana_diferida, importacion_diferida, pestanas_con_cambios, refrescar_pestanas
+)
 
-from gui.windows.a1_fondo_maniobra import A1FondoManiobraTab
-from gui.windows.a2_vertical import A2VerticalTab
-from gui.windows.a3_horizontal import A3HorizontalTab
-from gui.windows.a4_cce import A4CCETab
-from gui.windows.a5_diagnostico import A5DiagnosticoTab
+# Pestañas individuales: cada módulo se importa al abrir su pestaña
+A1FondoManiobraTab = importacion_diferida('gui.windows.a1_fondo_maniobra', 'A1FondoManiobraTab')
+A2VerticalTab = importacion_diferida('gui.windows.a2_vertical', 'A2VerticalTab')
+A3HorizontalTab = importacion_diferida('gui.windows.a3_horizontal', 'A3HorizontalTab')
+A4CCETab = importacion_diferida('gui.windows.a4_cce', 'A4CCETab')
+A5DiagnosticoTab = importacion_diferida('gui.windows.a5_diagnostico', 'A5DiagnosticoTab')
 
 
 class AnalisisPatrimonialTab(ttk.Frame):
@@ -27,8 +32,8 @@ class AnalisisPatrimonialTab(ttk.Frame):
         
         self.crear_interfaz()
         
-        if hasattr(self.app, 'on_data_change_callbacks'):
-            self.app.on_data_change_callbacks.append(self.marcar_desactualizado)
+        if hasattr(self.app, 'bus_cambios'):
+            self.app.bus_cambios.suscribir(self.marcar_desactualizado)
     
     def crear_interfaz(self):
         for widget in self.winfo_children():
@@ -83,26 +88,49 @@ class AnalisisPatrimonialTab(ttk.Frame):
     def crear_pestanas(self):
         """Crea las 5 pestañas del análisis patrimonial"""
         
-        a1_tab = A1FondoManiobraTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(a1_tab, text="A1 - Fondo Maniobra")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: A1FondoManiobraTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="A1 - Fondo Maniobra"
+        )
         
-        a2_tab = A2VerticalTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(a2_tab, text="A2 - Vertical")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: A2VerticalTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="A2 - Vertical"
+        )
         
-        a3_tab = A3HorizontalTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(a3_tab, text="A3 - Horizontal")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: A3HorizontalTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="A3 - Horizontal"
+        )
         
-        a4_tab = A4CCETab(self.sub_notebook, self.app)
-        self.sub_notebook.add(a4_tab, text="A4 - CCE")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: A4CCETab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="A4 - CCE"
+        )
         
-        a5_tab = A5DiagnosticoTab(self.sub_notebook, self.app)
-        self.sub_notebook.add(a5_tab, text="A5 - Diagnóstico")
+        agregar_pestana_diferida(
+            self.sub_notebook,
+            lambda padre: A5DiagnosticoTab(padre, self.app),
+            contexto=getattr(self.app, "analysis_context", None),
+            text="A5 - Diagnóstico"
+        )
     
-    def marcar_desactualizado(self):
+    def marcar_desactualizado(self, cambio=None):
         """
         Se llama automáticamente cuando se modifican datos en Balance/Estado.
         Muestra el indicador visual sin actualizar aún.
         """
+        # Solo si alguna sub-pestaña abierta muestra algo que cambió
+        if not pestanas_con_cambios(self.sub_notebook):
+            return
         self.datos_desactualizados = True
         if self.label_estado and self.label_estado.winfo_exists():
             self.label_estado.pack(side=tk.LEFT, padx=10)
@@ -114,15 +142,17 @@ class AnalisisPatrimonialTab(ttk.Frame):
     def actualizar_contenido(self):
         """
         Actualiza manualmente el contenido cuando el usuario hace clic.
-        Cierra figuras de matplotlib antes de recrear.
+        Las sub-pestañas ya abiertas se actualizan en el lugar (o se
+        reconstruyen solo ellas); las no abiertas se crean al abrirlas.
         """
         try:
-            # Cerrar todas las figuras de matplotlib para liberar memoria
-            import matplotlib.pyplot as plt
-            plt.close('all')
+            with perfilado.tramo("Actualizar análisis patrimonial", 'refresco'):
+                refrescar_pestanas(self.sub_notebook)
             
-            # Recrear toda la interfaz con datos actualizados
-            self.crear_interfaz()
+            # Marcar como actualizado
+            self.datos_desactualizados = False
+            if self.label_estado:
+                self.label_estado.pack_forget()
             
             print("✅ Análisis patrimonial actualizado correctamente")
             
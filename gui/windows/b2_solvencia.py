@@ -6,16 +6,26 @@ Pestaña B2 - Ratios de Solvencia
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class B2SolvenciaTab(ttk.Frame):
     """Pestaña B2 - Ratios de Solvencia"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'B2'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        
+        # Widgets de cada columna: {(key, year): {nombre: widget}}
+        self.columnas = {}
+        
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de B2"""
         
@@ -49,12 +59,8 @@ class B2SolvenciaTab(ttk.Frame):
             foreground=Colors.TEXT_SECONDARY
         ).pack(pady=(0, 15))
         
-        # Calcular ratios
-        from core.calculators.ratio_calculator import RatioCalculator
-        from core.analysis.financial_interpreter import FinancialInterpreter
-        
-        calculator = RatioCalculator(self.app.balance_data, self.app.income_data)
-        interpreter = FinancialInterpreter()
+        # Ratios y evaluaciones compartidos por todas las pestañas
+        contexto = self.app.analysis_context
         
         # Ratios
         ratios_info = [
@@ -69,14 +75,13 @@ class B2SolvenciaTab(ttk.Frame):
                 scrollable_frame,
                 nombre,
                 key,
-                calculator,
-                interpreter
+                contexto
             )
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
-    def _crear_analisis_ratio(self, parent, nombre, key, calculator, interpreter):
+    def _crear_analisis_ratio(self, parent, nombre, key, contexto):
         """Crea el análisis de un ratio con diseño lado a lado"""
         
         # Frame principal del ratio
@@ -87,14 +92,6 @@ class B2SolvenciaTab(ttk.Frame):
         )
         ratio_frame.pack(fill=tk.X, padx=20, pady=15)
         
-        # Calcular valores
-        valor_y1 = getattr(calculator, f'calcular_{key}')(1)
-        valor_y2 = getattr(calculator, f'calcular_{key}')(2)
-        
-        # Análisis
-        analisis_y1 = interpreter.evaluate_ratio(key, valor_y1)
-        analisis_y2 = interpreter.evaluate_ratio(key, valor_y2)
-        
         # ==========================================
         # DISEÑO LADO A LADO
         # ==========================================
@@ -107,7 +104,7 @@ class B2SolvenciaTab(ttk.Frame):
         col_y1 = ttk.Frame(container)
         col_y1.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
         
-        self._crear_columna_analisis(col_y1, "AÑO 1", valor_y1, analisis_y1)
+        self.columnas[(key, 1)] = self._crear_columna_analisis(col_y1, "AÑO 1")
         
         # Separador vertical
         separator = ttk.Separator(container, orient='vertical')
@@ -117,10 +114,55 @@ class B2SolvenciaTab(ttk.Frame):
         col_y2 = ttk.Frame(container)
         col_y2.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
         
-        self._crear_columna_analisis(col_y2, "AÑO 2", valor_y2, analisis_y2)
+        self.columnas[(key, 2)] = self._crear_columna_analisis(col_y2, "AÑO 2")
+        
+        for year in (1, 2):
+            self._mostrar_valores(self.columnas[(key, year)], key, year, contexto)
     
-    def _crear_columna_analisis(self, parent, titulo, valor, analisis):
-        """Crea una columna con el análisis de un año"""
+    def refrescar(self, cambiados=None):
+        """
+        Actualiza valores, semáforos y textos en el lugar, sin recrear widgets.
+        
+        Args:
+            cambiados: Nodos del grafo de dependencias que cambiaron; si se
+                       indica, solo se reescriben las columnas de esos ratios
+        
+        Returns:
+            bool: True (la estructura de la pestaña no cambia con los datos)
+        """
+        contexto = self.app.analysis_context
+        for (key, year), widgets in self.columnas.items():
+            if cambiados is not None and ('ratio', key, year) not in cambiados \
+                    and ('banda', key, year) not in cambiados:
+                continue
+            self._mostrar_valores(widgets, key, year, contexto)
+        return True
+    
+    def _mostrar_valores(self, widgets, key, year, contexto):
+        """Escribe en los widgets de una columna el valor y análisis actuales"""
+        valor = contexto.ratio(key, year)
+        analisis = contexto.evaluar(key, year)
+        color = self._get_color_semaforo(analisis['estado'])
+        
+        widgets['valor_frame'].config(bg=color)
+        widgets['valor'].config(text=f"{valor:.4f}", bg=color)
+        
+        estado_text = self._traducir_estado(analisis['estado']).upper()
+        widgets['estado'].config(text=f"Estado: {estado_text}", fg=color)
+        
+        rango = analisis['rango_optimo']
+        widgets['rango'].config(text=f"Rango Óptimo: {rango[0]:.2f} - {rango[1]:.2f}")
+        
+        escribir_texto(widgets['interpretacion'], analisis['interpretacion'])
+        escribir_texto(widgets['causa'], analisis['causa'])
+    
+    def _crear_columna_analisis(self, parent, titulo):
+        """
+        Crea una columna (vacía) para el análisis de un año
+        
+        Returns:
+            dict: Widgets que muestran valores, para actualizarlos después
+        """
         
         # Título del año
         ttk.Label(
@@ -133,38 +175,33 @@ class B2SolvenciaTab(ttk.Frame):
         # Valor con semáforo
         valor_frame = tk.Frame(
             parent,
-            bg=self._get_color_semaforo(analisis['estado']),
             relief='raised',
             borderwidth=2
         )
         valor_frame.pack(fill=tk.X, pady=(0, 10))
         
-        tk.Label(
+        valor_label = tk.Label(
             valor_frame,
-            text=f"{valor:.4f}",
             font=Fonts.LARGE,
-            bg=self._get_color_semaforo(analisis['estado']),
             fg="white",
             pady=15
-        ).pack()
+        )
+        valor_label.pack()
         
         # Estado
-        estado_text = self._traducir_estado(analisis['estado']).upper()
-        tk.Label(
+        estado_label = tk.Label(
             parent,
-            text=f"Estado: {estado_text}",
-            font=Fonts.NORMAL_BOLD,
-            fg=self._get_color_semaforo(analisis['estado'])
-        ).pack(pady=(0, 5))
+            font=Fonts.NORMAL_BOLD
+        )
+        estado_label.pack(pady=(0, 5))
         
         # Rango óptimo
-        rango = analisis['rango_optimo']
-        tk.Label(
+        rango_label = tk.Label(
             parent,
-            text=f"Rango Óptimo: {rango[0]:.2f} - {rango[1]:.2f}",
             font=Fonts.SMALL,
             fg=Colors.TEXT_SECONDARY
-        ).pack(pady=(0, 10))
+        )
+        rango_label.pack(pady=(0, 10))
         
         # Interpretación
         ttk.Label(
@@ -184,7 +221,6 @@ class B2SolvenciaTab(ttk.Frame):
             pady=5
         )
         interp_text.pack(fill=tk.X, pady=(0, 10))
-        interp_text.insert('1.0', analisis['interpretacion'])
         interp_text.config(state='disabled')
         
         # Causa
@@ -205,8 +241,16 @@ class B2SolvenciaTab(ttk.Frame):
             pady=5
         )
         causa_text.pack(fill=tk.X)
-        causa_text.insert('1.0', analisis['causa'])
         causa_text.config(state='disabled')
+        
+        return {
+            'valor_frame': valor_frame,
+            'valor': valor_label,
+            'estado': estado_label,
+            'rango': rango_label,
+            'interpretacion': interp_text,
+            'causa': causa_text
+        }
     
     def _get_color_semaforo(self, estado):
         """Retorna color semáforo según el estado"""
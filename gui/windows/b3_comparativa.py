@@ -8,18 +8,24 @@ no simplemente si subio o bajo.
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions
-from core.calculators.ratio_calculator import RatioCalculator
-from core.analysis.financial_interpreter import FinancialInterpreter
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class B3ComparativaTab(ttk.Frame):
     """Pestana B3 - Comparativa de Ratios entre año 1 y año 2"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'B3'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # {ratio: (label año 1, label año 2, label variación, label tendencia)}
+        self.filas = {}
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de B3"""
         
@@ -44,23 +50,44 @@ class B3ComparativaTab(ttk.Frame):
         )
         titulo.pack(pady=Dimensions.PADDING_LARGE)
         
-        # Calculadoras
-        calculator = RatioCalculator(self.app.balance_data, self.app.income_data)
-        interpreter = FinancialInterpreter()
-        
         # SECCION 1: COMPARATIVA DE LIQUIDEZ
-        self._crear_seccion_liquidez(scrollable_frame, calculator, interpreter)
+        self._crear_seccion_liquidez(scrollable_frame)
         
         # SECCION 2: COMPARATIVA DE SOLVENCIA
-        self._crear_seccion_solvencia(scrollable_frame, calculator, interpreter)
+        self._crear_seccion_solvencia(scrollable_frame)
         
         # SECCION 3: CONCLUSION GENERAL
-        self._crear_conclusion_general(scrollable_frame, calculator, interpreter)
+        self._crear_conclusion_general(scrollable_frame)
+        
+        self._mostrar_datos()
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
-    def _crear_seccion_liquidez(self, parent, calculator, interpreter):
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe valores, tendencias e interpretaciones en el lugar.
+        
+        Returns:
+            bool: True (las filas no cambian con los datos)
+        """
+        self._mostrar_datos()
+        return True
+    
+    def _mostrar_datos(self):
+        """Escribe en las filas y los textos los ratios actuales"""
+        # Ratios e interpretación compartidos por todas las pestañas
+        calculator = self.app.analysis_context.calculator
+        interpreter = self.app.analysis_context.interpreter
+        
+        for key in self.filas:
+            self._mostrar_fila(key, calculator, interpreter)
+        
+        escribir_texto(self.text_liquidez, self._generar_interpretacion_liquidez(calculator, interpreter))
+        escribir_texto(self.text_solvencia, self._generar_interpretacion_solvencia(calculator, interpreter))
+        escribir_texto(self.text_conclusion, self._generar_conclusion_general(calculator, interpreter))
+    
+    def _crear_seccion_liquidez(self, parent):
         """Crea la seccion de comparativa de liquidez"""
         
         frame = ttk.LabelFrame(
@@ -93,12 +120,12 @@ class B3ComparativaTab(ttk.Frame):
         ]
         
         for idx, (nombre, key) in enumerate(ratios_liquidez, start=1):
-            self._crear_fila_comparativa(frame, idx, nombre, key, calculator, interpreter)
+            self._crear_fila_comparativa(frame, idx, nombre, key)
         
         # Interpretacion de liquidez
-        self._crear_interpretacion_liquidez(parent, calculator, interpreter)
+        self._crear_interpretacion_liquidez(parent)
     
-    def _crear_seccion_solvencia(self, parent, calculator, interpreter):
+    def _crear_seccion_solvencia(self, parent):
         """Crea la seccion de comparativa de solvencia"""
         
         frame = ttk.LabelFrame(
@@ -131,10 +158,10 @@ class B3ComparativaTab(ttk.Frame):
         ]
         
         for idx, (nombre, key) in enumerate(ratios_solvencia, start=1):
-            self._crear_fila_comparativa(frame, idx, nombre, key, calculator, interpreter)
+            self._crear_fila_comparativa(frame, idx, nombre, key)
         
         # Interpretacion de solvencia
-        self._crear_interpretacion_solvencia(parent, calculator, interpreter)
+        self._crear_interpretacion_solvencia(parent)
     
     def _evaluar_tendencia_vs_optimo(self, ratio_key, valor_y1, valor_y2, interpreter):
         """
@@ -222,8 +249,29 @@ class B3ComparativaTab(ttk.Frame):
         else:
             return 0  # Esta dentro del rango optimo
     
-    def _crear_fila_comparativa(self, parent, row, nombre, key, calculator, interpreter):
-        """Crea una fila de la tabla comparativa"""
+    def _crear_fila_comparativa(self, parent, row, nombre, key):
+        """Crea una fila (sin valores) de la tabla comparativa"""
+        
+        # Nombre del ratio
+        tk.Label(
+            parent,
+            text=nombre,
+            font=Fonts.NORMAL_BOLD,
+            bg=Colors.BG_PRIMARY,
+            anchor="w"
+        ).grid(row=row, column=0, sticky="ew", padx=5, pady=3)
+        
+        # año 1, año 2, Variacion y Tendencia
+        etiquetas = []
+        for columna, fuente in ((1, Fonts.NORMAL), (2, Fonts.NORMAL),
+                                (3, Fonts.NORMAL_BOLD), (4, Fonts.NORMAL_BOLD)):
+            etiqueta = tk.Label(parent, font=fuente, bg=Colors.BG_PRIMARY)
+            etiqueta.grid(row=row, column=columna, padx=5, pady=3)
+            etiquetas.append(etiqueta)
+        self.filas[key] = tuple(etiquetas)
+    
+    def _mostrar_fila(self, key, calculator, interpreter):
+        """Escribe los valores, la variacion y la tendencia de una fila"""
         
         # Calcular valores
         if hasattr(calculator, f'calcular_{key}'):
@@ -244,50 +292,17 @@ class B3ComparativaTab(ttk.Frame):
             key, valor_y1, valor_y2, interpreter
         )
         
-        # Nombre del ratio
-        tk.Label(
-            parent,
-            text=nombre,
-            font=Fonts.NORMAL_BOLD,
-            bg=Colors.BG_PRIMARY,
-            anchor="w"
-        ).grid(row=row, column=0, sticky="ew", padx=5, pady=3)
-        
-        # año 1
-        tk.Label(
-            parent,
-            text=f"{valor_y1:.2f}",
-            font=Fonts.NORMAL,
-            bg=Colors.BG_PRIMARY
-        ).grid(row=row, column=1, padx=5, pady=3)
-        
-        # año 2
-        tk.Label(
-            parent,
-            text=f"{valor_y2:.2f}",
-            font=Fonts.NORMAL,
-            bg=Colors.BG_PRIMARY
-        ).grid(row=row, column=2, padx=5, pady=3)
-        
-        # Variacion
-        tk.Label(
-            parent,
+        label_y1, label_y2, label_variacion, label_tendencia = self.filas[key]
+        label_y1.config(text=f"{valor_y1:.2f}")
+        label_y2.config(text=f"{valor_y2:.2f}")
+        label_variacion.config(
             text=f"{variacion:+.1f}%",
-            font=Fonts.NORMAL_BOLD,
-            fg=Colors.POSITIVE if variacion > 0 else Colors.NEGATIVE if variacion < 0 else Colors.NEUTRAL,
-            bg=Colors.BG_PRIMARY
-        ).grid(row=row, column=3, padx=5, pady=3)
-        
+            fg=Colors.POSITIVE if variacion > 0 else Colors.NEGATIVE if variacion < 0 else Colors.NEUTRAL
+        )
         # Tendencia (ahora basada en rango optimo)
-        tk.Label(
-            parent,
-            text=tendencia,
-            font=Fonts.NORMAL_BOLD,
-            fg=color_tendencia,
-            bg=Colors.BG_PRIMARY
-        ).grid(row=row, column=4, padx=5, pady=3)
+        label_tendencia.config(text=tendencia, fg=color_tendencia)
     
-    def _crear_interpretacion_liquidez(self, parent, calculator, interpreter):
+    def _crear_interpretacion_liquidez(self, parent):
         """Crea la interpretacion de liquidez"""
         
         frame = ttk.LabelFrame(
@@ -298,9 +313,6 @@ class B3ComparativaTab(ttk.Frame):
         frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE, 
                   pady=Dimensions.PADDING_MEDIUM)
         
-        # Generar interpretacion
-        interpretacion = self._generar_interpretacion_liquidez(calculator, interpreter)
-        
         text_widget = tk.Text(
             frame,
             height=8,
@@ -312,10 +324,10 @@ class B3ComparativaTab(ttk.Frame):
             pady=10
         )
         text_widget.pack(fill=tk.X)
-        text_widget.insert('1.0', interpretacion)
         text_widget.config(state='disabled')
+        self.text_liquidez = text_widget
     
-    def _crear_interpretacion_solvencia(self, parent, calculator, interpreter):
+    def _crear_interpretacion_solvencia(self, parent):
         """Crea la interpretacion de solvencia"""
         
         frame = ttk.LabelFrame(
@@ -326,9 +338,6 @@ class B3ComparativaTab(ttk.Frame):
         frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE, 
                   pady=Dimensions.PADDING_MEDIUM)
         
-        # Generar interpretacion
-        interpretacion = self._generar_interpretacion_solvencia(calculator, interpreter)
-        
         text_widget = tk.Text(
             frame,
             height=8,
@@ -340,10 +349,10 @@ class B3ComparativaTab(ttk.Frame):
             pady=10
         )
         text_widget.pack(fill=tk.X)
-        text_widget.insert('1.0', interpretacion)
         text_widget.config(state='disabled')
+        self.text_solvencia = text_widget
     
-    def _crear_conclusion_general(self, parent, calculator, interpreter):
+    def _crear_conclusion_general(self, parent):
         """Crea la conclusion general"""
         
         frame = ttk.LabelFrame(
@@ -354,9 +363,6 @@ class B3ComparativaTab(ttk.Frame):
         frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE, 
                   pady=Dimensions.PADDING_MEDIUM)
         
-        # Generar conclusion
-        conclusion = self._generar_conclusion_general(calculator, interpreter)
-        
         text_widget = tk.Text(
             frame,
             height=5,
@@ -368,8 +374,8 @@ class B3ComparativaTab(ttk.Frame):
             pady=10
         )
         text_widget.pack(fill=tk.X)
-        text_widget.insert('1.0', conclusion)
         text_widget.config(state='disabled')
+        self.text_conclusion = text_widget
     
     def _generar_interpretacion_liquidez(self, calculator, interpreter):
         """Genera la interpretacion de liquidez basada en rangos optimos"""
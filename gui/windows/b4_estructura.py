@@ -7,16 +7,42 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions
 from core.analysis.estructura_financiera import EstructuraFinanciera
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class B4EstructuraTab(ttk.Frame):
     """Pestaña B4 - Análisis de Estructura Financiera"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'B4'
+    
+    # Componentes de la composición: (nombre, clave en porcentajes(), componente)
+    COMPONENTES = (
+        ("Pasivo Corriente", 'pct_pc', 'pasivo_corriente'),
+        ("Pasivo No Corriente", 'pct_pnc', 'pasivo_no_corriente'),
+        ("Patrimonio Neto", 'pct_pn', 'patrimonio'),
+        ("", None, None),
+        ("DEUDA TOTAL", 'pct_deuda_total', 'deuda_total'),
+    )
+    
+    NIVEL_COLORS = {
+        'ÓPTIMA': Colors.SUCCESS,
+        'EQUILIBRADA': Colors.INFO,
+        'ACEPTABLE': Colors.WARNING,
+        'RIESGOSA': Colors.DANGER
+    }
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Widgets que muestran datos, por (componente, año) o por año
+        self.valores_componentes = {}
+        self.textos_componentes = {}
+        self.diagnosticos = {}
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de B4"""
         
@@ -41,43 +67,82 @@ class B4EstructuraTab(ttk.Frame):
         )
         titulo.pack(pady=Dimensions.PADDING_LARGE)
         
-        # Obtener datos
-        balance = self.app.balance_data
-        
-        # ✅ USAR MÉTODOS CORRECTOS
-        # Año 1
-        estructura_y1 = EstructuraFinanciera(
-            pasivo_corriente=balance.get_total_pasivo_corriente(year=1),
-            pasivo_no_corriente=balance.get_total_pasivo_no_corriente(year=1),
-            patrimonio=balance.get_total_patrimonio(year=1),
-            sector='tecnologia'
-        )
+        estructura_y1, _ = self._estructuras()
         
-        # Año 2
-        estructura_y2 = EstructuraFinanciera(
-            pasivo_corriente=balance.get_total_pasivo_corriente(year=2),
-            pasivo_no_corriente=balance.get_total_pasivo_no_corriente(year=2),
-            patrimonio=balance.get_total_patrimonio(year=2),
-            sector='tecnologia'
-        )
-
-
         # Sección: Composición del Financiamiento
-        self._crear_composicion(scrollable_frame, estructura_y1, estructura_y2)
+        self._crear_composicion(scrollable_frame)
         
         # Sección: Análisis por Componente
-        self._crear_analisis_componentes(scrollable_frame, estructura_y1, estructura_y2)
+        self._crear_analisis_componentes(scrollable_frame)
         
-        # Sección: Rangos Óptimos Sector Tecnológico
+        # Sección: Rangos Óptimos Sector Tecnológico (no dependen de los datos)
         self._crear_rangos_sector(scrollable_frame, estructura_y1)
         
         # Sección: Diagnóstico General
-        self._crear_diagnostico(scrollable_frame, estructura_y1, estructura_y2)
+        self._crear_diagnostico(scrollable_frame)
+        
+        self._mostrar_datos()
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
-    def _crear_composicion(self, parent, est_y1, est_y2):
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe porcentajes, interpretaciones y diagnósticos en el lugar.
+        
+        Returns:
+            bool: True (la estructura de la pestaña no cambia con los datos)
+        """
+        self._mostrar_datos()
+        return True
+    
+    def _estructuras(self):
+        """EstructuraFinanciera de los años 1 y 2 con los datos actuales"""
+        balance = self.app.balance_data
+        return tuple(
+            EstructuraFinanciera(
+                pasivo_corriente=balance.get_total_pasivo_corriente(year=year),
+                pasivo_no_corriente=balance.get_total_pasivo_no_corriente(year=year),
+                patrimonio=balance.get_total_patrimonio(year=year),
+                sector='tecnologia'
+            )
+            for year in (1, 2)
+        )
+    
+    def _mostrar_datos(self):
+        """Escribe en los widgets ya creados la estructura de los datos actuales"""
+        for year, estructura in enumerate(self._estructuras(), start=1):
+            # Composición
+            pcts = estructura.porcentajes()
+            for _, pct, key in self.COMPONENTES:
+                if key is None:
+                    continue
+                estado = estructura.evaluar_componente(key)
+                bg_color = {
+                    'optimo': Colors.SUCCESS,
+                    'aceptable': Colors.WARNING,
+                    'riesgoso': Colors.DANGER
+                }.get(estado, Colors.NEUTRAL)
+                self.valores_componentes[(key, year)].config(
+                    text=f"{pcts[pct]*100:.1f}%", bg=bg_color
+                )
+            
+            # Interpretación por componente
+            interpretacion = estructura.interpretar()
+            for (key, year_texto), text_widget in self.textos_componentes.items():
+                if year_texto == year:
+                    escribir_texto(text_widget, interpretacion[key])
+            
+            # Diagnóstico
+            diagnostico = estructura.diagnostico()
+            nivel, text = self.diagnosticos[year]
+            nivel.config(
+                text=diagnostico['nivel'],
+                bg=self.NIVEL_COLORS.get(diagnostico['nivel'], Colors.NEUTRAL)
+            )
+            escribir_texto(text, diagnostico['descripcion'])
+    
+    def _crear_composicion(self, parent):
         """Crea la tabla de composición lado a lado"""
         
         frame = ttk.LabelFrame(
@@ -105,7 +170,7 @@ class B4EstructuraTab(ttk.Frame):
             pady=10
         ).pack(fill=tk.X)
         
-        self._crear_tabla_componentes(col_y1, est_y1, 1)
+        self._crear_tabla_componentes(col_y1, 1)
         
         # Separador
         ttk.Separator(container, orient="vertical").pack(side=tk.LEFT, fill=tk.Y, padx=15)
@@ -123,12 +188,10 @@ class B4EstructuraTab(ttk.Frame):
             pady=10
         ).pack(fill=tk.X)
         
-        self._crear_tabla_componentes(col_y2, est_y2, 2)
+        self._crear_tabla_componentes(col_y2, 2)
     
-    def _crear_tabla_componentes(self, parent, estructura, year):
-        """Crea tabla de componentes para un año"""
-        
-        pcts = estructura.porcentajes()
+    def _crear_tabla_componentes(self, parent, year):
+        """Crea tabla de componentes (sin valores) para un año"""
         
         # ✅ Frame con grid
         tabla_frame = tk.Frame(parent, bg=Colors.BG_PRIMARY)
@@ -138,17 +201,9 @@ class B4EstructuraTab(ttk.Frame):
         tabla_frame.columnconfigure(0, weight=1)  # ✅ Solo weight, sin minsize
         tabla_frame.columnconfigure(1, weight=2)  # ✅ Solo weight, sin minsize
         
-        componentes = [
-            ("Pasivo Corriente", pcts['pct_pc'], 'pasivo_corriente'),
-            ("Pasivo No Corriente", pcts['pct_pnc'], 'pasivo_no_corriente'),
-            ("Patrimonio Neto", pcts['pct_pn'], 'patrimonio'),
-            ("", None, None),
-            ("DEUDA TOTAL", pcts['pct_deuda_total'], 'deuda_total')
-        ]
-        
         row = 0
-        for nombre, valor, key in componentes:
-            if valor is None:
+        for nombre, _, key in self.COMPONENTES:
+            if key is None:
                 ttk.Separator(tabla_frame, orient="horizontal").grid(
                     row=row, column=0, columnspan=2, sticky="ew", pady=8
                 )
@@ -164,37 +219,25 @@ class B4EstructuraTab(ttk.Frame):
                 anchor="w"
             ).grid(row=row, column=0, sticky="w", padx=5, pady=5)
             
-            # Valor
-            valor_text = f"{valor*100:.1f}%"
-            
-            # Color
-            if key:
-                estado = estructura.evaluar_componente(key)
-                bg_color = {
-                    'optimo': Colors.SUCCESS,
-                    'aceptable': Colors.WARNING,
-                    'riesgoso': Colors.DANGER
-                }.get(estado, Colors.NEUTRAL)
-            else:
-                bg_color = Colors.NEUTRAL
-            
+            # Valor (texto y color según el estado los pone _mostrar_datos)
             # ✅ SIN width fijo, solo padding
-            tk.Label(
+            valor = tk.Label(
                 tabla_frame,
-                text=valor_text,
                 font=Fonts.LARGE if key == 'deuda_total' else Fonts.NORMAL_BOLD,
-                bg=bg_color,
+                bg=Colors.NEUTRAL,
                 fg="white",
                 padx=8,  # ✅ Padding moderado
                 pady=4,
                 relief="raised",
                 anchor="center"
-            ).grid(row=row, column=1, sticky="ew", padx=5, pady=5)
+            )
+            valor.grid(row=row, column=1, sticky="ew", padx=5, pady=5)
+            self.valores_componentes[(key, year)] = valor
             
             row += 1
 
     
-    def _crear_analisis_componentes(self, parent, est_y1, est_y2):
+    def _crear_analisis_componentes(self, parent):
         """Crea análisis detallado de cada componente"""
         
         frame = ttk.LabelFrame(
@@ -205,9 +248,6 @@ class B4EstructuraTab(ttk.Frame):
         frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE, 
                   pady=Dimensions.PADDING_MEDIUM)
         
-        interp_y1 = est_y1.interpretar()
-        interp_y2 = est_y2.interpretar()
-        
         componentes = [
             ("Patrimonio Neto (Recursos Propios)", 'patrimonio'),
             ("Deuda Total", 'deuda_total'),
@@ -216,14 +256,10 @@ class B4EstructuraTab(ttk.Frame):
         ]
         
         for nombre, key in componentes:
-            self._crear_analisis_componente_dual(
-                frame, nombre, key,
-                interp_y1[key], interp_y2[key],
-                est_y1, est_y2
-            )
+            self._crear_analisis_componente_dual(frame, nombre, key)
     
-    def _crear_analisis_componente_dual(self, parent, nombre, key, interp_y1, interp_y2, est_y1, est_y2):
-        """Crea análisis dual de un componente"""
+    def _crear_analisis_componente_dual(self, parent, nombre, key):
+        """Crea análisis dual (sin texto) de un componente"""
         
         comp_frame = ttk.LabelFrame(
             parent,
@@ -258,8 +294,8 @@ class B4EstructuraTab(ttk.Frame):
             pady=5
         )
         text_y1.pack(fill=tk.X)
-        text_y1.insert('1.0', interp_y1)
         text_y1.config(state='disabled')
+        self.textos_componentes[(key, 1)] = text_y1
         
         # Separador
         ttk.Separator(container, orient="vertical").pack(side=tk.LEFT, fill=tk.Y, padx=10)
@@ -286,8 +322,8 @@ class B4EstructuraTab(ttk.Frame):
             pady=5
         )
         text_y2.pack(fill=tk.X)
-        text_y2.insert('1.0', interp_y2)
         text_y2.config(state='disabled')
+        self.textos_componentes[(key, 2)] = text_y2
     
     def _crear_rangos_sector(self, parent, estructura):
         """Crea sección de rangos óptimos"""
@@ -326,7 +362,7 @@ class B4EstructuraTab(ttk.Frame):
                 pady=3
             ).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
     
-    def _crear_diagnostico(self, parent, est_y1, est_y2):
+    def _crear_diagnostico(self, parent):
         """Crea diagnóstico general"""
         
         frame = ttk.LabelFrame(
@@ -342,20 +378,18 @@ class B4EstructuraTab(ttk.Frame):
         container.pack(fill=tk.X, expand=True)
         
         # Año 1
-        diag_y1 = est_y1.diagnostico()
-        col_y1 = self._crear_diagnostico_columna(container, "AÑO 1", diag_y1)
+        col_y1 = self._crear_diagnostico_columna(container, "AÑO 1", 1)
         col_y1.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
         
         # Separador
         ttk.Separator(container, orient="vertical").pack(side=tk.LEFT, fill=tk.Y, padx=10)
         
         # Año 2
-        diag_y2 = est_y2.diagnostico()
-        col_y2 = self._crear_diagnostico_columna(container, "AÑO 2", diag_y2)
+        col_y2 = self._crear_diagnostico_columna(container, "AÑO 2", 2)
         col_y2.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
     
-    def _crear_diagnostico_columna(self, parent, titulo, diagnostico):
-        """Crea columna de diagnóstico"""
+    def _crear_diagnostico_columna(self, parent, titulo, year):
+        """Crea columna de diagnóstico (sin contenido)"""
         
         col = tk.Frame(parent, bg=Colors.BG_PRIMARY)
         
@@ -368,23 +402,16 @@ class B4EstructuraTab(ttk.Frame):
         ).pack(anchor='w', pady=(0, 5))
         
         # Nivel
-        nivel_colors = {
-            'ÓPTIMA': Colors.SUCCESS,
-            'EQUILIBRADA': Colors.INFO,
-            'ACEPTABLE': Colors.WARNING,
-            'RIESGOSA': Colors.DANGER
-        }
-        
-        tk.Label(
+        nivel = tk.Label(
             col,
-            text=diagnostico['nivel'],
             font=Fonts.LARGE,
-            bg=nivel_colors.get(diagnostico['nivel'], Colors.NEUTRAL),
+            bg=Colors.NEUTRAL,
             fg="white",
             padx=20,
             pady=10,
             relief="raised"
-        ).pack(fill=tk.X, pady=5)
+        )
+        nivel.pack(fill=tk.X, pady=5)
         
         # Descripción
         text = tk.Text(
@@ -398,7 +425,7 @@ class B4EstructuraTab(ttk.Frame):
             pady=5
         )
         text.pack(fill=tk.X)
-        text.insert('1.0', diagnostico['descripcion'])
         text.config(state='disabled')
+        self.diagnosticos[year] = (nivel, text)
         
         return col
\ No newline at end of file
@@ -7,16 +7,30 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions, NumberFormat
 from core.analysis.estres_financiero import EstresFinanciero
+from core.analysis.estres_montecarlo import CORRELACION_ESTRES, NIVELES_EQUILIBRIO
+from utils.perfilado import perfilar
 
 
 class B5EstresTab(ttk.Frame):
     """Pestaña B5 - Análisis de Estrés Financiero"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'B5'
+    
+    # Simulación Monte Carlo: opciones de escenarios y semilla fija para
+    # que el mismo dato dé siempre el mismo resultado
+    OPCIONES_ESCENARIOS = ("100,000", "1,000,000")
+    SEMILLA_MONTECARLO = 2024
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        self.analisis = None
+        self.mc_escenarios = None
+        self.mc_resultados = None
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de B5"""
         
@@ -52,18 +66,9 @@ class B5EstresTab(ttk.Frame):
         )
         subtitulo.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE, pady=5)
         
-        # Obtener datos del año 2
-        income_data = self.app.income_data
-        ingreso_servicios_y2 = income_data.ingresos_servicios_y2
-        utilidad_neta_y2 = income_data.get_utilidad_neta(year=2)
-        
-        # Crear análisis
-        analisis = EstresFinanciero(
-            ingreso_actual=ingreso_servicios_y2,
-            utilidad_neta_actual=utilidad_neta_y2,
-            proporcion_gastos_fijos=0.40,
-            proporcion_gastos_variables=0.60
-        )
+        # Crear análisis con los datos del año 2
+        analisis = self._crear_analisis()
+        self.analisis = analisis
         
         # Aplicar escenario pesimista
         escenario = analisis.aplicar_escenario_pesimista(caida_ingresos=0.30)
@@ -83,6 +88,9 @@ class B5EstresTab(ttk.Frame):
         # Sección 5: Conclusión
         self._crear_conclusion(scrollable_frame, analisis, escenario)
         
+        # Sección 6: Simulación Monte Carlo
+        self._crear_montecarlo(scrollable_frame)
+        
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
@@ -502,4 +510,259 @@ class B5EstresTab(ttk.Frame):
         )
         text_widget.pack(fill=tk.X)
         text_widget.insert('1.0', conclusion)
-        text_widget.config(state='disabled')
\ No newline at end of file
+        text_widget.config(state='disabled')
+    
+    # ============================================================
+    # SIMULACIÓN MONTE CARLO
+    # ============================================================
+    
+    def _crear_montecarlo(self, parent):
+        """Crea la sección de simulación Monte Carlo"""
+        
+        frame = ttk.LabelFrame(
+            parent,
+            text=" 🎲 Simulación Monte Carlo ",
+            padding=Dimensions.PADDING_LARGE
+        )
+        frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE, 
+                  pady=Dimensions.PADDING_MEDIUM)
+        
+        tk.Label(
+            frame,
+            text=(
+                "Escenarios aleatorios de caída de ingresos (0% a 60%, más probable 30%), "
+                "gastos fijos (30% a 50%) y aumento del costo financiero, con la caída de "
+                "ingresos correlacionada con crédito más caro."
+            ),
+            font=Fonts.SMALL,
+            bg=Colors.BG_PRIMARY,
+            fg=Colors.TEXT_SECONDARY,
+            wraplength=700,
+            justify="left"
+        ).pack(anchor='w', pady=(0, 5))
+        
+        controles = tk.Frame(frame, bg=Colors.BG_PRIMARY)
+        controles.pack(fill=tk.X, pady=5)
+        
+        tk.Label(
+            controles,
+            text="Escenarios:",
+            font=Fonts.NORMAL,
+            bg=Colors.BG_PRIMARY
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.mc_escenarios = ttk.Combobox(
+            controles,
+            values=self.OPCIONES_ESCENARIOS,
+            state="readonly",
+            width=12
+        )
+        self.mc_escenarios.current(0)
+        self.mc_escenarios.pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            controles,
+            text="▶ Simular",
+            font=Fonts.NORMAL_BOLD,
+            bg=Colors.INFO,
+            fg="white",
+            cursor="hand2",
+            command=self.simular_montecarlo
+        ).pack(side=tk.LEFT, padx=10)
+        
+        self.mc_resultados = tk.Frame(frame, bg=Colors.BG_PRIMARY)
+        self.mc_resultados.pack(fill=tk.X, pady=5)
+        
+        self.simular_montecarlo()
+    
+    def _crear_analisis(self):
+        """EstresFinanciero con los datos actuales del año 2"""
+        income_data = self.app.income_data
+        return EstresFinanciero(
+            ingreso_actual=income_data.ingresos_servicios_y2,
+            utilidad_neta_actual=income_data.get_utilidad_neta(year=2),
+            proporcion_gastos_fijos=0.40,
+            proporcion_gastos_variables=0.60
+        )
+    
+    def _revision_grafo(self):
+        """Revisión actual del grafo de dependencias (None sin contexto)"""
+        contexto = getattr(self.app, 'analysis_context', None)
+        return contexto.sincronizar() if contexto is not None else None
+    
+    def simular_montecarlo(self):
+        """
+        Ejecuta la simulación en segundo plano con los datos actuales y
+        muestra el resultado al terminar.
+        
+        No se envía con versión de datos: una edición que no toca lo que
+        lee B5 (p.ej. del balance) no invalida la simulación. Al terminar
+        se revisa en el grafo si las entradas de B5 cambiaron.
+        """
+        n = int(self.mc_escenarios.get().replace(",", ""))
+        analisis = self._crear_analisis()
+        argumentos = dict(
+            n=n,
+            gastos_financieros=self.app.income_data.gastos_financieros_y2,
+            correlacion=CORRELACION_ESTRES,
+            semilla=self.SEMILLA_MONTECARLO
+        )
+        
+        self._mostrar_mensaje_montecarlo(f"⏳ Simulando {n:,} escenarios...")
+        
+        if not hasattr(self.app, 'ejecutor'):
+            self._mostrar_montecarlo(analisis.simular_montecarlo(**argumentos))
+            return
+        
+        revision = self._revision_grafo()
+        self.app.ejecutor.enviar(
+            (id(self), 'montecarlo'),
+            analisis.simular_montecarlo,
+            al_terminar=lambda resultado: self._terminar_montecarlo(resultado, revision),
+            al_fallar=lambda e: self._mostrar_mensaje_montecarlo(f"❌ Error en la simulación: {e}"),
+            **argumentos
+        )
+    
+    def _terminar_montecarlo(self, resultado, revision):
+        """
+        Muestra el resultado si las entradas de B5 no cambiaron mientras se
+        simulaba; si cambiaron, la pestaña se reconstruye al refrescarse
+        (y vuelve a simular), así que solo se avisa.
+        """
+        contexto = getattr(self.app, 'analysis_context', None)
+        if revision is not None and contexto is not None:
+            contexto.sincronizar()
+            if contexto.grafo.cambio(('vista', self.VISTA, None), revision):
+                self._mostrar_mensaje_montecarlo(
+                    "⏳ Los datos cambiaron durante la simulación; se repetirá al actualizar la pestaña")
+                return
+        self._mostrar_montecarlo(resultado)
+    
+    def _limpiar_montecarlo(self):
+        """Retorna el marco de resultados vacío, o None si ya no existe"""
+        if self.mc_resultados is None or not self.mc_resultados.winfo_exists():
+            return None
+        for widget in self.mc_resultados.winfo_children():
+            widget.destroy()
+        return self.mc_resultados
+    
+    def _mostrar_mensaje_montecarlo(self, mensaje):
+        frame = self._limpiar_montecarlo()
+        if frame is not None:
+            tk.Label(frame, text=mensaje, font=Fonts.NORMAL,
+                     bg=Colors.BG_PRIMARY).pack(anchor='w', pady=5)
+    
+    def _mostrar_montecarlo(self, resultado):
+        """Muestra métricas de riesgo, percentiles y niveles del punto de equilibrio"""
+        frame = self._limpiar_montecarlo()
+        if frame is None:
+            return
+        
+        confianza = resultado['nivel_confianza'] * 100
+        prob_perdida = resultado['probabilidad_perdida']
+        
+        metricas = [
+            ("Probabilidad de pérdida", f"{prob_perdida * 100:.1f}%",
+             Colors.DANGER if prob_perdida >= 0.25 else
+             Colors.WARNING if prob_perdida >= 0.05 else Colors.SUCCESS),
+            ("Utilidad neta esperada", NumberFormat.format(resultado['utilidad_esperada']), Colors.INFO),
+            (f"VaR {confianza:.0f}% (caída de utilidad)", NumberFormat.format(resultado['var']), Colors.WARNING),
+            (f"CVaR {confianza:.0f}% (caída promedio en el peor {100 - confianza:.0f}%)",
+             NumberFormat.format(resultado['cvar']), Colors.DANGER),
+        ]
+        
+        for nombre, texto, color in metricas:
+            fila = tk.Frame(frame, bg=Colors.BG_PRIMARY)
+            fila.pack(fill=tk.X, pady=3)
+            
+            tk.Label(
+                fila,
+                text=nombre,
+                font=Fonts.NORMAL_BOLD,
+                bg=Colors.BG_PRIMARY,
+                anchor="w",
+                width=45
+            ).pack(side=tk.LEFT, padx=5)
+            
+            tk.Label(
+                fila,
+                text=texto,
+                font=Fonts.NORMAL_BOLD,
+                bg=color,
+                fg="white",
+                padx=20,
+                pady=5,
+                relief="raised"
+            ).pack(side=tk.RIGHT, padx=5)
+        
+        # Bandas de percentiles
+        ttk.Separator(frame, orient="horizontal").pack(fill=tk.X, pady=10)
+        
+        percentiles = resultado['percentiles']
+        columnas = list(percentiles['nueva_utilidad'])
+        
+        header_frame = tk.Frame(frame, bg=Colors.BG_SECONDARY)
+        header_frame.pack(fill=tk.X, pady=5)
+        
+        tk.Label(header_frame, text="Percentil", font=Fonts.HEADER,
+                 bg=Colors.BG_SECONDARY, width=25, anchor="w").pack(side=tk.LEFT, padx=5)
+        for p in columnas:
+            tk.Label(header_frame, text=f"P{p}", font=Fonts.HEADER,
+                     bg=Colors.BG_SECONDARY, width=12).pack(side=tk.LEFT, padx=2)
+        
+        filas = [
+            ("Utilidad Neta", percentiles['nueva_utilidad'], NumberFormat.format),
+            ("Punto de Equilibrio (% ingresos)", percentiles['porcentaje_equilibrio'],
+             lambda v: f"{v:.1f}%"),
+            ("Caída de Ingresos", percentiles['caida_ingresos'], lambda v: f"{v * 100:.1f}%"),
+        ]
+        for nombre, valores, formato in filas:
+            fila = tk.Frame(frame, bg=Colors.BG_PRIMARY)
+            fila.pack(fill=tk.X, pady=2)
+            tk.Label(fila, text=nombre, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY,
+                     width=25, anchor="w").pack(side=tk.LEFT, padx=5)
+            for p in columnas:
+                tk.Label(fila, text=formato(valores[p]), font=Fonts.NORMAL,
+                         bg=Colors.BG_PRIMARY, width=12).pack(side=tk.LEFT, padx=2)
+        
+        # Distribución de niveles del punto de equilibrio
+        ttk.Separator(frame, orient="horizontal").pack(fill=tk.X, pady=10)
+        
+        nivel_colors = {
+            'ÓPTIMO': Colors.SUCCESS,
+            'ACEPTABLE': Colors.INFO,
+            'RIESGOSO': Colors.WARNING,
+            'CRÍTICO': Colors.DANGER
+        }
+        
+        fila_niveles = tk.Frame(frame, bg=Colors.BG_PRIMARY)
+        fila_niveles.pack(fill=tk.X, pady=5)
+        
+        tk.Label(
+            fila_niveles,
+            text="Nivel del punto de equilibrio:",
+            font=Fonts.NORMAL_BOLD,
+            bg=Colors.BG_PRIMARY
+        ).pack(side=tk.LEFT, padx=5)
+        
+        for nivel in NIVELES_EQUILIBRIO:
+            proporcion = resultado['niveles_equilibrio'].get(nivel)
+            if proporcion is None:
+                continue
+            tk.Label(
+                fila_niveles,
+                text=f"{nivel} {proporcion * 100:.1f}%",
+                font=Fonts.NORMAL_BOLD,
+                bg=nivel_colors[nivel],
+                fg="white",
+                padx=10,
+                pady=4
+            ).pack(side=tk.LEFT, padx=3)
+        
+        tk.Label(
+            frame,
+            text=f"{resultado['n_escenarios']:,} escenarios simulados",
+            font=Fonts.SMALL,
+            bg=Colors.BG_PRIMARY,
+            fg=Colors.TEXT_SECONDARY
+        ).pack(anchor='e', pady=(5, 0))
@@ -233,12 +233,16 @@ class BalanceTab(ttk.Frame):
     def calcular_automatico(self):
         """Calcula automáticamente todos los totales"""
         try:
+            # Guardar en el modelo solo los campos que cambiaron
+            campos_modificados = []
             for field_name, entry in self.entries.items():
                 try:
                     value = NumberFormat.parse(entry.get())
-                    setattr(self.balance_model, field_name, value)
                 except:
-                    setattr(self.balance_model, field_name, 0.0)
+                    value = 0.0
+                if getattr(self.balance_model, field_name, None) != value:
+                    setattr(self.balance_model, field_name, value)
+                    campos_modificados.append(field_name)
             
             # Actualizar campos calculados
             self.actualizar_label("total_corriente_y1", 
@@ -270,8 +274,8 @@ class BalanceTab(ttk.Frame):
             self.actualizar_label("total_pasivo_patrimonio_y2", 
                                  self.balance_model.get_total_pasivo_patrimonio(2))
             
-            if self.callback_actualizar:
-                self.callback_actualizar()
+            if self.callback_actualizar and campos_modificados:
+                self.callback_actualizar(campos_modificados)
                 
         except Exception as e:
             pass
@@ -288,4 +292,9 @@ class BalanceTab(ttk.Frame):
             entry.delete(0, tk.END)
             entry.insert(0, NumberFormat.format(value))
         
-        self.calcular_automatico()
\ No newline at end of file
+        self.calcular_automatico()
+    
+    def refrescar(self):
+        """Muestra los valores actuales del modelo (p.ej. al abrir otra empresa)"""
+        self.cargar_datos()
+        return True
@@ -7,16 +7,31 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions, NumberFormat
 from core.analysis.rat_analysis import RATAnalysis
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class C1RATTab(ttk.Frame):
     """Pestaña C1 - Rentabilidad del Activo Total"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'C1'
+    
+    ESTADO_TEXTO = {
+        'sostenible': 'SOSTENIBLE ✓',
+        'precaucion': 'PRECAUCIÓN ⚠',
+        'no_sostenible': 'NO SOSTENIBLE ✗',
+        'estable': 'ESTABLE ='
+    }
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Widgets que muestran datos, por nombre (los escribe _mostrar_datos)
+        self.campos = {}
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de C1"""
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
@@ -40,14 +55,6 @@ class C1RATTab(ttk.Frame):
         )
         titulo.pack(pady=Dimensions.PADDING_LARGE)
         
-        # Obtener análisis
-        analisis = RATAnalysis(self.app.balance_data, self.app.income_data)
-        resultado = analisis.analisis_dual()
-        
-        ano1 = resultado['ano_1']
-        ano2 = resultado['ano_2']
-        comparacion = resultado['comparacion']
-        
         # FÓRMULA DEL RAT
         formula_frame = ttk.LabelFrame(
             scrollable_frame,
@@ -106,31 +113,27 @@ class C1RATTab(ttk.Frame):
         tk.Label(tabla_frame, text="BAII (Utilidad Operativa)", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=1, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(tabla_frame, text=NumberFormat.format(ano1['baii']),
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=1, padx=10, pady=3)
+        self.campos['baii_1'] = tk.Label(tabla_frame, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['baii_1'].grid(row=1, column=1, padx=10, pady=3)
         
         tk.Label(tabla_frame, text="BAII (Utilidad Operativa)", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=1, column=3, padx=10, pady=3, sticky="w")
-        tk.Label(tabla_frame, text=NumberFormat.format(ano2['baii']),
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=4, padx=10, pady=3)
+        self.campos['baii_2'] = tk.Label(tabla_frame, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['baii_2'].grid(row=1, column=4, padx=10, pady=3)
         
         # Activo Total
         tk.Label(tabla_frame, text="Activo Total", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=2, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(tabla_frame, text=NumberFormat.format(ano1['activo_total']),
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=1, padx=10, pady=3)
+        self.campos['activo_total_1'] = tk.Label(tabla_frame, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['activo_total_1'].grid(row=2, column=1, padx=10, pady=3)
         
         tk.Label(tabla_frame, text="Activo Total", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=2, column=3, padx=10, pady=3, sticky="w")
-        tk.Label(tabla_frame, text=NumberFormat.format(ano2['activo_total']),
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=4, padx=10, pady=3)
+        self.campos['activo_total_2'] = tk.Label(tabla_frame, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['activo_total_2'].grid(row=2, column=4, padx=10, pady=3)
         
         # Separador
         ttk.Separator(tabla_frame, orient="horizontal").grid(
@@ -139,44 +142,30 @@ class C1RATTab(ttk.Frame):
             row=3, column=3, columnspan=2, sticky="ew", pady=8)
         
         # RAT con color de fondo según sostenibilidad
-        rat_1 = ano1['rat']
-        rat_2 = ano2['rat']
-        
         tk.Label(tabla_frame, text="RAT (%)", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=4, column=0, padx=10, pady=5, sticky="w")
         
         # Color para Año 1 (referencia)
-        tk.Label(tabla_frame, 
-                text=f"{rat_1:.2f}%",
+        self.campos['rat_1'] = tk.Label(tabla_frame, 
                 font=Fonts.LARGE,
                 bg=Colors.INFO,
                 fg="white",
                 padx=10,
-                pady=5).grid(row=4, column=1, padx=10, pady=5)
+                pady=5)
+        self.campos['rat_1'].grid(row=4, column=1, padx=10, pady=5)
         
         tk.Label(tabla_frame, text="RAT (%)", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=4, column=3, padx=10, pady=5, sticky="w")
         
         # Color para Año 2 según sostenibilidad
-        sostenibilidad = comparacion['sostenible']
-        if sostenibilidad == 'sostenible':
-            color_rat2 = Colors.SUCCESS
-        elif sostenibilidad == 'precaucion':
-            color_rat2 = Colors.WARNING
-        elif sostenibilidad == 'no_sostenible':
-            color_rat2 = Colors.DANGER
-        else:  # estable
-            color_rat2 = Colors.INFO
-        
-        tk.Label(tabla_frame, 
-                text=f"{rat_2:.2f}%",
+        self.campos['rat_2'] = tk.Label(tabla_frame, 
                 font=Fonts.LARGE,
-                bg=color_rat2,
                 fg="white",
                 padx=10,
-                pady=5).grid(row=4, column=4, padx=10, pady=5)
+                pady=5)
+        self.campos['rat_2'].grid(row=4, column=4, padx=10, pady=5)
         
         # COMPARACIÓN
         comparacion_frame = ttk.LabelFrame(
@@ -188,50 +177,36 @@ class C1RATTab(ttk.Frame):
                               pady=Dimensions.PADDING_MEDIUM)
         
         # Cambio absoluto
-        delta = comparacion['delta_absoluto']
         tk.Label(comparacion_frame, text="Cambio Absoluto:", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=0, column=0, padx=10, pady=5, sticky="w")
         
-        color_delta = Colors.POSITIVE if delta > 0 else Colors.NEGATIVE if delta < 0 else Colors.NEUTRAL
-        tk.Label(comparacion_frame, 
-                text=f"{delta:+.2f} puntos porcentuales",
+        self.campos['delta'] = tk.Label(comparacion_frame, 
                 font=Fonts.NORMAL,
-                fg=color_delta,
-                bg=Colors.BG_PRIMARY).grid(row=0, column=1, padx=10, pady=5, sticky="w")
+                bg=Colors.BG_PRIMARY)
+        self.campos['delta'].grid(row=0, column=1, padx=10, pady=5, sticky="w")
         
         # Cambio relativo
-        crecimiento = comparacion['crecimiento_relativo']
         tk.Label(comparacion_frame, text="Cambio Relativo:", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=1, column=0, padx=10, pady=5, sticky="w")
         
-        color_crec = Colors.POSITIVE if crecimiento > 0 else Colors.NEGATIVE if crecimiento < 0 else Colors.NEUTRAL
-        tk.Label(comparacion_frame, 
-                text=f"{crecimiento:+.2f}%",
+        self.campos['crecimiento'] = tk.Label(comparacion_frame, 
                 font=Fonts.NORMAL,
-                fg=color_crec,
-                bg=Colors.BG_PRIMARY).grid(row=1, column=1, padx=10, pady=5, sticky="w")
+                bg=Colors.BG_PRIMARY)
+        self.campos['crecimiento'].grid(row=1, column=1, padx=10, pady=5, sticky="w")
         
         # Estado de sostenibilidad
         tk.Label(comparacion_frame, text="Sostenibilidad:", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=2, column=0, padx=10, pady=5, sticky="w")
         
-        estado_texto = {
-            'sostenible': 'SOSTENIBLE ✓',
-            'precaucion': 'PRECAUCIÓN ⚠',
-            'no_sostenible': 'NO SOSTENIBLE ✗',
-            'estable': 'ESTABLE ='
-        }
-        
-        tk.Label(comparacion_frame, 
-                text=estado_texto.get(sostenibilidad, 'N/A'),
+        self.campos['sostenibilidad'] = tk.Label(comparacion_frame, 
                 font=Fonts.NORMAL_BOLD,
                 fg="white",
-                bg=color_rat2,
                 padx=10,
-                pady=3).grid(row=2, column=1, padx=10, pady=5, sticky="w")
+                pady=3)
+        self.campos['sostenibilidad'].grid(row=2, column=1, padx=10, pady=5, sticky="w")
         
         # INTERPRETACIÓN PROFESIONAL
         interpretacion_frame = ttk.LabelFrame(
@@ -253,8 +228,60 @@ class C1RATTab(ttk.Frame):
             pady=10
         )
         interp_text.pack(fill=tk.X)
-        interp_text.insert('1.0', comparacion['interpretacion'])
         interp_text.config(state='disabled')
+        self.campos['interpretacion'] = interp_text
+        
+        self._mostrar_datos()
         
         canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
+        scrollbar.pack(side="right", fill="y")
+    
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe valores, comparación e interpretación en el lugar.
+        
+        Returns:
+            bool: True (la estructura de la pestaña no cambia con los datos)
+        """
+        self._mostrar_datos()
+        return True
+    
+    def _mostrar_datos(self):
+        """Escribe en self.campos el análisis RAT de los datos actuales"""
+        analisis = RATAnalysis(self.app.balance_data, self.app.income_data)
+        resultado = analisis.analisis_dual()
+        
+        ano1 = resultado['ano_1']
+        ano2 = resultado['ano_2']
+        comparacion = resultado['comparacion']
+        
+        for year, ano in ((1, ano1), (2, ano2)):
+            self.campos[f'baii_{year}'].config(text=NumberFormat.format(ano['baii']))
+            self.campos[f'activo_total_{year}'].config(text=NumberFormat.format(ano['activo_total']))
+        
+        # Color para Año 2 según sostenibilidad
+        sostenibilidad = comparacion['sostenible']
+        if sostenibilidad == 'sostenible':
+            color_rat2 = Colors.SUCCESS
+        elif sostenibilidad == 'precaucion':
+            color_rat2 = Colors.WARNING
+        elif sostenibilidad == 'no_sostenible':
+            color_rat2 = Colors.DANGER
+        else:  # estable
+            color_rat2 = Colors.INFO
+        
+        self.campos['rat_1'].config(text=f"{ano1['rat']:.2f}%")
+        self.campos['rat_2'].config(text=f"{ano2['rat']:.2f}%", bg=color_rat2)
+        
+        delta = comparacion['delta_absoluto']
+        color_delta = Colors.POSITIVE if delta > 0 else Colors.NEGATIVE if delta < 0 else Colors.NEUTRAL
+        self.campos['delta'].config(text=f"{delta:+.2f} puntos porcentuales", fg=color_delta)
+        
+        crecimiento = comparacion['crecimiento_relativo']
+        color_crec = Colors.POSITIVE if crecimiento > 0 else Colors.NEGATIVE if crecimiento < 0 else Colors.NEUTRAL
+        self.campos['crecimiento'].config(text=f"{crecimiento:+.2f}%", fg=color_crec)
+        
+        self.campos['sostenibilidad'].config(
+            text=self.ESTADO_TEXTO.get(sostenibilidad, 'N/A'), bg=color_rat2
+        )
+        escribir_texto(self.campos['interpretacion'], comparacion['interpretacion'])
\ No newline at end of file
@@ -7,16 +7,24 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions, NumberFormat
 from core.analysis.rrp_analysis import RRPAnalysis
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class C2RRPTab(ttk.Frame):
     """Pestaña C2 - Rentabilidad de Recursos Propios"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'C2'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Widgets que muestran datos, por nombre (los escribe _mostrar_datos)
+        self.campos = {}
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de C2"""
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
@@ -40,18 +48,6 @@ class C2RRPTab(ttk.Frame):
         )
         titulo.pack(pady=Dimensions.PADDING_LARGE)
         
-        # Obtener análisis
-        analisis = RRPAnalysis(self.app.balance_data, self.app.income_data)
-        resultado_rrp = analisis.analisis_dual_rrp()
-        resultado_comparativo = analisis.analisis_comparativo_rat_rrp()
-        
-        ano1_rrp = resultado_rrp['ano_1']
-        ano2_rrp = resultado_rrp['ano_2']
-        comparacion_rrp = resultado_rrp['comparacion']
-        
-        ano1_comp = resultado_comparativo['ano_1']
-        ano2_comp = resultado_comparativo['ano_2']
-        
         # FÓRMULA DEL RRP
         formula_frame = ttk.LabelFrame(
             scrollable_frame,
@@ -110,31 +106,27 @@ class C2RRPTab(ttk.Frame):
         tk.Label(tabla_frame, text="Utilidad Neta", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=1, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(tabla_frame, text=NumberFormat.format(ano1_rrp['utilidad_neta']),
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=1, padx=10, pady=3)
+        self.campos['utilidad_neta_1'] = tk.Label(tabla_frame, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['utilidad_neta_1'].grid(row=1, column=1, padx=10, pady=3)
         
         tk.Label(tabla_frame, text="Utilidad Neta", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=1, column=3, padx=10, pady=3, sticky="w")
-        tk.Label(tabla_frame, text=NumberFormat.format(ano2_rrp['utilidad_neta']),
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=4, padx=10, pady=3)
+        self.campos['utilidad_neta_2'] = tk.Label(tabla_frame, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['utilidad_neta_2'].grid(row=1, column=4, padx=10, pady=3)
         
         # Patrimonio Neto
         tk.Label(tabla_frame, text="Patrimonio Neto", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=2, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(tabla_frame, text=NumberFormat.format(ano1_rrp['patrimonio_neto']),
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=1, padx=10, pady=3)
+        self.campos['patrimonio_neto_1'] = tk.Label(tabla_frame, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['patrimonio_neto_1'].grid(row=2, column=1, padx=10, pady=3)
         
         tk.Label(tabla_frame, text="Patrimonio Neto", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=2, column=3, padx=10, pady=3, sticky="w")
-        tk.Label(tabla_frame, text=NumberFormat.format(ano2_rrp['patrimonio_neto']),
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=4, padx=10, pady=3)
+        self.campos['patrimonio_neto_2'] = tk.Label(tabla_frame, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['patrimonio_neto_2'].grid(row=2, column=4, padx=10, pady=3)
         
         # Separador
         ttk.Separator(tabla_frame, orient="horizontal").grid(
@@ -143,40 +135,29 @@ class C2RRPTab(ttk.Frame):
             row=3, column=3, columnspan=2, sticky="ew", pady=8)
         
         # RRP
-        rrp_1 = ano1_rrp['rrp']
-        rrp_2 = ano2_rrp['rrp']
-        
         tk.Label(tabla_frame, text="RRP (%)", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=4, column=0, padx=10, pady=5, sticky="w")
         
-        tk.Label(tabla_frame, 
-                text=f"{rrp_1:.2f}%",
+        self.campos['rrp_1'] = tk.Label(tabla_frame, 
                 font=Fonts.LARGE,
                 bg=Colors.INFO,
                 fg="white",
                 padx=10,
-                pady=5).grid(row=4, column=1, padx=10, pady=5)
+                pady=5)
+        self.campos['rrp_1'].grid(row=4, column=1, padx=10, pady=5)
         
         tk.Label(tabla_frame, text="RRP (%)", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=4, column=3, padx=10, pady=5, sticky="w")
         
         # Color según comparación con Año 1
-        if rrp_2 > rrp_1:
-            color_rrp2 = Colors.SUCCESS
-        elif rrp_2 < rrp_1:
-            color_rrp2 = Colors.DANGER
-        else:
-            color_rrp2 = Colors.INFO
-        
-        tk.Label(tabla_frame, 
-                text=f"{rrp_2:.2f}%",
+        self.campos['rrp_2'] = tk.Label(tabla_frame, 
                 font=Fonts.LARGE,
-                bg=color_rrp2,
                 fg="white",
                 padx=10,
-                pady=5).grid(row=4, column=4, padx=10, pady=5)
+                pady=5)
+        self.campos['rrp_2'].grid(row=4, column=4, padx=10, pady=5)
         
         # COMPARACIÓN RRP
         comparacion_frame = ttk.LabelFrame(
@@ -188,30 +169,24 @@ class C2RRPTab(ttk.Frame):
                               pady=Dimensions.PADDING_MEDIUM)
         
         # Cambio absoluto
-        delta = comparacion_rrp['delta_absoluto']
         tk.Label(comparacion_frame, text="Cambio Absoluto:", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=0, column=0, padx=10, pady=5, sticky="w")
         
-        color_delta = Colors.POSITIVE if delta > 0 else Colors.NEGATIVE if delta < 0 else Colors.NEUTRAL
-        tk.Label(comparacion_frame, 
-                text=f"{delta:+.2f} puntos porcentuales",
+        self.campos['delta'] = tk.Label(comparacion_frame, 
                 font=Fonts.NORMAL,
-                fg=color_delta,
-                bg=Colors.BG_PRIMARY).grid(row=0, column=1, padx=10, pady=5, sticky="w")
+                bg=Colors.BG_PRIMARY)
+        self.campos['delta'].grid(row=0, column=1, padx=10, pady=5, sticky="w")
         
         # Cambio relativo
-        crecimiento = comparacion_rrp['crecimiento_relativo']
         tk.Label(comparacion_frame, text="Cambio Relativo:", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=1, column=0, padx=10, pady=5, sticky="w")
         
-        color_crec = Colors.POSITIVE if crecimiento > 0 else Colors.NEGATIVE if crecimiento < 0 else Colors.NEUTRAL
-        tk.Label(comparacion_frame, 
-                text=f"{crecimiento:+.2f}%",
+        self.campos['crecimiento'] = tk.Label(comparacion_frame, 
                 font=Fonts.NORMAL,
-                fg=color_crec,
-                bg=Colors.BG_PRIMARY).grid(row=1, column=1, padx=10, pady=5, sticky="w")
+                bg=Colors.BG_PRIMARY)
+        self.campos['crecimiento'].grid(row=1, column=1, padx=10, pady=5, sticky="w")
         
         # INTERPRETACIÓN RRP
         interpretacion_rrp_frame = ttk.LabelFrame(
@@ -233,8 +208,8 @@ class C2RRPTab(ttk.Frame):
             pady=10
         )
         interp_rrp_text.pack(fill=tk.X)
-        interp_rrp_text.insert('1.0', comparacion_rrp['interpretacion'])
         interp_rrp_text.config(state='disabled')
+        self.campos['interpretacion_rrp'] = interp_rrp_text
         
         # COMPARACIÓN RAT vs RRP
         comparacion_rat_rrp_frame = ttk.LabelFrame(
@@ -260,40 +235,28 @@ class C2RRPTab(ttk.Frame):
         # RAT
         tk.Label(comp_grid, text="RAT (%)", font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=1, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(comp_grid, text=f"{ano1_comp['rat']:.2f}%", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=1, padx=10, pady=3)
-        tk.Label(comp_grid, text=f"{ano2_comp['rat']:.2f}%", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=2, padx=10, pady=3)
+        self.campos['rat_comp_1'] = tk.Label(comp_grid, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['rat_comp_1'].grid(row=1, column=1, padx=10, pady=3)
+        self.campos['rat_comp_2'] = tk.Label(comp_grid, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['rat_comp_2'].grid(row=1, column=2, padx=10, pady=3)
         
         # RRP
         tk.Label(comp_grid, text="RRP (%)", font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=2, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(comp_grid, text=f"{ano1_comp['rrp']:.2f}%", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=1, padx=10, pady=3)
-        tk.Label(comp_grid, text=f"{ano2_comp['rrp']:.2f}%", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=2, padx=10, pady=3)
+        self.campos['rrp_comp_1'] = tk.Label(comp_grid, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['rrp_comp_1'].grid(row=2, column=1, padx=10, pady=3)
+        self.campos['rrp_comp_2'] = tk.Label(comp_grid, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['rrp_comp_2'].grid(row=2, column=2, padx=10, pady=3)
         
         # Apalancamiento
         tk.Label(comp_grid, text="Apalancamiento", font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=3, column=0, padx=10, pady=5, sticky="w")
         
-        # Color Año 1
-        apal_1 = ano1_comp['apalancamiento']
-        color_apal_1 = Colors.SUCCESS if apal_1 == "positivo" else Colors.DANGER if apal_1 == "negativo" else Colors.INFO
-        tk.Label(comp_grid, text=apal_1.upper(), 
-                 font=Fonts.NORMAL_BOLD, fg="white", bg=color_apal_1, padx=5, pady=2).grid(
-            row=3, column=1, padx=10, pady=5)
-        
-        # Color Año 2
-        apal_2 = ano2_comp['apalancamiento']
-        color_apal_2 = Colors.SUCCESS if apal_2 == "positivo" else Colors.DANGER if apal_2 == "negativo" else Colors.INFO
-        tk.Label(comp_grid, text=apal_2.upper(), 
-                 font=Fonts.NORMAL_BOLD, fg="white", bg=color_apal_2, padx=5, pady=2).grid(
-            row=3, column=2, padx=10, pady=5)
+        # Color de cada año según el signo del apalancamiento
+        for year in (1, 2):
+            self.campos[f'apalancamiento_{year}'] = tk.Label(
+                comp_grid, font=Fonts.NORMAL_BOLD, fg="white", padx=5, pady=2)
+            self.campos[f'apalancamiento_{year}'].grid(row=3, column=year, padx=10, pady=5)
         
         # INTERPRETACIÓN COMPARATIVA
         interpretacion_comp_frame = ttk.LabelFrame(
@@ -315,8 +278,63 @@ class C2RRPTab(ttk.Frame):
             pady=10
         )
         interp_comp_text.pack(fill=tk.X)
-        interp_comp_text.insert('1.0', resultado_comparativo['interpretacion_completa'])
         interp_comp_text.config(state='disabled')
+        self.campos['interpretacion_comparativa'] = interp_comp_text
+        
+        self._mostrar_datos()
         
         canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
+        scrollbar.pack(side="right", fill="y")
+    
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe valores, comparaciones e interpretaciones en el lugar.
+        
+        Returns:
+            bool: True (la estructura de la pestaña no cambia con los datos)
+        """
+        self._mostrar_datos()
+        return True
+    
+    def _mostrar_datos(self):
+        """Escribe en self.campos el análisis RRP de los datos actuales"""
+        analisis = RRPAnalysis(self.app.balance_data, self.app.income_data)
+        resultado_rrp = analisis.analisis_dual_rrp()
+        resultado_comparativo = analisis.analisis_comparativo_rat_rrp()
+        comparacion_rrp = resultado_rrp['comparacion']
+        
+        for year in (1, 2):
+            ano_rrp = resultado_rrp[f'ano_{year}']
+            ano_comp = resultado_comparativo[f'ano_{year}']
+            self.campos[f'utilidad_neta_{year}'].config(text=NumberFormat.format(ano_rrp['utilidad_neta']))
+            self.campos[f'patrimonio_neto_{year}'].config(text=NumberFormat.format(ano_rrp['patrimonio_neto']))
+            self.campos[f'rat_comp_{year}'].config(text=f"{ano_comp['rat']:.2f}%")
+            self.campos[f'rrp_comp_{year}'].config(text=f"{ano_comp['rrp']:.2f}%")
+            
+            apal = ano_comp['apalancamiento']
+            color_apal = Colors.SUCCESS if apal == "positivo" else Colors.DANGER if apal == "negativo" else Colors.INFO
+            self.campos[f'apalancamiento_{year}'].config(text=apal.upper(), bg=color_apal)
+        
+        # RRP; el del Año 2 con color según comparación con Año 1
+        rrp_1 = resultado_rrp['ano_1']['rrp']
+        rrp_2 = resultado_rrp['ano_2']['rrp']
+        if rrp_2 > rrp_1:
+            color_rrp2 = Colors.SUCCESS
+        elif rrp_2 < rrp_1:
+            color_rrp2 = Colors.DANGER
+        else:
+            color_rrp2 = Colors.INFO
+        self.campos['rrp_1'].config(text=f"{rrp_1:.2f}%")
+        self.campos['rrp_2'].config(text=f"{rrp_2:.2f}%", bg=color_rrp2)
+        
+        delta = comparacion_rrp['delta_absoluto']
+        color_delta = Colors.POSITIVE if delta > 0 else Colors.NEGATIVE if delta < 0 else Colors.NEUTRAL
+        self.campos['delta'].config(text=f"{delta:+.2f} puntos porcentuales", fg=color_delta)
+        
+        crecimiento = comparacion_rrp['crecimiento_relativo']
+        color_crec = Colors.POSITIVE if crecimiento > 0 else Colors.NEGATIVE if crecimiento < 0 else Colors.NEUTRAL
+        self.campos['crecimiento'].config(text=f"{crecimiento:+.2f}%", fg=color_crec)
+        
+        escribir_texto(self.campos['interpretacion_rrp'], comparacion_rrp['interpretacion'])
+        escribir_texto(self.campos['interpretacion_comparativa'],
+                       resultado_comparativo['interpretacion_completa'])
\ No newline at end of file
@@ -7,17 +7,31 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions, NumberFormat
 from core.analysis.dupont_analysis import DuPontAnalysis
-from core.analysis.financial_interpreter import FinancialInterpreter
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class C3DuPontTab(ttk.Frame):
     """Pestaña C3 - Análisis DuPont"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'C3'
+    
+    # Componentes: (clave en el análisis, nombre, ratio del intérprete, formato)
+    COMPONENTES = (
+        ('margen_neto', "Margen Neto (%)", 'margen_neto', "{:.2f}%"),
+        ('rotacion_activo', "Rotación del Activo (veces)", 'rotacion_activos', "{:.2f}"),
+        ('apalancamiento', "Apalancamiento (veces)", 'apalancamiento', "{:.2f}"),
+    )
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Widgets que muestran datos, por (nombre, año) (los escribe _mostrar_datos)
+        self.campos = {}
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de C3"""
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
@@ -41,14 +55,6 @@ class C3DuPontTab(ttk.Frame):
         )
         titulo.pack(pady=Dimensions.PADDING_LARGE)
         
-        # Obtener análisis
-        analisis = DuPontAnalysis(self.app.balance_data, self.app.income_data)
-        resultado = analisis.analisis_dupont_dual()
-        interpreter = FinancialInterpreter()
-        
-        ano1 = resultado['ano_1']
-        ano2 = resultado['ano_2']
-        
         # EXPLICACIÓN DEL MODELO DUPONT
         explicacion_frame = ttk.LabelFrame(
             scrollable_frame,
@@ -110,175 +116,50 @@ class C3DuPontTab(ttk.Frame):
             row=0, column=4, padx=10, pady=5)
         
         row = 1
-        
-        # 1. MARGEN NETO
-        tk.Label(tabla_frame, text="1. Margen Neto (%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=0, padx=10, pady=5, sticky="w")
-        tk.Label(tabla_frame, text=f"{ano1['margen_neto']:.2f}%",
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=1, padx=10, pady=5)
-        
-        tk.Label(tabla_frame, text="1. Margen Neto (%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=3, padx=10, pady=5, sticky="w")
-        tk.Label(tabla_frame, text=f"{ano2['margen_neto']:.2f}%",
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=4, padx=10, pady=5)
-        row += 1
-        
-        # Interpretación Margen Neto
-        interp_margen_1 = interpreter.get_interpretacion('margen_neto', ano1['margen_neto'])
-        interp_margen_2 = interpreter.get_interpretacion('margen_neto', ano2['margen_neto'])
-        
-        tk.Label(tabla_frame, text="   Interpretación:", 
-                 font=Fonts.SMALL, bg=Colors.BG_PRIMARY, fg=Colors.NEUTRAL).grid(
-            row=row, column=0, padx=10, pady=2, sticky="w")
-        
-        text_margen_1 = tk.Text(tabla_frame, height=2, wrap='word', font=Fonts.SMALL,
-                               bg=Colors.BG_SECONDARY, relief='flat', padx=5, pady=3)
-        text_margen_1.grid(row=row, column=1, padx=10, pady=2, sticky="ew")
-        text_margen_1.insert('1.0', interp_margen_1)
-        text_margen_1.config(state='disabled')
-        
-        tk.Label(tabla_frame, text="   Interpretación:", 
-                 font=Fonts.SMALL, bg=Colors.BG_PRIMARY, fg=Colors.NEUTRAL).grid(
-            row=row, column=3, padx=10, pady=2, sticky="w")
-        
-        text_margen_2 = tk.Text(tabla_frame, height=2, wrap='word', font=Fonts.SMALL,
-                               bg=Colors.BG_SECONDARY, relief='flat', padx=5, pady=3)
-        text_margen_2.grid(row=row, column=4, padx=10, pady=2, sticky="ew")
-        text_margen_2.insert('1.0', interp_margen_2)
-        text_margen_2.config(state='disabled')
-        row += 1
-        
-        # Separador
-        ttk.Separator(tabla_frame, orient="horizontal").grid(
-            row=row, column=0, columnspan=2, sticky="ew", pady=8)
-        ttk.Separator(tabla_frame, orient="horizontal").grid(
-            row=row, column=3, columnspan=2, sticky="ew", pady=8)
-        row += 1
-        
-        # 2. ROTACIÓN DEL ACTIVO
-        tk.Label(tabla_frame, text="2. Rotación del Activo (veces)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=0, padx=10, pady=5, sticky="w")
-        tk.Label(tabla_frame, text=f"{ano1['rotacion_activo']:.2f}",
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=1, padx=10, pady=5)
-        
-        tk.Label(tabla_frame, text="2. Rotación del Activo (veces)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=3, padx=10, pady=5, sticky="w")
-        tk.Label(tabla_frame, text=f"{ano2['rotacion_activo']:.2f}",
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=4, padx=10, pady=5)
-        row += 1
-        
-        # Interpretación Rotación
-        interp_rotacion_1 = interpreter.get_interpretacion('rotacion_activos', ano1['rotacion_activo'])
-        interp_rotacion_2 = interpreter.get_interpretacion('rotacion_activos', ano2['rotacion_activo'])
-        
-        tk.Label(tabla_frame, text="   Interpretación:", 
-                 font=Fonts.SMALL, bg=Colors.BG_PRIMARY, fg=Colors.NEUTRAL).grid(
-            row=row, column=0, padx=10, pady=2, sticky="w")
-        
-        text_rotacion_1 = tk.Text(tabla_frame, height=2, wrap='word', font=Fonts.SMALL,
-                                 bg=Colors.BG_SECONDARY, relief='flat', padx=5, pady=3)
-        text_rotacion_1.grid(row=row, column=1, padx=10, pady=2, sticky="ew")
-        text_rotacion_1.insert('1.0', interp_rotacion_1)
-        text_rotacion_1.config(state='disabled')
-        
-        tk.Label(tabla_frame, text="   Interpretación:", 
-                 font=Fonts.SMALL, bg=Colors.BG_PRIMARY, fg=Colors.NEUTRAL).grid(
-            row=row, column=3, padx=10, pady=2, sticky="w")
-        
-        text_rotacion_2 = tk.Text(tabla_frame, height=2, wrap='word', font=Fonts.SMALL,
-                                 bg=Colors.BG_SECONDARY, relief='flat', padx=5, pady=3)
-        text_rotacion_2.grid(row=row, column=4, padx=10, pady=2, sticky="ew")
-        text_rotacion_2.insert('1.0', interp_rotacion_2)
-        text_rotacion_2.config(state='disabled')
-        row += 1
-        
-        # Separador
-        ttk.Separator(tabla_frame, orient="horizontal").grid(
-            row=row, column=0, columnspan=2, sticky="ew", pady=8)
-        ttk.Separator(tabla_frame, orient="horizontal").grid(
-            row=row, column=3, columnspan=2, sticky="ew", pady=8)
-        row += 1
-        
-        # 3. APALANCAMIENTO FINANCIERO
-        tk.Label(tabla_frame, text="3. Apalancamiento (veces)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=0, padx=10, pady=5, sticky="w")
-        tk.Label(tabla_frame, text=f"{ano1['apalancamiento']:.2f}",
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=1, padx=10, pady=5)
-        
-        tk.Label(tabla_frame, text="3. Apalancamiento (veces)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=3, padx=10, pady=5, sticky="w")
-        tk.Label(tabla_frame, text=f"{ano2['apalancamiento']:.2f}",
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=4, padx=10, pady=5)
-        row += 1
-        
-        # Interpretación Apalancamiento
-        interp_apal_1 = interpreter.get_interpretacion('apalancamiento', ano1['apalancamiento'])
-        interp_apal_2 = interpreter.get_interpretacion('apalancamiento', ano2['apalancamiento'])
-        
-        tk.Label(tabla_frame, text="   Interpretación:", 
-                 font=Fonts.SMALL, bg=Colors.BG_PRIMARY, fg=Colors.NEUTRAL).grid(
-            row=row, column=0, padx=10, pady=2, sticky="w")
-        
-        text_apal_1 = tk.Text(tabla_frame, height=2, wrap='word', font=Fonts.SMALL,
-                             bg=Colors.BG_SECONDARY, relief='flat', padx=5, pady=3)
-        text_apal_1.grid(row=row, column=1, padx=10, pady=2, sticky="ew")
-        text_apal_1.insert('1.0', interp_apal_1)
-        text_apal_1.config(state='disabled')
-        
-        tk.Label(tabla_frame, text="   Interpretación:", 
-                 font=Fonts.SMALL, bg=Colors.BG_PRIMARY, fg=Colors.NEUTRAL).grid(
-            row=row, column=3, padx=10, pady=2, sticky="w")
-        
-        text_apal_2 = tk.Text(tabla_frame, height=2, wrap='word', font=Fonts.SMALL,
-                             bg=Colors.BG_SECONDARY, relief='flat', padx=5, pady=3)
-        text_apal_2.grid(row=row, column=4, padx=10, pady=2, sticky="ew")
-        text_apal_2.insert('1.0', interp_apal_2)
-        text_apal_2.config(state='disabled')
-        row += 1
-        
-        # Separador final
-        ttk.Separator(tabla_frame, orient="horizontal").grid(
-            row=row, column=0, columnspan=2, sticky="ew", pady=8)
-        ttk.Separator(tabla_frame, orient="horizontal").grid(
-            row=row, column=3, columnspan=2, sticky="ew", pady=8)
-        row += 1
+        for numero, (clave, nombre, _, _) in enumerate(self.COMPONENTES, start=1):
+            for columna in (0, 3):
+                tk.Label(tabla_frame, text=f"{numero}. {nombre}", 
+                         font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
+                    row=row, column=columna, padx=10, pady=5, sticky="w")
+                self.campos[(clave, columna // 3 + 1)] = tk.Label(
+                    tabla_frame, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+                self.campos[(clave, columna // 3 + 1)].grid(row=row, column=columna + 1, padx=10, pady=5)
+            row += 1
+            
+            # Interpretación del componente
+            for columna in (0, 3):
+                tk.Label(tabla_frame, text="   Interpretación:", 
+                         font=Fonts.SMALL, bg=Colors.BG_PRIMARY, fg=Colors.NEUTRAL).grid(
+                    row=row, column=columna, padx=10, pady=2, sticky="w")
+                
+                text_widget = tk.Text(tabla_frame, height=2, wrap='word', font=Fonts.SMALL,
+                                      bg=Colors.BG_SECONDARY, relief='flat', padx=5, pady=3)
+                text_widget.grid(row=row, column=columna + 1, padx=10, pady=2, sticky="ew")
+                text_widget.config(state='disabled')
+                self.campos[(f'interpretacion_{clave}', columna // 3 + 1)] = text_widget
+            row += 1
+            
+            # Separador
+            ttk.Separator(tabla_frame, orient="horizontal").grid(
+                row=row, column=0, columnspan=2, sticky="ew", pady=8)
+            ttk.Separator(tabla_frame, orient="horizontal").grid(
+                row=row, column=3, columnspan=2, sticky="ew", pady=8)
+            row += 1
         
         # RESULTADO: RRP CALCULADO
-        tk.Label(tabla_frame, text="RRP (DuPont) (%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=0, padx=10, pady=5, sticky="w")
-        
-        tk.Label(tabla_frame, 
-                text=f"{ano1['rrp_dupont']:.2f}%",
-                font=Fonts.LARGE,
-                bg=Colors.INFO,
-                fg="white",
-                padx=10,
-                pady=5).grid(row=row, column=1, padx=10, pady=5)
-        
-        tk.Label(tabla_frame, text="RRP (DuPont) (%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=row, column=3, padx=10, pady=5, sticky="w")
-        
-        tk.Label(tabla_frame, 
-                text=f"{ano2['rrp_dupont']:.2f}%",
+        for columna in (0, 3):
+            tk.Label(tabla_frame, text="RRP (DuPont) (%)", 
+                     font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
+                row=row, column=columna, padx=10, pady=5, sticky="w")
+            
+            self.campos[('rrp_dupont', columna // 3 + 1)] = tk.Label(
+                tabla_frame,
                 font=Fonts.LARGE,
                 bg=Colors.INFO,
                 fg="white",
                 padx=10,
-                pady=5).grid(row=row, column=4, padx=10, pady=5)
+                pady=5)
+            self.campos[('rrp_dupont', columna // 3 + 1)].grid(row=row, column=columna + 1, padx=10, pady=5)
         row += 1
         
         # VERIFICACIÓN
@@ -301,44 +182,26 @@ class C3DuPontTab(ttk.Frame):
         tk.Label(verif_grid, text="Año 2", font=Fonts.HEADER, bg=Colors.BG_PRIMARY).grid(
             row=0, column=2, padx=10, pady=5)
         
-        # RRP Directo
-        tk.Label(verif_grid, text="RRP Directo (UN/PN):", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(verif_grid, text=f"{ano1['rrp_directo']:.2f}%", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=1, padx=10, pady=3)
-        tk.Label(verif_grid, text=f"{ano2['rrp_directo']:.2f}%", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=2, padx=10, pady=3)
-        
-        # RRP DuPont
-        tk.Label(verif_grid, text="RRP DuPont (M × R × A):", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(verif_grid, text=f"{ano1['rrp_dupont']:.2f}%", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=1, padx=10, pady=3)
-        tk.Label(verif_grid, text=f"{ano2['rrp_dupont']:.2f}%", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=2, padx=10, pady=3)
+        # RRP Directo y RRP DuPont
+        for fila, (clave, texto) in enumerate((('rrp_directo', "RRP Directo (UN/PN):"),
+                                               ('rrp_dupont', "RRP DuPont (M × R × A):")), start=1):
+            tk.Label(verif_grid, text=texto, 
+                     font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
+                row=fila, column=0, padx=10, pady=3, sticky="w")
+            for year in (1, 2):
+                self.campos[(f'verif_{clave}', year)] = tk.Label(
+                    verif_grid, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+                self.campos[(f'verif_{clave}', year)].grid(row=fila, column=year, padx=10, pady=3)
         
         # Verificación
         tk.Label(verif_grid, text="Verificación:", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=3, column=0, padx=10, pady=5, sticky="w")
         
-        verif_1_text = "✓ CORRECTO" if ano1['verificacion'] else "✗ ERROR"
-        verif_1_color = Colors.SUCCESS if ano1['verificacion'] else Colors.DANGER
-        tk.Label(verif_grid, text=verif_1_text, 
-                 font=Fonts.NORMAL_BOLD, fg="white", bg=verif_1_color, padx=5, pady=2).grid(
-            row=3, column=1, padx=10, pady=5)
-        
-        verif_2_text = "✓ CORRECTO" if ano2['verificacion'] else "✗ ERROR"
-        verif_2_color = Colors.SUCCESS if ano2['verificacion'] else Colors.DANGER
-        tk.Label(verif_grid, text=verif_2_text, 
-                 font=Fonts.NORMAL_BOLD, fg="white", bg=verif_2_color, padx=5, pady=2).grid(
-            row=3, column=2, padx=10, pady=5)
+        for year in (1, 2):
+            self.campos[('verificacion', year)] = tk.Label(
+                verif_grid, font=Fonts.NORMAL_BOLD, fg="white", padx=5, pady=2)
+            self.campos[('verificacion', year)].grid(row=3, column=year, padx=10, pady=5)
         
         # INTERPRETACIÓN GLOBAL DUPONT
         interpretacion_frame = ttk.LabelFrame(
@@ -360,8 +223,44 @@ class C3DuPontTab(ttk.Frame):
             pady=10
         )
         interp_text.pack(fill=tk.X)
-        interp_text.insert('1.0', resultado['interpretacion'])
         interp_text.config(state='disabled')
+        self.campos['interpretacion'] = interp_text
+        
+        self._mostrar_datos()
         
         canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
+        scrollbar.pack(side="right", fill="y")
+    
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe componentes, verificación e interpretaciones en el lugar.
+        
+        Returns:
+            bool: True (la estructura de la pestaña no cambia con los datos)
+        """
+        self._mostrar_datos()
+        return True
+    
+    def _mostrar_datos(self):
+        """Escribe en self.campos el análisis DuPont de los datos actuales"""
+        analisis = DuPontAnalysis(self.app.balance_data, self.app.income_data)
+        resultado = analisis.analisis_dupont_dual()
+        interpreter = self.app.analysis_context.interpreter
+        
+        for year in (1, 2):
+            ano = resultado[f'ano_{year}']
+            
+            for clave, _, ratio, formato in self.COMPONENTES:
+                self.campos[(clave, year)].config(text=formato.format(ano[clave]))
+                escribir_texto(self.campos[(f'interpretacion_{clave}', year)],
+                               interpreter.get_interpretacion(ratio, ano[clave]))
+            
+            self.campos[('rrp_dupont', year)].config(text=f"{ano['rrp_dupont']:.2f}%")
+            self.campos[('verif_rrp_directo', year)].config(text=f"{ano['rrp_directo']:.2f}%")
+            self.campos[('verif_rrp_dupont', year)].config(text=f"{ano['rrp_dupont']:.2f}%")
+            self.campos[('verificacion', year)].config(
+                text="✓ CORRECTO" if ano['verificacion'] else "✗ ERROR",
+                bg=Colors.SUCCESS if ano['verificacion'] else Colors.DANGER
+            )
+        
+        escribir_texto(self.campos['interpretacion'], resultado['interpretacion'])
@@ -7,16 +7,31 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions, NumberFormat
 from core.analysis.margenes_analysis import MargenesAnalysis
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class C4MargenesTab(ttk.Frame):
     """Pestaña C4 - Márgenes de Ganancia"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'C4'
+    
+    # Márgenes: (clave, nombre, mínimo para SUCCESS, mínimo para WARNING) en %
+    MARGENES = (
+        ('margen_bruto', "Margen Bruto", 50, 30),
+        ('margen_operativo', "Margen Operativo", 15, 8),
+        ('margen_neto', "Margen Neto", 10, 5),
+    )
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Widgets que muestran datos (los escribe _mostrar_datos)
+        self.campos = {}
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de C4"""
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
@@ -40,14 +55,6 @@ class C4MargenesTab(ttk.Frame):
         )
         titulo.pack(pady=Dimensions.PADDING_LARGE)
         
-        # Obtener análisis
-        analisis = MargenesAnalysis(self.app.income_data)
-        resultado = analisis.analisis_dual_margenes()
-        
-        ano1 = resultado['año_1']
-        ano2 = resultado['año_2']
-        interpretaciones = resultado['interpretaciones']
-        
         # FÓRMULAS
         formulas_frame = ttk.LabelFrame(
             scrollable_frame,
@@ -106,107 +113,30 @@ class C4MargenesTab(ttk.Frame):
         tk.Label(tabla_frame, text="Año 2", font=Fonts.HEADER, bg=Colors.BG_PRIMARY).grid(
             row=0, column=4, padx=10, pady=5)
         
-        # Margen Bruto
-        tk.Label(tabla_frame, text="Margen Bruto", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=0, padx=10, pady=5, sticky="w")
-        
-        tk.Label(tabla_frame, 
-                text=f"{ano1['margen_bruto']:.2f}%",
-                font=Fonts.LARGE,
-                bg=Colors.INFO,
-                fg="white",
-                padx=10,
-                pady=5).grid(row=1, column=1, padx=10, pady=5)
-        
-        tk.Label(tabla_frame, text="Margen Bruto", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=3, padx=10, pady=5, sticky="w")
-        
-        # Color según nivel
-        mb2 = ano2['margen_bruto']
-        if mb2 >= 50:
-            color_mb = Colors.SUCCESS
-        elif mb2 >= 30:
-            color_mb = Colors.WARNING
-        else:
-            color_mb = Colors.DANGER
-        
-        tk.Label(tabla_frame, 
-                text=f"{mb2:.2f}%",
-                font=Fonts.LARGE,
-                bg=color_mb,
-                fg="white",
-                padx=10,
-                pady=5).grid(row=1, column=4, padx=10, pady=5)
-        
-        # Margen Operativo
-        tk.Label(tabla_frame, text="Margen Operativo", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=0, padx=10, pady=5, sticky="w")
-        
-        tk.Label(tabla_frame, 
-                text=f"{ano1['margen_operativo']:.2f}%",
-                font=Fonts.LARGE,
-                bg=Colors.INFO,
-                fg="white",
-                padx=10,
-                pady=5).grid(row=2, column=1, padx=10, pady=5)
-        
-        tk.Label(tabla_frame, text="Margen Operativo", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=3, padx=10, pady=5, sticky="w")
-        
-        # Color según nivel
-        mo2 = ano2['margen_operativo']
-        if mo2 >= 15:
-            color_mo = Colors.SUCCESS
-        elif mo2 >= 8:
-            color_mo = Colors.WARNING
-        else:
-            color_mo = Colors.DANGER
-        
-        tk.Label(tabla_frame, 
-                text=f"{mo2:.2f}%",
-                font=Fonts.LARGE,
-                bg=color_mo,
-                fg="white",
-                padx=10,
-                pady=5).grid(row=2, column=4, padx=10, pady=5)
-        
-        # Margen Neto
-        tk.Label(tabla_frame, text="Margen Neto", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=3, column=0, padx=10, pady=5, sticky="w")
-        
-        tk.Label(tabla_frame, 
-                text=f"{ano1['margen_neto']:.2f}%",
-                font=Fonts.LARGE,
-                bg=Colors.INFO,
-                fg="white",
-                padx=10,
-                pady=5).grid(row=3, column=1, padx=10, pady=5)
-        
-        tk.Label(tabla_frame, text="Margen Neto", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=3, column=3, padx=10, pady=5, sticky="w")
-        
-        # Color según nivel
-        mn2 = ano2['margen_neto']
-        if mn2 >= 10:
-            color_mn = Colors.SUCCESS
-        elif mn2 >= 5:
-            color_mn = Colors.WARNING
-        else:
-            color_mn = Colors.DANGER
-        
-        tk.Label(tabla_frame, 
-                text=f"{mn2:.2f}%",
-                font=Fonts.LARGE,
-                bg=color_mn,
-                fg="white",
-                padx=10,
-                pady=5).grid(row=3, column=4, padx=10, pady=5)
+        for row, (clave, nombre, _, _) in enumerate(self.MARGENES, start=1):
+            tk.Label(tabla_frame, text=nombre, 
+                     font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
+                row=row, column=0, padx=10, pady=5, sticky="w")
+            
+            self.campos[(clave, 1)] = tk.Label(tabla_frame, 
+                    font=Fonts.LARGE,
+                    bg=Colors.INFO,
+                    fg="white",
+                    padx=10,
+                    pady=5)
+            self.campos[(clave, 1)].grid(row=row, column=1, padx=10, pady=5)
+            
+            tk.Label(tabla_frame, text=nombre, 
+                     font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
+                row=row, column=3, padx=10, pady=5, sticky="w")
+            
+            # Color según nivel (lo pone _mostrar_datos)
+            self.campos[(clave, 2)] = tk.Label(tabla_frame, 
+                    font=Fonts.LARGE,
+                    fg="white",
+                    padx=10,
+                    pady=5)
+            self.campos[(clave, 2)].grid(row=row, column=4, padx=10, pady=5)
         
         # INTERPRETACIÓN: Margen Bruto
         interp_bruto_frame = ttk.LabelFrame(
@@ -228,8 +158,8 @@ class C4MargenesTab(ttk.Frame):
             pady=10
         )
         text_bruto.pack(fill=tk.X)
-        text_bruto.insert('1.0', interpretaciones['margen_bruto'])
         text_bruto.config(state='disabled')
+        self.campos['interpretacion_margen_bruto'] = text_bruto
         
         # INTERPRETACIÓN: Margen Operativo
         interp_operativo_frame = ttk.LabelFrame(
@@ -251,8 +181,8 @@ class C4MargenesTab(ttk.Frame):
             pady=10
         )
         text_operativo.pack(fill=tk.X)
-        text_operativo.insert('1.0', interpretaciones['margen_operativo'])
         text_operativo.config(state='disabled')
+        self.campos['interpretacion_margen_operativo'] = text_operativo
         
         # INTERPRETACIÓN: Margen Neto
         interp_neto_frame = ttk.LabelFrame(
@@ -274,8 +204,8 @@ class C4MargenesTab(ttk.Frame):
             pady=10
         )
         text_neto.pack(fill=tk.X)
-        text_neto.insert('1.0', interpretaciones['margen_neto'])
         text_neto.config(state='disabled')
+        self.campos['interpretacion_margen_neto'] = text_neto
         
         # INTERPRETACIÓN: Eficiencia en Costos (Conjunta)
         interp_eficiencia_frame = ttk.LabelFrame(
@@ -297,8 +227,45 @@ class C4MargenesTab(ttk.Frame):
             pady=10
         )
         text_eficiencia.pack(fill=tk.X)
-        text_eficiencia.insert('1.0', interpretaciones['eficiencia_costos'])
         text_eficiencia.config(state='disabled')
+        self.campos['interpretacion_eficiencia_costos'] = text_eficiencia
+        
+        self._mostrar_datos()
         
         canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
+        scrollbar.pack(side="right", fill="y")
+    
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe márgenes e interpretaciones en el lugar.
+        
+        Returns:
+            bool: True (la estructura de la pestaña no cambia con los datos)
+        """
+        self._mostrar_datos()
+        return True
+    
+    def _mostrar_datos(self):
+        """Escribe en self.campos los márgenes de los datos actuales"""
+        analisis = MargenesAnalysis(self.app.income_data)
+        resultado = analisis.analisis_dual_margenes()
+        
+        ano1 = resultado['año_1']
+        ano2 = resultado['año_2']
+        interpretaciones = resultado['interpretaciones']
+        
+        for clave, _, minimo_exito, minimo_aviso in self.MARGENES:
+            self.campos[(clave, 1)].config(text=f"{ano1[clave]:.2f}%")
+            
+            # Color según nivel
+            valor_2 = ano2[clave]
+            if valor_2 >= minimo_exito:
+                color = Colors.SUCCESS
+            elif valor_2 >= minimo_aviso:
+                color = Colors.WARNING
+            else:
+                color = Colors.DANGER
+            self.campos[(clave, 2)].config(text=f"{valor_2:.2f}%", bg=color)
+        
+        for clave in ('margen_bruto', 'margen_operativo', 'margen_neto', 'eficiencia_costos'):
+            escribir_texto(self.campos[f'interpretacion_{clave}'], interpretaciones[clave])
\ No newline at end of file
@@ -7,16 +7,24 @@ import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions, NumberFormat
 from core.analysis.apalancamiento_analysis import ApalancamientoAnalysis
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class C5ApalancamientoTab(ttk.Frame):
     """Pestaña C5 - Apalancamiento Financiero"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'C5'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Widgets que muestran datos, por nombre (los escribe _mostrar_datos)
+        self.campos = {}
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de C5"""
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
@@ -40,14 +48,6 @@ class C5ApalancamientoTab(ttk.Frame):
         )
         titulo.pack(pady=Dimensions.PADDING_LARGE)
         
-        # Obtener análisis
-        analisis = ApalancamientoAnalysis(self.app.balance_data, self.app.income_data)
-        resultado = analisis.analisis_dual_apalancamiento()
-        
-        ano1 = resultado['ano_1']
-        ano2 = resultado['ano_2']
-        interpretaciones = resultado['interpretaciones']
-        
         # a) COSTO PROMEDIO DE LA DEUDA
         costo_frame = ttk.LabelFrame(
             scrollable_frame,
@@ -87,30 +87,21 @@ class C5ApalancamientoTab(ttk.Frame):
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=1, column=0, padx=10, pady=5, sticky="w")
         
-        tk.Label(costo_grid, 
-                text=f"{ano1['i']:.2f}%",
+        self.campos['i_1'] = tk.Label(costo_grid, 
                 font=Fonts.LARGE,
                 bg=Colors.INFO,
                 fg="white",
                 padx=10,
-                pady=5).grid(row=1, column=1, padx=10, pady=5)
-        
-        # Color según nivel
-        i2 = ano2['i']
-        if i2 <= 8:
-            color_i = Colors.SUCCESS
-        elif i2 <= 12:
-            color_i = Colors.WARNING
-        else:
-            color_i = Colors.DANGER
+                pady=5)
+        self.campos['i_1'].grid(row=1, column=1, padx=10, pady=5)
         
-        tk.Label(costo_grid, 
-                text=f"{i2:.2f}%",
+        # Color según nivel (lo pone _mostrar_datos)
+        self.campos['i_2'] = tk.Label(costo_grid, 
                 font=Fonts.LARGE,
-                bg=color_i,
                 fg="white",
                 padx=10,
-                pady=5).grid(row=1, column=2, padx=10, pady=5)
+                pady=5)
+        self.campos['i_2'].grid(row=1, column=2, padx=10, pady=5)
         
         # Interpretación
         interp_costo_text = tk.Text(
@@ -124,8 +115,8 @@ class C5ApalancamientoTab(ttk.Frame):
             pady=10
         )
         interp_costo_text.pack(fill=tk.X, pady=(10, 0))
-        interp_costo_text.insert('1.0', interpretaciones['costo_deuda'])
         interp_costo_text.config(state='disabled')
+        self.campos['interpretacion_costo_deuda'] = interp_costo_text
         
         # b) COMPARACIÓN RAT vs i
         comparacion_frame = ttk.LabelFrame(
@@ -149,47 +140,32 @@ class C5ApalancamientoTab(ttk.Frame):
         tk.Label(comp_grid, text="RAT (Rentabilidad Económica):", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=1, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(comp_grid, text=f"{ano2['rat']:.2f}%", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=1, padx=10, pady=3)
+        self.campos['rat'] = tk.Label(comp_grid, font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY)
+        self.campos['rat'].grid(row=1, column=1, padx=10, pady=3)
         
         # i
         tk.Label(comp_grid, text="i (Costo de Deuda):", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=2, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(comp_grid, text=f"{ano2['i']:.2f}%", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=1, padx=10, pady=3)
+        self.campos['i'] = tk.Label(comp_grid, font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY)
+        self.campos['i'].grid(row=2, column=1, padx=10, pady=3)
         
         # Diferencial
-        diferencial = ano2['diferencial']
         tk.Label(comp_grid, text="Diferencial (RAT - i):", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=3, column=0, padx=10, pady=5, sticky="w")
         
-        color_dif = Colors.SUCCESS if diferencial > 0 else Colors.DANGER if diferencial < 0 else Colors.INFO
-        tk.Label(comp_grid, text=f"{diferencial:+.2f} p.p.", 
-                 font=Fonts.LARGE, fg="white", bg=color_dif, padx=10, pady=3).grid(
-            row=3, column=1, padx=10, pady=5)
+        self.campos['diferencial'] = tk.Label(comp_grid, font=Fonts.LARGE, fg="white", padx=10, pady=3)
+        self.campos['diferencial'].grid(row=3, column=1, padx=10, pady=5)
         
         # Tipo de apalancamiento
         tk.Label(comp_grid, text="Tipo de Apalancamiento:", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=4, column=0, padx=10, pady=5, sticky="w")
         
-        if diferencial > 0:
-            tipo_apal = "POSITIVO ✓"
-            color_tipo = Colors.SUCCESS
-        elif diferencial < 0:
-            tipo_apal = "NEGATIVO ✗"
-            color_tipo = Colors.DANGER
-        else:
-            tipo_apal = "NEUTRAL ="
-            color_tipo = Colors.INFO
-        
-        tk.Label(comp_grid, text=tipo_apal, 
-                 font=Fonts.LARGE, fg="white", bg=color_tipo, padx=10, pady=3).grid(
-            row=4, column=1, padx=10, pady=5)
+        self.campos['tipo_apalancamiento'] = tk.Label(
+            comp_grid, font=Fonts.LARGE, fg="white", padx=10, pady=3)
+        self.campos['tipo_apalancamiento'].grid(row=4, column=1, padx=10, pady=5)
         
         # Interpretación
         interp_comp_text = tk.Text(
@@ -203,8 +179,8 @@ class C5ApalancamientoTab(ttk.Frame):
             pady=10
         )
         interp_comp_text.pack(fill=tk.X, pady=(10, 0))
-        interp_comp_text.insert('1.0', interpretaciones['rat_vs_i'])
         interp_comp_text.config(state='disabled')
+        self.campos['interpretacion_rat_vs_i'] = interp_comp_text
         
         # c) EFECTO APALANCAMIENTO
         efecto_frame = ttk.LabelFrame(
@@ -243,36 +219,32 @@ class C5ApalancamientoTab(ttk.Frame):
         tk.Label(comp_efecto_grid, text="D/PN (Apalancamiento):", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=1, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(comp_efecto_grid, text=f"{ano2['d_pn']:.2f} veces", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=1, padx=10, pady=3)
+        self.campos['d_pn'] = tk.Label(comp_efecto_grid, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['d_pn'].grid(row=1, column=1, padx=10, pady=3)
         
         # Efecto
-        efecto_apal = ano2['efecto_apalancamiento']
         tk.Label(comp_efecto_grid, text="Efecto Apalancamiento:", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=2, column=0, padx=10, pady=5, sticky="w")
         
-        color_efecto = Colors.SUCCESS if efecto_apal > 0 else Colors.DANGER if efecto_apal < 0 else Colors.INFO
-        tk.Label(comp_efecto_grid, text=f"{efecto_apal:+.2f} p.p.", 
-                 font=Fonts.LARGE, fg="white", bg=color_efecto, padx=10, pady=3).grid(
-            row=2, column=1, padx=10, pady=5)
+        self.campos['efecto_apalancamiento'] = tk.Label(
+            comp_efecto_grid, font=Fonts.LARGE, fg="white", padx=10, pady=3)
+        self.campos['efecto_apalancamiento'].grid(row=2, column=1, padx=10, pady=5)
         
         # RRP Calculado
         tk.Label(comp_efecto_grid, text="RRP (Calculado):", 
                  font=Fonts.NORMAL_BOLD, bg=Colors.BG_PRIMARY).grid(
             row=3, column=0, padx=10, pady=5, sticky="w")
-        tk.Label(comp_efecto_grid, text=f"{ano2['rrp_calculado']:.2f}%", 
-                 font=Fonts.LARGE, bg=Colors.INFO, fg="white", padx=10, pady=3).grid(
-            row=3, column=1, padx=10, pady=5)
+        self.campos['rrp_calculado'] = tk.Label(
+            comp_efecto_grid, font=Fonts.LARGE, bg=Colors.INFO, fg="white", padx=10, pady=3)
+        self.campos['rrp_calculado'].grid(row=3, column=1, padx=10, pady=5)
         
         # RRP Directo
         tk.Label(comp_efecto_grid, text="RRP (Directo):", 
                  font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
             row=4, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(comp_efecto_grid, text=f"{ano2['rrp_directo']:.2f}%", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=4, column=1, padx=10, pady=3)
+        self.campos['rrp_directo'] = tk.Label(comp_efecto_grid, font=Fonts.NORMAL, bg=Colors.BG_PRIMARY)
+        self.campos['rrp_directo'].grid(row=4, column=1, padx=10, pady=3)
         
         # Interpretación
         interp_efecto_text = tk.Text(
@@ -286,8 +258,8 @@ class C5ApalancamientoTab(ttk.Frame):
             pady=10
         )
         interp_efecto_text.pack(fill=tk.X, pady=(10, 0))
-        interp_efecto_text.insert('1.0', interpretaciones['efecto_apalancamiento'])
         interp_efecto_text.config(state='disabled')
+        self.campos['interpretacion_efecto_apalancamiento'] = interp_efecto_text
         
         # d) ¿CONVIENE AUMENTAR DEUDA?
         conveniencia_frame = ttk.LabelFrame(
@@ -309,8 +281,65 @@ class C5ApalancamientoTab(ttk.Frame):
             pady=10
         )
         interp_conv_text.pack(fill=tk.X)
-        interp_conv_text.insert('1.0', interpretaciones['conveniencia_deuda'])
         interp_conv_text.config(state='disabled')
+        self.campos['interpretacion_conveniencia_deuda'] = interp_conv_text
+        
+        self._mostrar_datos()
         
         canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
\ No newline at end of file
+        scrollbar.pack(side="right", fill="y")
+    
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe indicadores e interpretaciones en el lugar.
+        
+        Returns:
+            bool: True (la estructura de la pestaña no cambia con los datos)
+        """
+        self._mostrar_datos()
+        return True
+    
+    def _mostrar_datos(self):
+        """Escribe en self.campos el análisis de apalancamiento de los datos actuales"""
+        analisis = ApalancamientoAnalysis(self.app.balance_data, self.app.income_data)
+        resultado = analisis.analisis_dual_apalancamiento()
+        
+        ano1 = resultado['ano_1']
+        ano2 = resultado['ano_2']
+        interpretaciones = resultado['interpretaciones']
+        
+        # a) Costo de la deuda; Año 2 con color según nivel
+        i2 = ano2['i']
+        if i2 <= 8:
+            color_i = Colors.SUCCESS
+        elif i2 <= 12:
+            color_i = Colors.WARNING
+        else:
+            color_i = Colors.DANGER
+        self.campos['i_1'].config(text=f"{ano1['i']:.2f}%")
+        self.campos['i_2'].config(text=f"{i2:.2f}%", bg=color_i)
+        
+        # b) RAT vs i
+        diferencial = ano2['diferencial']
+        color_dif = Colors.SUCCESS if diferencial > 0 else Colors.DANGER if diferencial < 0 else Colors.INFO
+        if diferencial > 0:
+            tipo_apal = "POSITIVO ✓"
+        elif diferencial < 0:
+            tipo_apal = "NEGATIVO ✗"
+        else:
+            tipo_apal = "NEUTRAL ="
+        self.campos['rat'].config(text=f"{ano2['rat']:.2f}%")
+        self.campos['i'].config(text=f"{i2:.2f}%")
+        self.campos['diferencial'].config(text=f"{diferencial:+.2f} p.p.", bg=color_dif)
+        self.campos['tipo_apalancamiento'].config(text=tipo_apal, bg=color_dif)
+        
+        # c) Efecto apalancamiento
+        efecto_apal = ano2['efecto_apalancamiento']
+        color_efecto = Colors.SUCCESS if efecto_apal > 0 else Colors.DANGER if efecto_apal < 0 else Colors.INFO
+        self.campos['d_pn'].config(text=f"{ano2['d_pn']:.2f} veces")
+        self.campos['efecto_apalancamiento'].config(text=f"{efecto_apal:+.2f} p.p.", bg=color_efecto)
+        self.campos['rrp_calculado'].config(text=f"{ano2['rrp_calculado']:.2f}%")
+        self.campos['rrp_directo'].config(text=f"{ano2['rrp_directo']:.2f}%")
+        
+        for clave in ('costo_deuda', 'rat_vs_i', 'efecto_apalancamiento', 'conveniencia_deuda'):
+            escribir_texto(self.campos[f'interpretacion_{clave}'], interpretaciones[clave])
\ No newline at end of file
@@ -6,17 +6,24 @@ Pestaña D1 - Matriz de Ratios Comparativos
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions, NumberFormat
-from core.analysis.matriz_ratios import MatrizRatios
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class D1MatrizRatiosTab(ttk.Frame):
     """Pestaña D1 - Matriz de Ratios Comparativos"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'D1'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Widgets que muestran datos: (ratio, columna) y contadores del resumen
+        self.campos = {}
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de D1"""
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
@@ -50,23 +57,92 @@ class D1MatrizRatiosTab(ttk.Frame):
         )
         subtitulo.pack(pady=(0, Dimensions.PADDING_MEDIUM))
         
-        # Obtener análisis
-        analisis = MatrizRatios(self.app.balance_data, self.app.income_data)
-        matriz = analisis.generar_matriz_completa()
+        # Comparación con los pares del sector (solo si hay índice)
+        if getattr(self.app, 'percentiles', None) is not None:
+            self._crear_selector_sector(scrollable_frame)
+        
+        # Obtener análisis (los ratios presentes y la columna de percentiles
+        # definen las filas y columnas de las tablas)
+        matriz = self.app.analysis_context.matriz
+        percentiles = self.app.analysis_context.percentiles_sector
+        self.campos = {}
+        self.estructura = self._estructura(matriz, percentiles)
         
         # Crear secciones por categoría
         categorias = ['Patrimonial', 'Financiero', 'Económico']
         
         for categoria in categorias:
-            self._crear_seccion_categoria(scrollable_frame, matriz, categoria)
+            self._crear_seccion_categoria(scrollable_frame, matriz, categoria, percentiles)
         
         # RESUMEN EJECUTIVO
-        self._crear_resumen_ejecutivo(scrollable_frame, matriz)
+        self._crear_resumen_ejecutivo(scrollable_frame)
+        
+        self._mostrar_datos(matriz, percentiles)
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
-    def _crear_seccion_categoria(self, parent, matriz, categoria):
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe valores, estados, percentiles y resumen en el lugar.
+        
+        Returns:
+            bool: False si cambiaron los ratios de la matriz o la columna de
+            percentiles (hay que volver a crear las tablas)
+        """
+        matriz = self.app.analysis_context.matriz
+        percentiles = self.app.analysis_context.percentiles_sector
+        if self._estructura(matriz, percentiles) != self.estructura:
+            return False
+        self._mostrar_datos(matriz, percentiles)
+        return True
+    
+    @staticmethod
+    def _estructura(matriz, percentiles):
+        """Ratios por categoría y presencia de percentiles: lo que fija las tablas"""
+        return (tuple((k, v['categoria']) for k, v in matriz.items()),
+                percentiles is not None)
+    
+    def _crear_selector_sector(self, parent):
+        """Selector del sector con cuyas empresas se calculan los percentiles"""
+        indice = self.app.percentiles
+        
+        marco = tk.Frame(parent, bg=Colors.BG_PRIMARY)
+        marco.pack(pady=(0, Dimensions.PADDING_MEDIUM))
+        
+        tk.Label(
+            marco,
+            text="Comparar con el sector:",
+            font=Fonts.NORMAL_BOLD,
+            bg=Colors.BG_PRIMARY
+        ).pack(side=tk.LEFT)
+        
+        sector_var = tk.StringVar(value=self.app.sector or "")
+        combo = ttk.Combobox(marco, textvariable=sector_var, values=indice.sectores,
+                             state="readonly", width=28)
+        combo.pack(side=tk.LEFT, padx=Dimensions.PADDING_SMALL)
+        combo.bind('<<ComboboxSelected>>', lambda e: self._cambiar_sector(sector_var.get()))
+        
+        if self.app.sector in indice.sectores:
+            tk.Label(
+                marco,
+                text=f"({indice.empresas(self.app.sector):,} empresas; el año 2 se compara "
+                     f"con el último periodo del sector)",
+                font=Fonts.SMALL,
+                bg=Colors.BG_PRIMARY,
+                fg=Colors.NEUTRAL
+            ).pack(side=tk.LEFT)
+    
+    def _cambiar_sector(self, sector):
+        """Vuelve a crear la pestaña con los percentiles de otro sector"""
+        if sector == self.app.sector:
+            return
+        self.app.sector = sector
+        for widget in self.winfo_children():
+            widget.destroy()
+        self.crear_interfaz()
+    
+    def _crear_seccion_categoria(self, parent, matriz, categoria, percentiles=None):
         """Crea una sección para una categoría de ratios"""
         # Frame de la categoría
         categoria_frame = ttk.LabelFrame(
@@ -89,10 +165,16 @@ class D1MatrizRatiosTab(ttk.Frame):
         tabla_frame.grid_columnconfigure(1, weight=1)  # Año 1
         tabla_frame.grid_columnconfigure(2, weight=1)  # Año 2
         tabla_frame.grid_columnconfigure(3, weight=1)  # Cambio
-        tabla_frame.grid_columnconfigure(4, weight=3)  # Interpretación
+        tabla_frame.grid_columnconfigure(4, weight=1)  # Rango óptimo
         
         # Encabezados
-        headers = ["Ratio", "Año 1", "Año 2", "Cambio", "Interpretación"]
+        headers = ["Ratio", "Año 1", "Año 2", "Cambio", "Rango óptimo"]
+        if percentiles is not None:
+            headers.append("Percentil sector")
+        headers.append("Interpretación")
+        col_interpretacion = len(headers) - 1
+        for col in range(5, len(headers)):
+            tabla_frame.grid_columnconfigure(col, weight=3 if col == col_interpretacion else 1)
         for col, header in enumerate(headers):
             tk.Label(
                 tabla_frame,
@@ -103,7 +185,7 @@ class D1MatrizRatiosTab(ttk.Frame):
                 pady=8
             ).grid(row=0, column=col, sticky="ew", padx=1, pady=1)
         
-        # Filas de datos
+        # Filas de datos (los valores los escribe _mostrar_datos)
         row = 1
         for key, data in ratios_categoria.items():
             # Nombre del ratio
@@ -118,46 +200,62 @@ class D1MatrizRatiosTab(ttk.Frame):
             ).grid(row=row, column=0, sticky="ew", padx=1, pady=1)
             
             # Año 1
-            valor1 = self._formatear_valor(data['ano_1'], data['unidad'])
-            tk.Label(
+            self.campos[(key, 'ano_1')] = tk.Label(
                 tabla_frame,
-                text=valor1,
                 font=Fonts.NORMAL,
                 bg=Colors.BG_PRIMARY,
                 padx=10,
                 pady=8
-            ).grid(row=row, column=1, sticky="ew", padx=1, pady=1)
+            )
+            self.campos[(key, 'ano_1')].grid(row=row, column=1, sticky="ew", padx=1, pady=1)
             
             # Año 2 (con color según estado)
-            valor2 = self._formatear_valor(data['ano_2'], data['unidad'])
-            color_estado = self._get_color_estado(data['estado'])
-            tk.Label(
+            self.campos[(key, 'ano_2')] = tk.Label(
                 tabla_frame,
-                text=valor2,
                 font=Fonts.NORMAL_BOLD,
-                bg=color_estado,
                 fg="white",
                 padx=10,
                 pady=8
-            ).grid(row=row, column=2, sticky="ew", padx=1, pady=1)
+            )
+            self.campos[(key, 'ano_2')].grid(row=row, column=2, sticky="ew", padx=1, pady=1)
             
             # Cambio (con flecha y color)
-            cambio_text = f"{data['simbolo']} {abs(data['cambio_porcentual']):.1f}%"
-            color_cambio = self._get_color_cambio(data['simbolo'])
-            tk.Label(
+            self.campos[(key, 'cambio')] = tk.Label(
                 tabla_frame,
-                text=cambio_text,
                 font=Fonts.NORMAL_BOLD,
                 bg=Colors.BG_PRIMARY,
-                fg=color_cambio,
                 padx=10,
                 pady=8
-            ).grid(row=row, column=3, sticky="ew", padx=1, pady=1)
+            )
+            self.campos[(key, 'cambio')].grid(row=row, column=3, sticky="ew", padx=1, pady=1)
             
-            # Interpretación
+            # Rango óptimo (banda fija de referencia)
+            rango_min, rango_max = data['rango_optimo']
             tk.Label(
                 tabla_frame,
-                text=data['interpretacion'],
+                text=f"{self._formatear_valor(rango_min, data['unidad'])} - "
+                     f"{self._formatear_valor(rango_max, data['unidad'])}",
+                font=Fonts.SMALL,
+                bg=Colors.BG_PRIMARY,
+                fg=Colors.TEXT_SECONDARY,
+                padx=10,
+                pady=8
+            ).grid(row=row, column=4, sticky="ew", padx=1, pady=1)
+            
+            # Percentil entre las empresas del sector (año 1 -> año 2)
+            if percentiles is not None:
+                self.campos[(key, 'percentil')] = tk.Label(
+                    tabla_frame,
+                    font=Fonts.NORMAL,
+                    bg=Colors.BG_PRIMARY,
+                    padx=10,
+                    pady=8
+                )
+                self.campos[(key, 'percentil')].grid(row=row, column=5, sticky="ew", padx=1, pady=1)
+            
+            # Interpretación
+            self.campos[(key, 'interpretacion')] = tk.Label(
+                tabla_frame,
                 font=Fonts.SMALL,
                 bg=Colors.BG_SECONDARY,
                 anchor="w",
@@ -165,11 +263,23 @@ class D1MatrizRatiosTab(ttk.Frame):
                 justify="left",
                 padx=10,
                 pady=8
-            ).grid(row=row, column=4, sticky="ew", padx=1, pady=1)
+            )
+            self.campos[(key, 'interpretacion')].grid(row=row, column=col_interpretacion,
+                                                      sticky="ew", padx=1, pady=1)
             
             row += 1
     
-    def _crear_resumen_ejecutivo(self, parent, matriz):
+    # Contadores del resumen: (clave, etiqueta, fila, columna, color)
+    CONTADORES = (
+        ('optimos', "✓ Óptimos:", 1, 0, Colors.SUCCESS),
+        ('bajos', "⚠ Bajos:", 2, 0, Colors.DANGER),
+        ('altos', "⚠ Altos:", 3, 0, Colors.WARNING),
+        ('mejoras', "↑ Mejoras:", 1, 3, Colors.SUCCESS),
+        ('deterioros', "↓ Deterioros:", 2, 3, Colors.DANGER),
+        ('estables', "= Estables:", 3, 3, Colors.INFO),
+    )
+    
+    def _crear_resumen_ejecutivo(self, parent):
         """Crea un resumen ejecutivo de la matriz"""
         resumen_frame = ttk.LabelFrame(
             parent,
@@ -179,17 +289,6 @@ class D1MatrizRatiosTab(ttk.Frame):
         resumen_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
                           pady=Dimensions.PADDING_MEDIUM)
         
-        # Contar estados
-        optimos = sum(1 for r in matriz.values() if r['estado'] == 'optimo')
-        bajos = sum(1 for r in matriz.values() if r['estado'] == 'bajo')
-        altos = sum(1 for r in matriz.values() if r['estado'] == 'alto')
-        total = len(matriz)
-        
-        # Contar mejoras/deterioros
-        mejoras = sum(1 for r in matriz.values() if r['direccion'] == 'mejora')
-        deterioros = sum(1 for r in matriz.values() if r['direccion'] == 'deterioro')
-        estables = sum(1 for r in matriz.values() if r['direccion'] == 'estable')
-        
         # Estadísticas
         stats_frame = tk.Frame(resumen_frame, bg=Colors.BG_PRIMARY)
         stats_frame.pack(fill=tk.X, pady=10)
@@ -199,58 +298,23 @@ class D1MatrizRatiosTab(ttk.Frame):
                  font=Fonts.HEADER, bg=Colors.BG_PRIMARY).grid(
             row=0, column=0, columnspan=2, pady=5, sticky="w")
         
-        tk.Label(stats_frame, text=f"✓ Óptimos:", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(stats_frame, text=f"{optimos}/{total} ({optimos/total*100:.1f}%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.SUCCESS, fg="white", 
-                 padx=5, pady=2).grid(row=1, column=1, padx=10, pady=3, sticky="w")
-        
-        tk.Label(stats_frame, text=f"⚠ Bajos:", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(stats_frame, text=f"{bajos}/{total} ({bajos/total*100:.1f}%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.DANGER, fg="white", 
-                 padx=5, pady=2).grid(row=2, column=1, padx=10, pady=3, sticky="w")
-        
-        tk.Label(stats_frame, text=f"⚠ Altos:", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=3, column=0, padx=10, pady=3, sticky="w")
-        tk.Label(stats_frame, text=f"{altos}/{total} ({altos/total*100:.1f}%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.WARNING, fg="white", 
-                 padx=5, pady=2).grid(row=3, column=1, padx=10, pady=3, sticky="w")
-        
         tk.Label(stats_frame, text="TENDENCIAS (AÑO 1 vs 2)", 
                  font=Fonts.HEADER, bg=Colors.BG_PRIMARY).grid(
             row=0, column=3, columnspan=2, pady=5, padx=(50, 0), sticky="w")
         
-        tk.Label(stats_frame, text=f"↑ Mejoras:", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=1, column=3, padx=(50, 10), pady=3, sticky="w")
-        tk.Label(stats_frame, text=f"{mejoras}/{total} ({mejoras/total*100:.1f}%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.SUCCESS, fg="white", 
-                 padx=5, pady=2).grid(row=1, column=4, padx=10, pady=3, sticky="w")
-        
-        tk.Label(stats_frame, text=f"↓ Deterioros:", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=2, column=3, padx=(50, 10), pady=3, sticky="w")
-        tk.Label(stats_frame, text=f"{deterioros}/{total} ({deterioros/total*100:.1f}%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.DANGER, fg="white", 
-                 padx=5, pady=2).grid(row=2, column=4, padx=10, pady=3, sticky="w")
-        
-        tk.Label(stats_frame, text=f"= Estables:", 
-                 font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
-            row=3, column=3, padx=(50, 10), pady=3, sticky="w")
-        tk.Label(stats_frame, text=f"{estables}/{total} ({estables/total*100:.1f}%)", 
-                 font=Fonts.NORMAL_BOLD, bg=Colors.INFO, fg="white", 
-                 padx=5, pady=2).grid(row=3, column=4, padx=10, pady=3, sticky="w")
+        for clave, etiqueta, fila, columna, color in self.CONTADORES:
+            tk.Label(stats_frame, text=etiqueta, 
+                     font=Fonts.NORMAL, bg=Colors.BG_PRIMARY).grid(
+                row=fila, column=columna, padx=(50, 10) if columna else 10,
+                pady=3, sticky="w")
+            self.campos[clave] = tk.Label(stats_frame, font=Fonts.NORMAL_BOLD,
+                                          bg=color, fg="white", padx=5, pady=2)
+            self.campos[clave].grid(row=fila, column=columna + 1, padx=10, pady=3, sticky="w")
         
         # Conclusión
         ttk.Separator(resumen_frame, orient="horizontal").pack(fill=tk.X, pady=10)
         
-        conclusion = self._generar_conclusion(optimos, total, mejoras, deterioros)
-        
-        conclusion_text = tk.Text(
+        self.text_conclusion = tk.Text(
             resumen_frame,
             height=5,
             wrap='word',
@@ -260,9 +324,40 @@ class D1MatrizRatiosTab(ttk.Frame):
             padx=10,
             pady=10
         )
-        conclusion_text.pack(fill=tk.X)
-        conclusion_text.insert('1.0', conclusion)
-        conclusion_text.config(state='disabled')
+        self.text_conclusion.pack(fill=tk.X)
+        self.text_conclusion.config(state='disabled')
+    
+    def _mostrar_datos(self, matriz, percentiles):
+        """Escribe en las tablas y el resumen los ratios de la matriz actual"""
+        for key, data in matriz.items():
+            self.campos[(key, 'ano_1')].config(
+                text=self._formatear_valor(data['ano_1'], data['unidad']))
+            self.campos[(key, 'ano_2')].config(
+                text=self._formatear_valor(data['ano_2'], data['unidad']),
+                bg=self._get_color_estado(data['estado']))
+            self.campos[(key, 'cambio')].config(
+                text=f"{data['simbolo']} {abs(data['cambio_porcentual']):.1f}%",
+                fg=self._get_color_cambio(data['simbolo']))
+            if percentiles is not None:
+                self.campos[(key, 'percentil')].config(
+                    text=self._formatear_percentiles(percentiles.get(key)))
+            self.campos[(key, 'interpretacion')].config(text=data['interpretacion'])
+        
+        # Contar estados y mejoras/deterioros
+        total = len(matriz)
+        conteos = {
+            'optimos': sum(1 for r in matriz.values() if r['estado'] == 'optimo'),
+            'bajos': sum(1 for r in matriz.values() if r['estado'] == 'bajo'),
+            'altos': sum(1 for r in matriz.values() if r['estado'] == 'alto'),
+            'mejoras': sum(1 for r in matriz.values() if r['direccion'] == 'mejora'),
+            'deterioros': sum(1 for r in matriz.values() if r['direccion'] == 'deterioro'),
+            'estables': sum(1 for r in matriz.values() if r['direccion'] == 'estable'),
+        }
+        for clave, cantidad in conteos.items():
+            self.campos[clave].config(text=f"{cantidad}/{total} ({cantidad/total*100:.1f}%)")
+        
+        escribir_texto(self.text_conclusion, self._generar_conclusion(
+            conteos['optimos'], total, conteos['mejoras'], conteos['deterioros']))
     
     def _generar_conclusion(self, optimos, total, mejoras, deterioros):
         """Genera conclusión del análisis"""
@@ -304,6 +399,14 @@ class D1MatrizRatiosTab(ttk.Frame):
         else:  # ratio
             return f"{valor:.2f}"
     
+    def _formatear_percentiles(self, percentiles):
+        """'P42 → P57' (año 1 → año 2); 's/d' donde el sector no tiene datos"""
+        if not percentiles:
+            return "s/d"
+        textos = [f"P{p:.0f}" if p is not None else "s/d"
+                  for p in (percentiles.get(1), percentiles.get(2))]
+        return " → ".join(textos)
+    
     def _get_color_estado(self, estado):
         """Retorna color según el estado del ratio"""
         if estado == 'optimo':
@@ -6,18 +6,25 @@ Pestaña D2 - Fortalezas y Debilidades
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions, NumberFormat
-from core.analysis.matriz_ratios import MatrizRatios
-from core.analysis.fortalezas_debilidades import FortalezasDebilidadesAnalysis
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class D2FortalezasDebilidadesTab(ttk.Frame):
     """Pestaña D2 - Fortalezas y Debilidades"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'D2'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Widgets de cada card, en el orden del análisis (los escribe _mostrar_datos)
+        self.cards_fortalezas = []
+        self.cards_debilidades = []
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de D2"""
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
@@ -51,12 +58,8 @@ class D2FortalezasDebilidadesTab(ttk.Frame):
         )
         subtitulo.pack(pady=(0, Dimensions.PADDING_MEDIUM))
         
-        # Obtener análisis
-        matriz_analisis = MatrizRatios(self.app.balance_data, self.app.income_data)
-        matriz = matriz_analisis.generar_matriz_completa()
-        
-        analisis = FortalezasDebilidadesAnalysis(matriz)
-        resultado = analisis.identificar_fortalezas_debilidades()
+        # Obtener análisis (la cantidad de fortalezas y debilidades fija las cards)
+        resultado = self.app.analysis_context.fortalezas_debilidades
         
         # FORTALEZAS
         fortalezas_frame = ttk.LabelFrame(
@@ -67,8 +70,10 @@ class D2FortalezasDebilidadesTab(ttk.Frame):
         fortalezas_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
                              pady=Dimensions.PADDING_MEDIUM)
         
-        for fortaleza in resultado['fortalezas']:
-            self._crear_card_fortaleza(fortalezas_frame, fortaleza)
+        self.cards_fortalezas = [
+            self._crear_card(fortalezas_frame, Colors.SUCCESS, altura=10)
+            for _ in resultado['fortalezas']
+        ]
         
         # DEBILIDADES
         debilidades_frame = ttk.LabelFrame(
@@ -79,8 +84,10 @@ class D2FortalezasDebilidadesTab(ttk.Frame):
         debilidades_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
                                pady=Dimensions.PADDING_MEDIUM)
         
-        for debilidad in resultado['debilidades']:
-            self._crear_card_debilidad(debilidades_frame, debilidad)
+        self.cards_debilidades = [
+            self._crear_card(debilidades_frame, Colors.DANGER, altura=11)
+            for _ in resultado['debilidades']
+        ]
         
         # DIAGNÓSTICO INTEGRAL
         diagnostico_frame = ttk.LabelFrame(
@@ -91,7 +98,7 @@ class D2FortalezasDebilidadesTab(ttk.Frame):
         diagnostico_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
                               pady=Dimensions.PADDING_MEDIUM)
         
-        diagnostico_text = tk.Text(
+        self.diagnostico_text = tk.Text(
             diagnostico_frame,
             height=12,
             wrap='word',
@@ -101,145 +108,91 @@ class D2FortalezasDebilidadesTab(ttk.Frame):
             padx=10,
             pady=10
         )
-        diagnostico_text.pack(fill=tk.X)
-        diagnostico_text.insert('1.0', resultado['interpretacion_global'])
-        diagnostico_text.config(state='disabled')
+        self.diagnostico_text.pack(fill=tk.X)
+        self.diagnostico_text.config(state='disabled')
+        
+        self._mostrar_datos(resultado)
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
-    def _crear_card_fortaleza(self, parent, fortaleza):
-        """Crea una card para mostrar una fortaleza"""
-        # Frame contenedor
-        card_frame = tk.Frame(parent, bg=Colors.SUCCESS, relief='solid', borderwidth=1)
-        card_frame.pack(fill=tk.X, pady=Dimensions.PADDING_MEDIUM)
-        
-        # Padding interno
-        inner_frame = tk.Frame(card_frame, bg=Colors.SUCCESS)
-        inner_frame.pack(fill=tk.X, padx=15, pady=12)
-        
-        # Header con título y badge
-        header_frame = tk.Frame(inner_frame, bg=Colors.SUCCESS)
-        header_frame.pack(fill=tk.X, pady=(0, 8))
-        
-        # Título
-        titulo_label = tk.Label(
-            header_frame,
-            text=f"FORTALEZA #{fortaleza['posicion']}",
-            font=Fonts.HEADER,
-            bg=Colors.SUCCESS,
-            fg="white"
-        )
-        titulo_label.pack(side=tk.LEFT)
-        
-        # Badge de categoría
-        badge = tk.Label(
-            header_frame,
-            text=fortaleza['categoria'],
-            font=Fonts.SMALL,
-            bg="white",
-            fg=Colors.SUCCESS,
-            padx=8,
-            pady=2
-        )
-        badge.pack(side=tk.RIGHT)
-        
-        # Nombre del ratio
-        nombre_label = tk.Label(
-            inner_frame,
-            text=fortaleza['ratio'],
-            font=Fonts.LARGE,
-            bg=Colors.SUCCESS,
-            fg="white"
-        )
-        nombre_label.pack(anchor="w", pady=(0, 10))
-        
-        # Datos cuantitativos en grid
-        datos_frame = tk.Frame(inner_frame, bg="white")
-        datos_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        # Grid 2x2
-        tk.Label(datos_frame, text="Año 1:", font=Fonts.SMALL, 
-                 bg="white", fg=Colors.NEUTRAL).grid(row=0, column=0, padx=10, pady=5, sticky="w")
-        tk.Label(datos_frame, text=self._formatear_valor(fortaleza['ano_1'], fortaleza['unidad']), 
-                 font=Fonts.NORMAL_BOLD, bg="white").grid(row=0, column=1, padx=10, pady=5, sticky="w")
-        
-        tk.Label(datos_frame, text="Año 2:", font=Fonts.SMALL, 
-                 bg="white", fg=Colors.NEUTRAL).grid(row=0, column=2, padx=10, pady=5, sticky="w")
-        tk.Label(datos_frame, text=self._formatear_valor(fortaleza['ano_2'], fortaleza['unidad']), 
-                 font=Fonts.NORMAL_BOLD, bg="white", fg=Colors.SUCCESS).grid(row=0, column=3, padx=10, pady=5, sticky="w")
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe las cards y el diagnóstico en el lugar.
+        
+        Returns:
+            bool: False si cambió la cantidad de fortalezas o debilidades
+            (hay que volver a crear las cards)
+        """
+        resultado = self.app.analysis_context.fortalezas_debilidades
+        if (len(resultado['fortalezas']) != len(self.cards_fortalezas)
+                or len(resultado['debilidades']) != len(self.cards_debilidades)):
+            return False
+        self._mostrar_datos(resultado)
+        return True
+    
+    def _mostrar_datos(self, resultado):
+        """Escribe en las cards y el diagnóstico el análisis actual"""
+        for card, fortaleza in zip(self.cards_fortalezas, resultado['fortalezas']):
+            self._mostrar_card(card, fortaleza, "FORTALEZA")
+        for card, debilidad in zip(self.cards_debilidades, resultado['debilidades']):
+            self._mostrar_card(card, debilidad, "DEBILIDAD")
+        escribir_texto(self.diagnostico_text, resultado['interpretacion_global'])
+    
+    def _crear_card(self, parent, color, altura):
+        """
+        Crea una card vacía para una fortaleza o debilidad.
         
-        tk.Label(datos_frame, text="Cambio:", font=Fonts.SMALL, 
-                 bg="white", fg=Colors.NEUTRAL).grid(row=1, column=0, padx=10, pady=5, sticky="w")
-        cambio_color = Colors.SUCCESS if fortaleza['cambio_pct'] > 0 else Colors.DANGER
-        tk.Label(datos_frame, text=f"{fortaleza['cambio_pct']:+.1f}%", 
-                 font=Fonts.NORMAL_BOLD, bg="white", fg=cambio_color).grid(row=1, column=1, padx=10, pady=5, sticky="w")
+        Args:
+            parent: Frame contenedor
+            color: Color de la card (éxito para fortalezas, peligro para debilidades)
+            altura: Líneas del texto de análisis
         
-        tk.Label(datos_frame, text="Estado:", font=Fonts.SMALL, 
-                 bg="white", fg=Colors.NEUTRAL).grid(row=1, column=2, padx=10, pady=5, sticky="w")
-        tk.Label(datos_frame, text=fortaleza['estado'].upper(), 
-                 font=Fonts.NORMAL_BOLD, bg="white", fg=Colors.SUCCESS).grid(row=1, column=3, padx=10, pady=5, sticky="w")
+        Returns:
+            dict: Widgets de la card que dependen de los datos
+        """
+        card = {}
         
-        # Análisis completo
-        analisis_text = tk.Text(
-            inner_frame,
-            height=10,
-            wrap='word',
-            font=Fonts.SMALL,
-            bg="white",
-            relief='flat',
-            padx=10,
-            pady=10
-        )
-        analisis_text.pack(fill=tk.X)
-        analisis_text.insert('1.0', fortaleza['analisis'])
-        analisis_text.config(state='disabled')
-    
-    def _crear_card_debilidad(self, parent, debilidad):
-        """Crea una card para mostrar una debilidad"""
         # Frame contenedor
-        card_frame = tk.Frame(parent, bg=Colors.DANGER, relief='solid', borderwidth=1)
+        card_frame = tk.Frame(parent, bg=color, relief='solid', borderwidth=1)
         card_frame.pack(fill=tk.X, pady=Dimensions.PADDING_MEDIUM)
         
         # Padding interno
-        inner_frame = tk.Frame(card_frame, bg=Colors.DANGER)
+        inner_frame = tk.Frame(card_frame, bg=color)
         inner_frame.pack(fill=tk.X, padx=15, pady=12)
         
         # Header con título y badge
-        header_frame = tk.Frame(inner_frame, bg=Colors.DANGER)
+        header_frame = tk.Frame(inner_frame, bg=color)
         header_frame.pack(fill=tk.X, pady=(0, 8))
         
         # Título
-        titulo_label = tk.Label(
+        card['titulo'] = tk.Label(
             header_frame,
-            text=f"DEBILIDAD #{debilidad['posicion']}",
             font=Fonts.HEADER,
-            bg=Colors.DANGER,
+            bg=color,
             fg="white"
         )
-        titulo_label.pack(side=tk.LEFT)
+        card['titulo'].pack(side=tk.LEFT)
         
         # Badge de categoría
-        badge = tk.Label(
+        card['categoria'] = tk.Label(
             header_frame,
-            text=debilidad['categoria'],
             font=Fonts.SMALL,
             bg="white",
-            fg=Colors.DANGER,
+            fg=color,
             padx=8,
             pady=2
         )
-        badge.pack(side=tk.RIGHT)
+        card['categoria'].pack(side=tk.RIGHT)
         
         # Nombre del ratio
-        nombre_label = tk.Label(
+        card['ratio'] = tk.Label(
             inner_frame,
-            text=debilidad['ratio'],
             font=Fonts.LARGE,
-            bg=Colors.DANGER,
+            bg=color,
             fg="white"
         )
-        nombre_label.pack(anchor="w", pady=(0, 10))
+        card['ratio'].pack(anchor="w", pady=(0, 10))
         
         # Datos cuantitativos en grid
         datos_frame = tk.Frame(inner_frame, bg="white")
@@ -248,29 +201,28 @@ class D2FortalezasDebilidadesTab(ttk.Frame):
         # Grid 2x2
         tk.Label(datos_frame, text="Año 1:", font=Fonts.SMALL, 
                  bg="white", fg=Colors.NEUTRAL).grid(row=0, column=0, padx=10, pady=5, sticky="w")
-        tk.Label(datos_frame, text=self._formatear_valor(debilidad['ano_1'], debilidad['unidad']), 
-                 font=Fonts.NORMAL_BOLD, bg="white").grid(row=0, column=1, padx=10, pady=5, sticky="w")
+        card['ano_1'] = tk.Label(datos_frame, font=Fonts.NORMAL_BOLD, bg="white")
+        card['ano_1'].grid(row=0, column=1, padx=10, pady=5, sticky="w")
         
         tk.Label(datos_frame, text="Año 2:", font=Fonts.SMALL, 
                  bg="white", fg=Colors.NEUTRAL).grid(row=0, column=2, padx=10, pady=5, sticky="w")
-        tk.Label(datos_frame, text=self._formatear_valor(debilidad['ano_2'], debilidad['unidad']), 
-                 font=Fonts.NORMAL_BOLD, bg="white", fg=Colors.DANGER).grid(row=0, column=3, padx=10, pady=5, sticky="w")
+        card['ano_2'] = tk.Label(datos_frame, font=Fonts.NORMAL_BOLD, bg="white", fg=color)
+        card['ano_2'].grid(row=0, column=3, padx=10, pady=5, sticky="w")
         
         tk.Label(datos_frame, text="Cambio:", font=Fonts.SMALL, 
                  bg="white", fg=Colors.NEUTRAL).grid(row=1, column=0, padx=10, pady=5, sticky="w")
-        cambio_color = Colors.SUCCESS if debilidad['cambio_pct'] > 0 else Colors.DANGER
-        tk.Label(datos_frame, text=f"{debilidad['cambio_pct']:+.1f}%", 
-                 font=Fonts.NORMAL_BOLD, bg="white", fg=cambio_color).grid(row=1, column=1, padx=10, pady=5, sticky="w")
+        card['cambio'] = tk.Label(datos_frame, font=Fonts.NORMAL_BOLD, bg="white")
+        card['cambio'].grid(row=1, column=1, padx=10, pady=5, sticky="w")
         
         tk.Label(datos_frame, text="Estado:", font=Fonts.SMALL, 
                  bg="white", fg=Colors.NEUTRAL).grid(row=1, column=2, padx=10, pady=5, sticky="w")
-        tk.Label(datos_frame, text=debilidad['estado'].upper(), 
-                 font=Fonts.NORMAL_BOLD, bg="white", fg=Colors.DANGER).grid(row=1, column=3, padx=10, pady=5, sticky="w")
+        card['estado'] = tk.Label(datos_frame, font=Fonts.NORMAL_BOLD, bg="white", fg=color)
+        card['estado'].grid(row=1, column=3, padx=10, pady=5, sticky="w")
         
         # Análisis completo
-        analisis_text = tk.Text(
+        card['analisis'] = tk.Text(
             inner_frame,
-            height=11,
+            height=altura,
             wrap='word',
             font=Fonts.SMALL,
             bg="white",
@@ -278,9 +230,22 @@ class D2FortalezasDebilidadesTab(ttk.Frame):
             padx=10,
             pady=10
         )
-        analisis_text.pack(fill=tk.X)
-        analisis_text.insert('1.0', debilidad['analisis'])
-        analisis_text.config(state='disabled')
+        card['analisis'].pack(fill=tk.X)
+        card['analisis'].config(state='disabled')
+        
+        return card
+    
+    def _mostrar_card(self, card, item, tipo):
+        """Escribe en una card los datos de una fortaleza o debilidad"""
+        card['titulo'].config(text=f"{tipo} #{item['posicion']}")
+        card['categoria'].config(text=item['categoria'])
+        card['ratio'].config(text=item['ratio'])
+        card['ano_1'].config(text=self._formatear_valor(item['ano_1'], item['unidad']))
+        card['ano_2'].config(text=self._formatear_valor(item['ano_2'], item['unidad']))
+        cambio_color = Colors.SUCCESS if item['cambio_pct'] > 0 else Colors.DANGER
+        card['cambio'].config(text=f"{item['cambio_pct']:+.1f}%", fg=cambio_color)
+        card['estado'].config(text=item['estado'].upper())
+        escribir_texto(card['analisis'], item['analisis'])
     
     def _formatear_valor(self, valor, unidad):
         """Formatea un valor según su unidad"""
@@ -6,17 +6,31 @@ Pestaña D3 - Resumen Integral de Ratios
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions, NumberFormat
-from core.analysis.resumen_integral import ResumenIntegralRatios
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
 
 
 class D3ResumenIntegralTab(ttk.Frame):
     """Pestaña D3 - Resumen Integral de Ratios"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'D3'
+    
+    # Secciones del resumen: (clave, título, subtítulo)
+    SECCIONES = (
+        ('patrimonial', "ANÁLISIS PATRIMONIAL", "Ratios de Liquidez y Capital de Trabajo"),
+        ('financiero', "ANÁLISIS FINANCIERO", "Ratios de Solvencia y Estructura de Capital"),
+        ('economico', "ANÁLISIS ECONÓMICO", "Ratios de Rentabilidad y Eficiencia"),
+    )
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        # Widgets de cada card, por sección (los escribe _mostrar_datos)
+        self.cards = {}
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de D3"""
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
@@ -50,33 +64,18 @@ class D3ResumenIntegralTab(ttk.Frame):
         )
         subtitulo.pack(pady=(0, Dimensions.PADDING_MEDIUM))
         
-        # Obtener análisis
-        analisis = ResumenIntegralRatios(self.app.balance_data, self.app.income_data)
-        resumen = analisis.generar_resumen_completo()
-        
-        # ANÁLISIS PATRIMONIAL
-        self._crear_seccion_categoria(
-            scrollable_frame,
-            "ANÁLISIS PATRIMONIAL",
-            "Ratios de Liquidez y Capital de Trabajo",
-            resumen['patrimonial']
-        )
-        
-        # ANÁLISIS FINANCIERO
-        self._crear_seccion_categoria(
-            scrollable_frame,
-            "ANÁLISIS FINANCIERO",
-            "Ratios de Solvencia y Estructura de Capital",
-            resumen['financiero']
-        )
-        
-        # ANÁLISIS ECONÓMICO
-        self._crear_seccion_categoria(
-            scrollable_frame,
-            "ANÁLISIS ECONÓMICO",
-            "Ratios de Rentabilidad y Eficiencia",
-            resumen['economico']
-        )
+        # Obtener análisis (los ratios de cada sección fijan las cards)
+        resumen = self.app.analysis_context.resumen_integral
+        self.estructura = self._estructura(resumen)
+        
+        # ANÁLISIS PATRIMONIAL, FINANCIERO Y ECONÓMICO
+        for clave, titulo_seccion, subtitulo_seccion in self.SECCIONES:
+            self.cards[clave] = self._crear_seccion_categoria(
+                scrollable_frame,
+                titulo_seccion,
+                subtitulo_seccion,
+                resumen[clave]
+            )
         
         # CONCLUSIÓN GLOBAL
         conclusion_frame = ttk.LabelFrame(
@@ -87,7 +86,7 @@ class D3ResumenIntegralTab(ttk.Frame):
         conclusion_frame.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
                              pady=Dimensions.PADDING_MEDIUM)
         
-        conclusion_text = tk.Text(
+        self.conclusion_text = tk.Text(
             conclusion_frame,
             height=10,
             wrap='word',
@@ -97,13 +96,42 @@ class D3ResumenIntegralTab(ttk.Frame):
             padx=10,
             pady=10
         )
-        conclusion_text.pack(fill=tk.X)
-        conclusion_text.insert('1.0', resumen['conclusion_global'])
-        conclusion_text.config(state='disabled')
+        self.conclusion_text.pack(fill=tk.X)
+        self.conclusion_text.config(state='disabled')
+        
+        self._mostrar_datos(resumen)
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
+    def refrescar(self, cambiados=None):
+        """
+        Reescribe las cards y la conclusión en el lugar.
+        
+        Returns:
+            bool: False si cambiaron los ratios de alguna sección (hay que
+            volver a crear las cards)
+        """
+        resumen = self.app.analysis_context.resumen_integral
+        if self._estructura(resumen) != self.estructura:
+            return False
+        self._mostrar_datos(resumen)
+        return True
+    
+    def _estructura(self, resumen):
+        """Ratios de cada sección y si muestran rango óptimo: lo que fija las cards"""
+        return tuple(
+            tuple((r['ratio_key'], 'rango' in r['analisis']) for r in resumen[clave])
+            for clave, _, _ in self.SECCIONES
+        )
+    
+    def _mostrar_datos(self, resumen):
+        """Escribe en las cards y la conclusión el resumen actual"""
+        for clave, _, _ in self.SECCIONES:
+            for card, ratio_data in zip(self.cards[clave], resumen[clave]):
+                self._mostrar_card(card, ratio_data)
+        escribir_texto(self.conclusion_text, resumen['conclusion_global'])
+    
     def _crear_seccion_categoria(self, parent, titulo, subtitulo, ratios):
         """Crea una sección para una categoría de ratios"""
         # Frame de la categoría
@@ -126,27 +154,24 @@ class D3ResumenIntegralTab(ttk.Frame):
         subtitulo_label.pack(anchor="w", pady=(0, 10))
         
         # Crear cards para cada ratio
-        for ratio_data in ratios:
-            self._crear_card_ratio(categoria_frame, ratio_data)
+        return [self._crear_card_ratio(categoria_frame, ratio_data) for ratio_data in ratios]
     
     def _crear_card_ratio(self, parent, ratio_data):
-        """Crea una card para mostrar un ratio con su análisis completo"""
-        analisis = ratio_data['analisis']
-        valor = ratio_data['valor']
+        """
+        Crea una card vacía para un ratio con su análisis completo.
         
-        # Determinar color según estado
-        if analisis['estado'] == 'optimo':
-            color_borde = Colors.SUCCESS
-            color_header = Colors.SUCCESS
-        elif analisis['estado'] == 'bajo':
-            color_borde = Colors.DANGER
-            color_header = Colors.DANGER
-        else:  # alto
-            color_borde = Colors.WARNING
-            color_header = Colors.WARNING
+        Args:
+            parent: Frame de la sección
+            ratio_data: Ratio del resumen (define si la card lleva rango óptimo)
+        
+        Returns:
+            dict: Widgets de la card que dependen de los datos
+        """
+        analisis = ratio_data['analisis']
+        card = {}
         
         # Frame contenedor con borde
-        card_frame = tk.Frame(parent, bg=color_borde, relief='solid', borderwidth=2)
+        card_frame = tk.Frame(parent, relief='solid', borderwidth=2)
         card_frame.pack(fill=tk.X, pady=Dimensions.PADDING_MEDIUM)
         
         # Frame interno
@@ -154,53 +179,43 @@ class D3ResumenIntegralTab(ttk.Frame):
         inner_frame.pack(fill=tk.X, padx=2, pady=2)
         
         # HEADER
-        header_frame = tk.Frame(inner_frame, bg=color_header)
+        header_frame = tk.Frame(inner_frame)
         header_frame.pack(fill=tk.X)
         
         # Título y valor
-        titulo_container = tk.Frame(header_frame, bg=color_header)
+        titulo_container = tk.Frame(header_frame)
         titulo_container.pack(fill=tk.X, padx=15, pady=10)
         
-        nombre_label = tk.Label(
+        card['nombre'] = tk.Label(
             titulo_container,
-            text=analisis['nombre'],
             font=Fonts.LARGE,
-            bg=color_header,
             fg="white"
         )
-        nombre_label.pack(side=tk.LEFT)
+        card['nombre'].pack(side=tk.LEFT)
         
         # Valor y badge de estado
-        valor_container = tk.Frame(titulo_container, bg=color_header)
+        valor_container = tk.Frame(titulo_container)
         valor_container.pack(side=tk.RIGHT)
         
-        # Formatear valor
-        if analisis.get('unidad') == 'porcentaje':
-            valor_texto = f"{valor:.2f}%"
-        elif analisis.get('unidad') == 'veces':
-            valor_texto = f"{valor:.2f}x"
-        else:
-            valor_texto = f"{valor:.2f}"
-        
-        valor_label = tk.Label(
+        card['valor'] = tk.Label(
             valor_container,
-            text=valor_texto,
             font=("Arial", 18, "bold"),
-            bg=color_header,
             fg="white"
         )
-        valor_label.pack(side=tk.LEFT, padx=(0, 10))
+        card['valor'].pack(side=tk.LEFT, padx=(0, 10))
         
-        estado_badge = tk.Label(
+        card['estado'] = tk.Label(
             valor_container,
-            text=analisis['estado'].upper(),
             font=Fonts.SMALL,
             bg="white",
-            fg=color_header,
             padx=8,
             pady=3
         )
-        estado_badge.pack(side=tk.LEFT)
+        card['estado'].pack(side=tk.LEFT)
+        
+        # Widgets que toman el color del estado (borde y encabezado)
+        card['coloreados'] = [card_frame, header_frame, titulo_container, card['nombre'],
+                              valor_container, card['valor']]
         
         # CUERPO - Grid de 3 columnas
         body_frame = tk.Frame(inner_frame, bg=Colors.BG_PRIMARY)
@@ -223,7 +238,7 @@ class D3ResumenIntegralTab(ttk.Frame):
             fg=Colors.PRIMARY
         ).pack(anchor="w", padx=10, pady=(10, 5))
         
-        interp_text = tk.Text(
+        card['interpretacion'] = tk.Text(
             interp_frame,
             height=6,
             wrap='word',
@@ -233,9 +248,8 @@ class D3ResumenIntegralTab(ttk.Frame):
             padx=10,
             pady=5
         )
-        interp_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 10))
-        interp_text.insert('1.0', analisis['interpretacion'])
-        interp_text.config(state='disabled')
+        card['interpretacion'].pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 10))
+        card['interpretacion'].config(state='disabled')
         
         # CAUSA
         causa_frame = tk.Frame(body_frame, bg=Colors.BG_SECONDARY, relief='solid', borderwidth=1)
@@ -249,7 +263,7 @@ class D3ResumenIntegralTab(ttk.Frame):
             fg=Colors.PRIMARY
         ).pack(anchor="w", padx=10, pady=(10, 5))
         
-        causa_text = tk.Text(
+        card['causa'] = tk.Text(
             causa_frame,
             height=6,
             wrap='word',
@@ -259,9 +273,8 @@ class D3ResumenIntegralTab(ttk.Frame):
             padx=10,
             pady=5
         )
-        causa_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 10))
-        causa_text.insert('1.0', analisis['causa'])
-        causa_text.config(state='disabled')
+        card['causa'].pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 10))
+        card['causa'].config(state='disabled')
         
         # RECOMENDACIÓN
         recom_frame = tk.Frame(body_frame, bg=Colors.BG_SECONDARY, relief='solid', borderwidth=1)
@@ -275,7 +288,7 @@ class D3ResumenIntegralTab(ttk.Frame):
             fg=Colors.PRIMARY
         ).pack(anchor="w", padx=10, pady=(10, 5))
         
-        recom_text = tk.Text(
+        card['recomendacion'] = tk.Text(
             recom_frame,
             height=6,
             wrap='word',
@@ -285,22 +298,53 @@ class D3ResumenIntegralTab(ttk.Frame):
             padx=10,
             pady=5
         )
-        recom_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 10))
-        recom_text.insert('1.0', analisis['recomendacion'])
-        recom_text.config(state='disabled')
+        card['recomendacion'].pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 10))
+        card['recomendacion'].config(state='disabled')
         
         # RANGO ÓPTIMO (footer pequeño)
         if 'rango' in analisis:
-            rango_min, rango_max = analisis['rango']
-            rango_text = f"Rango Óptimo: {rango_min:.2f} - {rango_max:.2f}"
-            
-            rango_label = tk.Label(
+            card['rango'] = tk.Label(
                 inner_frame,
-                text=rango_text,
                 font=Fonts.SMALL,
                 bg=Colors.BG_SECONDARY,
                 fg=Colors.NEUTRAL,
                 padx=10,
                 pady=5
             )
-            rango_label.pack(fill=tk.X, padx=15, pady=(0, 10))
\ No newline at end of file
+            card['rango'].pack(fill=tk.X, padx=15, pady=(0, 10))
+        
+        return card
+    
+    def _mostrar_card(self, card, ratio_data):
+        """Escribe en una card el valor, el estado y el análisis de un ratio"""
+        analisis = ratio_data['analisis']
+        valor = ratio_data['valor']
+        
+        # Determinar color según estado
+        if analisis['estado'] == 'optimo':
+            color_estado = Colors.SUCCESS
+        elif analisis['estado'] == 'bajo':
+            color_estado = Colors.DANGER
+        else:  # alto
+            color_estado = Colors.WARNING
+        for widget in card['coloreados']:
+            widget.config(bg=color_estado)
+        
+        # Formatear valor
+        if analisis.get('unidad') == 'porcentaje':
+            valor_texto = f"{valor:.2f}%"
+        elif analisis.get('unidad') == 'veces':
+            valor_texto = f"{valor:.2f}x"
+        else:
+            valor_texto = f"{valor:.2f}"
+        
+        card['nombre'].config(text=analisis['nombre'])
+        card['valor'].config(text=valor_texto)
+        card['estado'].config(text=analisis['estado'].upper(), fg=color_estado)
+        escribir_texto(card['interpretacion'], analisis['interpretacion'])
+        escribir_texto(card['causa'], analisis['causa'])
+        escribir_texto(card['recomendacion'], analisis['recomendacion'])
+        
+        if 'rango' in card:
+            rango_min, rango_max = analisis['rango']
+            card['rango'].config(text=f"Rango Óptimo: {rango_min:.2f} - {rango_max:.2f}")
\ No newline at end of file
@@ -6,17 +6,31 @@ Pestaña D4 - Recomendaciones Estratégicas
 import tkinter as tk
 from tkinter import ttk
 from config import Colors, Fonts, Dimensions
-from core.analysis.recomendaciones_estrategicas import RecomendacionesEstrategicas
+from gui.components.refresco import escribir_texto
+from utils.perfilado import perfilar
+
+
+# Secciones de recomendaciones en el orden en que se muestran
+SECCIONES = ('liquidez', 'rentabilidad', 'eficiencia_operativa')
 
 
 class D4RecomendacionesTab(ttk.Frame):
     """Pestaña D4 - Recomendaciones Estratégicas"""
     
+    # Nodo del grafo de dependencias (services/grafo_dependencias.py)
+    VISTA = 'D4'
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        
+        # Widgets de cada card, en el orden de SECCIONES
+        self.cards = []
+        self.estructura = None
+        
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de D4"""
         canvas = tk.Canvas(self, bg=Colors.BG_PRIMARY)
@@ -51,8 +65,8 @@ class D4RecomendacionesTab(ttk.Frame):
         subtitulo.pack(pady=(0, Dimensions.PADDING_MEDIUM))
         
         # Obtener análisis
-        analisis = RecomendacionesEstrategicas(self.app.balance_data, self.app.income_data)
-        resultado = analisis.generar_recomendaciones_completas()
+        resultado = self.app.analysis_context.recomendaciones
+        self.estructura = self._estructura(resultado)
         
         # a) LIQUIDEZ
         self._crear_seccion_recomendaciones(
@@ -94,7 +108,42 @@ class D4RecomendacionesTab(ttk.Frame):
         
         # Crear cards para cada recomendación
         for recom in recomendaciones:
-            self._crear_card_recomendacion(seccion_frame, recom, color)
+            self.cards.append(self._crear_card_recomendacion(seccion_frame, recom, color))
+    
+    def refrescar(self, cambiados=None):
+        """
+        Actualiza los textos de las cards en el lugar.
+        
+        Args:
+            cambiados: Nodos del grafo de dependencias que cambiaron (no se
+                       usan: las recomendaciones se recalculan juntas)
+        
+        Returns:
+            bool: False si cambió la cantidad de recomendaciones o de
+                  acciones (hay que reconstruir la pestaña)
+        """
+        resultado = self.app.analysis_context.recomendaciones
+        if self._estructura(resultado) != self.estructura:
+            return False
+        
+        recomendaciones = [recom for seccion in SECCIONES for recom in resultado[seccion]]
+        for widgets, recom in zip(self.cards, recomendaciones):
+            widgets['numero'].config(text=f"#{recom['numero']}")
+            widgets['titulo'].config(text=recom['titulo'])
+            escribir_texto(widgets['fundamento'], recom['fundamento_cuantitativo'])
+            widgets['analisis'].config(text=recom['analisis'])
+            widgets['meta'].config(text=recom.get('meta', ''))
+            for label, accion in zip(widgets['acciones'], recom['acciones']):
+                label.config(text=f"  • {accion}")
+            widgets['impacto'].config(text=recom['impacto'])
+        return True
+    
+    def _estructura(self, resultado):
+        """Cantidad de recomendaciones y de acciones por sección"""
+        return tuple(
+            tuple(len(recom['acciones']) for recom in resultado[seccion])
+            for seccion in SECCIONES
+        )
     
     def _crear_card_recomendacion(self, parent, recom, color):
         """Crea una card para mostrar una recomendación"""
@@ -188,6 +237,28 @@ class D4RecomendacionesTab(ttk.Frame):
         )
         analisis_label.pack(anchor="w", padx=10, pady=(0, 10))
         
+        # META CUANTIFICADA (cambio mínimo en cuentas para llegar al rango óptimo)
+        meta_frame = tk.Frame(body_frame, bg=Colors.BG_SECONDARY, relief='solid', borderwidth=1)
+        meta_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        tk.Label(
+            meta_frame,
+            text="🎯 META CUANTIFICADA",
+            font=Fonts.NORMAL_BOLD,
+            bg=Colors.BG_SECONDARY,
+            fg=color
+        ).pack(anchor="w", padx=10, pady=(10, 5))
+        
+        meta_label = tk.Label(
+            meta_frame,
+            text=recom.get('meta', ''),
+            font=Fonts.NORMAL,
+            bg=Colors.BG_SECONDARY,
+            wraplength=900,
+            justify="left"
+        )
+        meta_label.pack(anchor="w", padx=10, pady=(0, 10))
+        
         # ACCIONES ESPECÍFICAS
         acciones_frame = tk.Frame(body_frame, bg=Colors.BG_SECONDARY, relief='solid', borderwidth=1)
         acciones_frame.pack(fill=tk.X, pady=(0, 10))
@@ -200,6 +271,7 @@ class D4RecomendacionesTab(ttk.Frame):
             fg=color
         ).pack(anchor="w", padx=10, pady=(10, 5))
         
+        acciones_labels = []
         for i, accion in enumerate(recom['acciones'], 1):
             accion_label = tk.Label(
                 acciones_frame,
@@ -210,6 +282,7 @@ class D4RecomendacionesTab(ttk.Frame):
                 justify="left"
             )
             accion_label.pack(anchor="w", padx=10, pady=2)
+            acciones_labels.append(accion_label)
         
         tk.Label(acciones_frame, text="", bg=Colors.BG_SECONDARY).pack(pady=5)
         
@@ -234,4 +307,14 @@ class D4RecomendacionesTab(ttk.Frame):
             wraplength=900,
             justify="left"
         )
-        impacto_label.pack(anchor="w", padx=10, pady=(0, 10))
\ No newline at end of file
+        impacto_label.pack(anchor="w", padx=10, pady=(0, 10))
+        
+        return {
+            'numero': numero_badge,
+            'titulo': titulo_label,
+            'fundamento': fund_text,
+            'analisis': analisis_label,
+            'meta': meta_label,
+            'acciones': acciones_labels,
+            'impacto': impacto_label
+        }
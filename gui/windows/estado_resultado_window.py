@@ -159,13 +159,16 @@ class EstadoResultadoTab(ttk.Frame):
     def calcular_automatico(self):
         """Calcula automáticamente todos los resultados"""
         try:
-            # Guardar datos en el modelo
+            # Guardar en el modelo solo los campos que cambiaron
+            campos_modificados = []
             for field_name, entry in self.entries.items():
                 try:
                     value = float(entry.get().replace(",", ""))
-                    setattr(self.estado_modelo, field_name, value)
                 except:
-                    setattr(self.estado_modelo, field_name, 0.0)
+                    value = 0.0
+                if getattr(self.estado_modelo, field_name, None) != value:
+                    setattr(self.estado_modelo, field_name, value)
+                    campos_modificados.append(field_name)
             
             # Actualizar campos calculados para Año 1
             self.actualizar_label("ganancia_bruta_y1", 
@@ -192,8 +195,8 @@ class EstadoResultadoTab(ttk.Frame):
                                  self.estado_modelo.get_utilidad_neta(2))
             
             # Llamar callback para actualizar análisis
-            if self.callback_actualizar:
-                self.callback_actualizar()
+            if self.callback_actualizar and campos_modificados:
+                self.callback_actualizar(campos_modificados)
                 
         except Exception as e:
             pass  # Ignorar errores durante la escritura
@@ -210,4 +213,9 @@ class EstadoResultadoTab(ttk.Frame):
             entry.delete(0, tk.END)
             entry.insert(0, f"{value:.2f}")
         
-        self.calcular_automatico()
\ No newline at end of file
+        self.calcular_automatico()
+    
+    def refrescar(self):
+        """Muestra los valores actuales del modelo (p.ej. al abrir otra empresa)"""
+        self.cargar_datos()
+        return True
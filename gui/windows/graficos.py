@@ -5,26 +5,31 @@ Ventana de Gráficos Financieros
 
 import tkinter as tk
 from tkinter import ttk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib as mpl
-from config import Colors, Fonts, Dimensions
-
-# Importar funciones de gráficos
-from graphics.graficas import grafico_analisis_financiero, grafico_analisis_economico
+import base64
+import numpy as np
+from config import Colors, Fonts, Dimensions, Labels
+from gui.components.pestana_diferida import agregar_pestana_diferida
+from core.models.campos import CAMPOS, ETIQUETAS_CAMPOS
+from core.analysis.sensibilidad import AnalisisSensibilidad
+from core.calculators.ratio_calculator_lote import RATIOS
+from utils.perfilado import perfilar
 
 
 class GraficosWindow(ttk.Frame):
     """Ventana de Gráficos Financieros"""
     
+    # Opciones de la pestaña de sensibilidad (texto -> variación relativa)
+    VARIACIONES_TORNADO = {"±5%": 0.05, "±10%": 0.10, "±20%": 0.20}
+    RANGOS_GRILLA = {"±10%": 0.10, "±30%": 0.30, "±50%": 0.50}
+    PUNTOS_GRILLA = 41
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
         
-        # Guardar configuración original de matplotlib
-        self.original_rcParams = mpl.rcParams.copy()
-        
         self.crear_interfaz()
     
+    @perfilar('interfaz')
     def crear_interfaz(self):
         """Crea la interfaz de gráficos"""
         # Notebook para los dos gráficos
@@ -32,17 +37,29 @@ class GraficosWindow(ttk.Frame):
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
         
         # Tab 1: Análisis Financiero (Liquidez y Solvencia)
-        self._crear_tab_analisis_financiero()
+        # Cada gráfico se genera al abrir su pestaña por primera vez
+        agregar_pestana_diferida(
+            self.notebook,
+            self._crear_tab_analisis_financiero,
+            text="Análisis Financiero - Liquidez y Solvencia"
+        )
         
         # Tab 2: Análisis Económico (Rentabilidad)
-        self._crear_tab_analisis_economico()
-    
-    def _crear_tab_analisis_financiero(self):
-        """Crea la pestaña de Análisis Financiero"""
-        # Frame para el gráfico
-        tab_financiero = ttk.Frame(self.notebook)
-        self.notebook.add(tab_financiero, text="Análisis Financiero - Liquidez y Solvencia")
+        agregar_pestana_diferida(
+            self.notebook,
+            self._crear_tab_analisis_economico,
+            text="Análisis Económico - Rentabilidad"
+        )
         
+        # Tab 3: Sensibilidad de los ratios a cada cuenta
+        agregar_pestana_diferida(
+            self.notebook,
+            self._crear_tab_sensibilidad,
+            text="Sensibilidad"
+        )
+    
+    def _crear_tab_analisis_financiero(self, tab_financiero):
+        """Crea el contenido de la pestaña de Análisis Financiero"""
         # Canvas con scrollbar
         canvas = tk.Canvas(tab_financiero, bg=Colors.BG_PRIMARY)
         scrollbar = ttk.Scrollbar(tab_financiero, orient="vertical", command=canvas.yview)
@@ -69,27 +86,11 @@ class GraficosWindow(ttk.Frame):
         datos_año1 = self._preparar_datos_financieros(1)
         datos_año2 = self._preparar_datos_financieros(2)
         
-        # Generar gráfico
-        try:
-            fig = grafico_analisis_financiero(datos_año1, datos_año2, "Año 1", "Año 2")
-            
-            # Integrar gráfico en tkinter
-            canvas_grafico = FigureCanvasTkAgg(fig, master=scrollable_frame)
-            canvas_grafico.draw()
-            canvas_grafico.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
-            
-            # Restaurar configuración de matplotlib
-            mpl.rcParams.update(self.original_rcParams)
-            
-        except Exception as e:
-            error_label = tk.Label(
-                scrollable_frame,
-                text=f"Error al generar gráfico: {str(e)}",
-                font=Fonts.NORMAL,
-                bg=Colors.BG_PRIMARY,
-                fg=Colors.DANGER
-            )
-            error_label.pack(pady=20)
+        # Generar gráfico (en segundo plano)
+        self._mostrar_grafico(
+            scrollable_frame, 'grafico_analisis_financiero',
+            datos_año1, datos_año2, "Año 1", "Año 2"
+        )
         
         # Descripción
         descripcion_frame = ttk.LabelFrame(
@@ -126,12 +127,8 @@ class GraficosWindow(ttk.Frame):
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
-    def _crear_tab_analisis_economico(self):
-        """Crea la pestaña de Análisis Económico"""
-        # Frame para el gráfico
-        tab_economico = ttk.Frame(self.notebook)
-        self.notebook.add(tab_economico, text="Análisis Económico - Rentabilidad")
-        
+    def _crear_tab_analisis_economico(self, tab_economico):
+        """Crea el contenido de la pestaña de Análisis Económico"""
         # Canvas con scrollbar
         canvas = tk.Canvas(tab_economico, bg=Colors.BG_PRIMARY)
         scrollbar = ttk.Scrollbar(tab_economico, orient="vertical", command=canvas.yview)
@@ -158,27 +155,11 @@ class GraficosWindow(ttk.Frame):
         datos_año1 = self._preparar_datos_economicos(1)
         datos_año2 = self._preparar_datos_economicos(2)
         
-        # Generar gráfico
-        try:
-            fig = grafico_analisis_economico(datos_año1, datos_año2, "Año 1", "Año 2")
-            
-            # Integrar gráfico en tkinter
-            canvas_grafico = FigureCanvasTkAgg(fig, master=scrollable_frame)
-            canvas_grafico.draw()
-            canvas_grafico.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
-            
-            # Restaurar configuración de matplotlib
-            mpl.rcParams.update(self.original_rcParams)
-            
-        except Exception as e:
-            error_label = tk.Label(
-                scrollable_frame,
-                text=f"Error al generar gráfico: {str(e)}",
-                font=Fonts.NORMAL,
-                bg=Colors.BG_PRIMARY,
-                fg=Colors.DANGER
-            )
-            error_label.pack(pady=20)
+        # Generar gráfico (en segundo plano)
+        self._mostrar_grafico(
+            scrollable_frame, 'grafico_analisis_economico',
+            datos_año1, datos_año2, "Año 1", "Año 2"
+        )
         
         # Descripción
         descripcion_frame = ttk.LabelFrame(
@@ -217,6 +198,178 @@ class GraficosWindow(ttk.Frame):
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
+    def _crear_tab_sensibilidad(self, tab_sensibilidad):
+        """Crea el contenido de la pestaña de Sensibilidad (tornado y mapa de calor)"""
+        # Canvas con scrollbar
+        canvas = tk.Canvas(tab_sensibilidad, bg=Colors.BG_PRIMARY)
+        scrollbar = ttk.Scrollbar(tab_sensibilidad, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg=Colors.BG_PRIMARY)
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # Título
+        titulo = tk.Label(
+            scrollable_frame,
+            text="ANÁLISIS DE SENSIBILIDAD (AÑO 2)",
+            font=Fonts.TITLE,
+            bg=Colors.BG_PRIMARY
+        )
+        titulo.pack(pady=Dimensions.PADDING_LARGE)
+        
+        interpreter = self.app.analysis_context.interpreter
+        nombres_ratios = {
+            (interpreter.get_nombre_completo(ratio) or ratio): ratio for ratio in RATIOS
+        }
+        nombres_campos = {ETIQUETAS_CAMPOS[c]: c for c in CAMPOS}
+        
+        def combo(parent, opciones, inicial, ancho):
+            widget = ttk.Combobox(parent, values=list(opciones), state="readonly", width=ancho)
+            widget.set(inicial)
+            widget.pack(side=tk.LEFT, padx=5)
+            return widget
+        
+        def etiqueta(parent, texto):
+            tk.Label(parent, text=texto, font=Fonts.NORMAL,
+                     bg=Colors.BG_PRIMARY).pack(side=tk.LEFT, padx=5)
+        
+        # ---- Tornado ----
+        frame_tornado = ttk.LabelFrame(
+            scrollable_frame,
+            text=" 🌪️ ¿Qué cuenta mueve más cada ratio? ",
+            padding=Dimensions.PADDING_LARGE
+        )
+        frame_tornado.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
+                           pady=Dimensions.PADDING_MEDIUM)
+        
+        controles = tk.Frame(frame_tornado, bg=Colors.BG_PRIMARY)
+        controles.pack(fill=tk.X, pady=5)
+        etiqueta(controles, "Ratio:")
+        ratio_tornado = combo(controles, nombres_ratios,
+                              interpreter.get_nombre_completo("rpp") or "rpp", 28)
+        etiqueta(controles, "Variación por cuenta:")
+        variacion = combo(controles, self.VARIACIONES_TORNADO, "±10%", 8)
+        
+        label_tornado = tk.Label(frame_tornado, bg=Colors.BG_PRIMARY)
+        
+        def generar_tornado():
+            sensibilidad = AnalisisSensibilidad(self.app.balance_data, self.app.income_data)
+            ratio = nombres_ratios[ratio_tornado.get()]
+            delta = self.VARIACIONES_TORNADO[variacion.get()]
+            self._renderizar_en(
+                label_tornado, 'grafico_tornado',
+                sensibilidad.tornado(ratio, delta), ratio_tornado.get(),
+                sensibilidad.base()[ratio], delta
+            )
+        
+        tk.Button(controles, text="▶ Generar", font=Fonts.NORMAL_BOLD, bg=Colors.INFO,
+                  fg="white", cursor="hand2", command=generar_tornado).pack(side=tk.LEFT, padx=10)
+        label_tornado.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        # ---- Mapa de calor ----
+        frame_grilla = ttk.LabelFrame(
+            scrollable_frame,
+            text=" 🗺️ Dos cuentas a la vez ",
+            padding=Dimensions.PADDING_LARGE
+        )
+        frame_grilla.pack(fill=tk.X, padx=Dimensions.PADDING_XLARGE,
+                          pady=Dimensions.PADDING_MEDIUM)
+        
+        controles = tk.Frame(frame_grilla, bg=Colors.BG_PRIMARY)
+        controles.pack(fill=tk.X, pady=5)
+        etiqueta(controles, "Eje X:")
+        campo_x = combo(controles, nombres_campos, ETIQUETAS_CAMPOS['ingresos_servicios'], 26)
+        etiqueta(controles, "Eje Y:")
+        campo_y = combo(controles, nombres_campos, ETIQUETAS_CAMPOS['gastos_admin'], 26)
+        
+        controles2 = tk.Frame(frame_grilla, bg=Colors.BG_PRIMARY)
+        controles2.pack(fill=tk.X, pady=5)
+        etiqueta(controles2, "Ratio:")
+        ratio_grilla = combo(controles2, nombres_ratios,
+                             interpreter.get_nombre_completo("margen_neto") or "margen_neto", 28)
+        etiqueta(controles2, "Rango:")
+        rango = combo(controles2, self.RANGOS_GRILLA, "±30%", 8)
+        
+        label_grilla = tk.Label(frame_grilla, bg=Colors.BG_PRIMARY)
+        
+        def generar_grilla():
+            sensibilidad = AnalisisSensibilidad(self.app.balance_data, self.app.income_data)
+            variaciones = np.linspace(-1, 1, self.PUNTOS_GRILLA) * self.RANGOS_GRILLA[rango.get()]
+            grilla = sensibilidad.grilla(
+                nombres_campos[campo_x.get()], nombres_campos[campo_y.get()],
+                variaciones, variaciones, nombres_ratios[ratio_grilla.get()]
+            )
+            self._renderizar_en(
+                label_grilla, 'grafico_mapa_calor',
+                grilla['x'], grilla['y'], grilla['valores'],
+                campo_x.get(), campo_y.get(), ratio_grilla.get()
+            )
+        
+        tk.Button(controles2, text="▶ Generar", font=Fonts.NORMAL_BOLD, bg=Colors.INFO,
+                  fg="white", cursor="hand2", command=generar_grilla).pack(side=tk.LEFT, padx=10)
+        label_grilla.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        generar_tornado()
+        generar_grilla()
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+    
+    def _mostrar_grafico(self, parent, nombre_grafico, *args):
+        """
+        Renderiza un gráfico de graphics/graficas.py en un proceso aparte
+        (EjecutorAnalisis) y lo muestra como imagen al terminar, sin
+        bloquear la interfaz mientras se genera.
+        
+        Args:
+            parent: Frame donde se muestra el gráfico
+            nombre_grafico: Nombre de la función de gráfico
+            *args: Argumentos de la función de gráfico
+        """
+        grafico_label = tk.Label(
+            parent,
+            text=f"⏳ {Labels.MSG_CALCULATING}",
+            font=Fonts.NORMAL,
+            bg=Colors.BG_PRIMARY,
+            fg=Colors.TEXT_SECONDARY
+        )
+        grafico_label.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        self._renderizar_en(grafico_label, nombre_grafico, *args)
+        return grafico_label
+    
+    def _renderizar_en(self, grafico_label, nombre_grafico, *args):
+        """
+        Renderiza un gráfico en segundo plano y lo muestra en un Label ya
+        creado. Volver a llamarlo con el mismo gráfico reemplaza el
+        trabajo anterior si aún no terminó.
+        """
+        def mostrar(png):
+            if not grafico_label.winfo_exists():
+                return
+            imagen = tk.PhotoImage(data=base64.b64encode(png))
+            grafico_label.config(image=imagen, text="")
+            grafico_label.image = imagen  # Conservar la referencia
+        
+        def mostrar_error(error):
+            if not grafico_label.winfo_exists():
+                return
+            grafico_label.config(text=f"Error al generar gráfico: {str(error)}",
+                                 fg=Colors.DANGER)
+        
+        self.app.ejecutor.renderizar(
+            (id(self), nombre_grafico),
+            nombre_grafico,
+            *args,
+            al_terminar=mostrar,
+            al_fallar=mostrar_error
+        )
+    
     def _preparar_datos_financieros(self, year):
         """
         Prepara los datos financieros para el gráfico
@@ -0,0 +1,82 @@
+"""
+Archivo: importar_estados.py
+Importa estados financieros desde CSV o Excel a la base local de empresas
+
+Uso:
+    python importar_estados.py balances.csv
+    python importar_estados.py balances.xlsx --hoja "Saldos" --plan plan_cuentas.yaml
+    python importar_estados.py saldos.csv --separador-decimal , --agrupado
+
+Formato largo (una fila por empresa, periodo y cuenta):
+    empresa,periodo,cuenta,valor
+    ACME,2023,Caja y Bancos,850
+Formato ancho (una columna por periodo):
+    empresa,cuenta,2023,2024
+    ACME,Caja y Bancos,850,1100
+"""
+
+import argparse
+import sys
+import time
+
+from config import StorageConfig
+from services.almacen import AlmacenFinanciero
+from services.importador import PlanCuentas, importar_a_almacen
+
+
+# Errores que se muestran antes de resumir el resto
+MAX_ERRORES_MOSTRADOS = 50
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Importa estados financieros de muchas empresas desde CSV o Excel."
+    )
+    parser.add_argument('archivo', help="Archivo .csv o .xlsx (Excel requiere openpyxl)")
+    parser.add_argument('--base', default=StorageConfig.DB_PATH,
+                        help=f"Base SQLite destino (por defecto {StorageConfig.DB_PATH})")
+    parser.add_argument('--plan', default=None,
+                        help="Plan de cuentas .json/.yaml (nombre en el archivo -> campo del modelo)")
+    parser.add_argument('--hoja', default=None, help="Hoja de Excel (por defecto, la activa)")
+    parser.add_argument('--delimitador', default=None, help="Separador del CSV (por defecto, se detecta)")
+    parser.add_argument('--separador-decimal', default='.', choices=('.', ','),
+                        help="Separador decimal de los valores (por defecto '.')")
+    parser.add_argument('--agrupado', action='store_true',
+                        help="Las filas de cada empresa vienen juntas (memoria constante)")
+    parser.add_argument('--incluir-invalidas', action='store_true',
+                        help="Guardar también las empresas con errores")
+    args = parser.parse_args(argv)
+
+    inicio = time.time()
+    try:
+        plan = PlanCuentas.desde_archivo(args.plan) if args.plan else None
+        almacen = AlmacenFinanciero(args.base)
+        try:
+            resumen = importar_a_almacen(
+                args.archivo, almacen,
+                solo_validas=not args.incluir_invalidas,
+                plan=plan,
+                hoja=args.hoja,
+                delimitador=args.delimitador,
+                separador_decimal=args.separador_decimal,
+                agrupado=args.agrupado,
+            )
+        finally:
+            almacen.cerrar()
+    except (ImportError, OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    errores = resumen['errores']
+    for error in errores[:MAX_ERRORES_MOSTRADOS]:
+        print(f"  ⚠️ {error}")
+    if len(errores) > MAX_ERRORES_MOSTRADOS:
+        print(f"  ... y {len(errores) - MAX_ERRORES_MOSTRADOS} errores más")
+
+    print(f"✅ {len(resumen['guardadas'])} empresas guardadas, "
+          f"{len(resumen['rechazadas'])} rechazadas ({time.time() - inicio:.1f} s) -> {args.base}")
+    return 0 if not errores else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
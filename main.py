@@ -3,37 +3,156 @@ Archivo: main.py
 Punto de entrada con sistema de actualización automática
 """
 
+import os
+
 from gui.main_window import MainWindow
+from config import WindowConfig, StorageConfig, DebugConfig
+from services.almacen import AlmacenFinanciero
+from core.analysis.percentiles_sector import IndicePercentiles
+from services.analysis_context import AnalysisContext
+from services.bus_cambios import BusCambios
+from services.ejecutor_analisis import EjecutorAnalisis
+from utils import perfilado
 
 
 class FinancialAnalysisApp:
     """Aplicación principal de análisis financiero"""
     
     def __init__(self):
+        # Tiempos de análisis, gráficos e interfaz (apagado salvo que se
+        # pida; el panel oculto también lo activa)
+        perfilado.activar(DebugConfig.PERFILADO)
+        
         # Modelos de datos compartidos
         self.balance_data = None
         self.income_data = None
         self.ratios_data = {}
         self.analisis_iniciado = False
         
-        # Sistema de callbacks para notificar cambios de datos
-        self.on_data_change_callbacks = []
-
+        # Versión de los datos: aumenta en cada cambio notificado
+        self.data_version = 0
+        
+        # Base local de empresas y análisis guardados (opcional: sin ella
+        # la aplicación funciona igual, solo que no recuerda nada)
+        self.empresa_actual = StorageConfig.EMPRESA_PREDETERMINADA
+        try:
+            self.almacen = AlmacenFinanciero(StorageConfig.DB_PATH)
+        except Exception as e:
+            print(f"No se pudo abrir la base local ({StorageConfig.DB_PATH}): {e}")
+            self.almacen = None
+        
+        # Percentiles de los pares del sector (opcional) y sector elegido en D1
+        self.percentiles = None
+        self.sector = None
+        if os.path.exists(StorageConfig.PERCENTILES_PATH):
+            try:
+                self.percentiles = IndicePercentiles.cargar(StorageConfig.PERCENTILES_PATH)
+                self.sector = next(iter(self.percentiles.sectores), None)
+            except Exception as e:
+                print(f"No se pudo leer el índice de percentiles ({StorageConfig.PERCENTILES_PATH}): {e}")
+        
+        # Análisis compartido por todas las pestañas (uno por versión de datos)
+        self.analysis_context = AnalysisContext(self)
         
+        # Bus que agrupa las ediciones y notifica a las pestañas suscritas
+        self.bus_cambios = BusCambios(self, WindowConfig.DATA_CHANGE_DEBOUNCE_MS,
+                                      WindowConfig.DATA_CHANGE_MAX_WAIT_MS)
+        
+        # Análisis y gráficos en segundo plano (no bloquean la interfaz)
+        self.ejecutor = EjecutorAnalisis(version_actual=lambda: self.data_version)
+        
+        # Las ediciones quedan guardadas en la empresa actual (abrir una
+        # empresa también notifica un cambio, pero no hay nada que guardar)
+        self.cambios_sin_guardar = False
+        self.bus_cambios.suscribir(lambda cambio: self.guardar_cambios())
+    
     def start(self):
         """Inicia la aplicación con la ventana principal"""
         MainWindow(self)
     
-    def notify_data_change(self):
+    def notify_data_change(self, campos=None, editado=True):
         """
         Notifica a todas las pestañas registradas que los datos han cambiado.
-        Esto permite la actualización automática de análisis.
+        Las ediciones seguidas se agrupan en una sola notificación.
+        
+        Args:
+            campos: Campos modificados; None si no se sabe qué cambió
+            editado: False si los datos vienen de la base local (no hay
+                     nada nuevo que guardar)
         """
-        for callback in self.on_data_change_callbacks:
-            try:
-                callback()
-            except Exception as e:
-                print(f"Error al ejecutar callback de actualización: {e}")
+        if editado:
+            self.cambios_sin_guardar = True
+        self.bus_cambios.publicar(campos)
+    
+    # ============================================================
+    # EMPRESAS GUARDADAS
+    # ============================================================
+    
+    def listar_empresas(self):
+        """Nombres de las empresas guardadas (vacío sin base local)"""
+        if self.almacen is None:
+            return []
+        return [empresa['nombre'] for empresa in self.almacen.listar_empresas()]
+    
+    def ultima_empresa(self):
+        """Nombre de la empresa guardada más recientemente, o None"""
+        if self.almacen is None:
+            return None
+        empresas = self.almacen.listar_empresas()
+        if not empresas:
+            return None
+        return max(empresas, key=lambda empresa: empresa['actualizada'])['nombre']
+    
+    def guardar_empresa(self, nombre=None):
+        """
+        Guarda los datos actuales en la base local.
+        
+        Args:
+            nombre: Nombre de la empresa (None = la empresa actual)
+        
+        Returns:
+            bool: True si se guardó
+        """
+        if self.almacen is None or self.balance_data is None or self.income_data is None:
+            return False
+        if nombre:
+            self.empresa_actual = nombre
+        try:
+            self.almacen.guardar_empresa(self.empresa_actual, self.balance_data, self.income_data)
+        except Exception as e:
+            print(f"Error al guardar la empresa '{self.empresa_actual}': {e}")
+            return False
+        self.cambios_sin_guardar = False
+        return True
+    
+    def guardar_cambios(self):
+        """
+        Guarda la empresa actual solo si tiene ediciones sin guardar.
+        
+        Returns:
+            bool: True si se guardó
+        """
+        if not self.cambios_sin_guardar:
+            return False
+        return self.guardar_empresa()
+    
+    def abrir_empresa(self, nombre):
+        """
+        Carga una empresa guardada en los modelos actuales y notifica el
+        cambio. Los análisis ya calculados para esos datos se toman de la
+        base local sin recalcular (ver AnalysisContext).
+        
+        Returns:
+            bool: True si la empresa existe y se cargó
+        """
+        if self.almacen is None:
+            return False
+        if self.almacen.cargar_empresa(nombre, self.balance_data, self.income_data) is None:
+            return False
+        self.empresa_actual = nombre
+        self.cambios_sin_guardar = False
+        self.notify_data_change(editado=False)
+        return True
 
 
 if __name__ == "__main__":
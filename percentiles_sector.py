@@ -0,0 +1,74 @@
+"""
+Archivo: percentiles_sector.py
+Genera (o actualiza) el índice de percentiles por sector que usa la matriz D1
+
+Uso:
+    python percentiles_sector.py cartera/
+    python percentiles_sector.py empresas/ --cartera cartera/
+    python percentiles_sector.py nuevas/ --agregar
+
+El origen es una cartera (core/models/cartera.py) o, como en analisis_lote.py,
+un directorio o manifiesto de archivos JSON de empresas con "sector".
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from config import StorageConfig
+from core.models.cartera import Cartera
+from core.analysis.percentiles_sector import IndicePercentiles
+from services.analisis_lote import listar_empresas, crear_cartera
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Calcula los percentiles de los ratios de cada sector para comparar empresas con sus pares."
+    )
+    parser.add_argument('origen',
+                        help="Cartera, directorio con un .json por empresa o manifiesto con una ruta por línea")
+    parser.add_argument('-o', '--salida', default=StorageConfig.PERCENTILES_PATH,
+                        help=f"Índice .npz (por defecto {StorageConfig.PERCENTILES_PATH})")
+    parser.add_argument('--cartera', default=None,
+                        help="Si el origen son archivos JSON, guardar aquí la cartera creada con ellos")
+    parser.add_argument('--agregar', action='store_true',
+                        help="Agregar las empresas al índice existente en lugar de reemplazarlo")
+    args = parser.parse_args(argv)
+
+    inicio = time.time()
+    try:
+        with tempfile.TemporaryDirectory() as temporal:
+            if os.path.exists(os.path.join(args.origen, Cartera.ARCHIVO_INDICE)):
+                cartera = Cartera.abrir(args.origen)
+            else:
+                rutas = listar_empresas(args.origen)
+                if not rutas:
+                    print(f"No se encontraron empresas en {args.origen}")
+                    return 1
+                print(f"Creando cartera con {len(rutas)} empresas")
+                cartera = crear_cartera(rutas, args.cartera or temporal)
+
+            indice = IndicePercentiles.desde_cartera(cartera)
+            del cartera
+
+        if args.agregar and os.path.exists(args.salida):
+            existente = IndicePercentiles.cargar(args.salida)
+            existente.combinar(indice)
+            indice = existente
+
+        os.makedirs(os.path.dirname(os.path.abspath(args.salida)), exist_ok=True)
+        indice.guardar(args.salida)
+    except (KeyError, OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    for sector in indice.sectores:
+        print(f"  {sector}: {indice.empresas(sector):,} empresas en el último periodo")
+    print(f"✅ Índice guardado en {args.salida} ({time.time() - inicio:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
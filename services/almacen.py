@@ -0,0 +1,385 @@
+"""
+Archivo: services/almacen.py
+Almacén local en SQLite (modo WAL) de empresas, periodos, valores de
+cuentas y resultados de análisis cacheados por huella de contenido
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+
+from core.models.balance import BalanceGeneral
+from core.models.estado_resultado import EstadoResultado
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+
+
+# Versión del esquema (PRAGMA user_version)
+VERSION_ESQUEMA = 1
+
+# Aumentar cuando cambie la salida de core/analysis: las huellas nuevas
+# no coinciden con los análisis guardados por la versión anterior
+VERSION_ANALISIS = 1
+
+# Modelo de cada estado en la tabla valores
+MODELOS = {
+    'balance': BalanceMultiperiodo,
+    'estado': EstadoResultadoMultiperiodo,
+}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS empresas (
+    id          INTEGER PRIMARY KEY,
+    nombre      TEXT NOT NULL UNIQUE,
+    actualizada TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS periodos (
+    id          INTEGER PRIMARY KEY,
+    empresa_id  INTEGER NOT NULL REFERENCES empresas(id) ON DELETE CASCADE,
+    orden       INTEGER NOT NULL,
+    etiqueta    TEXT NOT NULL,
+    UNIQUE (empresa_id, orden)
+);
+CREATE TABLE IF NOT EXISTS valores (
+    periodo_id  INTEGER NOT NULL REFERENCES periodos(id) ON DELETE CASCADE,
+    modelo      TEXT NOT NULL,
+    cuenta      TEXT NOT NULL,
+    valor       REAL NOT NULL,
+    PRIMARY KEY (periodo_id, modelo, cuenta)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS analisis (
+    huella      TEXT NOT NULL,
+    clave       TEXT NOT NULL,
+    resultado   TEXT NOT NULL,
+    creado      TEXT NOT NULL,
+    PRIMARY KEY (huella, clave)
+) WITHOUT ROWID;
+"""
+
+# Historial completo de una empresa en una sola consulta
+_CONSULTA_HISTORIAL = """
+SELECT p.orden, p.etiqueta, v.modelo, v.cuenta, v.valor
+FROM empresas e
+JOIN periodos p ON p.empresa_id = e.id
+JOIN valores v ON v.periodo_id = p.id
+WHERE e.nombre = ?
+ORDER BY p.orden
+"""
+
+
+def _ahora():
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+def _a_json(valor):
+    """
+    Convierte un resultado (posiblemente congelado) a tipos JSON.
+    A diferencia de la salida del lote, conserva inf/NaN (json los
+    escribe como Infinity/NaN y los vuelve a leer igual).
+    """
+    if isinstance(valor, Mapping):
+        return {str(clave): _a_json(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_a_json(v) for v in valor]
+    if hasattr(valor, 'item'):  # Escalares de NumPy
+        return valor.item()
+    return valor
+
+
+def huella_entradas(balance, estado, contexto=''):
+    """
+    Huella de contenido de los datos de entrada de un análisis.
+
+    Args:
+        balance: BalanceGeneral o BalanceMultiperiodo
+        estado: EstadoResultado o EstadoResultadoMultiperiodo
+        contexto: Texto adicional que también determina el resultado
+                  (p.ej. la huella de la base de conocimiento)
+
+    Returns:
+        str: SHA-256 hexadecimal; igual para los mismos valores de los
+        dos años, sin importar el objeto que los contenga
+    """
+    h = hashlib.sha256(f"v{VERSION_ANALISIS}|{contexto}|".encode('utf-8'))
+    for clase, modelo in ((BalanceMultiperiodo, balance), (EstadoResultadoMultiperiodo, estado)):
+        # + 0.0 unifica -0.0 y 0.0
+        h.update((clase.desde_modelo(modelo).valores + 0.0).tobytes())
+    return h.hexdigest()
+
+
+class AlmacenFinanciero:
+    """
+    Base SQLite local con los estados financieros de cada empresa (N
+    periodos) y los resultados de análisis ya calculados.
+
+    Los análisis se guardan por huella de contenido (huella_entradas):
+    volver a abrir una empresa ya analizada, o cualquier empresa con los
+    mismos valores, encuentra los resultados sin recalcular.
+
+    Usa una sola conexión protegida por un lock, así puede llamarse desde
+    la interfaz y desde los hilos del EjecutorAnalisis.
+    """
+
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta: Archivo de la base (se crea con sus carpetas si no
+                  existe); ':memory:' para una base temporal
+        """
+        if ruta != ':memory:':
+            carpeta = os.path.dirname(os.path.abspath(ruta))
+            os.makedirs(carpeta, exist_ok=True)
+
+        self.ruta = ruta
+        self._lock = threading.RLock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+
+        with self._lock:
+            conexion = self._conexion
+            # WAL: las lecturas no esperan a las escrituras; con WAL,
+            # synchronous=NORMAL sigue siendo seguro ante cortes
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.execute("PRAGMA foreign_keys=ON")
+
+            version = conexion.execute("PRAGMA user_version").fetchone()[0]
+            if version > VERSION_ESQUEMA:
+                conexion.close()
+                raise ValueError(
+                    f"{ruta}: esquema versión {version} no soportado "
+                    f"(se esperaba {VERSION_ESQUEMA} o anterior)"
+                )
+            with conexion:
+                conexion.executescript(_ESQUEMA)
+                conexion.execute(f"PRAGMA user_version={VERSION_ESQUEMA}")
+
+    def cerrar(self):
+        """Cierra la conexión"""
+        with self._lock:
+            self._conexion.close()
+
+    # ============================================================
+    # EMPRESAS Y PERIODOS
+    # ============================================================
+
+    def listar_empresas(self):
+        """
+        Returns:
+            list[dict]: {'nombre', 'periodos', 'actualizada'} por nombre
+        """
+        with self._lock:
+            filas = self._conexion.execute("""
+                SELECT e.nombre, COUNT(p.id), e.actualizada
+                FROM empresas e LEFT JOIN periodos p ON p.empresa_id = e.id
+                GROUP BY e.id ORDER BY e.nombre
+            """).fetchall()
+        return [{'nombre': n, 'periodos': p, 'actualizada': a} for n, p, a in filas]
+
+    def guardar_historial(self, empresa, balance, estado):
+        """
+        Guarda (reemplaza) todos los periodos de una empresa en una sola
+        transacción, con una inserción masiva de valores.
+
+        Args:
+            empresa: Nombre de la empresa
+            balance: BalanceMultiperiodo
+            estado: EstadoResultadoMultiperiodo con los mismos periodos
+        """
+        if balance.n_periodos != estado.n_periodos:
+            raise ValueError("El balance y el estado de resultados tienen distinta cantidad de periodos")
+
+        with self._lock, self._conexion as conexion:
+            conexion.execute(
+                "INSERT INTO empresas (nombre, actualizada) VALUES (?, ?) "
+                "ON CONFLICT(nombre) DO UPDATE SET actualizada = excluded.actualizada",
+                (empresa, _ahora())
+            )
+            empresa_id = conexion.execute(
+                "SELECT id FROM empresas WHERE nombre = ?", (empresa,)
+            ).fetchone()[0]
+
+            conexion.execute("DELETE FROM periodos WHERE empresa_id = ?", (empresa_id,))
+            ids = []
+            for orden, etiqueta in enumerate(balance.periodos, start=1):
+                cursor = conexion.execute(
+                    "INSERT INTO periodos (empresa_id, orden, etiqueta) VALUES (?, ?, ?)",
+                    (empresa_id, orden, str(etiqueta))
+                )
+                ids.append(cursor.lastrowid)
+
+            conexion.executemany(
+                "INSERT INTO valores (periodo_id, modelo, cuenta, valor) VALUES (?, ?, ?, ?)",
+                (
+                    (ids[p], nombre_modelo, cuenta, float(matriz.valores[fila, p]))
+                    for nombre_modelo, matriz in (('balance', balance), ('estado', estado))
+                    for fila, cuenta in enumerate(matriz.CUENTAS)
+                    for p in range(matriz.n_periodos)
+                )
+            )
+
+    def guardar_empresa(self, empresa, balance, estado, periodos=None):
+        """
+        Guarda los modelos de 2 años de la interfaz en los dos últimos
+        periodos de la empresa (año 1 = penúltimo, año 2 = último), como
+        los lee cargar_empresa. Los periodos anteriores y las etiquetas
+        existentes se conservan; si la empresa no existe o tiene un solo
+        periodo se crean los que falten.
+
+        Args:
+            empresa: Nombre de la empresa
+            balance: BalanceGeneral
+            estado: EstadoResultado
+            periodos: Etiquetas de los dos periodos (None = conservar las
+                      guardadas, o "Periodo 1"/"Periodo 2" si no hay)
+        """
+        matrices = (
+            ('balance', BalanceMultiperiodo.desde_modelo(balance)),
+            ('estado', EstadoResultadoMultiperiodo.desde_modelo(estado)),
+        )
+
+        with self._lock, self._conexion as conexion:
+            conexion.execute(
+                "INSERT INTO empresas (nombre, actualizada) VALUES (?, ?) "
+                "ON CONFLICT(nombre) DO UPDATE SET actualizada = excluded.actualizada",
+                (empresa, _ahora())
+            )
+            empresa_id = conexion.execute(
+                "SELECT id FROM empresas WHERE nombre = ?", (empresa,)
+            ).fetchone()[0]
+
+            existentes = conexion.execute(
+                "SELECT id, orden, etiqueta FROM periodos WHERE empresa_id = ? ORDER BY orden",
+                (empresa_id,)
+            ).fetchall()
+
+            if len(existentes) >= 2:
+                ids = [periodo_id for periodo_id, _, _ in existentes[-2:]]
+                if periodos is not None:
+                    conexion.executemany(
+                        "UPDATE periodos SET etiqueta = ? WHERE id = ?",
+                        zip((str(etiqueta) for etiqueta in periodos), ids)
+                    )
+            else:
+                # Sin periodos o con uno solo (que pasa a ser el año 2)
+                etiquetas = [f"Periodo {p}" for p in (1, 2)]
+                if existentes:
+                    etiquetas[1] = existentes[0][2]
+                if periodos is not None:
+                    etiquetas = [str(etiqueta) for etiqueta in periodos]
+                conexion.execute("DELETE FROM periodos WHERE empresa_id = ?", (empresa_id,))
+                ids = [
+                    conexion.execute(
+                        "INSERT INTO periodos (empresa_id, orden, etiqueta) VALUES (?, ?, ?)",
+                        (empresa_id, orden, etiqueta)
+                    ).lastrowid
+                    for orden, etiqueta in enumerate(etiquetas, start=1)
+                ]
+
+            conexion.executemany(
+                "INSERT INTO valores (periodo_id, modelo, cuenta, valor) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(periodo_id, modelo, cuenta) DO UPDATE SET valor = excluded.valor",
+                (
+                    (ids[p], nombre_modelo, cuenta, float(matriz.valores[fila, p]))
+                    for nombre_modelo, matriz in matrices
+                    for fila, cuenta in enumerate(matriz.CUENTAS)
+                    for p in range(2)
+                )
+            )
+
+    def cargar_historial(self, empresa):
+        """
+        Lee todos los periodos de una empresa con una sola consulta.
+
+        Returns:
+            tuple: (BalanceMultiperiodo, EstadoResultadoMultiperiodo), o
+            None si la empresa no existe. Las cuentas que falten quedan en 0.
+        """
+        with self._lock:
+            filas = self._conexion.execute(_CONSULTA_HISTORIAL, (empresa,)).fetchall()
+        if not filas:
+            return None
+
+        etiquetas = {}
+        for orden, etiqueta, _, _, _ in filas:
+            etiquetas.setdefault(orden, etiqueta)
+        columna = {orden: i for i, orden in enumerate(etiquetas)}
+
+        matrices = {
+            nombre: clase(np.zeros((len(clase.CUENTAS), len(etiquetas))), list(etiquetas.values()))
+            for nombre, clase in MODELOS.items()
+        }
+        indices = {nombre: clase.indice_cuentas() for nombre, clase in MODELOS.items()}
+        for orden, _, modelo, cuenta, valor in filas:
+            fila = indices.get(modelo, {}).get(cuenta)
+            # Cuentas de versiones anteriores que ya no existen
+            if fila is not None:
+                matrices[modelo].valores[fila, columna[orden]] = valor
+
+        return matrices['balance'], matrices['estado']
+
+    def cargar_empresa(self, empresa, balance=None, estado=None):
+        """
+        Carga los dos últimos periodos de una empresa en los modelos de la
+        interfaz (año 1 = penúltimo, año 2 = último).
+
+        Args:
+            empresa: Nombre de la empresa
+            balance, estado: Modelos destino (None = crea modelos nuevos)
+
+        Returns:
+            tuple: (balance, estado), o None si la empresa no existe
+        """
+        historial = self.cargar_historial(empresa)
+        if historial is None:
+            return None
+
+        balance = balance if balance is not None else BalanceGeneral()
+        estado = estado if estado is not None else EstadoResultado()
+        for matriz, modelo in zip(historial, (balance, estado)):
+            ultimos = matriz.valores[:, -2:]
+            if ultimos.shape[1] == 1:
+                ultimos = np.hstack([np.zeros_like(ultimos), ultimos])
+            type(matriz)(ultimos).a_modelo(modelo)
+        return balance, estado
+
+    def eliminar_empresa(self, empresa):
+        """Borra una empresa con sus periodos y valores"""
+        with self._lock, self._conexion as conexion:
+            conexion.execute("DELETE FROM empresas WHERE nombre = ?", (empresa,))
+
+    # ============================================================
+    # ANÁLISIS CACHEADOS
+    # ============================================================
+
+    def leer_analisis(self, huella):
+        """
+        Todos los resultados guardados para una huella, en una consulta.
+
+        Returns:
+            dict: {clave: resultado}
+        """
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT clave, resultado FROM analisis WHERE huella = ?", (huella,)
+            ).fetchall()
+        return {clave: json.loads(resultado) for clave, resultado in filas}
+
+    def guardar_analisis(self, huella, clave, resultado):
+        """Guarda (o reemplaza) un resultado de análisis para una huella"""
+        texto = json.dumps(_a_json(resultado), ensure_ascii=False)
+        with self._lock, self._conexion as conexion:
+            conexion.execute(
+                "INSERT OR REPLACE INTO analisis (huella, clave, resultado, creado) VALUES (?, ?, ?, ?)",
+                (huella, clave, texto, _ahora())
+            )
+
+    def limpiar_analisis(self):
+        """Descarta todos los análisis cacheados (no toca los datos)"""
+        with self._lock, self._conexion as conexion:
+            conexion.execute("DELETE FROM analisis")
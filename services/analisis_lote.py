@@ -0,0 +1,345 @@
+"""
+Archivo: services/analisis_lote.py
+Análisis por lotes sin interfaz gráfica: estados financieros de muchas
+empresas, repartidos en un pool de procesos y escritos en JSONL o Parquet
+"""
+
+import json
+import math
+import multiprocessing
+import os
+
+from core.models.balance import BalanceGeneral
+from core.models.estado_resultado import EstadoResultado
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+from core.models.cartera import Cartera
+from core.calculators.ratio_calculator import RatioCalculator
+from core.calculators.ratio_calculator_lote import RATIOS
+from core.analysis.financial_interpreter import FinancialInterpreter
+from core.analysis.matriz_ratios import MatrizRatios
+from core.analysis.fortalezas_debilidades import FortalezasDebilidadesAnalysis
+from core.analysis.recomendaciones_estrategicas import RecomendacionesEstrategicas
+from core.analysis.resumen_integral import ResumenIntegralRatios
+from core.analysis.estres_financiero import EstresFinanciero
+from core.analysis.dupont_analysis import DuPontAnalysis
+
+
+# Parámetros del escenario de estrés (los mismos de la pestaña B5)
+PROPORCION_GASTOS_FIJOS = 0.40
+PROPORCION_GASTOS_VARIABLES = 0.60
+CAIDA_INGRESOS = 0.30
+
+# Archivo de base de conocimiento del lote (None = la incluida) e
+# intérprete de cada proceso
+_ruta_base = None
+_interpreter = None
+
+
+# ============================================================
+# LECTURA DE EMPRESAS
+# ============================================================
+
+def listar_empresas(origen):
+    """
+    Lista los archivos de empresas de un directorio o de un manifiesto.
+
+    Args:
+        origen: Directorio con un .json por empresa, o archivo de texto
+                con una ruta por línea (relativa al manifiesto; las
+                líneas vacías o que empiezan con # se ignoran)
+
+    Returns:
+        list: Rutas de los archivos .json
+    """
+    if os.path.isdir(origen):
+        return sorted(
+            os.path.join(origen, nombre)
+            for nombre in os.listdir(origen)
+            if nombre.lower().endswith('.json')
+        )
+
+    base = os.path.dirname(os.path.abspath(origen))
+    rutas = []
+    with open(origen, encoding='utf-8') as manifiesto:
+        for linea in manifiesto:
+            linea = linea.strip()
+            if linea and not linea.startswith('#'):
+                rutas.append(os.path.join(base, linea))
+    return rutas
+
+
+def _cargar_modelo(modelo, cuentas, datos, origen):
+    """
+    Copia las cuentas de `datos` en un modelo de 2 años.
+    Acepta {"cuenta": [año1, año2]} o {"cuenta_y1": v, "cuenta_y2": v};
+    las cuentas que faltan quedan en 0.
+    """
+    for cuenta in cuentas:
+        for year in (1, 2):
+            setattr(modelo, f"{cuenta}_y{year}", 0.0)
+
+    for clave, valor in (datos or {}).items():
+        if clave in cuentas:
+            if len(valor) != 2:
+                raise ValueError(f"{origen}: '{clave}' debe tener 2 valores (año 1 y año 2)")
+            for year, v in enumerate(valor, 1):
+                setattr(modelo, f"{clave}_y{year}", float(v))
+            continue
+
+        cuenta, sep, year = clave.rpartition('_y')
+        if sep and cuenta in cuentas and year in ('1', '2'):
+            setattr(modelo, clave, float(valor))
+        else:
+            raise ValueError(f"{origen}: cuenta desconocida '{clave}'")
+    return modelo
+
+
+def cargar_empresa(ruta):
+    """
+    Lee un archivo JSON de empresa:
+    {"empresa": "...", "sector": "...", "balance": {...}, "estado_resultados": {...}}
+
+    Returns:
+        tuple: (nombre, BalanceGeneral, EstadoResultado)
+    """
+    nombre, _, balance, estado = _leer_empresa(ruta)
+    return nombre, balance, estado
+
+
+def _leer_empresa(ruta):
+    """Como cargar_empresa, con el "sector" del archivo (o None) en segundo lugar"""
+    with open(ruta, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+
+    nombre = datos.get('empresa') or os.path.splitext(os.path.basename(ruta))[0]
+    balance = _cargar_modelo(BalanceGeneral(), BalanceMultiperiodo.CUENTAS,
+                             datos.get('balance'), ruta)
+    estado = _cargar_modelo(EstadoResultado(), EstadoResultadoMultiperiodo.CUENTAS,
+                            datos.get('estado_resultados'), ruta)
+    return nombre, datos.get('sector'), balance, estado
+
+
+def crear_cartera(rutas, destino):
+    """
+    Convierte archivos de empresas en una cartera mapeada en memoria
+    (core/models/cartera.py). Cada archivo puede declarar "sector".
+
+    Args:
+        rutas: Archivos de empresas (p.ej. de listar_empresas)
+        destino: Directorio de la cartera
+
+    Returns:
+        Cartera
+    """
+    return Cartera.crear(destino, (_leer_empresa(ruta) for ruta in rutas), len(rutas))
+
+
+# ============================================================
+# ANÁLISIS DE UNA EMPRESA
+# ============================================================
+
+def analizar(balance, estado, interpreter=None):
+    """
+    Ejecuta todo el análisis de la aplicación para una empresa.
+
+    Returns:
+        dict: Resultados por análisis (serializable a JSON)
+    """
+    interpreter = interpreter or FinancialInterpreter()
+
+    matriz = MatrizRatios(balance, estado).generar_matriz_completa()
+
+    estres = EstresFinanciero(
+        ingreso_actual=estado.ingresos_servicios_y2,
+        utilidad_neta_actual=estado.get_utilidad_neta(2),
+        proporcion_gastos_fijos=PROPORCION_GASTOS_FIJOS,
+        proporcion_gastos_variables=PROPORCION_GASTOS_VARIABLES
+    )
+
+    return {
+        'balance_cuadra': {
+            'year_1': balance.validar_balance(1),
+            'year_2': balance.validar_balance(2)
+        },
+        'ratios': RatioCalculator(balance, estado).calcular_ambos_años(),
+        'matriz_ratios': matriz,
+        'fortalezas_debilidades': FortalezasDebilidadesAnalysis(matriz).identificar_fortalezas_debilidades(),
+        'recomendaciones': RecomendacionesEstrategicas(balance, estado).generar_recomendaciones_completas(),
+        'resumen_integral': ResumenIntegralRatios(balance, estado, interpreter).generar_resumen_completo(),
+        'dupont': DuPontAnalysis(balance, estado).analisis_dupont_dual(),
+        'estres': {
+            'metricas': estres.resumen_metricas(),
+            'escenario_pesimista': estres.aplicar_escenario_pesimista(caida_ingresos=CAIDA_INGRESOS),
+            'punto_equilibrio': estres.evaluar_punto_equilibrio()
+        }
+    }
+
+
+def analizar_archivo(ruta):
+    """
+    Carga y analiza una empresa. Se ejecuta en los procesos del pool.
+
+    Returns:
+        dict: {'archivo', 'empresa', 'resultado'} o {'archivo', 'error'}
+    """
+    global _interpreter
+    if _interpreter is None:
+        _interpreter = FinancialInterpreter(_ruta_base)
+
+    try:
+        nombre, balance, estado = cargar_empresa(ruta)
+        return {
+            'archivo': ruta,
+            'empresa': nombre,
+            'resultado': analizar(balance, estado, _interpreter)
+        }
+    except Exception as e:
+        return {'archivo': ruta, 'error': f"{type(e).__name__}: {e}"}
+
+
+def _iniciar_proceso(ruta_base):
+    """Inicializador de los procesos del pool"""
+    global _ruta_base, _interpreter
+    _ruta_base = ruta_base
+    _interpreter = None
+
+
+# ============================================================
+# ESCRITURA DE RESULTADOS
+# ============================================================
+
+def _a_json(valor):
+    """Convierte a tipos JSON estándar (inf/NaN -> None, tuplas -> listas)"""
+    if isinstance(valor, dict):
+        return {str(clave): _a_json(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_a_json(v) for v in valor]
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    if hasattr(valor, 'item'):  # Escalares de NumPy
+        return _a_json(valor.item())
+    return valor
+
+
+class EscritorJSONL:
+    """Escribe una línea JSON por empresa"""
+
+    def __init__(self, ruta):
+        self.archivo = open(ruta, 'w', encoding='utf-8')
+
+    def escribir(self, registro):
+        self.archivo.write(json.dumps(_a_json(registro), ensure_ascii=False))
+        self.archivo.write('\n')
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+class EscritorParquet:
+    """
+    Escribe Parquet por bloques (requiere pyarrow). Columnas planas con
+    los ratios de cada año y el detalle completo como texto JSON.
+    """
+
+    FILAS_POR_BLOQUE = 1000
+
+    def __init__(self, ruta):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("La salida Parquet requiere pyarrow (pip install pyarrow)")
+
+        self.pa = pa
+        self.schema = pa.schema(
+            [('archivo', pa.string()), ('empresa', pa.string()), ('error', pa.string())] +
+            [(f"{nombre}_year_{year}", pa.float64()) for year in (1, 2) for nombre in RATIOS] +
+            [('detalle', pa.string())]
+        )
+        self.escritor = pq.ParquetWriter(ruta, self.schema)
+        self.filas = []
+
+    def escribir(self, registro):
+        fila = {
+            'archivo': registro['archivo'],
+            'empresa': registro.get('empresa'),
+            'error': registro.get('error'),
+        }
+        ratios = (registro.get('resultado') or {}).get('ratios', {})
+        for year in (1, 2):
+            valores = ratios.get(f"year_{year}", {})
+            for nombre in RATIOS:
+                fila[f"{nombre}_year_{year}"] = _a_json(valores.get(nombre))
+        fila['detalle'] = json.dumps(_a_json(registro.get('resultado')), ensure_ascii=False)
+
+        self.filas.append(fila)
+        if len(self.filas) >= self.FILAS_POR_BLOQUE:
+            self._volcar()
+
+    def _volcar(self):
+        if self.filas:
+            self.escritor.write_table(self.pa.Table.from_pylist(self.filas, schema=self.schema))
+            self.filas = []
+
+    def cerrar(self):
+        self._volcar()
+        self.escritor.close()
+
+
+def crear_escritor(ruta):
+    """Elige el formato de salida por la extensión (.parquet o JSONL)"""
+    if ruta.lower().endswith('.parquet'):
+        return EscritorParquet(ruta)
+    return EscritorJSONL(ruta)
+
+
+# ============================================================
+# EJECUCIÓN DEL LOTE
+# ============================================================
+
+def ejecutar_lote(rutas, salida, procesos=None, chunksize=16, al_avanzar=None,
+                 base_conocimiento=None):
+    """
+    Analiza todas las empresas y va escribiendo los resultados a medida
+    que terminan (el orden de salida no es el de entrada).
+
+    Args:
+        rutas: Archivos de empresas
+        salida: Ruta del .jsonl/.parquet de salida
+        procesos: Procesos del pool (None = núcleos disponibles; 1 = sin pool)
+        chunksize: Empresas enviadas juntas a cada proceso
+        al_avanzar: callback(procesadas, total) opcional
+        base_conocimiento: Archivo .json/.yaml con los rangos de los ratios
+                           (por ejemplo, de un sector); None = el incluido
+
+    Returns:
+        dict: {'total', 'correctas', 'errores'}
+    """
+    # Validar la base de conocimiento antes de crear la salida
+    FinancialInterpreter(base_conocimiento)
+
+    total = len(rutas)
+    resumen = {'total': total, 'correctas': 0, 'errores': 0}
+    escritor = crear_escritor(salida)
+
+    def registrar(registro):
+        escritor.escribir(registro)
+        resumen['errores' if 'error' in registro else 'correctas'] += 1
+        if al_avanzar:
+            al_avanzar(resumen['correctas'] + resumen['errores'], total)
+
+    try:
+        if procesos == 1:
+            _iniciar_proceso(base_conocimiento)
+            for ruta in rutas:
+                registrar(analizar_archivo(ruta))
+        else:
+            with multiprocessing.Pool(processes=procesos, initializer=_iniciar_proceso,
+                                      initargs=(base_conocimiento,)) as pool:
+                for registro in pool.imap_unordered(analizar_archivo, rutas, chunksize):
+                    registrar(registro)
+    finally:
+        escritor.cerrar()
+
+    return resumen
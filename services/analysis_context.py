@@ -0,0 +1,347 @@
+"""
+Archivo: services/analysis_context.py
+Contexto de análisis compartido por todas las pestañas de la aplicación
+"""
+
+import threading
+from types import MappingProxyType
+
+from core.models.balance import BalanceGeneral
+from core.models.estado_resultado import EstadoResultado
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+from core.calculators.ratio_calculator import RatioCalculator
+from core.analysis.financial_interpreter import FinancialInterpreter
+from core.analysis.matriz_ratios import MatrizRatios
+from core.analysis.fortalezas_debilidades import FortalezasDebilidadesAnalysis
+from core.analysis.recomendaciones_estrategicas import RecomendacionesEstrategicas
+from core.analysis.resumen_integral import ResumenIntegralRatios
+from services.almacen import huella_entradas
+from services.grafo_dependencias import GrafoDependencias, analisis
+from utils.perfilado import perfilar
+
+
+# Resultados que se guardan en el AlmacenFinanciero (si la app tiene uno)
+CLAVES_PERSISTENTES = ('ratios', 'matriz', 'fortalezas_debilidades',
+                       'recomendaciones', 'resumen_integral')
+
+
+def congelar(valor):
+    """
+    Convierte recursivamente dicts en MappingProxyType y listas en tuplas,
+    para que un mismo resultado pueda compartirse entre pestañas sin que
+    ninguna lo modifique.
+    """
+    if isinstance(valor, dict):
+        return MappingProxyType({clave: congelar(v) for clave, v in valor.items()})
+    if isinstance(valor, list):
+        return tuple(congelar(v) for v in valor)
+    return valor
+
+
+class _CalculadoraCompartida:
+    """
+    Expone los ratios ya calculados del contexto con la misma interfaz
+    de RatioCalculator (`calcular_<ratio>(year)`), para las pestañas que
+    consultan los ratios uno por uno.
+    """
+
+    def __init__(self, contexto):
+        self._contexto = contexto
+
+    def __getattr__(self, nombre):
+        if not nombre.startswith('calcular_'):
+            raise AttributeError(nombre)
+        ratio = nombre[len('calcular_'):]
+        if ratio not in self._contexto.ratios['year_1']:
+            raise AttributeError(nombre)
+        return lambda year: self._contexto.ratio(ratio, year)
+
+
+class AnalysisContext:
+    """
+    Calcula una sola vez por versión de datos los análisis que usan
+    varias pestañas (ratios, matriz D1, fortalezas/debilidades,
+    recomendaciones y resumen integral) y entrega a todas el mismo
+    resultado inmutable.
+
+    La versión de datos la lleva FinancialAnalysisApp (`data_version`);
+    cuando cambia, el siguiente acceso sincroniza el GrafoDependencias y
+    descarta solo los resultados cuyas entradas cambiaron (editar las
+    existencias no recalcula, p.ej., la evaluación de los márgenes).
+
+    Si la app tiene un AlmacenFinanciero (`app.almacen`), los resultados
+    de CLAVES_PERSISTENTES se buscan primero ahí por huella de los datos
+    y, si se calculan, se guardan: una empresa ya analizada se reabre
+    sin recalcular.
+
+    Los modelos con que se calcula son los de la app (balance_data,
+    income_data), salvo en el hilo de precalcular(), que trabaja sobre
+    una copia tomada en el hilo de Tk para no leer los modelos mientras
+    el usuario los edita.
+    """
+
+    def __init__(self, app):
+        """
+        Args:
+            app: Instancia de FinancialAnalysisApp (balance_data, income_data,
+                 data_version y opcionalmente almacen)
+        """
+        self.app = app
+        self.interpreter = FinancialInterpreter()
+        self.calculator = _CalculadoraCompartida(self)
+        # Copia de los modelos de precalcular() en su hilo: (versión, balance, estado)
+        self._hilo = threading.local()
+        self.grafo = GrafoDependencias(self, self.interpreter)
+
+        self._version = None
+        # Revisión del grafo con que se calcularon los resultados guardados
+        self._revision = None
+        self._resultados = {}
+        # Análisis guardados de la versión actual: (huella, {clave: resultado})
+        self._persistidos = None
+        
+        # Los resultados pueden calcularse en un hilo del EjecutorAnalisis
+        self._lock = threading.RLock()
+
+    # ============================================================
+    # CONTROL DE VERSIÓN
+    # ============================================================
+
+    @property
+    def version(self):
+        """Versión de datos de la aplicación"""
+        return getattr(self.app, 'data_version', 0)
+
+    @property
+    def balance_data(self):
+        """Balance con que se calcula en este hilo"""
+        copia = getattr(self._hilo, 'copia', None)
+        return copia[1] if copia is not None else self.app.balance_data
+
+    @property
+    def income_data(self):
+        """Estado de resultados con que se calcula en este hilo"""
+        copia = getattr(self._hilo, 'copia', None)
+        return copia[2] if copia is not None else self.app.income_data
+
+    def _copia_vieja(self):
+        """True si este hilo calcula sobre una copia de una versión anterior"""
+        copia = getattr(self._hilo, 'copia', None)
+        return copia is not None and copia[0] != self.version
+
+    def instantanea(self):
+        """
+        Copia de los modelos actuales para precalcular() (llamar en el
+        hilo de Tk, que es el único que los edita).
+
+        Returns:
+            tuple: (versión, BalanceGeneral, EstadoResultado)
+        """
+        balance = BalanceMultiperiodo.desde_modelo(self.app.balance_data).a_modelo(BalanceGeneral())
+        estado = EstadoResultadoMultiperiodo.desde_modelo(self.app.income_data).a_modelo(EstadoResultado())
+        return self.version, balance, estado
+
+    def invalidar(self):
+        """Descarta todos los resultados calculados"""
+        with self._lock:
+            self._resultados.clear()
+            self._persistidos = None
+            self._version = None
+            self._revision = None
+            self.grafo.reiniciar()
+
+    def sincronizar(self):
+        """
+        Si la versión de datos cambió, actualiza el grafo y descarta los
+        resultados afectados.
+
+        Returns:
+            int: Revisión actual del grafo
+        """
+        with self._lock:
+            version = self.version
+            if self._copia_vieja():
+                # El grafo y los resultados son de una versión más nueva
+                return self._revision
+            if self._version != version:
+                self._descartar_afectados()
+                self._persistidos = None
+                self._version = version
+            return self._revision
+
+    def _descartar_afectados(self):
+        """Quita los resultados cuyo nodo del grafo cambió desde que se calcularon"""
+        revision = self.grafo.actualizar()
+        if self._revision is None:
+            self._resultados.clear()
+        elif revision != self._revision:
+            cambiados = self.grafo.cambiados_desde(self._revision)
+            for clave in list(self._resultados):
+                nodo = self._nodo(clave)
+                if nodo not in self.grafo or nodo in cambiados:
+                    del self._resultados[clave]
+        self._revision = revision
+
+    @staticmethod
+    def _nodo(clave):
+        """Nodo del grafo del que depende un resultado guardado"""
+        if isinstance(clave, tuple) and clave[0] == 'evaluacion':
+            return ('ratio', clave[1], clave[2])
+        if isinstance(clave, tuple) and clave[0] == 'percentiles':
+            # Mismos ratios que la matriz D1
+            return analisis('matriz')
+        return analisis(clave)
+
+    def _obtener(self, clave, calcular):
+        """Retorna el resultado de `clave` para la versión actual, calculándolo si falta"""
+        with self._lock:
+            self.sincronizar()
+            version = self._version
+            if clave in self._resultados and not self._copia_vieja():
+                return self._resultados[clave]
+
+        if clave in CLAVES_PERSISTENTES and getattr(self.app, 'almacen', None) is not None:
+            resultado = self._obtener_persistido(clave, calcular)
+        else:
+            resultado = congelar(calcular())
+
+        with self._lock:
+            # Si los datos cambiaron mientras se calculaba, no guardarlo
+            if self._version == version == self.version and not self._copia_vieja():
+                self._resultados.setdefault(clave, resultado)
+                return self._resultados[clave]
+        return resultado
+
+    def _huella(self):
+        """Huella de los datos actuales y de la base de conocimiento"""
+        return huella_entradas(self.balance_data, self.income_data,
+                               self.interpreter.base.huella())
+
+    def _obtener_persistido(self, clave, calcular):
+        """
+        Busca el resultado en el almacén por huella; si no está, lo calcula
+        y lo guarda. Se guarda solo si la huella no cambió durante el
+        cálculo (la versión de datos aumenta recién al publicar el cambio,
+        así que no alcanza para saber si los modelos se editaron).
+        """
+        almacen = self.app.almacen
+        huella = self._huella()
+
+        with self._lock:
+            persistidos = self._persistidos
+        if persistidos is None or persistidos[0] != huella:
+            # Una sola consulta trae todos los análisis de la huella
+            persistidos = (huella, almacen.leer_analisis(huella))
+            with self._lock:
+                self._persistidos = persistidos
+
+        if clave in persistidos[1]:
+            return congelar(persistidos[1][clave])
+
+        resultado = congelar(calcular())
+        if self._huella() == huella:
+            try:
+                almacen.guardar_analisis(huella, clave, resultado)
+            except Exception as e:
+                print(f"No se pudo guardar el análisis '{clave}': {e}")
+        return resultado
+
+    @perfilar('refresco', 'Precalcular análisis compartidos')
+    def precalcular(self, instantanea=None):
+        """
+        Calcula todos los resultados compartidos de la versión actual.
+        Pensado para ejecutarse en segundo plano (EjecutorAnalisis).
+
+        Args:
+            instantanea: Resultado de instantanea(), tomado en el hilo de
+                         Tk; sin ella se leen los modelos de la app (solo
+                         si nadie los edita mientras tanto)
+
+        Returns:
+            int: Versión de datos con que se calculó
+        """
+        if instantanea is None:
+            instantanea = (self.version, self.app.balance_data, self.app.income_data)
+        self._hilo.copia = instantanea
+        try:
+            for clave in ('ratios', 'matriz', 'fortalezas_debilidades',
+                          'recomendaciones', 'resumen_integral'):
+                if self._copia_vieja():
+                    break
+                getattr(self, clave)
+        finally:
+            self._hilo.copia = None
+        return instantanea[0]
+
+    # ============================================================
+    # RESULTADOS COMPARTIDOS
+    # ============================================================
+
+    @property
+    def ratios(self):
+        """Ratios de ambos años: {'year_1': {...}, 'year_2': {...}}"""
+        return self._obtener('ratios', lambda: RatioCalculator(
+            self.balance_data, self.income_data
+        ).calcular_ambos_años())
+
+    @property
+    def matriz(self):
+        """Matriz de ratios comparativos (D1)"""
+        return self._obtener('matriz', lambda: MatrizRatios(
+            self.balance_data, self.income_data
+        ).generar_matriz_completa())
+
+    @property
+    def fortalezas_debilidades(self):
+        """Fortalezas y debilidades a partir de la matriz (D2)"""
+        return self._obtener('fortalezas_debilidades', lambda: FortalezasDebilidadesAnalysis(
+            self.matriz
+        ).identificar_fortalezas_debilidades())
+
+    @property
+    def recomendaciones(self):
+        """Recomendaciones estratégicas (D4)"""
+        return self._obtener('recomendaciones', lambda: RecomendacionesEstrategicas(
+            self.balance_data, self.income_data
+        ).generar_recomendaciones_completas())
+
+    @property
+    def resumen_integral(self):
+        """Resumen integral con interpretación de cada ratio (D3)"""
+        return self._obtener('resumen_integral', lambda: ResumenIntegralRatios(
+            self.balance_data, self.income_data, self.interpreter
+        ).generar_resumen_completo())
+
+    @property
+    def percentiles_sector(self):
+        """
+        Percentil de cada ratio de la matriz D1 entre los pares del sector
+        elegido (app.sector), o None si no hay índice de percentiles.
+
+        Returns:
+            dict: {clave_matriz: {1: percentil, 2: percentil}} (None si el
+            sector no tiene datos del año)
+        """
+        indice = getattr(self.app, 'percentiles', None)
+        sector = getattr(self.app, 'sector', None)
+        if indice is None or sector not in indice.sectores:
+            return None
+
+        def calcular():
+            percentiles = indice.percentiles(sector, self.balance_data, self.income_data)
+            return {clave: percentiles[ratio] for clave, ratio in MatrizRatios.RATIOS_REGISTRO.items()
+                    if ratio in percentiles}
+
+        return self._obtener(('percentiles', sector), calcular)
+
+    def ratio(self, nombre, year):
+        """Valor de un ratio de RatioCalculator para un año (1 o 2)"""
+        return self.ratios[f'year_{year}'][nombre]
+
+    def evaluar(self, nombre, year):
+        """Evaluación del interpreter para un ratio y año"""
+        return self._obtener(
+            ('evaluacion', nombre, year),
+            lambda: self.interpreter.evaluate_ratio(nombre, self.ratio(nombre, year))
+        )
@@ -0,0 +1,153 @@
+"""
+Archivo: services/bus_cambios.py
+Bus de notificación de cambios de datos con agrupación de ediciones
+"""
+
+import time
+
+
+class CambioDatos:
+    """Evento entregado a los suscriptores: versión de datos y campos modificados"""
+
+    def __init__(self, version, campos=None):
+        """
+        Args:
+            version: Versión de datos de la aplicación al despachar
+            campos: Nombres de campos modificados (p.ej. 'caja_bancos_y2');
+                    None si no se sabe qué cambió
+        """
+        self.version = version
+        self.campos = frozenset(campos) if campos is not None else None
+
+    def afecta(self, campos):
+        """
+        Indica si el cambio toca alguno de los campos dados.
+        Un cambio sin detalle de campos afecta a todo.
+        """
+        if self.campos is None or campos is None:
+            return True
+        return not self.campos.isdisjoint(campos)
+
+    def __repr__(self):
+        return f"CambioDatos(version={self.version}, campos={self.campos})"
+
+
+class BusCambios:
+    """
+    Agrupa las ediciones seguidas y notifica a los suscriptores una sola
+    vez, con la unión de los campos modificados y la versión de datos
+    resultante. La notificación sale cuando pasa una ventana sin
+    ediciones (cada edición la reinicia), o a lo sumo `espera_maxima_ms`
+    después de la primera edición pendiente, para que escribir sin pausa
+    no deje las pestañas sin actualizar.
+
+    La versión de la aplicación (`app.data_version`) aumenta en cada
+    publicación, para que AnalysisContext nunca entregue resultados
+    viejos; lo que se agrupa es la notificación (y con ella el trabajo
+    que hacen los suscriptores).
+    """
+
+    def __init__(self, app, ventana_ms=250, espera_maxima_ms=1000):
+        """
+        Args:
+            app: FinancialAnalysisApp (lleva data_version)
+            ventana_ms: Pausa sin ediciones tras la que se notifica
+            espera_maxima_ms: Demora máxima desde la primera edición pendiente
+        """
+        self.app = app
+        self.ventana_ms = ventana_ms
+        self.espera_maxima_ms = espera_maxima_ms
+
+        self._raiz = None
+        self._programado = None
+        # Momento (time.monotonic) de la primera edición sin notificar
+        self._primera = None
+        self._pendientes = set()
+        self._sin_detalle = False
+
+        # [(callback, campos o None)]
+        self._suscriptores = []
+
+    def vincular(self, raiz):
+        """
+        Asocia el bus a un widget de Tk para programar con `after`.
+        Sin raíz (scripts, pruebas) cada publicación se despacha al momento.
+        """
+        self._raiz = raiz
+
+    def suscribir(self, callback, campos=None):
+        """
+        Registra un suscriptor.
+
+        Args:
+            callback: Función callback(cambio: CambioDatos)
+            campos: Iterable de campos de interés; si se indica, solo se
+                    notifica cuando el cambio toca alguno
+        """
+        filtro = frozenset(campos) if campos is not None else None
+        self._suscriptores.append((callback, filtro))
+
+    def desuscribir(self, callback):
+        """Quita todas las suscripciones de `callback`"""
+        self._suscriptores = [(c, f) for c, f in self._suscriptores if c != callback]
+
+    def publicar(self, campos=None):
+        """
+        Registra una edición y reprograma la notificación: sale tras
+        `ventana_ms` sin otra edición, sin pasar de `espera_maxima_ms`
+        desde la primera pendiente (o al momento si no hay raíz de Tk).
+
+        Args:
+            campos: Campos modificados; None si no se sabe
+        """
+        self.app.data_version += 1
+
+        if campos is None:
+            self._sin_detalle = True
+        else:
+            self._pendientes.update(campos)
+
+        if self._raiz is None:
+            self.despachar()
+            return
+
+        ahora = time.monotonic()
+        if self._primera is None:
+            self._primera = ahora
+        restante_ms = self.espera_maxima_ms - (ahora - self._primera) * 1000
+        demora = max(0, int(min(self.ventana_ms, restante_ms)))
+
+        self._cancelar()
+        self._programado = self._raiz.after(demora, self.despachar)
+
+    def _cancelar(self):
+        """Cancela la notificación programada, si la hay"""
+        if self._programado is not None and self._raiz is not None:
+            try:
+                self._raiz.after_cancel(self._programado)
+            except Exception:
+                pass
+        self._programado = None
+
+    def despachar(self):
+        """Notifica ya los cambios pendientes (si los hay)"""
+        self._cancelar()
+        self._primera = None
+
+        if not self._pendientes and not self._sin_detalle:
+            return
+
+        cambio = CambioDatos(
+            self.app.data_version,
+            None if self._sin_detalle else self._pendientes
+        )
+        self._pendientes = set()
+        self._sin_detalle = False
+
+        for callback, filtro in list(self._suscriptores):
+            if not cambio.afecta(filtro):
+                continue
+            try:
+                callback(cambio)
+            except Exception as e:
+                print(f"Error al ejecutar callback de actualización: {e}")
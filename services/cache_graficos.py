@@ -0,0 +1,139 @@
+"""
+Archivo: services/cache_graficos.py
+Cache LRU de gráficos ya renderizados (PNG), por huella de sus datos
+"""
+
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+
+def huella_grafico(nombre, args=(), kwargs=None, dpi=100):
+    """
+    Huella de un gráfico: su nombre, sus argumentos y la resolución.
+
+    Acepta números, textos, None, dicts (también congelados), listas,
+    tuplas y arreglos de NumPy, recorridos en profundidad.
+
+    Returns:
+        str: SHA-256 hexadecimal
+
+    Raises:
+        TypeError: Si algún argumento no tiene representación estable
+                   (el gráfico se renderiza sin cache)
+    """
+    h = hashlib.sha256()
+    _actualizar(h, (nombre, tuple(args), dict(kwargs or {}), dpi))
+    return h.hexdigest()
+
+
+def _actualizar(h, valor):
+    """Agrega `valor` a la huella con un prefijo de tipo (evita ambigüedades)"""
+    if valor is None or isinstance(valor, bool):
+        h.update(b'B' + repr(valor).encode())
+    elif isinstance(valor, (int, np.integer)):
+        h.update(b'I' + str(int(valor)).encode() + b';')
+    elif isinstance(valor, (float, np.floating)):
+        h.update(b'F' + struct.pack('<d', float(valor)))
+    elif isinstance(valor, str):
+        datos = valor.encode('utf-8')
+        h.update(b'S' + struct.pack('<Q', len(datos)) + datos)
+    elif isinstance(valor, Mapping):
+        h.update(b'D' + struct.pack('<Q', len(valor)))
+        for clave in sorted(valor, key=repr):
+            _actualizar(h, clave)
+            _actualizar(h, valor[clave])
+    elif isinstance(valor, (list, tuple)):
+        h.update(b'L' + struct.pack('<Q', len(valor)))
+        for elemento in valor:
+            _actualizar(h, elemento)
+    elif isinstance(valor, np.ndarray):
+        if valor.dtype.hasobject:
+            raise TypeError("Arreglo de objetos sin huella estable")
+        h.update(b'A' + valor.dtype.str.encode() + repr(valor.shape).encode())
+        h.update(np.ascontiguousarray(valor).tobytes())
+    else:
+        raise TypeError(f"Tipo sin huella estable: {type(valor).__name__}")
+
+
+class CacheGraficos:
+    """
+    PNG de gráficos indexados por huella_grafico, con desalojo LRU cuando
+    el total supera `max_bytes`. Un gráfico cuyos datos no cambiaron se
+    entrega sin volver a renderizarlo.
+
+    Seguro entre hilos (los PNG llegan desde los callbacks de los futures).
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Memoria máxima de los PNG guardados
+        """
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, huella):
+        return huella in self._entradas
+
+    @property
+    def bytes_usados(self):
+        return self._bytes
+
+    def obtener(self, huella):
+        """PNG guardado para la huella (y lo marca como reciente), o None"""
+        with self._lock:
+            png = self._entradas.get(huella)
+            if png is None:
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(huella)
+            self.aciertos += 1
+            return png
+
+    def guardar(self, huella, png):
+        """Guarda un PNG; los más antiguos salen si se supera max_bytes"""
+        if len(png) > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._entradas.pop(huella, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+            self._entradas[huella] = png
+            self._bytes += len(png)
+
+            while self._bytes > self.max_bytes:
+                _, desalojado = self._entradas.popitem(last=False)
+                self._bytes -= len(desalojado)
+
+    def limpiar(self):
+        """Descarta todos los gráficos guardados"""
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        """
+        Returns:
+            dict: {'entradas', 'bytes', 'max_bytes', 'aciertos', 'fallos'}
+        """
+        with self._lock:
+            return {
+                'entradas': len(self._entradas),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+            }
@@ -0,0 +1,310 @@
+"""
+Archivo: services/ejecutor_analisis.py
+Ejecución en segundo plano de análisis (hilos) y de gráficos (procesos)
+sin bloquear el mainloop de Tk
+"""
+
+import io
+import itertools
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+from services.cache_graficos import CacheGraficos, huella_grafico
+
+
+# Gráficos que se pueden renderizar en otro proceso: nombre -> (módulo, función)
+GRAFICOS = {
+    'grafico_analisis_financiero': ('graphics.graficas', 'grafico_analisis_financiero'),
+    'grafico_analisis_economico': ('graphics.graficas', 'grafico_analisis_economico'),
+    'grafico_barras_con_variacion': ('graphics.fondo_maniobra', 'grafico_barras_con_variacion'),
+    'grafico_balance': ('graphics.grafico_balance', 'grafico_balance'),
+    'grafico_tornado': ('graphics.sensibilidad', 'grafico_tornado'),
+    'grafico_mapa_calor': ('graphics.sensibilidad', 'grafico_mapa_calor'),
+}
+
+# Memoria máxima de los PNG ya renderizados que se conservan
+CACHE_GRAFICOS_BYTES = 64 * 1024 * 1024
+
+
+def _iniciar_proceso_grafico():
+    """Inicializador de los procesos de gráficos: backend sin ventana"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def renderizar_grafico_png(nombre, args=(), kwargs=None, dpi=100):
+    """
+    Genera un gráfico de graphics/* y lo retorna como PNG.
+    Se ejecuta en un proceso de gráficos o en un hilo: las figuras no
+    pasan por pyplot ni modifican rcParams globales.
+
+    Args:
+        nombre: Clave de GRAFICOS
+        args, kwargs: Argumentos de la función de gráfico
+        dpi: Resolución del PNG
+
+    Returns:
+        bytes: Imagen PNG
+    """
+    import importlib
+
+    modulo, funcion = GRAFICOS[nombre]
+    grafico = getattr(importlib.import_module(modulo), funcion)
+
+    # La figura se libera al salir (no queda registrada en pyplot)
+    fig = grafico(*args, **(kwargs or {}))
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi)
+    return buffer.getvalue()
+
+
+class _Trabajo:
+    """Trabajo enviado al ejecutor"""
+
+    def __init__(self, id_trabajo, clave, version, al_terminar, al_fallar):
+        self.id = id_trabajo
+        self.clave = clave
+        self.version = version
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.future = None
+
+
+class EjecutorAnalisis:
+    """
+    Ejecuta análisis en un pool de hilos y renderiza gráficos en un pool
+    de procesos. Los resultados vuelven al hilo de Tk a través de una
+    cola que se revisa con `after`, así los callbacks pueden tocar widgets.
+
+    Cada trabajo tiene una clave: si se envía otro con la misma clave, el
+    anterior se cancela (o su resultado se descarta si ya estaba en
+    curso). Los trabajos con versión de datos se descartan también si al
+    terminar la aplicación ya tiene datos más nuevos.
+
+    Los PNG renderizados se guardan en un CacheGraficos: pedir otra vez
+    un gráfico con los mismos datos lo entrega sin renderizar.
+    """
+
+    INTERVALO_MS = 50
+
+    def __init__(self, version_actual=None, hilos=2, procesos=1,
+                 cache_bytes=CACHE_GRAFICOS_BYTES):
+        """
+        Args:
+            version_actual: Función que retorna la versión de datos vigente
+            hilos: Hilos para análisis
+            procesos: Procesos para renderizar gráficos (0 = en los hilos)
+            cache_bytes: Memoria máxima del cache de gráficos (0 = sin cache)
+        """
+        self.version_actual = version_actual
+        self.n_procesos = procesos
+        self.cache_graficos = CacheGraficos(cache_bytes) if cache_bytes else None
+
+        self._hilos = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='analisis')
+        self._procesos = None
+
+        self._raiz = None
+        self._programado = None
+        self._resultados = queue.Queue()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+        # {clave: _Trabajo} vigente por clave
+        self._vigentes = {}
+
+        # Suscriptores al número de trabajos pendientes (indicadores de progreso)
+        self._observadores = []
+        self._ultimos_pendientes = 0
+
+    # ============================================================
+    # CONFIGURACIÓN
+    # ============================================================
+
+    def vincular(self, raiz):
+        """Asocia el ejecutor al widget de Tk cuyo `after` revisa la cola"""
+        self._raiz = raiz
+
+    def observar_pendientes(self, callback):
+        """Registra callback(pendientes: int), llamado en el hilo de Tk"""
+        self._observadores.append(callback)
+
+    @property
+    def pendientes(self):
+        """Cantidad de trabajos vigentes sin terminar"""
+        return len(self._vigentes)
+
+    def cerrar(self):
+        """Cancela lo pendiente y libera los pools"""
+        if self._programado is not None and self._raiz is not None:
+            try:
+                self._raiz.after_cancel(self._programado)
+            except Exception:
+                pass
+            self._programado = None
+
+        self._vigentes.clear()
+        self._hilos.shutdown(wait=False, cancel_futures=True)
+        if self._procesos is not None:
+            # Esperar evita errores del pool al salir del intérprete
+            self._procesos.shutdown(wait=True, cancel_futures=True)
+
+    # ============================================================
+    # ENVÍO DE TRABAJOS
+    # ============================================================
+
+    def enviar(self, clave, funcion, *args, al_terminar=None, al_fallar=None,
+               version=None, **kwargs):
+        """
+        Ejecuta funcion(*args, **kwargs) en el pool de hilos.
+
+        Args:
+            clave: Identifica el trabajo; uno nuevo con la misma clave
+                   reemplaza al anterior
+            funcion: Función de análisis (no debe tocar widgets)
+            al_terminar: callback(resultado), en el hilo de Tk
+            al_fallar: callback(excepcion), en el hilo de Tk
+            version: Versión de datos con que se calcula; si al terminar ya
+                     no es la vigente, el resultado se descarta
+
+        Returns:
+            int: Id del trabajo
+        """
+        trabajo = self._registrar(clave, version, al_terminar, al_fallar)
+        trabajo.future = self._hilos.submit(funcion, *args, **kwargs)
+        trabajo.future.add_done_callback(lambda f: self._resultados.put((trabajo, f)))
+        return trabajo.id
+
+    def renderizar(self, clave, nombre_grafico, *args, al_terminar=None,
+                   al_fallar=None, version=None, dpi=100, **kwargs):
+        """
+        Renderiza un gráfico de GRAFICOS a PNG en el pool de procesos
+        (o en el de hilos si el ejecutor se creó con procesos=0).
+        al_terminar recibe los bytes del PNG. Si el mismo gráfico con los
+        mismos argumentos ya está en el cache, se entrega sin renderizar.
+
+        Returns:
+            int: Id del trabajo
+        """
+        huella = None
+        if self.cache_graficos is not None:
+            try:
+                huella = huella_grafico(nombre_grafico, args, kwargs, dpi)
+            except TypeError:
+                pass  # Argumentos sin huella estable: siempre se renderiza
+
+        trabajo = self._registrar(clave, version, al_terminar, al_fallar)
+
+        png = self.cache_graficos.obtener(huella) if huella is not None else None
+        if png is not None:
+            trabajo.future = Future()
+            trabajo.future.set_result(png)
+            self._resultados.put((trabajo, trabajo.future))
+            return trabajo.id
+
+        pool = self._pool_procesos() if self.n_procesos else self._hilos
+        trabajo.future = pool.submit(
+            renderizar_grafico_png, nombre_grafico, args, kwargs, dpi
+        )
+        if huella is not None:
+            trabajo.future.add_done_callback(lambda f: self._guardar_en_cache(huella, f))
+        trabajo.future.add_done_callback(lambda f: self._resultados.put((trabajo, f)))
+        return trabajo.id
+
+    def _guardar_en_cache(self, huella, future):
+        """Guarda el PNG de un render terminado (aunque su trabajo se haya reemplazado)"""
+        if not future.cancelled() and future.exception() is None:
+            self.cache_graficos.guardar(huella, future.result())
+
+    def cancelar(self, clave):
+        """Cancela el trabajo vigente de una clave"""
+        trabajo = self._vigentes.pop(clave, None)
+        if trabajo is not None and trabajo.future is not None:
+            trabajo.future.cancel()
+        self._notificar_pendientes()
+
+    def _registrar(self, clave, version, al_terminar, al_fallar):
+        """Crea el trabajo, reemplazando al anterior con la misma clave"""
+        with self._lock:
+            trabajo = _Trabajo(next(self._ids), clave, version, al_terminar, al_fallar)
+
+        anterior = self._vigentes.get(clave)
+        if anterior is not None and anterior.future is not None:
+            anterior.future.cancel()
+        self._vigentes[clave] = trabajo
+
+        self._notificar_pendientes()
+        self._programar_revision()
+        return trabajo
+
+    def _pool_procesos(self):
+        """Crea el pool de procesos la primera vez que se necesita"""
+        if self._procesos is None:
+            self._procesos = ProcessPoolExecutor(
+                max_workers=self.n_procesos,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_iniciar_proceso_grafico
+            )
+        return self._procesos
+
+    # ============================================================
+    # ENTREGA DE RESULTADOS (hilo de Tk)
+    # ============================================================
+
+    def _programar_revision(self):
+        if self._raiz is not None and self._programado is None:
+            self._programado = self._raiz.after(self.INTERVALO_MS, self.revisar_cola)
+
+    def revisar_cola(self):
+        """
+        Entrega los resultados terminados a sus callbacks.
+        Con raíz de Tk se llama sola con `after`; sin raíz puede llamarse
+        a mano (scripts, pruebas).
+        """
+        self._programado = None
+
+        while True:
+            try:
+                trabajo, future = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            self._entregar(trabajo, future)
+
+        self._notificar_pendientes()
+        if self._vigentes:
+            self._programar_revision()
+
+    def _entregar(self, trabajo, future):
+        """Llama al callback del trabajo si sigue vigente"""
+        if self._vigentes.get(trabajo.clave) is not trabajo:
+            return  # Reemplazado por un trabajo más nuevo
+        del self._vigentes[trabajo.clave]
+
+        if future.cancelled():
+            return
+        if (trabajo.version is not None and self.version_actual is not None
+                and trabajo.version != self.version_actual()):
+            return  # Calculado con datos viejos
+
+        error = future.exception()
+        try:
+            if error is None:
+                if trabajo.al_terminar:
+                    trabajo.al_terminar(future.result())
+            elif trabajo.al_fallar:
+                trabajo.al_fallar(error)
+            else:
+                print(f"Error en trabajo '{trabajo.clave}': {error}")
+        except Exception as e:
+            print(f"Error al entregar resultado de '{trabajo.clave}': {e}")
+
+    def _notificar_pendientes(self):
+        if self.pendientes == self._ultimos_pendientes:
+            return
+        self._ultimos_pendientes = self.pendientes
+        for callback in self._observadores:
+            try:
+                callback(self.pendientes)
+            except Exception as e:
+                print(f"Error al actualizar indicador de progreso: {e}")
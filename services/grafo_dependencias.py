@@ -0,0 +1,361 @@
+"""
+Archivo: services/grafo_dependencias.py
+Grafo de dependencias campos -> subtotales -> ratios -> bandas del
+interpreter -> análisis y pestañas, con recálculo incremental por revisión
+"""
+
+import threading
+
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+from core.calculators.ratio_calculator import RATIOS_CALCULADORA
+from core.calculators.registro_ratios import REGISTRO
+
+
+YEARS = (1, 2)
+
+# Ratios de la matriz D1 (mismo orden que MatrizRatios.generar_matriz_completa)
+RATIOS_MATRIZ = ('fondo_maniobra', 'razon_liquidez', 'razon_tesoreria', 'razon_disponibilidad',
+                 'ratio_garantia', 'ratio_autonomia', 'ratio_calidad_deuda', 'rat_operativa',
+                 'rpp', 'margen_neto', 'rotacion_activos', 'apalancamiento')
+
+# Ratios del resumen integral D3 (solo año 2)
+RATIOS_RESUMEN = ('fondo_maniobra', 'razon_liquidez', 'razon_tesoreria', 'razon_disponibilidad',
+                  'ratio_garantia', 'ratio_autonomia', 'ratio_calidad_deuda',
+                  'rpp', 'margen_neto', 'rotacion_activos', 'apalancamiento')
+
+
+# ============================================================
+# NODOS
+# ============================================================
+# Cada nodo es una tupla (tipo, nombre, año); año None en análisis y vistas:
+#   ('campo', 'existencias', 2)        cuenta de un modelo
+#   ('subtotal', 'total_corriente', 2) total del modelo o subtotal derivado
+#   ('ratio', 'razon_liquidez', 2)     ratio declarado en registro_ratios
+#   ('banda', 'razon_liquidez', 2)     estado del interpreter ('optimo', ...)
+#   ('analisis', 'matriz', None)       resultado de AnalysisContext
+#   ('vista', 'B1', None)              pestaña (atributo VISTA de su clase)
+
+def campos(nombres, years=YEARS):
+    return [('campo', n, y) for n in nombres for y in years]
+
+
+def subtotales(nombres, years=YEARS):
+    return [('subtotal', n, y) for n in nombres for y in years]
+
+
+def ratios(nombres, years=YEARS):
+    return [('ratio', n, y) for n in nombres for y in years]
+
+
+def bandas(nombres, years=YEARS):
+    return [('banda', n, y) for n in nombres for y in years]
+
+
+def analisis(nombre):
+    return ('analisis', nombre, None)
+
+
+def vista(nombre):
+    return ('vista', nombre, None)
+
+
+# Lo que lee cada análisis compartido y cada pestaña. Los nodos de este
+# diccionario no tienen valor: cambian cuando cambia alguna entrada
+CONSUMIDORES = {
+    # AnalysisContext
+    analisis('ratios'): ratios(RATIOS_CALCULADORA),
+    analisis('matriz'): ratios(RATIOS_MATRIZ),
+    analisis('fortalezas_debilidades'): [analisis('matriz')],
+    # La búsqueda de objetivo de las recomendaciones recorre todas las cuentas del año 2
+    analisis('recomendaciones'): campos(BalanceMultiperiodo.CUENTAS + EstadoResultadoMultiperiodo.CUENTAS, (2,)),
+    analisis('resumen_integral'): ratios(RATIOS_RESUMEN, (2,)) + bandas(RATIOS_RESUMEN, (2,)),
+
+    # A - Análisis patrimonial
+    vista('A1'): subtotales(('total_corriente', 'total_no_corriente', 'total_pasivo_corriente',
+                             'total_pasivo_no_corriente', 'total_patrimonio', 'fondo_maniobra_absoluto')),
+    vista('A2'): campos(BalanceMultiperiodo.CUENTAS),
+    vista('A3'): campos(BalanceMultiperiodo.CUENTAS),
+    vista('A4'): campos(('clientes_cobrar', 'existencias', 'proveedores',
+                         'ingresos_servicios', 'costo_servicios')),
+    vista('A5'): subtotales(('total_activos', 'total_corriente', 'total_pasivo_corriente',
+                             'total_pasivo_no_corriente', 'total_patrimonio')),
+
+    # B - Análisis financiero
+    vista('B1'): ratios(('razon_liquidez', 'razon_tesoreria', 'razon_disponibilidad'))
+                 + bandas(('razon_liquidez', 'razon_tesoreria', 'razon_disponibilidad')),
+    vista('B2'): ratios(('ratio_garantia', 'ratio_autonomia', 'ratio_calidad_deuda'))
+                 + bandas(('ratio_garantia', 'ratio_autonomia', 'ratio_calidad_deuda')),
+    vista('B3'): ratios(('razon_liquidez', 'razon_tesoreria', 'razon_disponibilidad',
+                         'ratio_garantia', 'ratio_autonomia', 'ratio_calidad_deuda'))
+                 + bandas(('razon_liquidez', 'razon_tesoreria', 'razon_disponibilidad',
+                           'ratio_garantia', 'ratio_autonomia', 'ratio_calidad_deuda')),
+    vista('B4'): subtotales(('total_pasivo_corriente', 'total_pasivo_no_corriente', 'total_patrimonio')),
+    vista('B5'): campos(EstadoResultadoMultiperiodo.CUENTAS),
+
+    # C - Análisis económico
+    vista('C1'): ratios(('rat_operativa',)) + subtotales(('utilidad_operativa', 'total_activos')),
+    vista('C2'): ratios(('rpp', 'rat_operativa', 'apalancamiento'))
+                 + subtotales(('utilidad_neta', 'total_patrimonio', 'total_activos')),
+    vista('C3'): ratios(('margen_neto', 'rotacion_activos', 'apalancamiento', 'rpp'))
+                 + bandas(('margen_neto', 'rotacion_activos', 'apalancamiento', 'rpp')),
+    vista('C4'): ratios(('margen_bruto', 'margen_operativo', 'margen_neto'))
+                 + subtotales(('ganancia_bruta', 'utilidad_operativa', 'utilidad_neta'))
+                 + campos(('ingresos_servicios',)),
+    vista('C5'): ratios(('costo_deuda', 'rat_operativa', 'rpp', 'deuda_patrimonio'))
+                 + subtotales(('deuda_financiera', 'total_patrimonio')),
+
+    # D - Análisis integral
+    vista('D1'): [analisis('matriz')],
+    vista('D2'): [analisis('fortalezas_debilidades')],
+    vista('D3'): [analisis('resumen_integral')],
+    vista('D4'): [analisis('recomendaciones')],
+}
+
+
+def _distinto(a, b):
+    """a != b, tratando NaN como igual a NaN"""
+    return a != b and not (a != a and b != b)
+
+
+class GrafoDependencias:
+    """
+    Grafo acíclico desde las cuentas de los modelos hasta los análisis y
+    pestañas que las usan, armado con las declaraciones de los modelos
+    (TOTALES), de registro_ratios y de CONSUMIDORES.
+
+    actualizar() compara las cuentas con las de la última llamada y
+    vuelve a evaluar solo los nodos aguas abajo de las que cambiaron; si
+    un nodo da el mismo valor (p.ej. la banda de un ratio que se movió
+    dentro del rango), no propaga. Cada nodo guarda la revisión en que
+    cambió por última vez, así cada interesado (AnalysisContext, cada
+    pestaña) pregunta qué cambió desde su propia revisión.
+
+    Ejemplo: editar existencias_y2 cambia total_corriente y total_activos
+    del año 2; con ellos liquidez, fondo de maniobra y los ratios sobre
+    activo total (RAT, rotación, apalancamiento -> DuPont), no la razón
+    de tesorería ni los márgenes.
+    """
+
+    def __init__(self, app, interpreter=None):
+        """
+        Args:
+            app: Objeto con balance_data e income_data
+            interpreter: FinancialInterpreter para las bandas (sin él no
+                         hay nodos 'banda')
+        """
+        self.app = app
+        self.interpreter = interpreter
+
+        # {nodo: nodos de los que depende}
+        self.entradas = {}
+        self._armar()
+
+        # {nodo: nodos que dependen de él}
+        self.salidas = {}
+        for nodo, deps in self.entradas.items():
+            for dep in deps:
+                self.salidas.setdefault(dep, []).append(nodo)
+
+        self._orden = self._orden_topologico()
+        self._hojas = [n for n in self._orden if n[0] == 'campo']
+        self._internos = [n for n in self._orden if n[0] != 'campo']
+
+        self._valores = {}
+        self._revision_nodo = {}
+        self._revision = 0
+        self._lock = threading.Lock()
+
+    # ============================================================
+    # CONSTRUCCIÓN
+    # ============================================================
+
+    def _armar(self):
+        for clase in (BalanceMultiperiodo, EstadoResultadoMultiperiodo):
+            for year in YEARS:
+                for cuenta in clase.CUENTAS:
+                    self.entradas[('campo', cuenta, year)] = ()
+
+        nombres_subtotales = set(BalanceMultiperiodo.TOTALES) | set(EstadoResultadoMultiperiodo.TOTALES)
+        nombres_subtotales |= set(REGISTRO.dependencias)
+
+        def nodo_base(nombre, year):
+            return ('subtotal' if nombre in nombres_subtotales else 'campo', nombre, year)
+
+        # Totales de los modelos (en orden: cada uno usa cuentas o totales anteriores)
+        # y subtotales derivados del registro, que reemplazan al total del mismo nombre
+        for clase in (BalanceMultiperiodo, EstadoResultadoMultiperiodo):
+            for total, pesos in clase.TOTALES.items():
+                if total in REGISTRO.dependencias:
+                    continue
+                for year in YEARS:
+                    self.entradas[('subtotal', total, year)] = tuple(nodo_base(n, year) for n in pesos)
+        for derivado, nombres in REGISTRO.dependencias.items():
+            for year in YEARS:
+                self.entradas[('subtotal', derivado, year)] = tuple(nodo_base(n, year) for n in sorted(nombres))
+
+        for nombre, numerador, denominador, _ in REGISTRO.definiciones:
+            for year in YEARS:
+                self.entradas[('ratio', nombre, year)] = (nodo_base(numerador, year),
+                                                          nodo_base(denominador, year))
+
+        if self.interpreter is not None:
+            for nombre in self.interpreter.get_all_ratios_names():
+                if nombre in REGISTRO.indice:
+                    for year in YEARS:
+                        self.entradas[('banda', nombre, year)] = (('ratio', nombre, year),)
+
+        for consumidor, deps in CONSUMIDORES.items():
+            self.entradas[consumidor] = tuple(d for d in deps if d in self.entradas or d in CONSUMIDORES)
+
+    def _orden_topologico(self):
+        orden = []
+        visitados = set()
+
+        def visitar(nodo, camino):
+            if nodo in visitados:
+                return
+            if nodo in camino:
+                raise ValueError(f"Ciclo en el grafo de dependencias: {nodo}")
+            camino.add(nodo)
+            for dep in self.entradas[nodo]:
+                visitar(dep, camino)
+            camino.discard(nodo)
+            visitados.add(nodo)
+            orden.append(nodo)
+
+        for nodo in self.entradas:
+            visitar(nodo, set())
+        return orden
+
+    # ============================================================
+    # EVALUACIÓN INCREMENTAL
+    # ============================================================
+
+    @property
+    def revision(self):
+        """Revisión de la última actualización que cambió algo"""
+        return self._revision
+
+    def reiniciar(self):
+        """Olvida los valores: la próxima actualización marca todo como cambiado"""
+        with self._lock:
+            self._valores.clear()
+
+    def _leer_campo(self, nodo):
+        _, cuenta, year = nodo
+        modelo = self.app.balance_data if cuenta in BalanceMultiperiodo.CUENTAS else self.app.income_data
+        return getattr(modelo, f"{cuenta}_y{year}")
+
+    def _evaluar(self, nodo, resultado):
+        tipo, nombre, year = nodo
+        if tipo == 'ratio':
+            return resultado.valor(nombre, year)
+        if tipo == 'subtotal':
+            try:
+                return resultado.subtotal(nombre, year)
+            except KeyError:
+                # Total del modelo que ningún ratio usa
+                modelo = (self.app.balance_data if nombre in BalanceMultiperiodo.TOTALES
+                          else self.app.income_data)
+                return getattr(modelo, f"get_{nombre}")(year)
+        if tipo == 'banda':
+            return self.interpreter.evaluate_ratio(nombre, self._valores[('ratio', nombre, year)])['estado']
+        return None
+
+    def actualizar(self):
+        """
+        Sincroniza el grafo con los modelos: evalúa solo los nodos aguas
+        abajo de las cuentas que cambiaron desde la última llamada.
+
+        Returns:
+            int: Revisión actual (aumenta si algo cambió)
+        """
+        with self._lock:
+            cambiados = set()
+            for nodo in self._hojas:
+                valor = self._leer_campo(nodo)
+                if nodo not in self._valores or _distinto(valor, self._valores[nodo]):
+                    self._valores[nodo] = valor
+                    cambiados.add(nodo)
+            if not cambiados:
+                return self._revision
+
+            resultado = REGISTRO.evaluar_modelos(self.app.balance_data, self.app.income_data)
+            for nodo in self._internos:
+                if not any(dep in cambiados for dep in self.entradas[nodo]):
+                    continue
+                if nodo[0] in ('analisis', 'vista'):
+                    cambiados.add(nodo)
+                    continue
+                valor = self._evaluar(nodo, resultado)
+                if nodo not in self._valores or _distinto(valor, self._valores[nodo]):
+                    self._valores[nodo] = valor
+                    cambiados.add(nodo)
+
+            self._revision += 1
+            for nodo in cambiados:
+                self._revision_nodo[nodo] = self._revision
+            return self._revision
+
+    # ============================================================
+    # CONSULTAS
+    # ============================================================
+
+    def __contains__(self, nodo):
+        return nodo in self.entradas
+
+    def valor(self, nodo):
+        """Último valor evaluado de un nodo (None en análisis y vistas)"""
+        with self._lock:
+            return self._valores.get(nodo)
+
+    def cambio(self, nodo, desde):
+        """Indica si `nodo` cambió después de la revisión `desde`"""
+        return self._revision_nodo.get(nodo, 0) > desde
+
+    def cambiados_desde(self, desde, consumidor=None):
+        """
+        Nodos que cambiaron después de la revisión `desde`.
+
+        Args:
+            desde: Revisión retornada por actualizar()
+            consumidor: Si se indica (p.ej. vista('B1')), solo sus entradas
+                        directas que cambiaron (vacío si el consumidor no
+                        cambió)
+
+        Returns:
+            frozenset
+        """
+        with self._lock:
+            if consumidor is None:
+                return frozenset(n for n, r in self._revision_nodo.items() if r > desde)
+            if self._revision_nodo.get(consumidor, 0) <= desde:
+                return frozenset()
+            return frozenset(n for n in self.entradas.get(consumidor, ())
+                             if self._revision_nodo.get(n, 0) > desde)
+
+    def afectados(self, campos_modificados):
+        """
+        Todos los nodos que pueden cambiar al editar ciertos campos (sin
+        evaluar: el recorrido estático del grafo).
+
+        Args:
+            campos_modificados: Nombres como 'existencias_y2'
+
+        Returns:
+            frozenset de nodos, incluidos los campos
+        """
+        pendientes = []
+        for campo in campos_modificados:
+            cuenta, _, year = campo.rpartition('_y')
+            if year.isdigit() and ('campo', cuenta, int(year)) in self.entradas:
+                pendientes.append(('campo', cuenta, int(year)))
+
+        alcanzados = set(pendientes)
+        while pendientes:
+            for siguiente in self.salidas.get(pendientes.pop(), ()):
+                if siguiente not in alcanzados:
+                    alcanzados.add(siguiente)
+                    pendientes.append(siguiente)
+        return frozenset(alcanzados)
@@ -0,0 +1,492 @@
+"""
+Archivo: services/importador.py
+Importación masiva de estados financieros desde CSV o Excel (.xlsx):
+lectura por bloques, mapeo del plan de cuentas y errores por fila
+"""
+
+import csv
+import itertools
+import os
+import re
+import unicodedata
+
+import numpy as np
+
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+from core.models.campos import CAMPOS, ETIQUETAS_CAMPOS
+
+
+# Versión del formato de archivo de plan de cuentas
+VERSION_PLAN = 1
+
+# Filas que se leen y procesan juntas
+FILAS_POR_BLOQUE = 5000
+
+# Nombres de columna reconocidos (se comparan normalizados)
+COLUMNAS_PREDETERMINADAS = {
+    'empresa': ('empresa', 'razon social', 'compania'),
+    'periodo': ('periodo', 'ano', 'gestion', 'fecha'),
+    'cuenta': ('cuenta', 'nombre cuenta', 'descripcion'),
+    'valor': ('valor', 'saldo', 'importe', 'monto'),
+}
+
+_N_BALANCE = len(BalanceMultiperiodo.CUENTAS)
+_INDICE_CAMPOS = {campo: i for i, campo in enumerate(CAMPOS)}
+
+# Parte numérica de una celda de texto ('Bs. 1,200.50' -> '1,200.50')
+_NUMERO = re.compile(r'[-+]?[\d.,]*\d[\d.,]*')
+
+
+def normalizar(texto):
+    """Minúsculas, sin tildes ni signos y con espacios simples"""
+    texto = unicodedata.normalize('NFKD', str(texto))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', texto).split())
+
+
+def convertir_numero(valor, separador_decimal='.'):
+    """
+    Convierte una celda en número.
+
+    Acepta números, '1,234.56', '(1,234.56)' (negativo), '-', 'Bs. 100'
+    y, con separador_decimal=',', '1.234,56'.
+
+    Raises:
+        ValueError: Si la celda está vacía o no es un número
+    """
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return float(valor)
+    texto = str(valor if valor is not None else '').strip()
+    if not texto:
+        raise ValueError("valor vacío")
+    if texto == '-':
+        return 0.0
+
+    negativo = texto.startswith('(') and texto.endswith(')')
+    partes = _NUMERO.findall(texto)
+    if len(partes) != 1:
+        raise ValueError(f"'{texto}' no es un número")
+    miles = '.' if separador_decimal == ',' else ','
+    limpio = partes[0].replace(miles, '').replace(separador_decimal, '.')
+    try:
+        numero = float(limpio)
+    except ValueError:
+        raise ValueError(f"'{texto}' no es un número")
+    return -abs(numero) if negativo else numero
+
+
+def clave_periodo(etiqueta):
+    """
+    Clave para ordenar una etiqueta de periodo en el tiempo.
+
+    Reconoce el año (cuatro dígitos) y los números que lo acompañan:
+    '2023', 'Gestión 2023', '2023-06', '06/2023', '31/12/2023', 'T1 2024',
+    '2024Q2'. Lo que va antes del año (día/mes, trimestre) se lee de
+    derecha a izquierda. Sin año se usan los números en orden ('Periodo 2').
+
+    Returns:
+        tuple de int, o None si la etiqueta no tiene números
+    """
+    textos = re.findall(r'\d+', str(etiqueta))
+    if not textos:
+        return None
+    numeros = [int(n) for n in textos]
+    anios = [i for i, n in enumerate(textos) if len(n) == 4]
+    if not anios:
+        return (0,) + tuple(numeros)
+    i = anios[0]
+    return (numeros[i],) + tuple(reversed(numeros[:i])) + tuple(numeros[i + 1:])
+
+
+def ordenar_periodos(etiquetas):
+    """
+    Etiquetas de periodo en orden cronológico (ver clave_periodo). Si
+    alguna no tiene números ('Actual', 'Anterior') no hay cómo ordenarlas
+    y quedan en el orden del archivo.
+
+    Returns:
+        list
+    """
+    etiquetas = list(etiquetas)
+    claves = [clave_periodo(e) for e in etiquetas]
+    if None in claves:
+        return etiquetas
+    orden = sorted(range(len(etiquetas)), key=claves.__getitem__)
+    return [etiquetas[i] for i in orden]
+
+
+# ============================================================
+# PLAN DE CUENTAS
+# ============================================================
+
+class PlanCuentas:
+    """
+    Correspondencia entre los nombres de cuenta del archivo y los campos
+    del modelo (ver CAMPOS).
+
+    Formato de archivo (.json o .yaml):
+        {"version": 1,
+         "cuentas": {"Caja": "caja_bancos",
+                     "Bancos": "caja_bancos",           # se suman
+                     "Dep. acumulada": "-depreciacion_acum",  # cambia el signo
+                     "Total activo": null}}             # se ignora
+
+    Los nombres se comparan normalizados (sin tildes, mayúsculas ni
+    signos). Por defecto también se reconocen los nombres de los campos y
+    los textos de los formularios de carga.
+    """
+
+    def __init__(self, cuentas=None, incluir_predeterminadas=True):
+        """
+        Args:
+            cuentas: {nombre en el archivo: campo, '-campo' o None}
+            incluir_predeterminadas: Reconocer también los campos y las
+                                     etiquetas de los formularios
+        """
+        self.mapeo = {}
+        if incluir_predeterminadas:
+            for campo in CAMPOS:
+                self.mapeo[normalizar(campo)] = (campo, 1.0)
+            for campo, etiqueta in ETIQUETAS_CAMPOS.items():
+                self.mapeo[normalizar(etiqueta)] = (campo, 1.0)
+
+        for nombre, destino in (cuentas or {}).items():
+            self.mapeo[normalizar(nombre)] = self._destino(nombre, destino)
+
+        # Los nombres se repiten en cada periodo y empresa: se normalizan una vez
+        self._buscados = {}
+
+    @staticmethod
+    def _destino(nombre, destino):
+        if destino is None or destino == '':
+            return None
+        destino = str(destino).strip()
+        signo = -1.0 if destino.startswith('-') else 1.0
+        campo = destino.lstrip('-+').strip()
+        if campo not in _INDICE_CAMPOS:
+            raise ValueError(f"Plan de cuentas: '{nombre}' apunta a un campo desconocido '{campo}'")
+        return campo, signo
+
+    @classmethod
+    def desde_archivo(cls, ruta, incluir_predeterminadas=True):
+        """Carga un plan de cuentas .json o .yaml/.yml (YAML requiere PyYAML)"""
+        with open(ruta, encoding='utf-8') as archivo:
+            if ruta.lower().endswith(('.yaml', '.yml')):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ImportError("Leer el plan de cuentas en YAML requiere PyYAML (pip install pyyaml)")
+                datos = yaml.safe_load(archivo)
+            else:
+                import json
+                datos = json.load(archivo)
+
+        datos = datos or {}
+        if datos.get('version') != VERSION_PLAN:
+            raise ValueError(f"{ruta}: versión de formato {datos.get('version')!r} no soportada "
+                             f"(se esperaba {VERSION_PLAN})")
+        return cls(datos.get('cuentas'), incluir_predeterminadas)
+
+    def buscar(self, nombre):
+        """
+        Returns:
+            (campo, signo), None si la cuenta se ignora
+
+        Raises:
+            KeyError: Si la cuenta no está en el plan
+        """
+        destino = self._buscados.get(nombre, self)
+        if destino is self:
+            destino = self._buscados[nombre] = self.mapeo.get(normalizar(nombre), self)
+        if destino is self:
+            raise KeyError(nombre)
+        return destino
+
+
+# ============================================================
+# RESULTADOS
+# ============================================================
+
+class ErrorImportacion:
+    """Problema en una fila (o en un periodo) del archivo"""
+
+    __slots__ = ('linea', 'empresa', 'periodo', 'mensaje')
+
+    def __init__(self, linea, empresa, periodo, mensaje):
+        self.linea = linea
+        self.empresa = empresa
+        self.periodo = periodo
+        self.mensaje = mensaje
+
+    def __str__(self):
+        donde = f"línea {self.linea}" if self.linea is not None else f"periodo {self.periodo}"
+        return f"{self.empresa} - {donde}: {self.mensaje}"
+
+    def __repr__(self):
+        return f"ErrorImportacion({self})"
+
+
+class EmpresaImportada:
+    """Estados de una empresa leídos del archivo, con sus errores"""
+
+    def __init__(self, nombre, balance, estado, errores):
+        """
+        Args:
+            nombre: Nombre de la empresa
+            balance: BalanceMultiperiodo
+            estado: EstadoResultadoMultiperiodo (mismos periodos)
+            errores: Lista de ErrorImportacion
+        """
+        self.nombre = nombre
+        self.balance = balance
+        self.estado = estado
+        self.errores = errores
+
+    @property
+    def valida(self):
+        return not self.errores
+
+
+class _Acumulador:
+    """Cuentas de una empresa por periodo, mientras se lee el archivo"""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.periodos = {}
+        self.errores = []
+
+    def sumar(self, periodo, campo, valor):
+        vector = self.periodos.get(periodo)
+        if vector is None:
+            vector = self.periodos[periodo] = np.zeros(len(CAMPOS))
+        vector[_INDICE_CAMPOS[campo]] += valor
+
+    def terminar(self):
+        etiquetas = ordenar_periodos(self.periodos)
+        if etiquetas:
+            valores = np.column_stack([self.periodos[p] for p in etiquetas])
+        else:
+            valores = np.zeros((len(CAMPOS), 0))
+        balance = BalanceMultiperiodo(valores[:_N_BALANCE], etiquetas)
+        estado = EstadoResultadoMultiperiodo(valores[_N_BALANCE:], etiquetas)
+
+        errores = list(self.errores)
+        if not etiquetas:
+            errores.append(ErrorImportacion(None, self.nombre, None, "sin valores importados"))
+        for i, periodo in enumerate(etiquetas, start=1):
+            if not balance.validar_balance(i):
+                errores.append(ErrorImportacion(
+                    None, self.nombre, periodo,
+                    f"el balance no cuadra: activos {balance.get_total_activos(i):,.2f} vs. "
+                    f"pasivo + patrimonio {balance.get_total_pasivo_patrimonio(i):,.2f}"
+                ))
+        return EmpresaImportada(self.nombre, balance, estado, errores)
+
+
+# ============================================================
+# LECTURA DE ARCHIVOS
+# ============================================================
+
+def leer_filas(ruta, hoja=None, delimitador=None):
+    """
+    Recorre las filas de un CSV o .xlsx sin cargar el archivo completo.
+
+    Args:
+        ruta: Archivo .csv/.txt o .xlsx/.xlsm (Excel requiere openpyxl)
+        hoja: Hoja de Excel (None = la activa)
+        delimitador: Separador del CSV (None = detectar entre , ; y tab)
+
+    Yields:
+        tuple: (número de línea, valores de la fila)
+    """
+    if ruta.lower().endswith(('.xlsx', '.xlsm')):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError("Importar Excel requiere openpyxl (pip install openpyxl)")
+        libro = openpyxl.load_workbook(ruta, read_only=True, data_only=True)
+        try:
+            hoja_excel = libro[hoja] if hoja else libro.active
+            for numero, fila in enumerate(hoja_excel.iter_rows(values_only=True), start=1):
+                yield numero, fila
+        finally:
+            libro.close()
+        return
+
+    with open(ruta, encoding='utf-8-sig', newline='') as archivo:
+        if delimitador is None:
+            muestra = archivo.read(64 * 1024)
+            archivo.seek(0)
+            try:
+                delimitador = csv.Sniffer().sniff(muestra, delimiters=',;\t').delimiter
+            except csv.Error:
+                delimitador = ','
+        for numero, fila in enumerate(csv.reader(archivo, delimiter=delimitador), start=1):
+            yield numero, fila
+
+
+def _ubicar_columnas(encabezado, columnas):
+    """
+    Índices de las columnas empresa/periodo/cuenta/valor en el encabezado.
+    Sin columna 'periodo' el archivo es ancho: cada columna que no sea
+    empresa o cuenta es un periodo.
+
+    Returns:
+        tuple: (indices {rol: índice o None}, columnas de periodo [(índice, etiqueta)])
+    """
+    nombres = [normalizar(c) if c is not None else '' for c in encabezado]
+    indices = {}
+    for rol, candidatos in COLUMNAS_PREDETERMINADAS.items():
+        if columnas and rol in columnas:
+            candidatos = (columnas[rol],)
+        candidatos = [normalizar(c) for c in candidatos]
+        indices[rol] = next((i for i, n in enumerate(nombres) if n in candidatos), None)
+
+    if indices['cuenta'] is None:
+        raise ValueError("No se encontró la columna de cuenta en el encabezado")
+
+    periodos = []
+    if indices['periodo'] is None:
+        usados = {indices['empresa'], indices['cuenta'], indices['valor']}
+        periodos = [(i, str(encabezado[i]).strip()) for i, n in enumerate(nombres)
+                    if n and i not in usados]
+        if not periodos:
+            raise ValueError("No se encontró la columna de periodo ni columnas por periodo")
+    elif indices['valor'] is None:
+        raise ValueError("No se encontró la columna de valor en el encabezado")
+
+    return indices, periodos
+
+
+def importar(ruta, plan=None, columnas=None, hoja=None, delimitador=None,
+             separador_decimal='.', agrupado=False):
+    """
+    Importa los estados de una o muchas empresas.
+
+    Formatos aceptados (con encabezado en la primera fila no vacía):
+        largo: empresa, periodo, cuenta, valor
+        ancho: empresa, cuenta, <periodo 1>, <periodo 2>, ...
+    Sin columna de empresa, todo el archivo es una empresa con el nombre
+    del archivo. Los periodos se ordenan cronológicamente (ver
+    ordenar_periodos), así el último es siempre el año 2 de la interfaz.
+
+    Args:
+        ruta: Archivo .csv o .xlsx
+        plan: PlanCuentas (None = nombres de campos y etiquetas)
+        columnas: {rol: nombre de columna} para encabezados no estándar
+                  (roles: empresa, periodo, cuenta, valor)
+        hoja: Hoja de Excel
+        delimitador: Separador del CSV
+        separador_decimal: '.' o ','
+        agrupado: True si las filas de cada empresa vienen juntas; cada
+                  empresa se entrega apenas termina y la memoria no crece
+                  con el archivo. Si es False se entregan al final.
+
+    Yields:
+        EmpresaImportada (con errores por fila y por periodo, si los hay)
+
+    Raises:
+        ValueError: Si el encabezado no tiene las columnas necesarias
+    """
+    plan = plan or PlanCuentas()
+    nombre_archivo = os.path.splitext(os.path.basename(ruta))[0]
+
+    filas = leer_filas(ruta, hoja, delimitador)
+    for numero, encabezado in filas:
+        if any(c not in (None, '') for c in encabezado):
+            break
+    else:
+        return
+
+    indices, periodos = _ubicar_columnas(list(encabezado), columnas)
+    i_empresa, i_periodo = indices['empresa'], indices['periodo']
+    i_cuenta, i_valor = indices['cuenta'], indices['valor']
+
+    empresas = {}
+    terminadas = set()
+    actual = None
+
+    def celda(fila, i):
+        return fila[i] if i is not None and i < len(fila) else None
+
+    while True:
+        bloque = list(itertools.islice(filas, FILAS_POR_BLOQUE))
+        if not bloque:
+            break
+
+        for numero, fila in bloque:
+            if not any(c not in (None, '') for c in fila):
+                continue
+
+            empresa = str(celda(fila, i_empresa) or '').strip() if i_empresa is not None else nombre_archivo
+            if not empresa:
+                # Sin empresa, la fila es de la última leída
+                empresa = actual.nombre if actual is not None else nombre_archivo
+
+            if actual is None or empresa != actual.nombre:
+                if agrupado and actual is not None:
+                    terminadas.add(actual.nombre)
+                    yield empresas.pop(actual.nombre).terminar()
+                if empresa in terminadas:
+                    raise ValueError(f"línea {numero}: la empresa '{empresa}' aparece en dos bloques "
+                                     f"separados; ordene el archivo por empresa o use agrupado=False")
+                actual = empresas.get(empresa)
+                if actual is None:
+                    actual = empresas[empresa] = _Acumulador(empresa)
+
+            cuenta = celda(fila, i_cuenta)
+            try:
+                destino = plan.buscar(cuenta or '')
+            except KeyError:
+                actual.errores.append(ErrorImportacion(
+                    numero, empresa, None, f"cuenta '{cuenta}' sin correspondencia en el plan de cuentas"))
+                continue
+            if destino is None:
+                continue
+            campo, signo = destino
+
+            if i_periodo is not None:
+                pares = [(str(celda(fila, i_periodo) or '').strip(), celda(fila, i_valor))]
+            else:
+                pares = [(etiqueta, celda(fila, i)) for i, etiqueta in periodos]
+
+            for periodo, valor in pares:
+                if not periodo:
+                    actual.errores.append(ErrorImportacion(numero, empresa, None, "periodo vacío"))
+                    continue
+                if i_periodo is None and valor in (None, ''):
+                    continue
+                try:
+                    actual.sumar(periodo, campo, signo * convertir_numero(valor, separador_decimal))
+                except ValueError as e:
+                    actual.errores.append(ErrorImportacion(
+                        numero, empresa, periodo, f"cuenta '{cuenta}': {e}"))
+
+    for acumulador in empresas.values():
+        yield acumulador.terminar()
+
+
+def importar_a_almacen(ruta, almacen, solo_validas=True, **opciones):
+    """
+    Importa un archivo y guarda cada empresa en un AlmacenFinanciero.
+
+    Args:
+        ruta: Archivo .csv o .xlsx
+        almacen: AlmacenFinanciero destino
+        solo_validas: Guardar solo las empresas sin errores
+        **opciones: Opciones de importar()
+
+    Returns:
+        dict: {'guardadas': [nombres], 'rechazadas': [nombres],
+        'errores': [ErrorImportacion]}
+    """
+    resumen = {'guardadas': [], 'rechazadas': [], 'errores': []}
+    for empresa in importar(ruta, **opciones):
+        resumen['errores'].extend(empresa.errores)
+        if (empresa.valida or not solo_validas) and empresa.balance.n_periodos:
+            almacen.guardar_historial(empresa.nombre, empresa.balance, empresa.estado)
+            resumen['guardadas'].append(empresa.nombre)
+        else:
+            resumen['rechazadas'].append(empresa.nombre)
+    return resumen
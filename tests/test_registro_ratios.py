@@ -0,0 +1,203 @@
+"""
+Archivo: tests/test_registro_ratios.py
+Pruebas del registro de ratios: resultados escalares y vectoriales contra
+las fórmulas de los modelos, e invalidación de caches al asignar campos
+
+Ejecutar con: python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test_datos_reales import crear_datos_caso_estudio
+from core.calculators.registro_ratios import REGISTRO
+from core.models.balance_multiperiodo import BalanceMultiperiodo
+from core.models.cache_subtotales import TODOS_LOS_CAMPOS
+from core.models.estado_resultado_multiperiodo import EstadoResultadoMultiperiodo
+
+
+def ratios_esperados(balance, estado, year):
+    """Cada ratio declarado, escrito a mano con los getters de los modelos"""
+    tc = balance.get_total_corriente(year)
+    tpc = balance.get_total_pasivo_corriente(year)
+    tp = tpc + balance.get_total_pasivo_no_corriente(year)
+    ta = balance.get_total_activos(year)
+    pn = balance.get_total_patrimonio(year)
+    caja = getattr(balance, f"caja_bancos_y{year}")
+    clientes = getattr(balance, f"clientes_cobrar_y{year}")
+    proveedores = getattr(balance, f"proveedores_y{year}")
+    prestamos_lp = getattr(balance, f"prestamos_lp_y{year}")
+    deuda_cp = getattr(balance, f"deuda_cp_y{year}")
+
+    ventas = getattr(estado, f"ingresos_servicios_y{year}")
+    gastos_financieros = getattr(estado, f"gastos_financieros_y{year}")
+    un = estado.get_utilidad_neta(year)
+    uo = estado.get_utilidad_operativa(year)
+
+    return {
+        'fondo_maniobra': (tc - tpc) / ta,
+        'razon_liquidez': tc / tpc,
+        'razon_tesoreria': (caja + clientes) / tpc,
+        'razon_disponibilidad': caja / tpc,
+        'ratio_garantia': ta / tp,
+        'ratio_autonomia': pn / tp,
+        'ratio_calidad_deuda': tpc / tp,
+        'rat': un / ta,
+        'rpp': un / pn,
+        'margen_neto': un / ventas,
+        'rotacion_activos': ventas / ta,
+        'apalancamiento': ta / pn,
+        'margen_bruto': estado.get_ganancia_bruta(year) / ventas,
+        'margen_operativo': uo / ventas,
+        'rat_operativa': uo / ta,
+        'ratio_endeudamiento': tp / ta,
+        'costo_deuda': gastos_financieros / (prestamos_lp + proveedores),
+        'deuda_patrimonio': (prestamos_lp + deuda_cp) / pn,
+    }
+
+
+def arreglos(balance, estado):
+    """Cuentas de los dos modelos como arreglos (periodos x cuentas)"""
+    return (BalanceMultiperiodo.desde_modelo(balance).valores.T,
+            EstadoResultadoMultiperiodo.desde_modelo(estado).valores.T)
+
+
+class TestResultadosRegistro(unittest.TestCase):
+    """El registro compilado da lo mismo que las fórmulas de los modelos"""
+
+    def setUp(self):
+        REGISTRO.limpiar()
+        self.balance, self.estado = crear_datos_caso_estudio()
+
+    def test_declara_todos_los_ratios(self):
+        self.assertEqual(set(REGISTRO.ratios), set(ratios_esperados(self.balance, self.estado, 2)))
+
+    def test_escalar_igual_a_formulas(self):
+        resultado = REGISTRO.evaluar_modelos(self.balance, self.estado)
+        for year in (1, 2):
+            for ratio, esperado in ratios_esperados(self.balance, self.estado, year).items():
+                with self.subTest(ratio=ratio, year=year):
+                    self.assertAlmostEqual(resultado.valor(ratio, year), esperado, places=12)
+
+    def test_subtotales_escalares_iguales_a_getters(self):
+        resultado = REGISTRO.evaluar_modelos(self.balance, self.estado)
+        for year in (1, 2):
+            self.assertAlmostEqual(resultado.subtotal('utilidad_neta', year),
+                                   self.estado.get_utilidad_neta(year), places=9)
+            self.assertAlmostEqual(resultado.subtotal('impuestos_renta', year),
+                                   self.estado.get_impuestos_renta(year), places=9)
+            self.assertAlmostEqual(resultado.subtotal('total_activos', year),
+                                   self.balance.get_total_activos(year), places=9)
+
+    def test_vectorial_igual_a_formulas(self):
+        balance_arr, estado_arr = arreglos(self.balance, self.estado)
+        valores = REGISTRO.evaluar(balance_arr, estado_arr)
+        self.assertEqual(valores.shape, (2, len(REGISTRO.ratios)))
+        for year in (1, 2):
+            esperados = ratios_esperados(self.balance, self.estado, year)
+            for i, ratio in enumerate(REGISTRO.ratios):
+                with self.subTest(ratio=ratio, year=year):
+                    self.assertAlmostEqual(valores[year - 1, i], esperados[ratio], places=12)
+
+    def test_subtotales_vectoriales_iguales_a_getters(self):
+        balance_arr, estado_arr = arreglos(self.balance, self.estado)
+        s = REGISTRO.subtotales(balance_arr, estado_arr)
+        for year in (1, 2):
+            self.assertAlmostEqual(s['total_activos'][year - 1],
+                                   self.balance.get_total_activos(year), places=9)
+            self.assertAlmostEqual(s['utilidad_neta'][year - 1],
+                                   self.estado.get_utilidad_neta(year), places=9)
+
+    def test_denominador_cero_usa_valor_declarado(self):
+        for campo in ('proveedores', 'impuestos_pagar', 'deuda_cp'):
+            setattr(self.balance, f"{campo}_y2", 0.0)
+        resultado = REGISTRO.evaluar_modelos(self.balance, self.estado)
+        self.assertEqual(resultado.valor('razon_liquidez', 2), np.inf)
+        self.assertEqual(resultado.valor('razon_liquidez', 2, cero=0.0), 0.0)
+
+        balance_arr, estado_arr = arreglos(self.balance, self.estado)
+        valores = REGISTRO.evaluar(balance_arr, estado_arr, nombres=['razon_liquidez'])
+        self.assertEqual(valores[1, 0], np.inf)
+
+    def test_periodo_fuera_de_rango(self):
+        resultado = REGISTRO.evaluar_modelos(self.balance, self.estado)
+        for year in (0, 3):
+            with self.assertRaises(ValueError):
+                resultado.valor('rat', year)
+
+    def test_matrices_de_n_periodos(self):
+        balance = BalanceMultiperiodo.desde_modelo(self.balance)
+        estado = EstadoResultadoMultiperiodo.desde_modelo(self.estado)
+        balance = BalanceMultiperiodo(np.hstack([balance.valores, balance.valores[:, 1:] * 2]))
+        estado = EstadoResultadoMultiperiodo(np.hstack([estado.valores, estado.valores[:, 1:] * 2]))
+
+        resultado = REGISTRO.evaluar_modelos(balance, estado)
+        self.assertEqual(resultado.n_periodos, 3)
+        # Todo el periodo 3 escala por 2: los ratios de cuentas lineales no cambian
+        self.assertAlmostEqual(resultado.valor('razon_liquidez', 3),
+                               resultado.valor('razon_liquidez', 2), places=12)
+        self.assertAlmostEqual(resultado.subtotal('total_activos', 3),
+                               2 * resultado.subtotal('total_activos', 2), places=9)
+
+
+class TestInvalidacionCache(unittest.TestCase):
+    """Asignar un campo <cuenta>_yN descarta los resultados guardados"""
+
+    def setUp(self):
+        REGISTRO.limpiar()
+        self.balance, self.estado = crear_datos_caso_estudio()
+
+    def claves_registro(self, modelo):
+        return [c for c in modelo._cache_subtotales if c[0] == TODOS_LOS_CAMPOS]
+
+    def test_resultado_en_cache_hasta_asignar(self):
+        resultado = REGISTRO.evaluar_modelos(self.balance, self.estado)
+        self.assertIs(REGISTRO.evaluar_modelos(self.balance, self.estado), resultado)
+        self.assertTrue(self.claves_registro(self.balance))
+        self.assertTrue(self.claves_registro(self.estado))
+
+    def test_asignar_en_balance_invalida(self):
+        antes = REGISTRO.evaluar_modelos(self.balance, self.estado)
+        self.balance.get_total_corriente(2)
+        self.assertIn(('get_total_corriente', 2), self.balance._cache_subtotales)
+
+        self.balance.caja_bancos_y2 += 100.0
+        self.assertEqual(self.claves_registro(self.balance), [])
+        self.assertNotIn(('get_total_corriente', 2), self.balance._cache_subtotales)
+
+        despues = REGISTRO.evaluar_modelos(self.balance, self.estado)
+        self.assertIsNot(despues, antes)
+        esperados = ratios_esperados(self.balance, self.estado, 2)
+        self.assertAlmostEqual(despues.valor('razon_disponibilidad', 2),
+                               esperados['razon_disponibilidad'], places=12)
+        self.assertNotAlmostEqual(despues.valor('razon_disponibilidad', 2),
+                                  antes.valor('razon_disponibilidad', 2))
+
+    def test_asignar_en_estado_invalida(self):
+        antes = REGISTRO.evaluar_modelos(self.balance, self.estado)
+        self.estado.get_utilidad_neta(1)
+        self.assertIn(('get_utilidad_neta', 1), self.estado._cache_subtotales)
+
+        self.estado.ingresos_servicios_y1 += 500.0
+        self.assertEqual(self.claves_registro(self.estado), [])
+        self.assertNotIn(('get_utilidad_neta', 1), self.estado._cache_subtotales)
+
+        despues = REGISTRO.evaluar_modelos(self.balance, self.estado)
+        self.assertIsNot(despues, antes)
+        self.assertAlmostEqual(despues.valor('margen_neto', 1),
+                               ratios_esperados(self.balance, self.estado, 1)['margen_neto'],
+                               places=12)
+
+    def test_asignar_otro_anio_conserva_subtotales(self):
+        self.balance.get_total_corriente(1)
+        self.balance.caja_bancos_y2 += 100.0
+        self.assertIn(('get_total_corriente', 1), self.balance._cache_subtotales)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+"""
+Archivo: utils/perfilado.py
+Tramos de tiempo (spans) opcionales para análisis, gráficos e interfaz,
+agrupados en árboles por refresco y exportables como traza de Chrome
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+# Árboles completos que se conservan (los más antiguos se descartan)
+MAX_ARBOLES = 50
+
+_activo = False
+_arboles = deque(maxlen=MAX_ARBOLES)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def activar(activo=True):
+    """Activa (o desactiva) el registro de tramos en todo el proceso"""
+    global _activo
+    _activo = bool(activo)
+
+
+def esta_activo():
+    return _activo
+
+
+# ============================================================
+# TRAMOS
+# ============================================================
+
+class Tramo:
+    """
+    Intervalo de tiempo con nombre. Los tramos abiertos dentro de otro (en
+    el mismo hilo) quedan como sus hijos; un tramo sin padre es la raíz de
+    un árbol (p.ej. un refresco completo de una pestaña).
+    """
+
+    __slots__ = ('nombre', 'categoria', 'inicio_ns', 'fin_ns', 'hilo', 'hijos')
+
+    def __init__(self, nombre, categoria):
+        self.nombre = nombre
+        self.categoria = categoria
+        self.inicio_ns = 0
+        self.fin_ns = 0
+        self.hilo = threading.get_ident()
+        self.hijos = []
+
+    @property
+    def duracion_ms(self):
+        return (self.fin_ns - self.inicio_ns) / 1e6
+
+    @property
+    def propio_ms(self):
+        """Tiempo que no está en ningún hijo (p.ej. el layout de Tk)"""
+        return self.duracion_ms - sum(hijo.duracion_ms for hijo in self.hijos)
+
+    def __enter__(self):
+        pila = getattr(_local, 'pila', None)
+        if pila is None:
+            pila = _local.pila = []
+        if pila:
+            pila[-1].hijos.append(self)
+        pila.append(self)
+        self.inicio_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.fin_ns = time.perf_counter_ns()
+        pila = _local.pila
+        pila.pop()
+        if not pila:
+            with _lock:
+                _arboles.append(self)
+        return False
+
+    def recorrer(self, nivel=0):
+        """Genera (nivel, tramo) en profundidad, empezando por este"""
+        yield nivel, self
+        for hijo in self.hijos:
+            yield from hijo.recorrer(nivel + 1)
+
+
+class _TramoNulo:
+    """Tramo que no mide nada: lo que retorna tramo() con el perfilado apagado"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+_NULO = _TramoNulo()
+
+
+def tramo(nombre, categoria='general'):
+    """
+    Context manager que mide un bloque:
+
+        with tramo('Actualizar análisis patrimonial', 'refresco'):
+            ...
+
+    Con el perfilado apagado retorna un objeto compartido que no hace nada.
+
+    Args:
+        nombre: Texto del tramo en el panel y en la traza
+        categoria: 'analisis', 'grafico', 'interfaz', 'refresco', 'tk', ...
+    """
+    if not _activo:
+        return _NULO
+    return Tramo(nombre, categoria)
+
+
+def perfilar(categoria='general', nombre=None):
+    """
+    Decorador: mide cada llamada a la función como un tramo.
+
+    Args:
+        categoria: Categoría del tramo
+        nombre: Nombre del tramo (por defecto, Clase.metodo o modulo.funcion)
+    """
+    def decorador(funcion):
+        texto = nombre or funcion.__qualname__
+        if nombre is None and '.' not in texto:
+            texto = f"{funcion.__module__.rsplit('.', 1)[-1]}.{texto}"
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return funcion(*args, **kwargs)
+            with Tramo(texto, categoria):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+# ============================================================
+# CONSULTA Y EXPORTACIÓN
+# ============================================================
+
+def arboles():
+    """Árboles registrados, del más antiguo al más reciente"""
+    with _lock:
+        return list(_arboles)
+
+
+def limpiar():
+    """Descarta todos los árboles registrados"""
+    with _lock:
+        _arboles.clear()
+
+
+def texto_arbol(raiz):
+    """
+    Árbol como texto con sangría, duración y porcentaje de la raíz.
+
+    Returns:
+        str: Una línea por tramo
+    """
+    total = raiz.duracion_ms or 1e-9
+    lineas = []
+    for nivel, t in raiz.recorrer():
+        lineas.append(f"{'  ' * nivel}{t.nombre}  {t.duracion_ms:.1f} ms "
+                      f"({t.duracion_ms / total:.0%}) [{t.categoria}]")
+    return "\n".join(lineas)
+
+
+def eventos_chrome(raices=None):
+    """
+    Tramos en el formato de eventos de Chrome (chrome://tracing, Perfetto).
+
+    Args:
+        raices: Árboles a exportar (por defecto, todos los registrados)
+
+    Returns:
+        dict: {'traceEvents': [...], 'displayTimeUnit': 'ms'}
+    """
+    pid = os.getpid()
+    eventos = []
+    for raiz in (arboles() if raices is None else raices):
+        for _, t in raiz.recorrer():
+            eventos.append({
+                'name': t.nombre,
+                'cat': t.categoria,
+                'ph': 'X',
+                'ts': t.inicio_ns / 1000,
+                'dur': (t.fin_ns - t.inicio_ns) / 1000,
+                'pid': pid,
+                'tid': t.hilo,
+            })
+    return {'traceEvents': eventos, 'displayTimeUnit': 'ms'}
+
+
+def exportar_chrome(ruta, raices=None):
+    """
+    Guarda los tramos como traza JSON de Chrome.
+
+    Returns:
+        int: Cantidad de eventos escritos
+    """
+    traza = eventos_chrome(raices)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(traza, archivo, ensure_ascii=False)
+    return len(traza['traceEvents'])